@@ -0,0 +1,42 @@
+"""add chat message search
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-09-08 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add a trigger-maintained tsvector to chat_messages with a GIN index."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.execute('ALTER TABLE chat_messages ADD COLUMN search_vector tsvector')
+
+    op.execute("""
+        CREATE TRIGGER chat_messages_search_vector
+        BEFORE INSERT OR UPDATE OF content ON chat_messages
+        FOR EACH ROW
+        EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.english', content)
+    """)
+
+    op.execute("UPDATE chat_messages SET search_vector = to_tsvector('pg_catalog.english', content)")
+
+    # room_id leads so a room's matches come from one index scan
+    op.execute(
+        'CREATE INDEX ix_chat_messages_room_search '
+        'ON chat_messages USING gin (room_id, search_vector)'
+    )
+
+
+def downgrade() -> None:
+    """Drop chat message search."""
+    op.execute('DROP INDEX IF EXISTS ix_chat_messages_room_search')
+    op.execute('DROP TRIGGER IF EXISTS chat_messages_search_vector ON chat_messages')
+    op.execute('ALTER TABLE chat_messages DROP COLUMN IF EXISTS search_vector')
@@ -12,7 +12,9 @@ This module provides AI capabilities through LlamaIndex with:
 from .llama_config import llama_config_manager, LlamaIndexConfig
 from .llama_service import llama_service, LlamaIndexService
 from .embedding_service import EmbeddingService
+from .similarity import SimilarityMatrix, SimilarityMetric
 from .context.manager import ContextManager
+from .prompt_template import PromptTemplate
 from .prompt_loader import (
     PromptLoader,
     PromptType,
@@ -28,8 +30,11 @@ __all__ = [
     'llama_service',
     'LlamaIndexService',
     'EmbeddingService',
+    'SimilarityMatrix',
+    'SimilarityMetric',
     'ContextManager',
     'PromptLoader',
+    'PromptTemplate',
     'PromptType',
     'PromptMetadata',
     'TokenBudget',
@@ -1,30 +1,29 @@
-import tiktoken
 from typing import Dict, List, Any, Optional
 
+from ...infrastructure.token_counter import get_token_counter
+
 class TokenOptimizer:
     def __init__(self):
-        self.encoder = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        # gpt-3.5-turbo uses cl100k_base; counts are shared process-wide
+        self.counter = get_token_counter("cl100k_base")
+        self.encoder = self.counter.encoder
         
     def count_tokens(self, text: str) -> int:
-        return len(self.encoder.encode(text))
+        return self.counter.count(text)
         
     def truncate_to_token_limit(self, text: str, limit: int) -> str:
-        tokens = self.encoder.encode(text)
-        if len(tokens) <= limit:
-            return text
-        return self.encoder.decode(tokens[:limit])
+        return self.counter.truncate(text, limit)
         
     def optimize_messages(self, messages: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
-        total_tokens = sum(self.count_tokens(msg['content']) for msg in messages)
-        if total_tokens <= budget:
+        message_tokens = self.counter.count_batch([msg['content'] for msg in messages])
+        if sum(message_tokens) <= budget:
             return messages
             
         # Keep most recent messages within budget
         optimized_messages = []
         current_tokens = 0
         
-        for msg in reversed(messages):
-            msg_tokens = self.count_tokens(msg['content'])
+        for msg, msg_tokens in zip(reversed(messages), reversed(message_tokens)):
             if current_tokens + msg_tokens <= budget:
                 optimized_messages.insert(0, msg)
                 current_tokens += msg_tokens
@@ -40,11 +39,11 @@ class TokenOptimizer:
         return optimized_messages
         
     def optimize_context(self, context: Dict[str, Any], budget: int) -> Dict[str, Any]:
-        total_tokens = sum(
-            self.count_tokens(str(value))
+        total_tokens = sum(self.counter.count_batch([
+            str(value)
             for value in context.values()
             if isinstance(value, (str, int, float))
-        )
+        ]))
         
         if total_tokens <= budget:
             return context
@@ -7,8 +7,9 @@ using OpenAI's text-embedding-3-small model.
 
 import logging
 import hashlib
+import inspect
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
@@ -16,9 +17,17 @@ import numpy as np
 
 from openai import AsyncOpenAI, OpenAI
 from redis import Redis
-import tiktoken
 
 from .llama_config import llama_config_manager
+from .similarity import SimilarityMatrix
+from ..infrastructure.redis.redis_mcp import binary_client
+from ..infrastructure.token_counter import get_token_counter
+from ..infrastructure.vector_codec import (
+    VectorDType,
+    decode_vector_prefix,
+    encode_vector,
+    is_encoded_vector
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +35,11 @@ logger = logging.getLogger(__name__)
 class EmbeddingService:
     """Service for generating and managing embeddings"""
     
-    def __init__(self, redis_client: Optional[Redis] = None):
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        cache_dtype: VectorDType = VectorDType.FLOAT32
+    ):
         self.config = llama_config_manager.get_config()
         self.embedding_config = llama_config_manager.get_embedding_config()
         
@@ -34,12 +47,16 @@ class EmbeddingService:
         self.sync_client = OpenAI(api_key=self.embedding_config["api_key"])
         self.async_client = AsyncOpenAI(api_key=self.embedding_config["api_key"])
         
-        # Initialize tokenizer for text-embedding-3-small
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        # Shared token counter for text-embedding-3-small's encoding
+        self.token_counter = get_token_counter("cl100k_base")
         
-        # Redis for caching (optional)
+        # Redis for caching (optional). Cached vectors are binary, so the
+        # cache needs a client that returns raw bytes.
+        if redis_client is not None and hasattr(redis_client, "connection_pool"):
+            redis_client = binary_client(redis_client)
         self.redis_client = redis_client
         self.cache_enabled = self.config.enable_caching and redis_client is not None
+        self.cache_dtype = cache_dtype
         
         # Thread pool for parallel processing
         self.executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
@@ -115,10 +132,15 @@ class EmbeddingService:
         batch_size: Optional[int] = None,
         metadata: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Generate embeddings for multiple texts in batches"""
+        """
+        Generate embeddings for multiple texts in batches.
+        
+        Results are aligned with ``texts``. Identical texts are looked up and
+        embedded once per call; each batch resolves its cache keys in a single
+        MGET and writes new embeddings back in a single pipeline.
+        """
         try:
             batch_size = batch_size or self.config.batch_size
-            results = []
             
             # Process metadata
             if metadata is None:
@@ -126,63 +148,75 @@ class EmbeddingService:
             elif len(metadata) != len(texts):
                 raise ValueError("Metadata list must match texts list length")
             
+            # Dedupe: first input position of every distinct text
+            first_index: Dict[str, int] = {}
+            for idx, text in enumerate(texts):
+                first_index.setdefault(text, idx)
+            unique_texts = list(first_index)
+            
+            use_cache = use_cache and self.cache_enabled
+            cached: Dict[str, Dict[str, Any]] = {}
+            generated: Dict[str, Dict[str, Any]] = {}
+            
             # Process in batches
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i + batch_size]
-                batch_metadata = metadata[i:i + batch_size]
+            for i in range(0, len(unique_texts), batch_size):
+                batch_texts = unique_texts[i:i + batch_size]
                 
-                # Check cache for each text in batch
-                batch_to_process = []
-                batch_indices = []
-                
-                for idx, text in enumerate(batch_texts):
-                    if use_cache and self.cache_enabled:
-                        cached = await self._get_cached_embedding(text)
-                        if cached:
-                            self.stats["cache_hits"] += 1
-                            results.append(cached)
-                            continue
-                        self.stats["cache_misses"] += 1
-                    
-                    batch_to_process.append(self._prepare_text(text))
-                    batch_indices.append(i + idx)
+                # Resolve the whole batch against the cache in one round trip
+                to_generate = batch_texts
+                if use_cache:
+                    to_generate = []
+                    for text, hit in zip(batch_texts, await self._get_cached_embeddings(batch_texts)):
+                        if hit:
+                            cached[text] = hit
+                        else:
+                            to_generate.append(text)
+                    self.stats["cache_hits"] += len(batch_texts) - len(to_generate)
+                    self.stats["cache_misses"] += len(to_generate)
                 
                 # Generate embeddings for uncached texts
-                if batch_to_process:
+                if to_generate:
                     response = await self.async_client.embeddings.create(
                         model=self.embedding_config["model_name"],
-                        input=batch_to_process,
+                        input=[self._prepare_text(text) for text in to_generate],
                         dimensions=self.embedding_config["dimensions"],
                     )
                     
                     # Process responses
-                    for j, embedding_data in enumerate(response.data):
-                        original_idx = batch_indices[j]
-                        original_text = texts[original_idx]
-                        
+                    new_entries = []
+                    for text, embedding_data in zip(to_generate, response.data):
                         result = {
                             "embedding": embedding_data.embedding,
-                            "text": original_text[:500],
+                            "text": text[:500],
                             "model": self.embedding_config["model_name"],
                             "dimensions": len(embedding_data.embedding),
                             "tokens": response.usage.total_tokens // len(response.data),
-                            "metadata": metadata[original_idx],
+                            "metadata": metadata[first_index[text]],
                             "timestamp": datetime.utcnow().isoformat(),
                         }
-                        
-                        results.append(result)
-                        
-                        # Cache the result
-                        if use_cache and self.cache_enabled:
-                            await self._cache_embedding(original_text, result)
+                        generated[text] = result
+                        new_entries.append((text, result))
+                    
+                    # Cache the batch in one pipeline
+                    if use_cache:
+                        await self._cache_embeddings(new_entries)
                     
                     # Update statistics
                     self.stats["total_embeddings_generated"] += len(response.data)
                     self.stats["total_tokens_processed"] += response.usage.total_tokens
-                
-                # Add delay to respect rate limits
-                if i + batch_size < len(texts):
-                    await asyncio.sleep(0.1)
+                    
+                    # Add delay to respect rate limits between API calls
+                    if i + batch_size < len(unique_texts):
+                        await asyncio.sleep(0.1)
+            
+            # Align with the input; repeated texts get their own copy and
+            # freshly generated results carry their own metadata
+            results = []
+            for idx, text in enumerate(texts):
+                if text in generated:
+                    results.append({**generated[text], "metadata": metadata[idx]})
+                else:
+                    results.append(dict(cached[text]))
             
             logger.info(f"Generated embeddings for {len(texts)} texts in batches")
             return results
@@ -199,14 +233,12 @@ class EmbeddingService:
         
         # Truncate if too long (max ~8000 tokens for text-embedding-3-small)
         max_tokens = 8000
-        tokens = self.tokenizer.encode(text)
+        truncated = self.token_counter.truncate(text, max_tokens)
         
-        if len(tokens) > max_tokens:
-            tokens = tokens[:max_tokens]
-            text = self.tokenizer.decode(tokens)
-            logger.warning(f"Text truncated from {len(tokens)} to {max_tokens} tokens")
+        if truncated != text:
+            logger.warning(f"Text truncated to {max_tokens} tokens")
         
-        return text
+        return truncated
     
     async def _get_cached_embedding(self, text: str) -> Optional[Dict[str, Any]]:
         """Get cached embedding if available"""
@@ -218,7 +250,7 @@ class EmbeddingService:
             cached_data = self.redis_client.get(cache_key)
             
             if cached_data:
-                return json.loads(cached_data)
+                return self._decode_cache_entry(cached_data)
             
             return None
             
@@ -234,20 +266,75 @@ class EmbeddingService:
         try:
             cache_key = self._get_cache_key(text)
             
-            # Convert numpy arrays to lists for JSON serialization
-            cache_data = embedding_data.copy()
-            if isinstance(cache_data.get("embedding"), np.ndarray):
-                cache_data["embedding"] = cache_data["embedding"].tolist()
-            
             self.redis_client.setex(
                 cache_key,
                 self.config.cache_ttl,
-                json.dumps(cache_data)
+                self._encode_cache_entry(embedding_data)
             )
             
         except Exception as e:
             logger.warning(f"Failed to cache embedding: {str(e)}")
     
+    async def _get_cached_embeddings(
+        self,
+        texts: List[str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Get cached embeddings for ``texts`` with one MGET, in input order"""
+        if not self.redis_client or not texts:
+            return [None] * len(texts)
+        
+        try:
+            values = self.redis_client.mget([self._get_cache_key(text) for text in texts])
+            if inspect.isawaitable(values):
+                values = await values
+            return [self._decode_cache_entry(value) if value else None for value in values]
+            
+        except Exception as e:
+            logger.warning(f"Failed to get cached embeddings: {str(e)}")
+            return [None] * len(texts)
+    
+    async def _cache_embeddings(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Cache (text, embedding data) pairs with TTL in one pipeline"""
+        if not self.redis_client or not entries:
+            return
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for text, embedding_data in entries:
+                pipe.setex(
+                    self._get_cache_key(text),
+                    self.config.cache_ttl,
+                    self._encode_cache_entry(embedding_data)
+                )
+            executed = pipe.execute()
+            if inspect.isawaitable(executed):
+                await executed
+            
+        except Exception as e:
+            logger.warning(f"Failed to cache embeddings: {str(e)}")
+    
+    def _encode_cache_entry(self, embedding_data: Dict[str, Any]) -> bytes:
+        """
+        Cache entry layout: the encoded vector followed by the remaining
+        fields as JSON, so a hit never parses the vector as text
+        """
+        fields = {k: v for k, v in embedding_data.items() if k != "embedding"}
+        return (
+            encode_vector(embedding_data["embedding"], self.cache_dtype)
+            + json.dumps(fields).encode()
+        )
+    
+    @staticmethod
+    def _decode_cache_entry(data: bytes) -> Dict[str, Any]:
+        """Decode a cache entry; entries from before the binary format are JSON"""
+        if not is_encoded_vector(data):
+            return json.loads(data)
+        
+        vector, end = decode_vector_prefix(data)
+        result = json.loads(data[end:])
+        result["embedding"] = vector.tolist()
+        return result
+    
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key for text"""
         text_hash = hashlib.sha256(text.encode()).hexdigest()
@@ -292,33 +379,32 @@ class EmbeddingService:
     async def find_similar(
         self,
         query_embedding: List[float],
-        embeddings: List[Tuple[str, List[float]]],
+        embeddings: Union[List[Tuple[str, List[float]]], SimilarityMatrix],
         top_k: int = 5,
         threshold: float = 0.7,
         metric: str = "cosine"
     ) -> List[Dict[str, Any]]:
-        """Find most similar embeddings to query"""
+        """
+        Find most similar embeddings to query.
+        
+        ``embeddings`` may be a prebuilt ``SimilarityMatrix`` so callers that
+        search the same candidates repeatedly convert and normalize them once;
+        its own metric is used in that case.
+        """
         try:
-            similarities = []
-            
-            for text, embedding in embeddings:
-                similarity = await self.calculate_similarity(
-                    query_embedding,
-                    embedding,
-                    metric=metric
+            if isinstance(embeddings, SimilarityMatrix):
+                matrix = embeddings
+            else:
+                matrix = SimilarityMatrix.from_pairs(
+                    embeddings,
+                    metric=metric,
+                    executor=self.executor
                 )
-                
-                if similarity >= threshold:
-                    similarities.append({
-                        "text": text,
-                        "similarity": similarity,
-                    })
-            
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
             
-            # Return top-k results
-            return similarities[:top_k]
+            return [
+                {"text": text, "similarity": similarity}
+                for text, similarity in await matrix.top_k_async(query_embedding, top_k, threshold)
+            ]
             
         except Exception as e:
             logger.error(f"Failed to find similar embeddings: {str(e)}")
@@ -326,11 +412,11 @@ class EmbeddingService:
     
     def estimate_tokens(self, text: str) -> int:
         """Estimate token count for text"""
-        return len(self.tokenizer.encode(text))
+        return self.token_counter.count(text)
     
     def estimate_cost(self, texts: List[str]) -> Dict[str, Any]:
         """Estimate cost for embedding generation"""
-        total_tokens = sum(self.estimate_tokens(text) for text in texts)
+        total_tokens = sum(self.token_counter.count_batch(texts))
         
         # OpenAI text-embedding-3-small pricing (as of 2024)
         # $0.02 per 1M tokens
@@ -21,11 +21,19 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+from collections import OrderedDict
 from functools import lru_cache
 
 from ..services.mcp_integrations.ref_optimization import RefMCP
 from ..services.mcp_integrations.memory_bank import MemoryBankMCP
 from .context.token_optimizer import TokenOptimizer
+from .prompt_template import PromptTemplate, file_stat
+from ..infrastructure.token_counter import get_token_counter
+from ..infrastructure.cache.invalidation_bus import (
+    CacheInvalidation,
+    CacheInvalidationBus,
+    cache_invalidation_bus
+)
 
 logger = logging.getLogger(__name__)
 
@@ -123,12 +131,22 @@ class PromptLoader:
     Main PromptLoader class that manages prompt templates with MCP integration
     """
     
+    # Invalidation bus namespace for loaded prompts
+    INVALIDATION_NAMESPACE = "prompt_loader"
+    
+    # Prompt file extensions, in lookup order
+    PROMPT_EXTENSIONS = (".md", ".txt", ".json", ".yaml")
+    
+    # Cached renders kept per prompt, least recently used out
+    MAX_RENDERS_PER_PROMPT = 64
+    
     def __init__(
         self,
         prompts_dir: str = "prolaunch_prompts",
         cache_enabled: bool = True,
         cache_ttl: int = 3600,
-        token_budget: Optional[TokenBudget] = None
+        token_budget: Optional[TokenBudget] = None,
+        invalidation_bus: Optional[CacheInvalidationBus] = None
     ):
         """
         Initialize PromptLoader
@@ -138,6 +156,7 @@ class PromptLoader:
             cache_enabled: Enable caching
             cache_ttl: Cache time-to-live in seconds
             token_budget: Token budget configuration
+            invalidation_bus: Bus used to drop cached prompts in other processes
         """
         self.prompts_dir = Path(prompts_dir)
         self.cache_enabled = cache_enabled
@@ -149,9 +168,15 @@ class PromptLoader:
         self.memory_bank = MemoryBankMCP()
         self.token_optimizer = TokenOptimizer()
         
-        # Cache storage
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
+        # Cache storage: renders per prompt key, keyed by
+        # (template version, variables, inject_context, optimize, max_tokens)
+        self._cache: Dict[str, "OrderedDict[Tuple, Tuple[Any, datetime]]"] = {}
         self._prompt_registry: Dict[str, PromptMetadata] = {}
+        self._templates: Dict[str, PromptTemplate] = {}
+        
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.register(self.INVALIDATION_NAMESPACE, self._apply_invalidation)
         
         # Load prompts on initialization
         self._load_prompt_registry()
@@ -170,7 +195,7 @@ class PromptLoader:
                 type_dir = self.prompts_dir / prompt_type.value
                 if type_dir.exists() and type_dir.is_dir():
                     for file_path in type_dir.glob("*"):
-                        if file_path.suffix in [".md", ".txt", ".json", ".yaml"]:
+                        if file_path.suffix in self.PROMPT_EXTENSIONS:
                             self._register_prompt(file_path, prompt_type)
             
             logger.info(f"Loaded {len(self._prompt_registry)} prompts into registry")
@@ -183,9 +208,16 @@ class PromptLoader:
         try:
             # Extract metadata from file
             name = file_path.stem
+            registry_key = f"{prompt_type.value}/{name}"
             
-            # Parse metadata from file header if available
-            metadata = self._extract_metadata(file_path)
+            # Compile the template and parse metadata from the same read
+            template, raw = None, None
+            try:
+                template, raw = self._compile_prompt_file(file_path)
+            except Exception as e:
+                # Registered anyway; loading it reports the error as before
+                logger.warning(f"Could not compile prompt {file_path}: {e}")
+            metadata = self._extract_metadata(file_path, raw)
             
             # Create PromptMetadata object
             prompt_meta = PromptMetadata(
@@ -203,20 +235,29 @@ class PromptLoader:
             )
             
             # Register prompt
-            registry_key = f"{prompt_type.value}/{name}"
             self._prompt_registry[registry_key] = prompt_meta
             
+            # Loading prefers extensions in PROMPT_EXTENSIONS order
+            current = self._templates.get(registry_key)
+            if template is not None and (
+                current is None
+                or self.PROMPT_EXTENSIONS.index(file_path.suffix)
+                < self.PROMPT_EXTENSIONS.index(current.path.suffix)
+            ):
+                self._templates[registry_key] = template
+            
             logger.debug(f"Registered prompt: {registry_key}")
             
         except Exception as e:
             logger.error(f"Error registering prompt {file_path}: {e}")
     
-    def _extract_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Extract metadata from prompt file"""
+    def _extract_metadata(self, file_path: Path, content: Optional[str] = None) -> Dict[str, Any]:
+        """Extract metadata from prompt file (or its already read content)"""
         metadata = {}
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            if content is None:
+                content = file_path.read_text(encoding='utf-8')
             
             # Look for metadata header (YAML front matter style)
             if content.startswith("---"):
@@ -243,8 +284,7 @@ class PromptLoader:
                 if purpose_match:
                     metadata["description"] = purpose_match.group(1).strip()
             
-            # Estimate tokens (rough approximation)
-            metadata["token_estimate"] = len(content) // 4
+            metadata["token_estimate"] = get_token_counter().count(content)
             
         except Exception as e:
             logger.warning(f"Could not extract metadata from {file_path}: {e}")
@@ -283,19 +323,25 @@ class PromptLoader:
             if not prompt_key:
                 raise ValueError(f"Prompt '{prompt_name}' not found")
             
+            # Compiled template, recompiled if the file changed
+            template = self._get_template(prompt_key)
+            render_key = (
+                template.version,
+                template.variables_key(variables),
+                inject_context,
+                optimize,
+                max_tokens
+            )
+            
             # Check cache
             if self.cache_enabled:
-                cached = self._get_cached(prompt_key)
+                cached = self._get_cached(prompt_key, render_key)
                 if cached:
                     logger.debug(f"Using cached prompt: {prompt_key}")
                     return cached
             
-            # Load prompt content
-            prompt_content = await self._load_prompt_content(prompt_key)
-            
-            # Interpolate variables
-            if variables:
-                prompt_content = self._interpolate_variables(prompt_content, variables)
+            # Interpolate variables in one pass
+            prompt_content = template.render(variables)
             
             # Inject context from Memory Bank
             if inject_context:
@@ -324,7 +370,7 @@ class PromptLoader:
             
             # Cache result
             if self.cache_enabled:
-                self._set_cached(prompt_key, result)
+                self._set_cached(prompt_key, render_key, result)
             
             return result
             
@@ -626,42 +672,63 @@ class PromptLoader:
         return None
     
     async def _load_prompt_content(self, prompt_key: str) -> str:
-        """Load prompt content from file"""
+        """Load prompt content from its compiled template"""
         try:
-            parts = prompt_key.split("/")
-            if len(parts) != 2:
-                raise ValueError(f"Invalid prompt key: {prompt_key}")
-            
-            prompt_type, prompt_name = parts
-            
-            # Try different file extensions
-            for ext in [".md", ".txt", ".json", ".yaml"]:
-                file_path = self.prompts_dir / prompt_type / f"{prompt_name}{ext}"
-                if file_path.exists():
-                    content = file_path.read_text(encoding='utf-8')
-                    
-                    # Process based on file type
-                    if ext == ".json":
-                        data = json.loads(content)
-                        content = data.get("prompt", str(data))
-                    elif ext == ".yaml":
-                        data = yaml.safe_load(content)
-                        content = data.get("prompt", str(data))
-                    elif ext == ".md":
-                        # Remove metadata header if present
-                        if content.startswith("---"):
-                            parts = content.split("---", 2)
-                            if len(parts) >= 3:
-                                content = parts[2].strip()
-                    
-                    return content
-            
-            raise FileNotFoundError(f"Prompt file not found for: {prompt_key}")
+            return self._get_template(prompt_key).source
             
         except Exception as e:
             logger.error(f"Error loading prompt content for {prompt_key}: {e}")
             raise
     
+    def _get_template(self, prompt_key: str) -> PromptTemplate:
+        """Compiled template for a prompt, recompiled when its file changes"""
+        template = self._templates.get(prompt_key)
+        if template is not None and template.is_current():
+            return template
+        
+        parts = prompt_key.split("/")
+        if len(parts) != 2:
+            raise ValueError(f"Invalid prompt key: {prompt_key}")
+        
+        prompt_type, prompt_name = parts
+        
+        # Try different file extensions
+        for ext in self.PROMPT_EXTENSIONS:
+            file_path = self.prompts_dir / prompt_type / f"{prompt_name}{ext}"
+            if file_path.exists():
+                template, _ = self._compile_prompt_file(file_path)
+                self._templates[prompt_key] = template
+                # Renders of the previous version can never be hit again
+                self._cache.pop(prompt_key, None)
+                logger.debug(f"Compiled prompt template: {prompt_key}")
+                return template
+        
+        self._templates.pop(prompt_key, None)
+        raise FileNotFoundError(f"Prompt file not found for: {prompt_key}")
+    
+    def _compile_prompt_file(self, file_path: Path) -> Tuple[PromptTemplate, str]:
+        """Read, parse and compile a prompt file; returns it with the raw text"""
+        # Stat before reading, so an edit racing the read triggers a recompile
+        stat = file_stat(file_path)
+        raw = file_path.read_text(encoding='utf-8')
+        content = raw
+        
+        # Process based on file type
+        if file_path.suffix == ".json":
+            data = json.loads(content)
+            content = data.get("prompt", str(data))
+        elif file_path.suffix == ".yaml":
+            data = yaml.safe_load(content)
+            content = data.get("prompt", str(data))
+        elif file_path.suffix == ".md":
+            # Remove metadata header if present
+            if content.startswith("---"):
+                parts = content.split("---", 2)
+                if len(parts) >= 3:
+                    content = parts[2].strip()
+        
+        return PromptTemplate.compile(content, path=file_path, stat=stat), raw
+    
     def _interpolate_variables(
         self,
         content: str,
@@ -669,14 +736,7 @@ class PromptLoader:
     ) -> str:
         """Interpolate variables into prompt content"""
         try:
-            # Use Python string formatting
-            for key, value in variables.items():
-                # Handle different placeholder styles
-                content = content.replace(f"{{{key}}}", str(value))
-                content = content.replace(f"${{{key}}}", str(value))
-                content = content.replace(f"${key}", str(value))
-            
-            return content
+            return PromptTemplate.compile(content).render(variables)
             
         except Exception as e:
             logger.error(f"Error interpolating variables: {e}")
@@ -795,7 +855,7 @@ class PromptLoader:
             
         except Exception as e:
             logger.error(f"Error optimizing prompt: {e}")
-            return content[:max_tokens * 4]  # Fallback to truncation
+            return get_token_counter().truncate(content, max_tokens)  # Fallback to truncation
     
     async def _optimize_prompt_chain(
         self,
@@ -827,43 +887,65 @@ class PromptLoader:
             return results
     
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text"""
-        # Simple estimation: 1 token ≈ 4 characters
-        return len(text) // 4
+        """Token count for text, memoized by the shared counter"""
+        return get_token_counter().count(text)
     
     def _extract_variables(self, content: str) -> set:
         """Extract variable placeholders from content"""
-        variables = set()
-        
-        # Find {variable} style
-        variables.update(re.findall(r'\{(\w+)\}', content))
-        
-        # Find ${variable} style
-        variables.update(re.findall(r'\$\{(\w+)\}', content))
-        
-        # Find $variable style
-        variables.update(re.findall(r'\$(\w+)\b', content))
-        
-        return variables
+        return set(PromptTemplate.compile(content).names)
     
-    def _get_cached(self, key: str) -> Optional[Any]:
-        """Get cached item if valid"""
+    def _get_cached(self, key: str, render_key: Tuple = ()) -> Optional[Any]:
+        """Get cached render of a prompt if valid"""
         if not self.cache_enabled:
             return None
         
-        if key in self._cache:
-            value, timestamp = self._cache[key]
+        renders = self._cache.get(key)
+        if renders and render_key in renders:
+            value, timestamp = renders[render_key]
             if datetime.utcnow() - timestamp < timedelta(seconds=self.cache_ttl):
+                renders.move_to_end(render_key)
                 return value
             else:
-                del self._cache[key]
+                del renders[render_key]
         
         return None
     
-    def _set_cached(self, key: str, value: Any):
-        """Set cached item"""
+    def _set_cached(self, key: str, render_key: Tuple, value: Any):
+        """Set cached render of a prompt"""
         if self.cache_enabled:
-            self._cache[key] = (value, datetime.utcnow())
+            renders = self._cache.setdefault(key, OrderedDict())
+            renders[render_key] = (value, datetime.utcnow())
+            renders.move_to_end(render_key)
+            if len(renders) > self.MAX_RENDERS_PER_PROMPT:
+                renders.popitem(last=False)
+    
+    def invalidate_cache(self, *prompt_keys: str) -> None:
+        """
+        Drop cached prompts (all of them when no keys are given) in this
+        process and, through the invalidation bus, in every other one
+        """
+        self._apply_invalidation(CacheInvalidation(
+            namespace=self.INVALIDATION_NAMESPACE,
+            keys=prompt_keys,
+            flush=not prompt_keys
+        ))
+        if self._invalidation_bus is not None:
+            self._invalidation_bus.publish(
+                self.INVALIDATION_NAMESPACE,
+                keys=prompt_keys,
+                flush=not prompt_keys
+            )
+    
+    def _apply_invalidation(self, invalidation: CacheInvalidation):
+        """Drop cached prompts invalidated locally or by another process"""
+        if invalidation.flush:
+            self._cache.clear()
+            self._templates.clear()
+            return
+        
+        for key in invalidation.keys:
+            self._cache.pop(key, None)
+            self._templates.pop(key, None)
     
     def _export_as_markdown(self, export_data: Dict[str, Any]) -> str:
         """Export prompts as markdown document"""
@@ -916,6 +998,7 @@ def get_prompt_loader(
     global prompt_loader
     
     if prompt_loader is None:
+        kwargs.setdefault("invalidation_bus", cache_invalidation_bus)
         prompt_loader = PromptLoader(prompts_dir=prompts_dir, **kwargs)
     
     return prompt_loader
\ No newline at end of file
@@ -0,0 +1,308 @@
+"""
+Matrix-Based Similarity Engine
+
+Scoring candidates one pair at a time rebuilds two arrays and their norms per
+candidate. ``SimilarityMatrix`` keeps candidates in one contiguous float32
+matrix instead (rows pre-normalized for cosine, squared norms cached for
+euclidean), scores a query or a batch of queries with a single matmul and
+selects top-k with ``argpartition``.
+
+For very large matrices the rows can be scored in chunks on a thread pool;
+NumPy releases the GIL inside matmul, so chunks run in parallel and only
+their per-chunk top-k candidates are merged. Coroutines use
+``top_k_async`` so the event loop awaits those chunks instead of blocking
+on them.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from enum import Enum
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..infrastructure.vector_storage import grow_rows
+
+
+class SimilarityMetric(str, Enum):
+    """Supported similarity metrics; higher scores are always more similar"""
+    COSINE = "cosine"
+    DOT = "dot"
+    EUCLIDEAN = "euclidean"
+
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+class SimilarityMatrix:
+    """
+    Candidate vectors with their keys, scored against queries in bulk.
+
+    Scores match ``EmbeddingService.calculate_similarity``: cosine and dot
+    products as-is, euclidean distance mapped to ``1 / (1 + distance)``.
+    Zero vectors score 0 under cosine instead of NaN.
+    """
+
+    def __init__(
+        self,
+        metric: Union[SimilarityMetric, str] = SimilarityMetric.COSINE,
+        dimensions: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        parallel_threshold: int = 50_000,
+        chunk_rows: int = 16_384
+    ):
+        """
+        Args:
+            metric: Similarity metric used for every query
+            dimensions: Vector size; inferred from the first add if omitted
+            executor: Thread pool for chunked scoring of large matrices
+            parallel_threshold: Minimum row count before the executor is used
+            chunk_rows: Rows per chunk in thread-pool mode
+        """
+        self.metric = SimilarityMetric(metric)
+        self.dimensions = dimensions
+        self.executor = executor
+        self.parallel_threshold = parallel_threshold
+        self.chunk_rows = max(1, chunk_rows)
+
+        self._keys: List[Any] = []
+        self._rows = np.empty((0, dimensions or 0), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def from_pairs(
+        cls,
+        pairs: Iterable[Tuple[Any, VectorLike]],
+        metric: Union[SimilarityMetric, str] = SimilarityMetric.COSINE,
+        **kwargs
+    ) -> "SimilarityMatrix":
+        """Build a matrix from (key, vector) pairs"""
+        matrix = cls(metric=metric, **kwargs)
+        pairs = list(pairs)
+        if pairs:
+            keys, vectors = zip(*pairs)
+            matrix.add(keys, vectors)
+        return matrix
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def keys(self) -> List[Any]:
+        return list(self._keys)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored rows (normalized for cosine) as a read-only view"""
+        view = self._rows[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def add(self, keys: Sequence[Any], vectors: Union[Sequence[VectorLike], np.ndarray]) -> None:
+        """Append candidates; ``vectors`` is one row per key"""
+        if len(keys) == 0 and len(vectors) == 0:
+            return
+        block = self._as_matrix(vectors)
+        if len(keys) != block.shape[0]:
+            raise ValueError("Keys and vectors must have the same length")
+
+        if self.metric is SimilarityMetric.COSINE:
+            block = self._normalize(block)
+
+        self._reserve(self._size + block.shape[0])
+        end = self._size + block.shape[0]
+        self._rows[self._size:end] = block
+        if self.metric is SimilarityMetric.EUCLIDEAN:
+            self._sq_norms[self._size:end] = np.einsum("ij,ij->i", block, block)
+        self._keys.extend(keys)
+        self._size = end
+
+    def clear(self) -> None:
+        """Drop all candidates, keeping the dimensions"""
+        self._keys = []
+        self._rows = np.empty((0, self.dimensions or 0), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._size = 0
+
+    def score(self, queries: Union[VectorLike, Sequence[VectorLike]]) -> np.ndarray:
+        """
+        Score queries against every candidate.
+
+        Returns:
+            ``(n_candidates,)`` for a single query, else
+            ``(n_queries, n_candidates)``
+        """
+        single = self._is_single(queries)
+        scores = self._score_rows(self._prepare_queries(queries), 0, self._size)
+        return scores[0] if single else scores
+
+    def top_k(
+        self,
+        query: VectorLike,
+        k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[Any, float]]:
+        """Best ``k`` (key, score) pairs at or above ``threshold``, best first"""
+        return self.top_k_batch([query], k, threshold)[0]
+
+    def top_k_batch(
+        self,
+        queries: Sequence[VectorLike],
+        k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[Any, float]]]:
+        """``top_k`` for several queries with one matmul per chunk"""
+        prepared = self._prepare_queries(queries)
+        if k <= 0 or self._size == 0:
+            return [[] for _ in range(prepared.shape[0])]
+
+        if self._is_parallel():
+            futures = [
+                self.executor.submit(self._chunk_top_k, prepared, k, start)
+                for start in self._chunk_starts()
+            ]
+            indices, scores = self._merge([future.result() for future in futures], k)
+        else:
+            indices, scores = self._select(self._score_rows(prepared, 0, self._size), k)
+        return self._ranked(indices, scores, threshold)
+
+    async def top_k_async(
+        self,
+        query: VectorLike,
+        k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[Any, float]]:
+        """``top_k`` for coroutines; executor chunks are awaited, not joined"""
+        return (await self.top_k_batch_async([query], k, threshold))[0]
+
+    async def top_k_batch_async(
+        self,
+        queries: Sequence[VectorLike],
+        k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[Any, float]]]:
+        """``top_k_batch`` for coroutines; executor chunks are awaited, not joined"""
+        if not self._is_parallel():
+            return self.top_k_batch(queries, k, threshold)
+
+        prepared = self._prepare_queries(queries)
+        if k <= 0:
+            return [[] for _ in range(prepared.shape[0])]
+
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self._chunk_top_k, prepared, k, start)
+            for start in self._chunk_starts()
+        ))
+        return self._ranked(*self._merge(parts, k), threshold)
+
+    def _is_parallel(self) -> bool:
+        return self.executor is not None and self._size >= self.parallel_threshold
+
+    def _chunk_starts(self) -> range:
+        return range(0, self._size, self.chunk_rows)
+
+    def _chunk_top_k(self, queries: np.ndarray, k: int, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k of ``queries`` among rows [start, start + chunk_rows)"""
+        end = min(start + self.chunk_rows, self._size)
+        indices, scores = self._select(self._score_rows(queries, start, end), k)
+        return indices + start, scores
+
+    def _merge(
+        self,
+        parts: Sequence[Tuple[np.ndarray, np.ndarray]],
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Overall top-k from per-chunk top-k candidates"""
+        indices = np.concatenate([part[0] for part in parts], axis=1)
+        scores = np.concatenate([part[1] for part in parts], axis=1)
+
+        order, merged = self._select(scores, k)
+        return np.take_along_axis(indices, order, axis=1), merged
+
+    def _ranked(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        threshold: Optional[float]
+    ) -> List[List[Tuple[Any, float]]]:
+        """(key, score) lists per query, cut at ``threshold``"""
+        results = []
+        for row_indices, row_scores in zip(indices, scores):
+            ranked = []
+            for index, value in zip(row_indices.tolist(), row_scores.tolist()):
+                if threshold is not None and value < threshold:
+                    break
+                ranked.append((self._keys[index], value))
+            results.append(ranked)
+        return results
+
+    def _score_rows(self, queries: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Scores of ``queries`` (already prepared) against rows [start, end)"""
+        rows = self._rows[start:end]
+        scores = queries @ rows.T
+
+        if self.metric is SimilarityMetric.EUCLIDEAN:
+            q_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+            sq_dist = q_norms + self._sq_norms[start:end][None, :] - 2.0 * scores
+            np.maximum(sq_dist, 0.0, out=sq_dist)
+            scores = 1.0 / (1.0 + np.sqrt(sq_dist))
+
+        return scores
+
+    @staticmethod
+    def _select(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indices and scores of the best ``k`` per row, best first"""
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+        picked = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-picked, axis=1, kind="stable")
+        return (
+            np.take_along_axis(candidates, order, axis=1),
+            np.take_along_axis(picked, order, axis=1),
+        )
+
+    def _prepare_queries(self, queries: Union[VectorLike, Sequence[VectorLike]]) -> np.ndarray:
+        prepared = self._as_matrix(queries)
+        if self.metric is SimilarityMetric.COSINE:
+            prepared = self._normalize(prepared)
+        return prepared
+
+    def _as_matrix(self, vectors: Union[VectorLike, Sequence[VectorLike]]) -> np.ndarray:
+        """2-D contiguous float32 view of one vector or a batch of vectors"""
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1 and matrix.size == 0:
+            matrix = matrix.reshape(0, self.dimensions or 0)
+        elif matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2:
+            raise ValueError("Vectors must be 1-D or 2-D")
+
+        if self.dimensions is None:
+            self.dimensions = matrix.shape[1]
+            self._rows = np.empty((0, self.dimensions), dtype=np.float32)
+        elif matrix.shape[1] != self.dimensions and matrix.shape[0] > 0:
+            raise ValueError(
+                f"Expected vectors of {self.dimensions} dimensions, got {matrix.shape[1]}"
+            )
+        return matrix
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def _is_single(queries: Union[VectorLike, Sequence[VectorLike]]) -> bool:
+        return np.ndim(queries) == 1
+
+    def _reserve(self, size: int) -> None:
+        grown = grow_rows((self._rows, self._sq_norms), size, self._size)
+        if grown is not None:
+            self._rows, self._sq_norms = grown
@@ -9,7 +9,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from datetime import datetime
 
-from ..services.context import ContextManager
+from ..services.context import ContextManager, context_registry
+from ..infrastructure.token_counter import get_token_counter
 from ..core.dependencies import get_current_user, AuthUser
 from ..models.base import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,10 +25,6 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Store context managers per session
-context_managers: Dict[str, ContextManager] = {}
-
-
 class MessageInput(BaseModel):
     """Input model for adding messages"""
     role: str = Field(..., description="Message role (user, assistant, system)")
@@ -68,17 +65,10 @@ async def get_context_manager(
     """
     Get or create context manager for the current user session.
     """
-    session_key = f"{current_user.id}:{current_user.token_payload.get('session_id', 'default')}"
-    
-    if session_key not in context_managers:
-        manager = ContextManager(
-            user_id=current_user.id,
-            session_id=current_user.token_payload.get('session_id', 'default')
-        )
-        await manager.initialize()
-        context_managers[session_key] = manager
-    
-    return context_managers[session_key]
+    return await context_registry.get(
+        user_id=current_user.id,
+        session_id=current_user.token_payload.get('session_id', 'default')
+    )
 
 
 @router.post("/initialize")
@@ -168,7 +158,7 @@ async def query_context(
         return {
             "status": "success",
             "context": context,
-            "token_count": len(context) // 4,  # Rough estimate
+            "token_count": get_token_counter().count(context),
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -381,6 +371,7 @@ async def get_context_statistics(
         return {
             "status": "success",
             "statistics": statistics,
+            "registry": context_registry.stats,
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -11,10 +11,11 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from ...models import get_db
+from ...models.base import AsyncSessionLocal
 from ...models.citation import (
     SourceType, VerificationStatus, ContentType,
     FeedbackType, MetricType
@@ -107,7 +108,7 @@ class BatchCitationResponse(BaseModel):
 
 # Dependency injection
 def get_citation_service(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     background_tasks: BackgroundTasks = None
 ) -> CitationService:
     """Get citation service instance."""
@@ -119,7 +120,8 @@ def get_citation_service(
         db=db,
         cache_manager=cache_manager,
         postgres_mcp=postgres_mcp,
-        puppeteer_mcp=puppeteer_mcp
+        puppeteer_mcp=puppeteer_mcp,
+        session_factory=AsyncSessionLocal
     )
 
 
@@ -274,7 +276,7 @@ async def update_citation(
 async def delete_citation(
     citation_id: UUID,
     current_user: dict = Depends(require_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a citation.
@@ -282,18 +284,18 @@ async def delete_citation(
     Soft deletes a citation by marking it as inactive. Requires authentication.
     """
     try:
-        citation = db.get(Citation, citation_id)
+        citation = await db.get(Citation, citation_id)
         if not citation:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Citation not found")
         
         citation.is_active = False
         citation.is_archived = True
-        db.commit()
+        await db.commit()
         
         return None
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
@@ -16,6 +16,7 @@ from ...models.user import User
 from ...services.dependency_manager import DependencyManager, DependencyType
 from ...services.milestone_cache import MilestoneCacheService
 from ...infrastructure.redis.redis_mcp import RedisMCPClient
+from ...infrastructure.cache.invalidation_bus import cache_invalidation_bus
 from ...core.exceptions import (
     CircularDependencyError,
     DependencyValidationError,
@@ -38,8 +39,10 @@ async def get_dependency_manager(
     db: AsyncSession = Depends(get_db)
 ) -> DependencyManager:
     """Dependency injection for DependencyManager."""
-    cache_service = MilestoneCacheService(db, RedisMCPClient())
-    return DependencyManager(db, cache_service)
+    cache_service = MilestoneCacheService(db, RedisMCPClient(async_mode=True))
+    return DependencyManager(
+        db, cache_service, invalidation_bus=cache_invalidation_bus
+    )
 
 
 # Admin endpoints for managing dependencies
@@ -449,23 +452,26 @@ async def bulk_validate_dependencies(
     from ...models.milestone import Milestone
     from sqlalchemy import select
     
+    # Resolve all codes in one query
+    stmt = select(Milestone.id, Milestone.code).where(Milestone.code.in_(milestone_codes))
+    result = await db.execute(stmt)
+    milestone_ids = {code: str(milestone_id) for milestone_id, code in result.all()}
+    
+    validations = await manager.bulk_validate_dependencies(
+        str(current_user.id),
+        list(milestone_ids.values()),
+        check_conditions=True
+    )
+    
     results = {}
     
     for code in milestone_codes:
-        # Get milestone by code
-        stmt = select(Milestone).where(Milestone.code == code)
-        result = await db.execute(stmt)
-        milestone = result.scalar_one_or_none()
-        
-        if milestone:
-            all_met, unmet = await manager.validate_dependencies(
-                str(current_user.id),
-                str(milestone.id),
-                check_conditions=True
-            )
+        if code in milestone_ids:
+            validation = validations[milestone_ids[code]]
+            unmet = validation["unmet_dependencies"]
             
             results[code] = {
-                "can_start": all_met,
+                "can_start": validation["all_met"],
                 "unmet_count": len(unmet),
                 "unmet_dependencies": [d["milestone_code"] for d in unmet]
             }
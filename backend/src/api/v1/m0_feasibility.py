@@ -89,6 +89,8 @@ async def generate_m0_snapshot(
     Returns:
         Generated M0 snapshot response
     """
+    global m0_generator, m0_cache
+    
     try:
         # Initialize services if needed
         if not m0_generator:
@@ -96,9 +98,8 @@ async def generate_m0_snapshot(
             llama_service = LlamaService()
             citation_service = CitationService(db)
             context_manager = ContextManager(str(current_user.id), "session_id")
-            redis_client = RedisMCPClient()
+            redis_client = RedisMCPClient(async_mode=True)
             
-            global m0_generator
             m0_generator = M0GeneratorService(
                 db, llama_service, citation_service,
                 context_manager, redis_client
@@ -115,8 +116,7 @@ async def generate_m0_snapshot(
         # Check cache first if requested
         if request.use_cache:
             if not m0_cache:
-                global m0_cache
-                m0_cache = M0CacheService(db, RedisMCPClient())
+                m0_cache = M0CacheService(db, RedisMCPClient(async_mode=True))
                 await m0_cache.initialize()
             
             cached = await m0_cache.get_cached_snapshot(
@@ -20,6 +20,7 @@ from ...services.milestone_service import MilestoneService
 from ...services.milestone_cache import MilestoneCacheService
 from ...services.dependency_manager import DependencyManager
 from ...infrastructure.redis.redis_mcp import RedisMCPClient
+from ...infrastructure.cache.invalidation_bus import cache_invalidation_bus
 from ...core.auth import get_current_user
 from ...core.dependencies import get_redis_client
 from ...core.exceptions import (
@@ -151,7 +152,9 @@ async def get_dependency_manager(
 ) -> DependencyManager:
     """Get dependency manager instance."""
     cache_service = MilestoneCacheService(redis)
-    return DependencyManager(db, cache_service, redis)
+    return DependencyManager(
+        db, cache_service, redis, invalidation_bus=cache_invalidation_bus
+    )
 
 
 # Milestone retrieval endpoints
@@ -286,16 +286,18 @@ async def handle_websocket_message_secure(
         # Limit message history size
         limit = min(message.get("limit", 50), 100)  # Cap at 100 messages
         
-        messages = await chat_service.get_messages(
+        page = await chat_service.get_messages(
             room_id=room_id,
             limit=limit,
+            before=message.get("before"),
             before_id=UUID(message["before_id"]) if message.get("before_id") else None
         )
         
         return {
             "type": "message_history",
             "room_id": str(room_id),
-            "messages": [msg.dict() for msg in messages]
+            "messages": page["messages"],
+            "next_cursor": page["next_cursor"]
         }
 
     else:
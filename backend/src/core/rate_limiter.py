@@ -1,10 +1,70 @@
 from typing import Optional, Dict, Tuple
-from datetime import datetime, timedelta
-import redis
+from dataclasses import dataclass
+import logging
+import math
+
+from redis.asyncio import Redis, from_url
+from redis.exceptions import RedisError
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
-import json
+
+logger = logging.getLogger(__name__)
+
+
+# Generic Cell Rate Algorithm (GCRA) evaluated atomically on the server.
+#
+# The key stores the "theoretical arrival time" (TAT) in milliseconds. Each
+# request pushes the TAT forward by one emission interval (window / limit);
+# a request is allowed while the TAT stays within one full window of "now".
+# The script answers allow/deny, remaining quota, retry-after and reset in a
+# single round trip and never needs a cleanup scan.
+#
+# KEYS[1] = limiter key
+# ARGV[1] = emission interval in ms (window_ms / max_requests)
+# ARGV[2] = delay variation tolerance in ms (window_ms)
+# ARGV[3] = cost of this request (number of tokens)
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local emission_interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local tat = tonumber(redis.call('GET', key))
+if not tat or tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission_interval * cost
+local allow_at = new_tat - tolerance
+local diff = now - allow_at
+
+if diff < 0 then
+    local retry_after = -diff
+    local reset_after = tat - now
+    return {0, 0, retry_after, reset_after}
+end
+
+local reset_after = new_tat - now
+redis.call('SET', key, new_tat, 'PX', math.max(1, math.ceil(reset_after)))
+local remaining = math.floor(diff / emission_interval)
+return {1, remaining, 0, reset_after}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a single rate limit evaluation."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int
+    reset_after: int
+
 
 class RateLimitExceeded(HTTPException):
     def __init__(self, retry_after: int):
@@ -15,60 +75,64 @@ class RateLimitExceeded(HTTPException):
         self.headers = {"Retry-After": str(retry_after)}
 
 class RateLimiter:
-    def __init__(self, redis_url: str):
-        self.redis = redis.from_url(redis_url)
-
-    def _get_window_key(self, key: str, window_size: int) -> str:
-        """Get the current window key based on timestamp."""
-        timestamp = int(datetime.now().timestamp())
-        window = timestamp - (timestamp % window_size)
-        return f"ratelimit:{key}:{window}"
-
-    def _cleanup_old_windows(self, key: str, window_size: int):
-        """Remove expired window keys."""
-        current_time = int(datetime.now().timestamp())
-        pattern = f"ratelimit:{key}:*"
-        for old_key in self.redis.keys(pattern):
-            window_time = int(old_key.decode().split(":")[-1])
-            if current_time - window_time > window_size:
-                self.redis.delete(old_key)
-
-    def check_rate_limit(
+    def __init__(self, redis_url: Optional[str] = None, redis: Optional[Redis] = None):
+        if redis is None:
+            if redis_url is None:
+                raise ValueError("Either redis_url or redis must be provided")
+            redis = from_url(redis_url)
+        self.redis = redis
+        self._script = self.redis.register_script(GCRA_SCRIPT)
+
+    async def check_rate_limit(
         self,
         key: str,
         max_requests: int,
-        window_size: int
-    ) -> Tuple[bool, Optional[int]]:
+        window_size: int,
+        cost: int = 1
+    ) -> RateLimitResult:
         """
-        Check if the rate limit has been exceeded.
-        Returns (allowed: bool, retry_after: Optional[int])
+        Check and consume quota for ``key`` with one atomic script call.
+
+        Allows ``max_requests`` per ``window_size`` seconds with bursts up to
+        the full limit. Fails open if Redis is unavailable.
         """
-        window_key = self._get_window_key(key, window_size)
-        
-        # Use pipeline for atomic operations
-        pipe = self.redis.pipeline()
-        pipe.incr(window_key)
-        pipe.expire(window_key, window_size)
-        current_requests = pipe.execute()[0]
-
-        if current_requests > max_requests:
-            # Calculate retry-after
-            window_end = (int(datetime.now().timestamp()) // window_size + 1) * window_size
-            retry_after = window_end - int(datetime.now().timestamp())
-            return False, retry_after
-
-        return True, None
+        window_ms = window_size * 1000
+        emission_interval = window_ms / max_requests
+
+        try:
+            allowed, remaining, retry_after_ms, reset_after_ms = await self._script(
+                keys=[f"ratelimit:{key}"],
+                args=[emission_interval, window_ms, cost]
+            )
+        except RedisError as e:
+            logger.error(f"Rate limiter error: {e}")
+            return RateLimitResult(
+                allowed=True,
+                limit=max_requests,
+                remaining=max_requests,
+                retry_after=0,
+                reset_after=0
+            )
+
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=max_requests,
+            remaining=min(max_requests, int(remaining)),
+            retry_after=math.ceil(float(retry_after_ms) / 1000),
+            reset_after=math.ceil(float(reset_after_ms) / 1000)
+        )
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
         app: ASGIApp,
-        redis_url: str,
-        auth_limits: Optional[Dict[str, Tuple[int, int]]] = None
+        redis_url: Optional[str] = None,
+        auth_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        redis: Optional[Redis] = None
     ):
         super().__init__(app)
-        self.limiter = RateLimiter(redis_url)
-        
+        self.limiter = RateLimiter(redis_url, redis=redis)
+
         # Default rate limits if none provided
         self.limits = {
             "default": (100, 60),  # 100 requests per minute
@@ -84,7 +148,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Prefer authenticated user ID if available
         if hasattr(request.state, "user_id"):
             return f"user:{request.state.user_id}"
-        
+
         # Fall back to IP address
         forwarded = request.headers.get("X-Forwarded-For")
         if forwarded:
@@ -96,7 +160,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def _get_endpoint_type(self, request: Request) -> str:
         """Determine the type of endpoint being accessed."""
         path = request.url.path.lower()
-        
+
         if path.startswith("/auth"):
             return "auth"
         elif path.startswith("/ws"):
@@ -105,33 +169,45 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return "export"
         return "default"
 
+    @staticmethod
+    def _rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(max(0, result.remaining)),
+            "X-RateLimit-Reset": str(result.reset_after),
+        }
+
     async def dispatch(self, request: Request, call_next):
         # Determine rate limit based on endpoint
         endpoint_type = self._get_endpoint_type(request)
         max_requests, window_size = self.limits[endpoint_type]
-        
+
         # Get client identifier
         client_id = self._get_client_identifier(request)
-        
-        # Check rate limit
-        allowed, retry_after = self.limiter.check_rate_limit(
+
+        # Check rate limit (single round trip, non-blocking)
+        result = await self.limiter.check_rate_limit(
             f"{endpoint_type}:{client_id}",
             max_requests,
             window_size
         )
-        
-        if not allowed:
-            raise RateLimitExceeded(retry_after)
-        
+
+        if not result.allowed:
+            # Exceptions raised from middleware bypass FastAPI's handlers,
+            # so render the 429 response directly.
+            exc = RateLimitExceeded(result.retry_after)
+            return JSONResponse(
+                status_code=exc.status_code,
+                content={"detail": exc.detail},
+                headers={**exc.headers, **self._rate_limit_headers(result)}
+            )
+
         # If allowed, process the request
         response = await call_next(request)
-        
-        # Add rate limit headers
-        remaining = max_requests - 1  # Approximate remaining requests
-        response.headers["X-RateLimit-Limit"] = str(max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
-        response.headers["X-RateLimit-Reset"] = str(window_size)
-        
+
+        # Add rate limit headers from the same script evaluation
+        response.headers.update(self._rate_limit_headers(result))
+
         return response
 
 def setup_rate_limiter(
@@ -141,7 +217,7 @@ def setup_rate_limiter(
 ) -> None:
     """
     Configure rate limiting middleware for a FastAPI application.
-    
+
     Args:
         app: The FastAPI application instance
         redis_url: Redis connection URL
@@ -151,4 +227,4 @@ def setup_rate_limiter(
         RateLimitMiddleware,
         redis_url=redis_url,
         auth_limits=auth_limits
-    )
\ No newline at end of file
+    )
@@ -2,7 +2,7 @@
 Security module initialization.
 Configures and initializes all security components.
 """
-from .rate_limiter import RedisRateLimiter, RateLimitType, RateLimitExceeded
+from .rate_limiter import RedisRateLimiter, TwoTierRateLimiter, RateLimitType, RateLimitExceeded
 from .content_security import content_validator, file_validator, ContentSecurityError
 from .websocket_security import (
     WebSocketAuthenticator, WebSocketConnectionManager, 
@@ -15,6 +15,7 @@ from .sentry_security import (
 
 __all__ = [
     'RedisRateLimiter',
+    'TwoTierRateLimiter',
     'RateLimitType', 
     'RateLimitExceeded',
     'content_validator',
@@ -9,7 +9,7 @@ from datetime import datetime
 from redis.asyncio import Redis
 
 from .sentry_security import initialize_security_monitoring, SentrySecurityMonitor
-from .rate_limiter import RedisRateLimiter
+from .rate_limiter import RedisRateLimiter, TwoTierRateLimiter
 from .websocket_security import WebSocketAuthenticator, IPWhitelist
 from ..config import settings
 
@@ -26,6 +26,9 @@ class SecurityConfig:
     # Rate Limiting Configuration
     ENABLE_RATE_LIMITING = os.getenv("ENABLE_RATE_LIMITING", "true").lower() == "true"
     RATE_LIMIT_STRICT_MODE = os.getenv("RATE_LIMIT_STRICT_MODE", "false").lower() == "true"
+    # Fraction of each limit leased to the local token bucket (0 = exact, Redis per request)
+    RATE_LIMIT_LEASE_FRACTION = float(os.getenv("RATE_LIMIT_LEASE_FRACTION", "0.1"))
+    RATE_LIMIT_BLOCK_CACHE_TTL = float(os.getenv("RATE_LIMIT_BLOCK_CACHE_TTL", "1.0"))
     
     # Content Security Configuration
     ENABLE_CONTENT_VALIDATION = os.getenv("ENABLE_CONTENT_VALIDATION", "true").lower() == "true"
@@ -83,8 +86,16 @@ class SecurityManager:
             
             # Initialize rate limiter
             if self.config.ENABLE_RATE_LIMITING:
-                self.rate_limiter = RedisRateLimiter(redis)
-                logger.info("Redis rate limiter initialized")
+                if self.config.RATE_LIMIT_STRICT_MODE:
+                    self.rate_limiter = RedisRateLimiter(redis)
+                    logger.info("Redis rate limiter initialized")
+                else:
+                    self.rate_limiter = TwoTierRateLimiter(
+                        redis,
+                        lease_fraction=self.config.RATE_LIMIT_LEASE_FRACTION,
+                        block_cache_ttl=self.config.RATE_LIMIT_BLOCK_CACHE_TTL
+                    )
+                    logger.info("Two-tier rate limiter initialized")
             
             # Initialize WebSocket authenticator
             if hasattr(settings, 'SECRET_KEY'):
@@ -1,8 +1,12 @@
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from redis.asyncio import Redis
+import asyncio
 import json
 import logging
+import math
+import time
 from fastapi import HTTPException
 import enum
 
@@ -223,6 +227,191 @@ class RedisRateLimiter:
         except Exception as e:
             logger.error(f"Failed to record attempt: {e}")
 
+# Reserve up to ARGV[3] requests from a shared fixed-window budget.
+#
+# KEYS[1] = budget counter key
+# ARGV[1] = max requests per window
+# ARGV[2] = window length in ms
+# ARGV[3] = requested lease size
+# Returns {granted, window_ttl_ms}
+LEASE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local grant = math.min(requested, limit - used)
+if grant > 0 then
+    if redis.call('INCRBY', KEYS[1], grant) == grant then
+        redis.call('PEXPIRE', KEYS[1], window_ms)
+    end
+else
+    grant = 0
+end
+
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    ttl = window_ms
+end
+return {grant, ttl}
+"""
+
+
+@dataclass
+class _LocalBucket:
+    """Quota leased from Redis and spent locally until the window ends."""
+    tokens: int = 0
+    expires_at: float = 0.0
+    denied_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class TwoTierRateLimiter(RedisRateLimiter):
+    """
+    Rate limiter with an in-process token bucket in front of Redis.
+
+    Each (key, identifier, action) bucket leases a batch of requests from a
+    shared per-window budget in Redis and answers subsequent requests
+    locally until the lease is spent or the window rolls over. Denials and
+    IP block lookups are cached locally as well, so steady traffic that is
+    clearly under (or clearly over) the limit costs no Redis round trips.
+
+    ``lease_fraction`` sets the accuracy/throughput trade-off: each lease
+    reserves that fraction of the limit, so a node may hold up to one
+    unspent lease per bucket that other nodes cannot use. ``0`` leases a
+    single request at a time (exact, one round trip per request).
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        lease_fraction: float = 0.1,
+        max_lease: int = 100,
+        block_cache_ttl: float = 1.0,
+        max_buckets: int = 100_000
+    ):
+        super().__init__(redis)
+        self.lease_fraction = lease_fraction
+        self.max_lease = max_lease
+        self.block_cache_ttl = block_cache_ttl
+        self.max_buckets = max_buckets
+
+        self._lease_script = redis.register_script(LEASE_SCRIPT)
+        self._buckets: Dict[str, _LocalBucket] = {}
+        self._blocked_cache: Dict[str, Tuple[bool, float]] = {}
+        self.stats = {
+            "local_hits": 0,
+            "leases": 0,
+            "local_denials": 0,
+            "remote_denials": 0,
+        }
+
+    def _lease_size(self, max_requests: int) -> int:
+        return max(1, min(self.max_lease, int(max_requests * self.lease_fraction)))
+
+    def _prune(self, now: float) -> None:
+        """Drop expired buckets and block entries once the maps grow too large."""
+        if len(self._buckets) > self.max_buckets:
+            self._buckets = {
+                k: b for k, b in self._buckets.items()
+                if max(b.expires_at, b.denied_until) > now or b.lock.locked()
+            }
+        if len(self._blocked_cache) > self.max_buckets:
+            self._blocked_cache = {
+                ip: entry for ip, entry in self._blocked_cache.items()
+                if entry[1] > now
+            }
+
+    async def check_rate_limit(
+        self,
+        key: str,
+        identifier: str,
+        action: str,
+        max_requests: Optional[int] = None,
+        window_seconds: Optional[int] = None
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Check a request against the local lease, refilling it from Redis
+        when spent. Returns (is_allowed, retry_after_seconds).
+        """
+        if max_requests is None or window_seconds is None:
+            max_requests, window_seconds = self.DEFAULT_LIMITS.get(action, (30, 60))
+
+        bucket_key = f"{action}:{key}:{identifier}"
+        now = time.monotonic()
+
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            self._prune(now)
+            bucket = self._buckets.setdefault(bucket_key, _LocalBucket())
+
+        # Fast path: answer from local state without touching Redis
+        if bucket.denied_until > now:
+            self.stats["local_denials"] += 1
+            return False, math.ceil(bucket.denied_until - now)
+        if bucket.tokens > 0 and bucket.expires_at > now:
+            bucket.tokens -= 1
+            self.stats["local_hits"] += 1
+            return True, None
+
+        async with bucket.lock:
+            # Another coroutine may have refilled the bucket while we waited
+            now = time.monotonic()
+            if bucket.tokens > 0 and bucket.expires_at > now:
+                bucket.tokens -= 1
+                self.stats["local_hits"] += 1
+                return True, None
+
+            try:
+                granted, ttl_ms = await self._lease_script(
+                    keys=[f"rate_lease:{bucket_key}"],
+                    args=[max_requests, window_seconds * 1000, self._lease_size(max_requests)]
+                )
+            except Exception as e:
+                logger.error(f"Rate limiter lease error: {e}")
+                # On error, allow the request but log the issue
+                return True, None
+
+            self.stats["leases"] += 1
+            window_end = now + int(ttl_ms) / 1000
+
+            if int(granted) <= 0:
+                bucket.tokens = 0
+                bucket.denied_until = window_end
+                self.stats["remote_denials"] += 1
+                return False, max(1, math.ceil(int(ttl_ms) / 1000))
+
+            bucket.tokens = int(granted) - 1
+            bucket.expires_at = window_end
+            bucket.denied_until = 0.0
+            return True, None
+
+    async def ip_is_blocked(self, ip: str) -> bool:
+        """
+        Check if an IP is blocked, caching the answer for ``block_cache_ttl``
+        """
+        now = time.monotonic()
+        cached = self._blocked_cache.get(ip)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        blocked = await super().ip_is_blocked(ip)
+        self._blocked_cache[ip] = (blocked, now + self.block_cache_ttl)
+        return blocked
+
+    async def block_ip(
+        self,
+        ip: str,
+        reason: str,
+        duration: int = 3600
+    ) -> None:
+        """
+        Block an IP and record the block locally right away
+        """
+        await super().block_ip(ip, reason, duration)
+        self._blocked_cache[ip] = (True, time.monotonic() + min(duration, self.block_cache_ttl))
+
+
 async def rate_limit_dependency(
     action: str,
     redis: Redis,
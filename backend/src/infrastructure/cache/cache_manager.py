@@ -6,11 +6,15 @@ memory cache (L1) and Redis cache (L2) for optimal performance.
 """
 
 import asyncio
+import fnmatch
+import inspect
 import json
 import logging
 import pickle
+import re
+import time
 import zlib
-from typing import Optional, Dict, Any, List, Callable, Union, TypeVar, Generic
+from typing import Optional, Dict, Any, List, Callable, Union, TypeVar, Generic, Tuple, Iterable
 from datetime import datetime, timedelta
 from functools import wraps
 import hashlib
@@ -20,12 +24,18 @@ import sys
 
 from ..redis.redis_mcp import RedisMCPClient, redis_mcp_client
 from ..config.settings import settings, CacheSettings
+from .invalidation_bus import CacheInvalidation, CacheInvalidationBus, cache_invalidation_bus
+from .stampede import SingleFlight, run_with_lease, xfetch_should_refresh
+from .tags import TagIndex
 
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Upper bound on keys tracked for probabilistic early refresh
+REFRESH_META_MAX_SIZE = 10000
+
 
 class CacheLayer(Enum):
     """Cache layer types"""
@@ -48,6 +58,7 @@ class LRUCache(Generic[T]):
     def __init__(self, max_size: int = 1000):
         self.max_size = max_size
         self.cache: OrderedDict[str, Tuple[T, datetime, int]] = OrderedDict()
+        self.tags = TagIndex()
         self.lock = asyncio.Lock()
         self.hits = 0
         self.misses = 0
@@ -57,14 +68,15 @@ class LRUCache(Generic[T]):
         async with self.lock:
             if key in self.cache:
                 # Move to end (most recently used)
-                value, expiry, _ = self.cache.pop(key)
+                value, expiry, access_count = self.cache.pop(key)
                 
                 # Check expiry
                 if expiry and datetime.utcnow() > expiry:
+                    self.tags.discard(key)
                     self.misses += 1
                     return None
                 
-                self.cache[key] = (value, expiry, self.cache[key][2] + 1)
+                self.cache[key] = (value, expiry, access_count + 1)
                 self.hits += 1
                 return value
             
@@ -75,9 +87,10 @@ class LRUCache(Generic[T]):
         self,
         key: str,
         value: T,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
     ) -> None:
-        """Set value in cache"""
+        """Set value in cache, optionally under invalidation tags"""
         async with self.lock:
             # Calculate expiry
             expiry = None
@@ -90,24 +103,37 @@ class LRUCache(Generic[T]):
             
             # Add to end
             self.cache[key] = (value, expiry, 0)
+            self.tags.add(key, tags or ())
             
             # Evict if necessary
             while len(self.cache) > self.max_size:
                 # Remove least recently used
-                self.cache.popitem(last=False)
+                evicted, _ = self.cache.popitem(last=False)
+                self.tags.discard(evicted)
     
     async def delete(self, key: str) -> bool:
         """Delete from cache"""
         async with self.lock:
             if key in self.cache:
                 self.cache.pop(key)
+                self.tags.discard(key)
                 return True
             return False
     
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry registered under any of the tags"""
+        async with self.lock:
+            count = 0
+            for key in self.tags.pop(*tags):
+                if self.cache.pop(key, None) is not None:
+                    count += 1
+            return count
+    
     async def clear(self) -> None:
         """Clear entire cache"""
         async with self.lock:
             self.cache.clear()
+            self.tags.clear()
             self.hits = 0
             self.misses = 0
     
@@ -131,12 +157,17 @@ class CacheManager:
     """
     Multi-layer cache manager with intelligent routing and optimization.
     Implements L1 (memory) and L2 (Redis) caching with automatic promotion/demotion.
+    With an invalidation bus, L1 writes and invalidations are broadcast so
+    other worker processes drop their stale copies.
     """
     
+    INVALIDATION_NAMESPACE = "cache_manager"
+    
     def __init__(
         self,
         cache_settings: Optional[CacheSettings] = None,
-        redis_client: Optional[RedisMCPClient] = None
+        redis_client: Optional[RedisMCPClient] = None,
+        invalidation_bus: Optional[CacheInvalidationBus] = None
     ):
         """Initialize cache manager"""
         self.settings = cache_settings or settings.cache
@@ -145,15 +176,27 @@ class CacheManager:
         # Initialize memory cache
         self.memory_cache = LRUCache(max_size=self.settings.memory_cache_max_size)
         
+        # Cross-process L1 coherence
+        self.invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.register(self.INVALIDATION_NAMESPACE, self._apply_invalidation)
+        
         # Cache statistics
         self.stats = {
             "requests": 0,
             "memory_hits": 0,
             "redis_hits": 0,
             "misses": 0,
-            "errors": 0
+            "errors": 0,
+            "early_refreshes": 0,
+            "stale_served": 0
         }
         
+        # Stampede protection: in-flight recomputes and, per key, the last
+        # recompute duration and logical expiry used for early refresh
+        self._single_flight = SingleFlight()
+        self._refresh_meta: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        
         # Background tasks
         self._warmup_task: Optional[asyncio.Task] = None
         self._metrics_task: Optional[asyncio.Task] = None
@@ -208,9 +251,14 @@ class CacheManager:
             
             # Check L2 (Redis cache)
             if self.settings.enable_redis_cache and policy.get("layer") in ["redis", "both"]:
-                value = await self.redis_client.get(key, default)
+                promote = policy.get("layer") == "both" and self.settings.enable_memory_cache
+                if promote:
+                    # Promoted copies keep their tags so invalidate_tags reaches them
+                    value, tags = await self.redis_client.get_with_tags(key)
+                else:
+                    value = await self.redis_client.get(key)
                 
-                if value != default:
+                if value is not None:
                     self.stats["redis_hits"] += 1
                     
                     # Decompress if needed
@@ -218,8 +266,8 @@ class CacheManager:
                         value = self._decompress_value(value)
                     
                     # Promote to L1 if policy allows
-                    if policy.get("layer") == "both" and self.settings.enable_memory_cache:
-                        await self.memory_cache.set(key, value, policy.get("ttl"))
+                    if promote:
+                        await self.memory_cache.set(key, value, policy.get("ttl"), list(tags))
                     
                     return value
             
@@ -236,16 +284,18 @@ class CacheManager:
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        data_type: Optional[str] = None
+        data_type: Optional[str] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
         """
         Set value in cache with intelligent layer selection.
-        May set in L1, L2, or both based on policy.
+        May set in L1, L2, or both based on policy. Keys written with
+        ``tags`` can later be dropped together with ``invalidate_tags``.
         """
         try:
             # Determine cache policy
             policy = self._get_cache_policy(data_type)
-            ttl = ttl or policy.get("ttl", self.settings.cache_policies.get("default", {}).get("ttl", 3600))
+            ttl = self._resolve_ttl(ttl, data_type)
             
             # Compress if needed
             if policy.get("compress"):
@@ -255,11 +305,15 @@ class CacheManager:
             
             # Set in L1 (memory cache)
             if self.settings.enable_memory_cache and policy.get("layer") in ["memory", "both"]:
-                await self.memory_cache.set(key, value, ttl)
+                await self.memory_cache.set(key, value, ttl, tags)
+                self._publish_invalidation(keys=[key])
             
             # Set in L2 (Redis cache)
             if self.settings.enable_redis_cache and policy.get("layer") in ["redis", "both"]:
-                success = await self.redis_client.set(key, value, ttl)
+                if tags:
+                    success = await self.redis_client.set(key, value, ttl, tags=tags)
+                else:
+                    success = await self.redis_client.set(key, value, ttl)
             
             return success
             
@@ -278,6 +332,10 @@ class CacheManager:
                 for key in keys:
                     if await self.memory_cache.delete(key):
                         count += 1
+                self._publish_invalidation(keys=keys)
+            
+            for key in keys:
+                self._refresh_meta.pop(key, None)
             
             # Delete from L2
             if self.settings.enable_redis_cache:
@@ -291,21 +349,50 @@ class CacheManager:
             logger.error(f"Cache delete error for keys {keys}: {e}")
             return 0
     
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every key written under any of ``tags`` in both layers.
+        Only the tagged keys are touched; the keyspace is never scanned.
+        """
+        count = 0
+        
+        try:
+            if self.settings.enable_memory_cache:
+                count += await self.memory_cache.invalidate_tags(*tags)
+                self._publish_invalidation(tags=tags)
+            
+            if self.settings.enable_redis_cache:
+                count = max(count, await self.redis_client.invalidate_tags(*tags))
+            
+            return count
+            
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Cache invalidation error for tags {tags}: {e}")
+            return 0
+    
     async def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern"""
+        """
+        Invalidate all keys matching pattern.
+        Scans every key; prefer ``invalidate_tags`` for hot paths.
+        """
         count = 0
         
         try:
             # Clear from memory cache (simple pattern matching)
             if self.settings.enable_memory_cache:
+                matcher = self._compile_pattern(pattern)
                 async with self.memory_cache.lock:
                     keys_to_delete = [
                         key for key in self.memory_cache.cache.keys()
-                        if self._matches_pattern(key, pattern)
+                        if matcher(key)
                     ]
                     for key in keys_to_delete:
                         self.memory_cache.cache.pop(key)
+                        self.memory_cache.tags.discard(key)
                         count += 1
+                # Other processes hold different keys; they flush instead
+                self._publish_invalidation(flush=True)
             
             # Clear from Redis
             if self.settings.enable_redis_cache:
@@ -325,32 +412,98 @@ class CacheManager:
         key: str,
         factory: Callable,
         ttl: Optional[int] = None,
-        data_type: Optional[str] = None
+        data_type: Optional[str] = None,
+        lease: bool = False,
+        beta: float = 1.0,
+        tags: Optional[List[str]] = None
     ) -> Any:
-        """Get from cache or compute and set if missing"""
+        """
+        Get from cache or compute and set if missing.
+        
+        Concurrent misses for the same key share a single factory call. Hot
+        keys are recomputed ahead of expiry with probabilistic early
+        expiration (XFetch), weighted by how long the factory took last time;
+        ``beta`` above 1 favours earlier refreshes. With ``lease`` set, the
+        recompute is also coordinated across processes through a Redis lease
+        so other workers keep serving the cached value meanwhile. ``tags``
+        are attached to the stored value as in ``set``.
+        """
         # Try to get from cache
         value = await self.get(key, data_type)
         
         if value is not None:
-            return value
+            meta = self._refresh_meta.get(key)
+            if (
+                meta is None
+                or self._single_flight.in_flight(key)
+                or not xfetch_should_refresh(*meta, beta=beta)
+            ):
+                return value
+            
+            self.stats["early_refreshes"] += 1
+            return await self._single_flight.do(
+                key,
+                lambda: self._recompute(key, factory, ttl, data_type, lease, tags, stale=value)
+            )
         
-        # Compute value
-        if asyncio.iscoroutinefunction(factory):
-            value = await factory()
-        else:
+        return await self._single_flight.do(
+            key,
+            lambda: self._recompute(key, factory, ttl, data_type, lease, tags)
+        )
+    
+    async def _recompute(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: Optional[int],
+        data_type: Optional[str],
+        lease: bool,
+        tags: Optional[List[str]] = None,
+        stale: Any = None
+    ) -> Any:
+        """Run the factory, cache its result and record its duration"""
+        async def compute() -> Any:
+            started = time.perf_counter()
             value = factory()
+            if inspect.isawaitable(value):
+                value = await value
+            delta = time.perf_counter() - started
+            
+            # Cache the computed value
+            resolved_ttl = self._resolve_ttl(ttl, data_type)
+            await self.set(key, value, resolved_ttl, data_type, tags)
+            self._remember_refresh(key, delta, time.time() + resolved_ttl)
+            
+            return value
         
-        # Cache the computed value
-        await self.set(key, value, ttl, data_type)
+        if not lease:
+            return await compute()
         
+        value, source = await run_with_lease(
+            self.redis_client,
+            key,
+            compute,
+            lambda: self.get(key, data_type),
+            stale=stale
+        )
+        if source == "stale":
+            self.stats["stale_served"] += 1
         return value
     
+    def _remember_refresh(self, key: str, delta: float, expires_at: float) -> None:
+        """Track recompute cost and expiry for early refresh, bounded in size"""
+        self._refresh_meta.pop(key, None)
+        self._refresh_meta[key] = (delta, expires_at)
+        while len(self._refresh_meta) > REFRESH_META_MAX_SIZE:
+            self._refresh_meta.popitem(last=False)
+    
     def cache_decorator(
         self,
         ttl: Optional[int] = None,
         data_type: Optional[str] = None,
         key_prefix: Optional[str] = None,
-        include_args: bool = True
+        include_args: bool = True,
+        lease: bool = False
     ):
         """Decorator for caching function results"""
         def decorator(func: Callable) -> Callable:
@@ -362,18 +515,13 @@ class CacheManager:
                     prefix=key_prefix
                 )
                 
-                # Try to get from cache
-                cached = await self.get(cache_key, data_type)
-                if cached is not None:
-                    return cached
-                
-                # Execute function
-                result = await func(*args, **kwargs)
-                
-                # Cache result
-                await self.set(cache_key, result, ttl, data_type)
-                
-                return result
+                return await self.get_or_set(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    ttl,
+                    data_type,
+                    lease=lease
+                )
             
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
@@ -434,6 +582,9 @@ class CacheManager:
             "redis_hits": self.stats["redis_hits"],
             "misses": self.stats["misses"],
             "errors": self.stats["errors"],
+            "coalesced": self._single_flight.coalesced,
+            "early_refreshes": self.stats["early_refreshes"],
+            "stale_served": self.stats["stale_served"],
             "hit_rate": hit_rate,
             "memory_cache": memory_stats,
             "layers": {
@@ -459,6 +610,11 @@ class CacheManager:
     
     # Utility methods
     
+    def _resolve_ttl(self, ttl: Optional[int], data_type: Optional[str]) -> int:
+        """Explicit TTL, else the data type's policy TTL, else the default"""
+        policy = self._get_cache_policy(data_type)
+        return ttl or policy.get("ttl", self.settings.cache_policies.get("default", {}).get("ttl", 3600))
+    
     def _get_cache_policy(self, data_type: Optional[str]) -> Dict[str, Any]:
         """Get cache policy for data type"""
         if data_type and data_type in self.settings.cache_policies:
@@ -529,13 +685,40 @@ class CacheManager:
         
         return ":".join(parts)
     
+    def _compile_pattern(self, pattern: str) -> Callable[[str], bool]:
+        """Compile a Redis glob pattern once for matching many keys"""
+        return re.compile(fnmatch.translate(pattern)).match
+    
+    def _publish_invalidation(
+        self,
+        keys: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        flush: bool = False
+    ) -> None:
+        """Broadcast an L1 change to other processes, if a bus is attached"""
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.publish(
+                self.INVALIDATION_NAMESPACE, keys=keys, tags=tags, flush=flush
+            )
+    
+    async def _apply_invalidation(self, invalidation: CacheInvalidation) -> None:
+        """Drop L1 entries invalidated by another process"""
+        if invalidation.flush:
+            async with self.memory_cache.lock:
+                self.memory_cache.cache.clear()
+                self.memory_cache.tags.clear()
+            self._refresh_meta.clear()
+            return
+        
+        for key in invalidation.keys:
+            await self.memory_cache.delete(key)
+            self._refresh_meta.pop(key, None)
+        if invalidation.tags:
+            await self.memory_cache.invalidate_tags(*invalidation.tags)
+    
     def _matches_pattern(self, key: str, pattern: str) -> bool:
         """Simple pattern matching for memory cache"""
-        # Convert Redis pattern to simple Python pattern
-        pattern = pattern.replace("*", ".*").replace("?", ".")
-        
-        import re
-        return bool(re.match(pattern, key))
+        return bool(self._compile_pattern(pattern)(key))
     
     async def cleanup(self) -> None:
         """Cleanup cache manager resources"""
@@ -560,4 +743,4 @@ class CacheManager:
 
 
 # Global cache manager instance
-cache_manager = CacheManager()
\ No newline at end of file
+cache_manager = CacheManager(invalidation_bus=cache_invalidation_bus)
\ No newline at end of file
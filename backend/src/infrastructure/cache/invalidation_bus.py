@@ -0,0 +1,292 @@
+"""
+Cache Invalidation Bus
+
+Every worker process keeps in-memory (L1) caches in front of Redis. A write or
+invalidation in one worker has to reach the L1 copies held by the others, so
+caches publish what they dropped on a shared Redis pub/sub channel and every
+worker's bus applies it to the caches registered under the same namespace.
+
+Pub/sub delivery is at-most-once, so the bus guards against lost messages:
+
+- Each message carries the publishing node's id and a per-node sequence
+  number. A subscriber that sees a gap in a node's sequence flushes every
+  registered cache instead of guessing what it missed.
+- Messages published while a subscriber was disconnected are gone for good,
+  so every (re)subscription bumps the local epoch and flushes all caches.
+
+Invalidations issued in the same event loop tick are coalesced into a single
+PUBLISH.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..redis.redis_mcp import RedisMCPClient, redis_mcp_client
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheInvalidation:
+    """What a registered cache must drop: keys, tagged keys, or everything."""
+    namespace: str
+    keys: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    flush: bool = False
+
+
+InvalidationHandler = Callable[[CacheInvalidation], Any]
+
+
+class CacheInvalidationBus:
+    """
+    Redis pub/sub fan-out of L1 cache invalidations between worker processes.
+
+    Caches ``register`` a handler per namespace and ``publish`` what they
+    invalidated locally; the bus never echoes a node's own messages back to
+    it. Publishing is a no-op until ``start`` has been called, so caches can
+    hold a bus reference in tests and scripts without talking to Redis.
+    """
+
+    DEFAULT_CHANNEL = "cache:invalidation"
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisMCPClient] = None,
+        channel: str = DEFAULT_CHANNEL,
+        node_id: Optional[str] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0
+    ):
+        self.redis = redis_client or redis_mcp_client
+        self.channel = channel
+        self.node_id = node_id or uuid.uuid4().hex
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # Local epoch, bumped on every (re)subscription
+        self.epoch = 0
+
+        self._seq = 0
+        self._last_seen: Dict[str, int] = {}
+        self._handlers: Dict[str, List[Callable[[], Optional[InvalidationHandler]]]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._send_task: Optional[asyncio.Task] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
+
+        self.stats = {
+            "published": 0,
+            "received": 0,
+            "gaps": 0,
+            "epoch_flushes": 0,
+            "errors": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    # Registration
+
+    def register(self, namespace: str, handler: InvalidationHandler) -> None:
+        """
+        Apply remote invalidations for ``namespace`` with ``handler``.
+
+        Bound methods are held weakly so short-lived services (one per
+        request) drop out of the bus when they are garbage collected. Dead
+        references are pruned here as well as on dispatch, so the handler
+        list tracks live services rather than the number of requests served.
+        """
+        if inspect.ismethod(handler):
+            ref = weakref.WeakMethod(handler)
+        else:
+            ref = lambda: handler
+        refs = [live for live in self._handlers.get(namespace, []) if live() is not None]
+        refs.append(ref)
+        self._handlers[namespace] = refs
+
+    def unregister(self, namespace: str, handler: InvalidationHandler) -> None:
+        self._handlers[namespace] = [
+            ref for ref in self._handlers.get(namespace, [])
+            if ref() not in (None, handler)
+        ]
+
+    # Publishing
+
+    def publish(
+        self,
+        namespace: str,
+        keys: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        flush: bool = False
+    ) -> None:
+        """
+        Tell other workers to drop ``keys``/``tags`` (or everything) from
+        their ``namespace`` caches. Sent at the end of the current loop tick.
+        """
+        if not self.running:
+            return
+
+        pending = self._pending.setdefault(
+            namespace, {"keys": set(), "tags": set(), "flush": False}
+        )
+        pending["keys"].update(keys)
+        pending["tags"].update(tags)
+        pending["flush"] = pending["flush"] or flush
+
+        if self._send_task is None or self._send_task.done():
+            self._send_task = asyncio.get_running_loop().create_task(self._send_pending())
+
+    async def flush(self) -> None:
+        """Wait until pending invalidations have been published."""
+        if self._send_task is not None:
+            await self._send_task
+
+    async def _send_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        # Sequence numbers are taken before sending so a failed publish
+        # shows up as a gap on the subscribers
+        self._seq += 1
+        message = {
+            "node": self.node_id,
+            "seq": self._seq,
+            "items": [
+                {
+                    "ns": namespace,
+                    "keys": sorted(item["keys"]),
+                    "tags": sorted(item["tags"]),
+                    "flush": item["flush"]
+                }
+                for namespace, item in pending.items()
+            ]
+        }
+        try:
+            await self.redis.publish(self.channel, message)
+            self.stats["published"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    # Subscribing
+
+    async def start(self, timeout: float = 5.0) -> None:
+        """Start listening and wait (up to ``timeout``) for the subscription."""
+        if self.running:
+            return
+        self._subscribed = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Cache invalidation bus not subscribed yet; retrying in background")
+
+    async def stop(self) -> None:
+        await self.flush()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                await self._bump_epoch()
+                self._subscribed.set()
+                delay = self.reconnect_delay
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                self._subscribed.clear()
+                logger.warning(f"Cache invalidation bus disconnected: {e}; retrying in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _bump_epoch(self) -> None:
+        """Anything may have been missed while unsubscribed: flush all caches."""
+        self.epoch += 1
+        self._last_seen.clear()
+        self.stats["epoch_flushes"] += 1
+        await self._flush_all()
+
+    async def _handle_message(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+            node, seq = message["node"], int(message["seq"])
+            items = message["items"]
+        except (ValueError, TypeError, KeyError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Malformed cache invalidation message: {e}")
+            return
+
+        if node == self.node_id:
+            return
+        self.stats["received"] += 1
+
+        last = self._last_seen.get(node)
+        self._last_seen[node] = seq if last is None else max(last, seq)
+        if last is not None and seq > last + 1:
+            # Lost messages from this node; their namespaces are unknown
+            self.stats["gaps"] += 1
+            await self._flush_all()
+            return
+
+        for item in items:
+            await self._dispatch(CacheInvalidation(
+                namespace=item["ns"],
+                keys=tuple(item.get("keys", ())),
+                tags=tuple(item.get("tags", ())),
+                flush=bool(item.get("flush"))
+            ))
+
+    async def _flush_all(self) -> None:
+        for namespace in list(self._handlers):
+            await self._dispatch(CacheInvalidation(namespace=namespace, flush=True))
+
+    async def _dispatch(self, invalidation: CacheInvalidation) -> None:
+        refs = self._handlers.get(invalidation.namespace, [])
+        alive = []
+        for ref in refs:
+            handler = ref()
+            if handler is None:
+                continue
+            alive.append(ref)
+            try:
+                result = handler(invalidation)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Cache invalidation handler failed for {invalidation.namespace}: {e}")
+        if len(alive) != len(refs):
+            self._handlers[invalidation.namespace] = alive
+
+
+# Process-wide bus; started by the application lifespan
+cache_invalidation_bus = CacheInvalidationBus()
@@ -0,0 +1,134 @@
+"""
+Cache Stampede Protection
+
+Building blocks that keep a hot key's expiry from turning into a burst of
+identical recomputations:
+
+- ``SingleFlight`` coalesces concurrent misses for the same key inside one
+  process so the factory runs once and every caller shares its result.
+- ``run_with_lease`` extends that across processes with a short Redis lease:
+  the lease holder recomputes while other workers serve the stale value, or
+  wait briefly for the fresh one.
+- ``xfetch_should_refresh`` implements probabilistic early expiration
+  (XFetch), refreshing ahead of expiry with a probability driven by how long
+  the value took to compute.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller starts the work as a task; later callers await the same
+    task. The task is shielded, so a cancelled caller does not cancel the
+    computation the others are waiting on.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` for ``key`` unless a call for it is already in flight."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for ``key`` is currently running."""
+        return key in self._calls
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+
+
+def xfetch_should_refresh(
+    delta: float,
+    expires_at: float,
+    beta: float = 1.0,
+    now: Optional[float] = None
+) -> bool:
+    """
+    Decide whether to recompute a value before it expires (XFetch).
+
+    Args:
+        delta: Seconds the last recomputation took
+        expires_at: Logical expiry as a Unix timestamp
+        beta: Values above 1 favour earlier refreshes
+        now: Current Unix timestamp (defaults to ``time.time()``)
+    """
+    now = time.time() if now is None else now
+    if delta <= 0:
+        return now >= expires_at
+    # 1 - random() lies in (0, 1], keeping log() finite
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+async def run_with_lease(
+    redis_client,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    read_fresh: Callable[[], Awaitable[Any]],
+    stale: Any = None,
+    lease_ttl: int = 10,
+    wait_timeout: float = 1.0,
+    poll_interval: float = 0.05
+) -> Tuple[Any, str]:
+    """
+    Recompute ``key`` under a cross-process Redis lease.
+
+    If another process holds the lease, the stale value is returned when
+    there is one; otherwise ``read_fresh`` is polled for up to
+    ``wait_timeout`` seconds before computing anyway. If the lease cannot be
+    taken because Redis is failing, the value is computed locally right
+    away rather than waiting as if another process held it.
+
+    Returns:
+        Tuple of (value, source) where source is "computed", "stale" or "waited"
+    """
+    lease_name = f"cache_lease:{key}"
+    try:
+        token = await redis_client.try_lock(lease_name, expiry=lease_ttl)
+    except Exception as e:
+        logger.warning(f"Cache lease error for {key}: {e}")
+        return await compute(), "computed"
+
+    if token is None:
+        if stale is not None:
+            return stale, "stale"
+
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval)
+            value = await read_fresh()
+            if value is not None:
+                return value, "waited"
+
+        return await compute(), "computed"
+
+    try:
+        return await compute(), "computed"
+    finally:
+        try:
+            await redis_client.unlock(lease_name, token)
+        except Exception as e:
+            logger.warning(f"Cache lease release error for {key}: {e}")
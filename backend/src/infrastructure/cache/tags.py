@@ -0,0 +1,57 @@
+"""
+Cache Tag Index
+
+In-memory map between cache keys and the tags (user id, milestone id,
+snapshot id...) they were written under. Invalidating a tag touches only the
+keys registered under it instead of scanning the keyspace. Redis keeps the
+same mapping in one set per tag; see ``RedisMCPClient.invalidate_tags``.
+"""
+
+from typing import Dict, Iterable, Set
+
+
+class TagIndex:
+    """Bidirectional tag <-> key index for an in-process cache tier."""
+
+    def __init__(self):
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._tags_by_key: Dict[str, Set[str]] = {}
+
+    def add(self, key: str, tags: Iterable[str]) -> None:
+        """Register ``key`` under ``tags``, replacing any previous tags."""
+        self.discard(key)
+        tags = set(tags)
+        if not tags:
+            return
+        self._tags_by_key[key] = tags
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def discard(self, key: str) -> None:
+        """Forget ``key`` once it has left the cache."""
+        for tag in self._tags_by_key.pop(key, ()):
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def keys_for(self, tag: str) -> Set[str]:
+        """Keys currently registered under ``tag``."""
+        return set(self._keys_by_tag.get(tag, ()))
+
+    def pop(self, *tags: str) -> Set[str]:
+        """Remove ``tags`` and return every key registered under any of them."""
+        keys: Set[str] = set()
+        for tag in tags:
+            keys |= self._keys_by_tag.get(tag, set())
+        for key in keys:
+            self.discard(key)
+        return keys
+
+    def clear(self) -> None:
+        self._keys_by_tag.clear()
+        self._tags_by_key.clear()
+
+    def __len__(self) -> int:
+        return len(self._tags_by_key)
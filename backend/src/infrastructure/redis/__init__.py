@@ -1,5 +1,5 @@
 """Redis MCP integration module"""
 
-from .redis_mcp import RedisMCPClient, redis_mcp_client, RedisOperation
+from .redis_mcp import RedisMCPClient, redis_mcp_client
 
-__all__ = ["RedisMCPClient", "redis_mcp_client", "RedisOperation"]
\ No newline at end of file
+__all__ = ["RedisMCPClient", "redis_mcp_client"]
@@ -15,6 +15,10 @@ import statistics
 
 logger = logging.getLogger(__name__)
 
+# Bounds for auto-tuning a memory-bounded L1 cache
+L1_MIN_BYTES = 1024 * 1024
+L1_MAX_BYTES = 256 * 1024 * 1024
+
 
 class AlertSeverity(Enum):
     """Alert severity levels"""
@@ -422,7 +426,18 @@ class CachePerformanceMonitor:
         
         # Auto-tune L1 cache size based on memory pressure
         memory_usage = self._baselines.get(MetricType.MEMORY_USAGE, 0)
-        if memory_usage > 0.8:
+        max_bytes = getattr(self.cache_service, "_l1_max_bytes", None)
+        if max_bytes:
+            # Memory-bounded L1: tune the byte budget instead of the entry count
+            if memory_usage > 0.8:
+                new_bytes = max(int(max_bytes * 0.8), L1_MIN_BYTES)
+            elif memory_usage < 0.3:
+                new_bytes = min(int(max_bytes * 1.2), L1_MAX_BYTES)
+            else:
+                return
+            self.cache_service._l1_max_bytes = new_bytes
+            logger.info(f"Auto-tuning: Set L1 cache memory budget to {new_bytes} bytes")
+        elif memory_usage > 0.8:
             # Reduce L1 cache size
             current_size = self.cache_service._l1_max_size
             new_size = int(current_size * 0.8)
@@ -1,5 +1,6 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Callable, Iterable, List, Set, Tuple
 import redis
+import redis.asyncio as aioredis
 from redis.client import Redis
 from redis.connection import ConnectionPool
 from functools import wraps
@@ -8,7 +9,64 @@ import time
 import asyncio
 from datetime import datetime, timedelta
 
+
+# Redis set holding the keys written under a cache tag
+TAG_KEY_PREFIX = "cache:tag:"
+
+# Redis set holding the tags a cache key was written under, so readers
+# that copy the value into another tier can keep it invalidatable, and so a
+# deleted or expired key can be removed from every tag set it was added to
+KEY_TAGS_PREFIX = "cache:keytags:"
+
+# Floor for tag set expiry, longer than any cache TTL in use so a tag set
+# never expires before the keys registered in it
+TAG_TTL = 172800
+
+# Keys handled per round trip when invalidating or pruning a tag set, so a
+# large tag never blocks Redis in a single command
+TAG_BATCH_SIZE = 500
+
+
+def binary_client(client: Any) -> Any:
+    """
+    Client on the same server and pool settings as ``client`` that returns
+    raw bytes, for binary values such as encoded vectors. Returns ``client``
+    itself when it does not decode responses.
+    """
+    pool = client.connection_pool
+    if not pool.connection_kwargs.get("decode_responses"):
+        return client
+
+    kwargs = {**pool.connection_kwargs, "decode_responses": False}
+    if isinstance(pool, aioredis.ConnectionPool):
+        return aioredis.Redis(connection_pool=aioredis.ConnectionPool(
+            connection_class=pool.connection_class,
+            max_connections=pool.max_connections,
+            **kwargs
+        ))
+    return redis.Redis(connection_pool=ConnectionPool(
+        connection_class=pool.connection_class,
+        max_connections=pool.max_connections,
+        **kwargs
+    ))
+
+
 class RedisMCPClient:
+    """
+    JSON-oriented Redis client shared by the cache and storage services.
+
+    Two execution modes expose the same coroutine API:
+
+    * ``async_mode=False`` wraps a synchronous ``redis.Redis`` and offloads each
+      command to the default thread pool via ``asyncio.to_thread``.
+    * ``async_mode=True`` uses a native ``redis.asyncio`` client so commands are
+      awaited directly on the event loop without a thread hop.
+
+    Subclasses and callers that still reach for ``self.client`` directly must
+    use the synchronous mode; everything else should go through the public
+    coroutines (or :meth:`execute` for commands without a dedicated wrapper).
+    """
+
     def __init__(
         self,
         host: str = "localhost",
@@ -18,23 +76,89 @@ class RedisMCPClient:
         ssl: bool = False,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        async_mode: bool = False,
+        max_connections: int = 50,
+        client: Optional[Any] = None,
     ):
-        self.pool = ConnectionPool(
-            host=host,
-            port=port,
-            password=password,
-            db=db,
-            ssl=ssl,
-            decode_responses=True,
-            max_connections=50
-        )
-        self.client: Redis = redis.Redis(connection_pool=self.pool)
+        self.async_mode = async_mode
+        if client is not None:
+            # Pre-built client (e.g. a fakeredis instance in tests/benchmarks)
+            self.pool = client.connection_pool
+            self.client = client
+        elif async_mode:
+            self.pool = aioredis.ConnectionPool(
+                host=host,
+                port=port,
+                password=password,
+                db=db,
+                decode_responses=True,
+                max_connections=max_connections,
+                **({"connection_class": aioredis.SSLConnection} if ssl else {})
+            )
+            self.client = aioredis.Redis(connection_pool=self.pool)
+        else:
+            self.pool = ConnectionPool(
+                host=host,
+                port=port,
+                password=password,
+                db=db,
+                ssl=ssl,
+                decode_responses=True,
+                max_connections=max_connections
+            )
+            self.client: Redis = redis.Redis(connection_pool=self.pool)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        
+        self._binary_client = None
+
+    async def _call(self, command: str, *args, **kwargs) -> Any:
+        """Run a client method in the configured mode."""
+        method: Callable = getattr(self.client, command)
+        if self.async_mode:
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def _execute_pipeline(self, build: Callable[[Any], None]) -> list:
+        """Queue commands with ``build(pipe)`` and execute them in one round trip."""
+        if self.async_mode:
+            async with self.client.pipeline() as pipe:
+                build(pipe)
+                return await pipe.execute()
+
+        def run() -> list:
+            with self.client.pipeline() as pipe:
+                build(pipe)
+                return pipe.execute()
+
+        return await asyncio.to_thread(run)
+
+    @property
+    def binary(self) -> Any:
+        """Raw-bytes twin of ``client``, created on first use."""
+        if self._binary_client is None:
+            self._binary_client = binary_client(self.client)
+        return self._binary_client
+
+    async def _call_binary(self, command: str, *args, **kwargs) -> Any:
+        """Run a command on the raw-bytes client in the configured mode."""
+        method: Callable = getattr(self.binary, command)
+        if self.async_mode:
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def execute(self, command: str, *args, **kwargs) -> Any:
+        """
+        Run an arbitrary Redis command by client method name.
+
+        Used by services for commands without a dedicated wrapper
+        (``zadd``, ``incr``, ``info``...) so they work in both modes.
+        Redis errors propagate to the caller.
+        """
+        return await self._call(command, *args, **kwargs)
+
     async def get_cache(self, key: str) -> Optional[Any]:
         try:
-            value = await asyncio.to_thread(self.client.get, key)
+            value = await self._call("get", key)
             return json.loads(value) if value else None
         except redis.RedisError as e:
             print(f"Redis error in get_cache: {e}")
@@ -44,19 +168,26 @@ class RedisMCPClient:
         self, 
         key: str, 
         value: Any, 
-        expiry: Optional[int] = None
+        expiry: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
     ) -> bool:
+        """
+        Store ``value`` as JSON. With ``tags``, the key is also added to each
+        tag's set in the same round trip so ``invalidate_tags`` can find it.
+        """
         try:
             serialized = json.dumps(value)
+            if tags:
+                return await self._set_tagged(key, serialized, expiry, tags)
             if expiry:
-                return await asyncio.to_thread(
-                    self.client.setex, 
-                    key, 
-                    expiry, 
+                return await self._call(
+                    "setex",
+                    key,
+                    expiry,
                     serialized
                 )
-            return await asyncio.to_thread(
-                self.client.set,
+            return await self._call(
+                "set",
                 key,
                 serialized
             )
@@ -64,18 +195,176 @@ class RedisMCPClient:
             print(f"Redis error in set_cache: {e}")
             return False
 
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._call_binary("get", key)
+        except redis.RedisError as e:
+            print(f"Redis error in get_bytes: {e}")
+            return None
+
+    async def mget_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch several binary values in one round trip, in key order."""
+        if not keys:
+            return []
+        try:
+            return await self._call_binary("mget", keys)
+        except redis.RedisError as e:
+            print(f"Redis error in mget_bytes: {e}")
+            return [None] * len(keys)
+
+    async def set_bytes(
+        self,
+        key: str,
+        value: bytes,
+        expiry: Optional[int] = None
+    ) -> bool:
+        """Store a binary value as-is (no JSON encoding)."""
+        try:
+            if expiry:
+                return await self._call_binary("setex", key, expiry, value)
+            return await self._call_binary("set", key, value)
+        except redis.RedisError as e:
+            print(f"Redis error in set_bytes: {e}")
+            return False
+
     async def delete_cache(self, key: str) -> bool:
         try:
-            return await asyncio.to_thread(self.client.delete, key)
+            return await self._call("delete", key)
         except redis.RedisError as e:
             print(f"Redis error in delete_cache: {e}")
             return False
 
+    async def _set_tagged(
+        self,
+        key: str,
+        value: str,
+        expiry: Optional[int],
+        tags: Iterable[str]
+    ) -> bool:
+        """
+        Write ``key``, add it to each tag's set and record its tags in one
+        round trip.
+        """
+        tags = list(tags)
+        tag_ttl = max(expiry or 0, TAG_TTL)
+        key_tags = f"{KEY_TAGS_PREFIX}{key}"
+
+        def build(pipe) -> None:
+            if expiry:
+                pipe.setex(key, expiry, value)
+            else:
+                pipe.set(key, value)
+            for tag in tags:
+                pipe.sadd(f"{TAG_KEY_PREFIX}{tag}", key)
+                pipe.expire(f"{TAG_KEY_PREFIX}{tag}", tag_ttl)
+            pipe.delete(key_tags)
+            pipe.sadd(key_tags, *tags)
+            pipe.expire(key_tags, tag_ttl)
+
+        results = await self._execute_pipeline(build)
+        return bool(results[0])
+
+    async def tag_members(self, tag: str) -> Set[str]:
+        """Keys written under ``tag`` (some may since have expired)."""
+        try:
+            return set(await self._call("smembers", f"{TAG_KEY_PREFIX}{tag}"))
+        except redis.RedisError as e:
+            print(f"Redis error in tag_members: {e}")
+            return set()
+
+    async def get_with_tags(self, key: str) -> Tuple[Optional[str], Set[str]]:
+        """String value of ``key`` and the tags it was written under."""
+        try:
+            def build(pipe) -> None:
+                pipe.get(key)
+                pipe.smembers(f"{KEY_TAGS_PREFIX}{key}")
+
+            value, tags = await self._execute_pipeline(build)
+            return value, set(tags)
+        except redis.RedisError as e:
+            print(f"Redis error in get_with_tags: {e}")
+            return None, set()
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key written under any of ``tags`` without scanning the
+        keyspace. Tag sets are drained ``TAG_BATCH_SIZE`` keys at a time with
+        SPOP, so each round trip stays short however large the tag is.
+        Returns the number of keys deleted.
+        """
+        deleted = 0
+        try:
+            for tag in tags:
+                while True:
+                    keys = await self._call("spop", f"{TAG_KEY_PREFIX}{tag}", TAG_BATCH_SIZE)
+                    if not keys:
+                        break
+                    deleted += await self._delete_tagged(keys)
+            return deleted
+        except redis.RedisError as e:
+            print(f"Redis error in invalidate_tags: {e}")
+            return deleted
+
+    async def delete_tagged(self, *keys: str) -> int:
+        """
+        Delete keys written with ``tags`` and remove them from their tag
+        sets. Returns the number of keys deleted.
+        """
+        if not keys:
+            return 0
+        try:
+            return await self._delete_tagged(list(keys))
+        except redis.RedisError as e:
+            print(f"Redis error in delete_tagged: {e}")
+            return 0
+
+    async def prune_tag(self, tag: str, cursor: int = 0) -> int:
+        """
+        Remove up to ``TAG_BATCH_SIZE`` members of ``tag`` whose keys have
+        expired, along with their membership in other tags. Call repeatedly
+        with the returned SSCAN cursor; it is 0 once the set was covered.
+        """
+        try:
+            cursor, keys = await self._call(
+                "sscan", f"{TAG_KEY_PREFIX}{tag}", cursor, count=TAG_BATCH_SIZE
+            )
+            if keys:
+                def build(pipe) -> None:
+                    for key in keys:
+                        pipe.exists(key)
+
+                exists = await self._execute_pipeline(build)
+                expired = [key for key, found in zip(keys, exists) if not found]
+                if expired:
+                    await self._delete_tagged(expired)
+            return int(cursor)
+        except redis.RedisError as e:
+            print(f"Redis error in prune_tag: {e}")
+            return 0
+
+    async def _delete_tagged(self, keys: List[str]) -> int:
+        """Delete ``keys`` and their tag records, and drop them from their tag sets."""
+        def read_tags(pipe) -> None:
+            for key in keys:
+                pipe.smembers(f"{KEY_TAGS_PREFIX}{key}")
+
+        key_tags = await self._execute_pipeline(read_tags)
+
+        def build(pipe) -> None:
+            pipe.delete(*keys)
+            pipe.delete(*(f"{KEY_TAGS_PREFIX}{key}" for key in keys))
+            for key, tags in zip(keys, key_tags):
+                for tag in tags:
+                    pipe.srem(f"{TAG_KEY_PREFIX}{tag}", key)
+
+        results = await self._execute_pipeline(build)
+        return results[0]
+
     async def publish(self, channel: str, message: Any) -> int:
         try:
             serialized = json.dumps(message)
-            return await asyncio.to_thread(
-                self.client.publish,
+            return await self._call(
+                "publish",
                 channel,
                 serialized
             )
@@ -83,6 +372,12 @@ class RedisMCPClient:
             print(f"Redis error in publish: {e}")
             return 0
 
+    def pubsub(self):
+        """Pub/sub handle for long-lived subscribers; requires ``async_mode=True``."""
+        if not self.async_mode:
+            raise RuntimeError("Pub/sub subscriptions require async_mode=True")
+        return self.client.pubsub()
+
     async def rate_limit(
         self, 
         key: str, 
@@ -93,12 +388,13 @@ class RedisMCPClient:
             current = int(time.time())
             window_start = current - window
             
-            pipe = self.client.pipeline()
-            pipe.zremrangebyscore(key, 0, window_start)
-            pipe.zadd(key, {str(current): current})
-            pipe.zcard(key)
-            pipe.expire(key, window)
-            results = pipe.execute()
+            def build(pipe):
+                pipe.zremrangebyscore(key, 0, window_start)
+                pipe.zadd(key, {str(current): current})
+                pipe.zcard(key)
+                pipe.expire(key, window)
+
+            results = await self._execute_pipeline(build)
             
             return results[2] <= limit
         except redis.RedisError as e:
@@ -140,32 +436,39 @@ class RedisMCPClient:
         expiry: int = 10
     ) -> Optional[str]:
         try:
-            lock_value = str(time.time())
-            acquired = await asyncio.to_thread(
-                self.client.set,
-                f"lock:{lock_name}",
-                lock_value,
-                ex=expiry,
-                nx=True
-            )
-            return lock_value if acquired else None
+            return await self.try_lock(lock_name, expiry)
         except redis.RedisError as e:
             print(f"Redis error in lock: {e}")
             return None
 
+    async def try_lock(self, lock_name: str, expiry: int = 10) -> Optional[str]:
+        """
+        Like ``lock``, but Redis errors propagate so callers can tell a lock
+        held elsewhere (None) from an unreachable server.
+        """
+        lock_value = str(time.time())
+        acquired = await self._call(
+            "set",
+            f"lock:{lock_name}",
+            lock_value,
+            ex=expiry,
+            nx=True
+        )
+        return lock_value if acquired else None
+
     async def unlock(
         self, 
         lock_name: str, 
         lock_value: str
     ) -> bool:
         try:
-            current_value = await asyncio.to_thread(
-                self.client.get,
+            current_value = await self._call(
+                "get",
                 f"lock:{lock_name}"
             )
             if current_value == lock_value:
-                return await asyncio.to_thread(
-                    self.client.delete,
+                return await self._call(
+                    "delete",
                     f"lock:{lock_name}"
                 )
             return False
@@ -194,23 +497,31 @@ class RedisMCPClient:
     async def exists(self, key: str) -> bool:
         """Check if a key exists in Redis"""
         try:
-            return await asyncio.to_thread(self.client.exists, key) > 0
+            return await self._call("exists", key) > 0
         except redis.RedisError as e:
             print(f"Redis error in exists: {e}")
             return False
     
-    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
-        """Set a string value with optional TTL"""
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """Set a string value with optional TTL and invalidation tags"""
         try:
+            if tags:
+                return await self._set_tagged(key, value, ttl, tags)
             if ttl:
-                return await asyncio.to_thread(
-                    self.client.setex,
+                return await self._call(
+                    "setex",
                     key,
                     ttl,
                     value
                 )
-            return await asyncio.to_thread(
-                self.client.set,
+            return await self._call(
+                "set",
                 key,
                 value
             )
@@ -221,22 +532,39 @@ class RedisMCPClient:
     async def get(self, key: str) -> Optional[str]:
         """Get a string value from Redis"""
         try:
-            return await asyncio.to_thread(self.client.get, key)
+            return await self._call("get", key)
         except redis.RedisError as e:
             print(f"Redis error in get: {e}")
             return None
+
+    async def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """Atomically increment an integer value"""
+        try:
+            return await self._call("incrby", key, amount)
+        except redis.RedisError as e:
+            print(f"Redis error in increment: {e}")
+            return None
     
     async def delete(self, key: str) -> bool:
         """Delete a key from Redis"""
         try:
-            return await asyncio.to_thread(self.client.delete, key) > 0
+            return await self._call("delete", key) > 0
         except redis.RedisError as e:
             print(f"Redis error in delete: {e}")
             return False
     
     async def close(self):
         try:
-            self.pool.disconnect()
+            binary = self._binary_client
+            if self.async_mode:
+                await self.client.aclose()
+                await self.pool.disconnect()
+                if binary is not None and binary is not self.client:
+                    await binary.aclose()
+            else:
+                self.pool.disconnect()
+                if binary is not None and binary is not self.client:
+                    binary.close()
         except redis.RedisError as e:
             print(f"Redis error in close: {e}")
 
@@ -249,5 +577,6 @@ redis_mcp_client = RedisMCPClient(
     port=int(os.getenv("REDIS_PORT", "6379")),
     password=os.getenv("REDIS_PASSWORD"),
     db=int(os.getenv("REDIS_DB", "0")),
-    ssl=os.getenv("REDIS_SSL", "false").lower() == "true"
+    ssl=os.getenv("REDIS_SSL", "false").lower() == "true",
+    async_mode=os.getenv("REDIS_ASYNC_MODE", "true").lower() == "true"
 )
\ No newline at end of file
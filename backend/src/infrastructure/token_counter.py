@@ -0,0 +1,215 @@
+"""
+Shared Token Counter
+
+One place to count tokens instead of a mix of ``len(text) // 4`` estimates
+and repeated full tiktoken encodes of the same text. Counts are memoized in
+an LRU keyed by a content hash, so a context entry or prompt is encoded at
+most once while it stays hot; hashing is far cheaper than BPE encoding.
+
+Misses in a batch are encoded together with tiktoken's ``encode_batch``
+(which fans out over its own thread pool), and ``count_batch_async`` runs
+that off the event loop. ``TokenCountMode.ESTIMATE`` keeps the old 4 chars
+per token heuristic for callers that only need a rough size; it is also
+used for every count when the BPE file for the encoding cannot be loaded.
+
+Truncation is prefix-aware: tiktoken's pre-tokenizer never merges a word
+or punctuation run with a following space, so encoding a prefix that ends
+just before one yields a prefix of the full encoding, and only that window
+needs encoding to cut a long text to a budget.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+
+CHARS_PER_TOKEN = 4
+
+# Prefix window per requested token when truncating; cl100k averages ~4
+_WINDOW_CHARS_PER_TOKEN = 6
+
+
+class TokenCountMode(str, Enum):
+    """How token counts are computed"""
+    EXACT = "exact"        # tiktoken encode, memoized
+    ESTIMATE = "estimate"  # len(text) // 4, no encoding
+
+
+class TokenCounter:
+    """Memoized, batch-capable token counting for one tiktoken encoding."""
+
+    def __init__(
+        self,
+        encoding: str = "cl100k_base",
+        mode: TokenCountMode = TokenCountMode.EXACT,
+        cache_size: int = 50_000,
+        num_threads: int = 4
+    ):
+        """
+        Args:
+            encoding: tiktoken encoding name
+            mode: Default counting mode
+            cache_size: Counts kept, least recently used out
+            num_threads: Threads tiktoken uses for batch encodes
+        """
+        self.mode = TokenCountMode(mode)
+        try:
+            self.encoder = tiktoken.get_encoding(encoding)
+        except Exception as e:
+            logger.warning(f"Failed to load tiktoken encoding {encoding}, estimating token counts: {e}")
+            self.encoder = None
+            self.mode = TokenCountMode.ESTIMATE
+        self.cache_size = cache_size
+        self.num_threads = num_threads
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def count(self, text: str, mode: Optional[TokenCountMode] = None) -> int:
+        """Token count of ``text``."""
+        if not text:
+            return 0
+        if self._estimating(mode):
+            return len(text) // CHARS_PER_TOKEN
+
+        key = self._key(text)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        count = len(self.encoder.encode(text, disallowed_special=()))
+        self._put(key, count)
+        return count
+
+    def count_batch(
+        self,
+        texts: Sequence[str],
+        mode: Optional[TokenCountMode] = None
+    ) -> List[int]:
+        """Token counts of ``texts``; cache misses are encoded in one batch."""
+        if self._estimating(mode):
+            return [len(text) // CHARS_PER_TOKEN for text in texts]
+
+        keys = [self._key(text) if text else None for text in texts]
+        counts: List[Optional[int]] = [
+            self._get(key) if key is not None else 0 for key in keys
+        ]
+
+        # Encode each distinct missing text once
+        missing = {}
+        for position, count in enumerate(counts):
+            if count is None:
+                missing.setdefault(keys[position], []).append(position)
+        if missing:
+            positions = list(missing.values())
+            encoded = self.encoder.encode_batch(
+                [texts[group[0]] for group in positions],
+                num_threads=self.num_threads,
+                disallowed_special=()
+            )
+            for key, group, tokens in zip(missing, positions, encoded):
+                self._put(key, len(tokens))
+                for position in group:
+                    counts[position] = len(tokens)
+
+        return counts  # type: ignore[return-value]
+
+    async def count_batch_async(
+        self,
+        texts: Sequence[str],
+        mode: Optional[TokenCountMode] = None,
+        executor: Optional[Executor] = None
+    ) -> List[int]:
+        """``count_batch`` off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.count_batch, texts, mode)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        First ``max_tokens`` tokens of ``text``, decoded.
+
+        Texts already known (or estimated) to fit are returned without
+        encoding; otherwise only a prefix window a bit longer than the
+        budget is encoded, growing it if it turns out too short.
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.encoder is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        if len(text.encode("utf-8", "surrogatepass")) <= max_tokens:
+            return text  # Every token covers at least one UTF-8 byte
+        cached = self._get(self._key(text))
+        if cached is not None and cached <= max_tokens:
+            return text
+
+        window = (max_tokens + 1) * _WINDOW_CHARS_PER_TOKEN
+        while window < len(text):
+            cut = self._prefix_boundary(text, window)
+            if cut is None:
+                break
+            tokens = self.encoder.encode(text[:cut], disallowed_special=())
+            if len(tokens) > max_tokens:
+                return self.encoder.decode(tokens[:max_tokens])
+            window *= 2
+
+        tokens = self.encoder.encode(text, disallowed_special=())
+        self._put(self._key(text), len(tokens))
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoder.decode(tokens[:max_tokens])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def _estimating(self, mode: Optional[TokenCountMode]) -> bool:
+        """Whether counts are estimated; always so without an encoder."""
+        return self.encoder is None or (mode or self.mode) == TokenCountMode.ESTIMATE
+
+    @staticmethod
+    def _prefix_boundary(text: str, limit: int) -> Optional[int]:
+        """
+        Largest cut <= ``limit`` where ``text[cut]`` is a non-newline
+        space and ``text[cut - 1]`` is not whitespace, or None. Newlines
+        are excluded because punctuation pieces absorb trailing newlines.
+        """
+        for cut in range(limit, 0, -1):
+            if text[cut] in " \t" and not text[cut - 1].isspace():
+                return cut
+        return None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.stats["misses"] += 1
+                return None
+            self._counts.move_to_end(key)
+            self.stats["hits"] += 1
+            return count
+
+    def _put(self, key: bytes, count: int) -> None:
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            if len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(encoding: str = "cl100k_base") -> TokenCounter:
+    """Process-wide counter for ``encoding``, shared by all services."""
+    return TokenCounter(encoding)
@@ -0,0 +1,137 @@
+"""
+Compact Binary Vector Codec
+
+Embeddings cached as JSON float lists cost ~30 KB of text per 1536-dim
+vector and a full parse on every hit. This codec stores them as raw
+little-endian bytes behind a small versioned header:
+
+    offset  size  field
+    0       2     magic b"VC"
+    2       1     format version
+    3       1     dtype code (float32, float16 or int8)
+    4       4     dimensions (uint32, little-endian)
+    8       4     int8 only: quantization scale (float32, little-endian)
+    8/12    n     payload
+
+float32 payloads decode zero-copy into NumPy with ``np.frombuffer``; float16
+halves the size and int8 (symmetric scalar quantization) quarters it, at the
+cost of a dequantizing copy on decode.
+"""
+
+import struct
+from enum import Enum
+from typing import Any, Sequence, Tuple, Union
+
+import numpy as np
+
+
+MAGIC = b"VC"
+VERSION = 1
+
+_HEADER = struct.Struct("<2sBBI")
+_SCALE = struct.Struct("<f")
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class VectorDType(str, Enum):
+    """Storage precision for encoded vectors"""
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+
+_CODES = {VectorDType.FLOAT32: 0, VectorDType.FLOAT16: 1, VectorDType.INT8: 2}
+_DTYPES = {code: dtype for dtype, code in _CODES.items()}
+_NUMPY_DTYPES = {
+    VectorDType.FLOAT32: np.dtype("<f4"),
+    VectorDType.FLOAT16: np.dtype("<f2"),
+    VectorDType.INT8: np.dtype("i1"),
+}
+
+
+class VectorCodecError(ValueError):
+    """Raised for data that is not a vector in a supported format"""
+
+
+def as_float32(vector: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+    """View or convert a vector as a 1-D contiguous float32 array."""
+    return np.ascontiguousarray(vector, dtype=np.float32).reshape(-1)
+
+
+def encode_vector(
+    vector: Union[Sequence[float], np.ndarray],
+    dtype: VectorDType = VectorDType.FLOAT32
+) -> bytes:
+    """
+    Encode a 1-D vector with a versioned header.
+
+    Args:
+        vector: Float sequence or NumPy array
+        dtype: Storage precision; INT8 quantizes symmetrically around zero
+    """
+    dtype = VectorDType(dtype)
+    values = as_float32(vector)
+    header = _HEADER.pack(MAGIC, VERSION, _CODES[dtype], values.size)
+
+    if dtype is VectorDType.INT8:
+        peak = float(np.max(np.abs(values))) if values.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+        return header + _SCALE.pack(scale) + quantized.tobytes()
+
+    return header + values.astype(_NUMPY_DTYPES[dtype], copy=False).tobytes()
+
+
+def is_encoded_vector(data: Any) -> bool:
+    """Whether ``data`` starts with this codec's header (vs. legacy JSON)."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:2]) == MAGIC
+
+
+def decode_vector_prefix(
+    data: BytesLike,
+    dequantize: bool = True
+) -> Tuple[np.ndarray, int]:
+    """
+    Decode the vector at the start of ``data``.
+
+    Returns:
+        Tuple of (vector, bytes consumed) so callers can store trailing data
+        after the vector. float32 vectors, and float16/int8 ones with
+        ``dequantize=False``, are read-only views into ``data``.
+    """
+    if len(data) < _HEADER.size:
+        raise VectorCodecError("Encoded vector is truncated")
+
+    magic, version, code, dims = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise VectorCodecError("Not an encoded vector")
+    if version != VERSION:
+        raise VectorCodecError(f"Unsupported vector codec version: {version}")
+    if code not in _DTYPES:
+        raise VectorCodecError(f"Unknown vector dtype code: {code}")
+
+    dtype = _DTYPES[code]
+    offset = _HEADER.size
+    scale = None
+    if dtype is VectorDType.INT8:
+        (scale,) = _SCALE.unpack_from(data, offset)
+        offset += _SCALE.size
+
+    numpy_dtype = _NUMPY_DTYPES[dtype]
+    end = offset + dims * numpy_dtype.itemsize
+    if len(data) < end:
+        raise VectorCodecError("Encoded vector is truncated")
+
+    values = np.frombuffer(data, dtype=numpy_dtype, count=dims, offset=offset)
+    if dequantize and dtype is VectorDType.FLOAT16:
+        values = values.astype(np.float32)
+    elif dequantize and dtype is VectorDType.INT8:
+        values = values.astype(np.float32) * np.float32(scale)
+
+    return values, end
+
+
+def decode_vector(data: BytesLike, dequantize: bool = True) -> np.ndarray:
+    """Decode an encoded vector; see ``decode_vector_prefix``."""
+    return decode_vector_prefix(data, dequantize)[0]
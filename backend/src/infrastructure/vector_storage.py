@@ -0,0 +1,40 @@
+"""
+Growable Vector Storage
+
+The in-process vector indexes keep their rows in preallocated NumPy arrays
+and append into spare capacity. ``grow_rows`` reallocates those arrays
+together when they run out, doubling capacity so appends stay amortized
+O(1).
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+INITIAL_CAPACITY = 64
+
+
+def grow_rows(
+    arrays: Sequence[np.ndarray],
+    size: int,
+    used: int
+) -> Optional[List[np.ndarray]]:
+    """
+    Reallocate ``arrays``, which share their first dimension, to hold at
+    least ``size`` rows, copying the first ``used``.
+
+    Returns:
+        The new arrays, or None if the current capacity is enough
+    """
+    capacity = arrays[0].shape[0]
+    if size <= capacity:
+        return None
+
+    capacity = max(size, capacity * 2, INITIAL_CAPACITY)
+    grown = []
+    for array in arrays:
+        copy = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+        copy[:used] = array[:used]
+        grown.append(copy)
+    return grown
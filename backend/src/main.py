@@ -6,6 +6,8 @@ from core.data_encryption import setup_encryption
 from core.gdpr_compliance import setup_gdpr_compliance
 from core.cors_config import setup_cors, CORSConfig
 from services.chat import connection_manager
+from services.context import context_registry
+from infrastructure.cache.invalidation_bus import cache_invalidation_bus
 from models.base import init_db, close_db
 import os
 
@@ -19,11 +21,14 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()  # Initialize database tables
     await connection_manager.initialize()  # Initialize WebSocket manager
+    await cache_invalidation_bus.start()  # Keep L1 caches coherent across workers
     
     yield
     
     # Shutdown
+    await cache_invalidation_bus.stop()
     await connection_manager.shutdown()  # Cleanup WebSocket connections
+    await context_registry.close()  # Persist and snapshot live context managers
     await close_db()  # Close database connections
 
 
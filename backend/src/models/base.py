@@ -4,10 +4,13 @@ Base Database Configuration
 This module provides the base configuration for database models and sessions.
 """
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Callable, List, Optional, Tuple
+from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, event
 from sqlalchemy.sql import func
 from sqlalchemy.pool import NullPool
 import os
@@ -15,6 +18,13 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from pgvector.asyncpg import register_vector
+except ImportError:  # Only needed for the pgvector tables
+    register_vector = None
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 env_path = Path(__file__).parent.parent.parent / ".env"
 if env_path.exists():
@@ -33,6 +43,17 @@ engine = create_async_engine(
     pool_recycle=3600,  # Recycle connections after 1 hour
 )
 
+
+if register_vector is not None and engine.dialect.driver == "asyncpg":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_vector_codec(dbapi_connection, connection_record):
+        """Exchange pgvector values as binary float32 arrays instead of text"""
+        try:
+            dbapi_connection.run_async(register_vector)
+        except Exception as e:
+            # The extension may not exist yet; vector columns stay text-typed
+            logger.warning(f"pgvector codec not registered: {e}")
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -91,6 +112,35 @@ async def get_db_context():
         finally:
             await session.close()
 
+
+async def execute_concurrently(
+    session: AsyncSession,
+    session_factory: Optional[async_sessionmaker],
+    *queries: Tuple[Any, Callable[[Result], Any]]
+) -> List[Any]:
+    """
+    Run independent read-only queries and return their extracted results.
+
+    An AsyncSession cannot run statements concurrently, so when a session
+    factory is given each query gets its own short-lived session (and pool
+    connection) and all of them run under ``asyncio.gather``. Without a
+    factory the queries run one after another on ``session``.
+
+    Args:
+        session: Session used when no factory is available
+        session_factory: Optional factory for per-query sessions
+        queries: (statement, extract) pairs, e.g. ``(stmt, Result.all)``
+    """
+    if session_factory is None:
+        return [extract(await session.execute(stmt)) for stmt, extract in queries]
+
+    async def run(stmt, extract):
+        async with session_factory() as query_session:
+            return extract(await query_session.execute(stmt))
+
+    return list(await asyncio.gather(*(run(stmt, extract) for stmt, extract in queries)))
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
@@ -1,9 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 from enum import Enum as PyEnum
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID as PGUUID
+from sqlalchemy.orm import deferred, relationship
 
 from .base import Base
 
@@ -72,6 +72,8 @@ class ChatMessage(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime)
+    # Maintained by the chat_messages_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR))
 
     room = relationship("ChatRoom", back_populates="messages")
     user = relationship("User", back_populates="chat_messages")
@@ -84,6 +86,24 @@ class ChatMessage(Base):
         Index("ix_chat_messages_room_created", "room_id", "created_at"),
     )
 
+# Search trigger and GIN index, as created by migration 005. They are DDL
+# events rather than table metadata so that create_all (init_db) also gets
+# the trigger, and creates btree_gin before the uuid + tsvector GIN index.
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    "CREATE TRIGGER chat_messages_search_vector "
+    "BEFORE INSERT OR UPDATE OF content ON chat_messages "
+    "FOR EACH ROW "
+    "EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.english', content)",
+    "CREATE INDEX ix_chat_messages_room_search "
+    "ON chat_messages USING gin (room_id, search_vector)",
+):
+    event.listen(
+        ChatMessage.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql")
+    )
+
 class ChatMessageReaction(Base):
     __tablename__ = "chat_message_reactions"
     __table_args__ = (
@@ -13,7 +13,8 @@ from uuid import UUID
 from enum import Enum
 
 from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 import redis
 from prometheus_client import Counter, Gauge, Histogram
 import sentry_sdk
@@ -22,6 +23,7 @@ from ..models.citation import (
     Citation, AccuracyTracking, VerificationLog,
     MetricType, FeedbackType, VerificationStatus
 )
+from ..models.base import execute_concurrently
 from ..core.exceptions import ServiceUnavailableError
 from ..utils.notifications import NotificationService
 
@@ -102,12 +104,14 @@ class AccuracyTracker:
     
     def __init__(
         self,
-        db: Session,
+        db: AsyncSession,
         redis_client: Optional[redis.Redis] = None,
-        notification_service: Optional[NotificationService] = None
+        notification_service: Optional[NotificationService] = None,
+        session_factory: Optional[async_sessionmaker] = None
     ):
         """Initialize accuracy tracker."""
         self.db = db
+        self.session_factory = session_factory
         self.redis = redis_client
         self.notifications = notification_service
         self.accuracy_threshold = 0.95
@@ -154,10 +158,10 @@ class AccuracyTracker:
         """
         try:
             # Calculate system-wide accuracy
-            result = self.db.execute(
+            result = (await self.db.execute(
                 select(func.avg(Citation.overall_quality_score))
                 .where(Citation.is_active == True)
-            ).scalar()
+            )).scalar()
             
             overall_accuracy = float(result) if result else 0.0
             
@@ -214,7 +218,7 @@ class AccuracyTracker:
         """
         try:
             # Find citations with low accuracy
-            low_accuracy_citations = self.db.execute(
+            low_accuracy_citations = (await self.db.execute(
                 select(Citation)
                 .where(
                     and_(
@@ -224,7 +228,7 @@ class AccuracyTracker:
                 )
                 .order_by(Citation.overall_quality_score.asc())
                 .limit(limit)
-            ).scalars().all()
+            )).scalars().all()
             
             for citation in low_accuracy_citations:
                 # Update metric
@@ -250,7 +254,9 @@ class AccuracyTracker:
                     
                     # Mark for reverification
                     citation.requires_reverification = True
-                    self.db.commit()
+            
+            if low_accuracy_citations:
+                await self.db.commit()
             
             logger.info(f"Checked {len(low_accuracy_citations)} low-accuracy citations")
             
@@ -262,7 +268,7 @@ class AccuracyTracker:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=30)
             
-            stale_citations = self.db.execute(
+            stale_citations = (await self.db.execute(
                 select(Citation)
                 .where(
                     and_(
@@ -274,7 +280,7 @@ class AccuracyTracker:
                     )
                 )
                 .limit(50)
-            ).scalars().all()
+            )).scalars().all()
             
             for citation in stale_citations:
                 citation.verification_status = VerificationStatus.STALE
@@ -284,7 +290,7 @@ class AccuracyTracker:
                 citation.availability_score = max(0.5, citation.availability_score - 0.1)
             
             if stale_citations:
-                self.db.commit()
+                await self.db.commit()
                 logger.info(f"Marked {len(stale_citations)} citations as stale")
             
         except Exception as e:
@@ -305,7 +311,7 @@ class AccuracyTracker:
         """
         try:
             # Get all feedback for the citation
-            feedback_data = self.db.execute(
+            feedback_data = (await self.db.execute(
                 select(
                     AccuracyTracking.metric_type,
                     func.avg(AccuracyTracking.score).label('avg_score'),
@@ -314,7 +320,7 @@ class AccuracyTracker:
                 )
                 .where(AccuracyTracking.citation_id == citation_id)
                 .group_by(AccuracyTracking.metric_type)
-            ).all()
+            )).all()
             
             metrics = {
                 MetricType.ACCURACY: 0.0,
@@ -398,7 +404,7 @@ class AccuracyTracker:
             self.db.add(tracking)
             
             # Update citation scores
-            citation = self.db.get(Citation, citation_id)
+            citation = await self.db.get(Citation, citation_id)
             if citation:
                 metrics = await self.calculate_accuracy_metrics(citation_id)
                 
@@ -416,7 +422,7 @@ class AccuracyTracker:
                         current_score=citation.overall_quality_score
                     )
             
-            self.db.commit()
+            await self.db.commit()
             
             # Update metrics
             feedback_submissions.labels(
@@ -428,7 +434,7 @@ class AccuracyTracker:
             return tracking
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error submitting feedback: {e}")
             raise
     
@@ -477,7 +483,7 @@ class AccuracyTracker:
                     )
                 ).group_by(func.date(Citation.updated_at))
             
-            results = self.db.execute(query).all()
+            results = (await self.db.execute(query)).all()
             
             # Format trends data
             trends = {}
@@ -523,7 +529,7 @@ class AccuracyTracker:
                 start_date = end_date - timedelta(days=30)
             
             # Overall system metrics
-            system_metrics = self.db.execute(
+            system_metrics_query = (
                 select(
                     func.avg(Citation.overall_quality_score).label('avg_accuracy'),
                     func.min(Citation.overall_quality_score).label('min_accuracy'),
@@ -537,10 +543,10 @@ class AccuracyTracker:
                         Citation.created_at <= end_date
                     )
                 )
-            ).first()
+            )
             
             # Accuracy by source type
-            source_metrics = self.db.execute(
+            source_metrics_query = (
                 select(
                     Citation.source_type,
                     func.avg(Citation.overall_quality_score).label('avg_accuracy'),
@@ -552,10 +558,10 @@ class AccuracyTracker:
                         Citation.created_at <= end_date
                     )
                 ).group_by(Citation.source_type)
-            ).all()
+            )
             
             # Verification statistics
-            verification_stats = self.db.execute(
+            verification_query = (
                 select(
                     VerificationLog.status,
                     func.count(VerificationLog.id).label('count'),
@@ -566,10 +572,10 @@ class AccuracyTracker:
                         VerificationLog.started_at <= end_date
                     )
                 ).group_by(VerificationLog.status)
-            ).all()
+            )
             
             # Feedback statistics
-            feedback_stats = self.db.execute(
+            feedback_query = (
                 select(
                     AccuracyTracking.feedback_type,
                     AccuracyTracking.metric_type,
@@ -584,7 +590,22 @@ class AccuracyTracker:
                     AccuracyTracking.feedback_type,
                     AccuracyTracking.metric_type
                 )
-            ).all()
+            )
+            
+            # The aggregates are independent, so run them concurrently
+            (
+                system_metrics,
+                source_metrics,
+                verification_stats,
+                feedback_stats
+            ) = await execute_concurrently(
+                self.db,
+                self.session_factory,
+                (system_metrics_query, Result.first),
+                (source_metrics_query, Result.all),
+                (verification_query, Result.all),
+                (feedback_query, Result.all)
+            )
             
             # Alert statistics
             alert_count = len([
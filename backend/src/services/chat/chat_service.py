@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from sqlalchemy import select, and_, or_, func, text
 from sqlalchemy.orm import selectinload
@@ -11,13 +11,25 @@ from ...database import AsyncSession
 from ...models.chat import ChatRoom, ChatMessage, ChatRoomParticipant
 from ...models.tenant import Tenant
 from ...core.security.sentry_security import get_security_monitor, SecurityEventType
+from .message_history import RecentMessages, decode_cursor, encode_cursor, history_query, serialize_message
+from .message_search import decode_search_cursor, encode_search_cursor, search_query
 
 logger = logging.getLogger(__name__)
 
+# Keep only alphanumeric, spaces, and basic punctuation
+_SEARCH_DISALLOWED_CHARS = re.compile(r'[^\w\s\-_.,!?@#]')
+# SQL injection patterns, as one alternation
+_SQL_INJECTION_PATTERN = re.compile(
+    r'\b(?:union|select|insert|update|delete|drop|create|alter|exec|execute)\b'
+    r'|--|/\*|\*/|;|\|\||&&',
+    re.IGNORECASE
+)
+
 class ChatService:
     def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
         self.redis = redis
+        self.recent = RecentMessages(redis)
         self.security_monitor = get_security_monitor()
 
     async def create_room(
@@ -97,33 +109,58 @@ class ChatService:
         self.db.add(message)
         await self.db.commit()
         await self.db.refresh(message)
+        await self.recent.push(room_id, serialize_message(message))
         return message
 
     async def get_messages(
         self,
         room_id: UUID,
         limit: int = 50,
+        before: Optional[str] = None,
         before_id: Optional[UUID] = None
-    ) -> List[ChatMessage]:
-        query = (
-            select(ChatMessage)
-            .where(ChatMessage.room_id == room_id)
-            .options(
-                selectinload(ChatMessage.user),
-                selectinload(ChatMessage.reactions),
-                selectinload(ChatMessage.receipts)
-            )
-            .order_by(ChatMessage.created_at.desc())
-            .limit(limit)
-        )
-        
-        if before_id:
-            message = await self.db.get(ChatMessage, before_id)
-            if message:
-                query = query.where(ChatMessage.created_at < message.created_at)
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+    ) -> Dict[str, Any]:
+        """
+        One page of history, newest first, as serialized messages with
+        receipt counts. The latest page is served from the room's cached
+        recent messages when possible.
+
+        Args:
+            before: ``next_cursor`` of the previous page
+            before_id: Message id to page back from (older clients)
+
+        Returns:
+            {"messages": [...], "next_cursor": str or None}
+        """
+        if before is None and before_id is None:
+            cached = await self.recent.read(room_id, limit)
+            if cached is not None:
+                return self._history_page(*cached)
+            version = await self.recent.version(room_id)
+            items, has_more = await self._query_history(room_id, max(limit, self.recent.size))
+            await self.recent.fill(room_id, items, not has_more, version)
+            return self._history_page(items[:limit], has_more or len(items) > limit)
+
+        cursor = decode_cursor(before) if before is not None else None
+        return self._history_page(*await self._query_history(room_id, limit, cursor, before_id))
+
+    async def _query_history(
+        self,
+        room_id: UUID,
+        limit: int,
+        before: Optional[tuple] = None,
+        before_id: Optional[UUID] = None
+    ) -> tuple:
+        result = await self.db.execute(history_query(room_id, limit + 1, before, before_id))
+        rows = result.all()
+        items = [serialize_message(row, row.delivered, row.read) for row in rows[:limit]]
+        return items, len(rows) > limit
+
+    @staticmethod
+    def _history_page(items: List[Dict[str, Any]], has_more: bool) -> Dict[str, Any]:
+        return {
+            "messages": items,
+            "next_cursor": encode_cursor(items[-1]) if has_more and items else None
+        }
 
     async def validate_room_access(self, room_id: UUID, user_id: UUID):
         stmt = select(ChatRoomParticipant).where(
@@ -154,33 +191,37 @@ class ChatService:
         room_id: UUID,
         query: str,
         limit: int = 50,
-        offset: int = 0,
+        before: Optional[str] = None,
         user_id: Optional[UUID] = None
-    ) -> List[ChatMessage]:
+    ) -> Dict[str, Any]:
+        """
+        Full-text search of a room, best match first.
+
+        Args:
+            before: ``next_cursor`` of the previous page
+
+        Returns:
+            {"messages": [...], "next_cursor": str or None}
+        """
         # Validate and sanitize search query
         sanitized_query = self._sanitize_search_query(query, user_id)
+        if not sanitized_query:
+            return {"messages": [], "next_cursor": None}
         
         # Limit result size
-        safe_limit = min(limit, 100)
-        safe_offset = max(0, offset)
+        safe_limit = max(1, min(limit, 100))
+        cursor = decode_search_cursor(before) if before is not None else None
         
         # Use parameterized query to prevent SQL injection
-        stmt = (
-            select(ChatMessage)
-            .where(
-                and_(
-                    ChatMessage.room_id == room_id,
-                    ChatMessage.content.ilike(f"%{sanitized_query}%"),
-                    ChatMessage.deleted_at.is_(None)  # Only search non-deleted messages
-                )
-            )
-            .order_by(ChatMessage.created_at.desc())
-            .offset(safe_offset)
-            .limit(safe_limit)
-        )
+        result = await self.db.execute(search_query(room_id, sanitized_query, safe_limit + 1, cursor))
+        rows = result.all()
+        items = [serialize_message(row, row.delivered, row.read) for row in rows[:safe_limit]]
         
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+        has_more = len(rows) > safe_limit
+        return {
+            "messages": items,
+            "next_cursor": encode_search_cursor(rows[safe_limit - 1].rank, items[-1]) if has_more else None
+        }
     
     def _sanitize_search_query(self, query: str, user_id: Optional[UUID] = None) -> str:
         """Sanitize search query to prevent SQL injection and other attacks"""
@@ -188,35 +229,28 @@ class ChatService:
             return ""
         
         # Remove or escape potentially dangerous characters
-        # Keep only alphanumeric, spaces, and basic punctuation
-        sanitized = re.sub(r'[^\w\s\-_.,!?@#]', '', query)
+        sanitized = _SEARCH_DISALLOWED_CHARS.sub('', query)
         
         # Limit length
         sanitized = sanitized[:200]
         
         # Check for SQL injection patterns
-        sql_patterns = [
-            r'\bunion\b', r'\bselect\b', r'\binsert\b', r'\bupdate\b', r'\bdelete\b',
-            r'\bdrop\b', r'\bcreate\b', r'\balter\b', r'\bexec\b', r'\bexecute\b',
-            r'--', r'/\*', r'\*/', r';', r'\|\|', r'&&'
-        ]
-        
-        query_lower = sanitized.lower()
-        for pattern in sql_patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
-                if self.security_monitor and user_id:
-                    self.security_monitor.track_security_event(
-                        SecurityEventType.SQL_INJECTION_ATTEMPT,
-                        user_id=user_id,
-                        details={
-                            "query": query[:100],  # First 100 chars only
-                            "pattern_matched": pattern,
-                            "sanitized_query": sanitized
-                        }
-                    )
-                logger.warning(f"Potential SQL injection attempt detected: {pattern} in query: {query[:50]}")
-                # Return empty string to prevent injection
-                return ""
+        match = _SQL_INJECTION_PATTERN.search(sanitized)
+        if match:
+            pattern = match.group(0).lower()
+            if self.security_monitor and user_id:
+                self.security_monitor.track_security_event(
+                    SecurityEventType.SQL_INJECTION_ATTEMPT,
+                    user_id=user_id,
+                    details={
+                        "query": query[:100],  # First 100 chars only
+                        "pattern_matched": pattern,
+                        "sanitized_query": sanitized
+                    }
+                )
+            logger.warning(f"Potential SQL injection attempt detected: {pattern} in query: {query[:50]}")
+            # Return empty string to prevent injection
+            return ""
         
         return sanitized.strip()
 
@@ -0,0 +1,216 @@
+"""
+Chat Message History
+
+History pages are read with a keyset cursor on ``(created_at, id)``,
+newest first, so every page is an index range scan on
+``ix_chat_messages_room_created`` however deep the client scrolls. Rows
+are a lean projection of the message columns plus aggregate receipt
+counts; receipt rows, reactions and authors are not loaded.
+
+The most recent messages of each room are also kept serialized in a
+Redis list (``chat:room:{room_id}:recent``, newest first), so opening a
+room is a single LRANGE. Sent messages are pushed onto the list only
+while it exists; a missing list is rebuilt from the database by the next
+reader. A rebuild is discarded when a message was pushed after the
+reader's query started, so the list never misses a message. A trailing
+``END_OF_HISTORY`` entry marks a list holding the room's whole history.
+
+Receipt counts in the list are those at the time the entry was written;
+clients follow later receipts through ``messages_read`` events.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from redis.exceptions import WatchError
+from sqlalchemy import func, or_, select
+
+from ...models.chat import ChatMessage, ChatMessageReceipt
+
+logger = logging.getLogger(__name__)
+
+Cursor = Tuple[datetime, UUID]
+
+# Core tables: history rows are plain projections, never ORM instances
+messages = ChatMessage.__table__
+receipts = ChatMessageReceipt.__table__
+
+END_OF_HISTORY = b""
+
+
+def encode_cursor(item: Dict[str, Any]) -> str:
+    """Cursor pointing just past a serialized message."""
+    return f"{item['created_at']}_{item['id']}"
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, _, message_id = cursor.rpartition("_")
+    return datetime.fromisoformat(created_at), UUID(message_id)
+
+
+def serialize_message(message: Any, delivered: int = 0, read: int = 0) -> Dict[str, Any]:
+    """Lean history item for a message row or ``ChatMessage``."""
+    return {
+        "id": str(message.id),
+        "user_id": str(message.user_id),
+        "content": message.content,
+        "content_type": message.content_type,
+        "metadata": message.message_metadata or {},
+        "parent_id": str(message.parent_id) if message.parent_id else None,
+        "created_at": message.created_at.isoformat(),
+        "deleted_at": message.deleted_at.isoformat() if message.deleted_at else None,
+        "receipts": {"delivered": delivered, "read": read}
+    }
+
+
+def lean_columns() -> List[Any]:
+    """Columns ``serialize_message`` reads, with receipt counts."""
+    counted = select(func.count()).where(receipts.c.message_id == messages.c.id)
+    return [
+        messages.c.id,
+        messages.c.user_id,
+        messages.c.content,
+        messages.c.content_type,
+        messages.c.metadata.label("message_metadata"),
+        messages.c.parent_id,
+        messages.c.created_at,
+        messages.c.deleted_at,
+        counted.scalar_subquery().label("delivered"),
+        counted.where(receipts.c.read_at.is_not(None)).scalar_subquery().label("read")
+    ]
+
+
+def history_query(room_id: UUID, limit: int, before: Optional[Cursor] = None, before_id: Optional[UUID] = None):
+    """
+    One page of a room's history, newest first.
+
+    ``before`` is a decoded cursor; ``before_id`` (older clients) is
+    resolved to its timestamp inside the same query.
+    """
+    stmt = (
+        select(*lean_columns())
+        .where(messages.c.room_id == room_id)
+        .order_by(messages.c.created_at.desc(), messages.c.id.desc())
+        .limit(limit)
+    )
+
+    if before is not None:
+        created_at, message_id = before
+    elif before_id is not None:
+        created_at = select(messages.c.created_at).where(messages.c.id == before_id).scalar_subquery()
+        message_id = before_id
+    else:
+        return stmt
+
+    # (created_at, id) < cursor, spelled so the created_at bound is an
+    # index condition on (room_id, created_at)
+    return stmt.where(
+        messages.c.created_at <= created_at,
+        or_(messages.c.created_at < created_at, messages.c.id < message_id)
+    )
+
+
+class RecentMessages:
+    """Per-room Redis list of the latest ``size`` serialized messages."""
+
+    def __init__(self, redis: Any, size: int = 100, ttl: int = 86400):
+        self.redis = redis
+        self.size = size
+        self.ttl = ttl
+
+    def key(self, room_id: UUID) -> str:
+        return f"chat:room:{room_id}:recent"
+
+    def version_key(self, room_id: UUID) -> str:
+        return f"chat:room:{room_id}:recent:version"
+
+    async def push(self, room_id: UUID, item: Dict[str, Any]) -> None:
+        """Add a newly sent message, if the room's list is cached."""
+        key, version = self.key(room_id), self.version_key(room_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incr(version)
+            pipe.expire(version, self.ttl)
+            pipe.lpushx(key, json.dumps(item))
+            pipe.ltrim(key, 0, self.size - 1)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Error caching message for room {room_id}: {e}")
+
+    async def read(self, room_id: UUID, limit: int) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Latest ``limit`` messages, and whether older ones may exist.
+
+        Returns:
+            None when the list is not cached or too short for ``limit``
+        """
+        try:
+            raw = await self.redis.lrange(self.key(room_id), 0, limit)
+        except Exception as e:
+            logger.warning(f"Error reading cached messages for room {room_id}: {e}")
+            return None
+        if not raw:
+            return None
+
+        # The sentinel is b"" or "", depending on the client's decode_responses
+        complete = not raw[-1]
+        try:
+            items = [json.loads(entry) for entry in raw if entry]
+        except ValueError as e:
+            logger.warning(f"Corrupt cached messages for room {room_id}: {e}")
+            return None
+        if len(items) < limit and not complete:
+            return None
+        return items[:limit], len(items) > limit or not complete
+
+    async def version(self, room_id: UUID) -> Optional[bytes]:
+        """Read before querying the database for a later ``fill``."""
+        try:
+            return await self.redis.get(self.version_key(room_id))
+        except Exception as e:
+            logger.warning(f"Error reading message cache version for room {room_id}: {e}")
+            return None
+
+    async def fill(
+        self,
+        room_id: UUID,
+        items: List[Dict[str, Any]],
+        complete: bool,
+        version: Optional[bytes]
+    ) -> bool:
+        """
+        Cache ``items`` (newest first) unless a message was pushed since
+        ``version`` was read.
+
+        Returns:
+            True if the list was written
+        """
+        key, version_key = self.key(room_id), self.version_key(room_id)
+        entries = [json.dumps(item) for item in items[:self.size]]
+        if complete and len(items) < self.size:
+            entries.append(END_OF_HISTORY)
+
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(version_key)
+                if await pipe.get(version_key) != version:
+                    return False
+                pipe.multi()
+                pipe.delete(key)
+                pipe.rpush(key, *entries)
+                pipe.expire(key, self.ttl)
+                await pipe.execute()
+            return True
+        except WatchError:
+            return False
+        except Exception as e:
+            logger.warning(f"Error caching messages for room {room_id}: {e}")
+            return False
@@ -0,0 +1,64 @@
+"""
+Chat Message Search
+
+Messages are matched against ``chat_messages.search_vector``, a
+``tsvector`` kept up to date by the ``chat_messages_search_vector``
+trigger and indexed together with ``room_id`` by the GIN index
+``ix_chat_messages_room_search``. A room search is therefore an index
+lookup on (room, terms) instead of a substring scan of the room's whole
+history.
+
+Results are ordered by ``ts_rank``, newest first among equal ranks, and
+paged with a keyset cursor on ``(rank, created_at, id)``. Only matching
+rows are ranked and sorted; pages never re-read the rows before them.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+
+from .message_history import lean_columns, messages
+
+SEARCH_CONFIG = "english"
+
+SearchCursor = Tuple[float, datetime, UUID]
+
+
+def encode_search_cursor(rank: float, item: Dict[str, Any]) -> str:
+    """Cursor pointing just past a ranked, serialized message."""
+    return f"{rank!r}_{item['created_at']}_{item['id']}"
+
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    rank, created_at, message_id = cursor.split("_", 2)
+    return float(rank), datetime.fromisoformat(created_at), UUID(message_id)
+
+
+def search_query(room_id: UUID, terms: str, limit: int, before: Optional[SearchCursor] = None):
+    """
+    One page of a room's non-deleted messages matching all of ``terms``,
+    best match first. Rows carry their ``rank`` for the next cursor.
+    """
+    tsquery = func.plainto_tsquery(SEARCH_CONFIG, terms)
+    rank = func.ts_rank(messages.c.search_vector, tsquery)
+
+    stmt = (
+        select(*lean_columns(), rank.label("rank"))
+        .where(
+            messages.c.room_id == room_id,
+            messages.c.search_vector.bool_op("@@")(tsquery),
+            messages.c.deleted_at.is_(None)
+        )
+        .order_by(rank.desc(), messages.c.created_at.desc(), messages.c.id.desc())
+        .limit(limit)
+    )
+
+    if before is not None:
+        stmt = stmt.where(tuple_(rank, messages.c.created_at, messages.c.id) < tuple_(*before))
+    return stmt
@@ -0,0 +1,176 @@
+"""
+Per-Connection Outbound Queues
+
+Fan-out to a room enqueues one pre-serialized frame per connection and
+returns; each connection's writer task drains its own queue onto the
+socket. A slow or stalled client then only delays itself, never the rest
+of the room.
+
+Backpressure, per connection:
+
+- Ephemeral events (typing indicators and presence changes) are the first
+  to go. Once ``shed_depth`` frames are waiting, new ephemeral frames are
+  dropped. When the queue is full, queued ephemeral frames are purged to
+  make room for chat messages and receipts.
+- If the queue is still full of essential frames (``max_depth``), the
+  client is not keeping up at all. The queue closes and ``on_close`` is
+  called so the manager can disconnect it. A send that fails or takes
+  longer than ``send_timeout`` does the same.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events safe to lose under backpressure; a later one supersedes them
+EPHEMERAL_EVENTS = frozenset({
+    "typing_indicator",
+    "user_joined",
+    "user_left",
+    "user_online",
+    "user_offline",
+})
+
+
+class OutboundQueue:
+    """
+    Bounded frame queue with a dedicated writer task for one WebSocket.
+
+    Frames are (text, ephemeral, enqueue time); ``offer`` never awaits.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        connection_id: str,
+        max_depth: int = 512,
+        shed_depth: int = 64,
+        send_timeout: float = 10.0,
+        on_close: Optional[Callable[["OutboundQueue"], Any]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.websocket = websocket
+        self.connection_id = connection_id
+        self.max_depth = max_depth
+        self.shed_depth = min(shed_depth, max_depth)
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+        self.clock = clock
+
+        self.closed = False
+        self._frames: Deque[Tuple[str, bool, float]] = deque()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._drain())
+
+    async def close(self) -> None:
+        """Stop the writer; frames still queued are discarded."""
+        self.closed = True
+        self._frames.clear()
+        self._ready.set()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest queued frame has been waiting."""
+        if not self._frames:
+            return 0.0
+        return self.clock() - self._frames[0][2]
+
+    def offer(self, text: str, ephemeral: bool = False) -> bool:
+        """
+        Queue a frame for sending.
+
+        Returns:
+            False if the frame was dropped or the connection is closed
+        """
+        if self.closed:
+            return False
+
+        if ephemeral and len(self._frames) >= self.shed_depth:
+            self.dropped += 1
+            return False
+
+        if len(self._frames) >= self.max_depth:
+            self._purge_ephemeral()
+            if len(self._frames) >= self.max_depth:
+                self.dropped += 1
+                self._give_up(f"queue exceeded {self.max_depth} frames")
+                return False
+
+        self._frames.append((text, ephemeral, self.clock()))
+        self.peak_depth = max(self.peak_depth, len(self._frames))
+        self._ready.set()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connection_id": self.connection_id,
+            "depth": len(self._frames),
+            "peak_depth": self.peak_depth,
+            "lag": self.lag,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "closed": self.closed
+        }
+
+    def _purge_ephemeral(self) -> None:
+        kept = deque(frame for frame in self._frames if not frame[1])
+        self.dropped += len(self._frames) - len(kept)
+        self._frames = kept
+
+    def _give_up(self, reason: str) -> None:
+        logger.warning(f"Disconnecting slow consumer {self.connection_id}: {reason}")
+        self.closed = True
+        self._frames.clear()
+        self._ready.set()
+        if self.on_close is not None:
+            self.on_close(self)
+
+    async def _drain(self) -> None:
+        while not self.closed:
+            if not self._frames:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            text, _, enqueued_at = self._frames.popleft()
+            try:
+                async with asyncio.timeout(self.send_timeout):
+                    await self.websocket.send_text(text)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self._give_up(f"send blocked for {self.send_timeout}s")
+                return
+            except Exception as e:
+                self._give_up(f"send failed: {e}")
+                return
+
+            self.sent += 1
+            self.last_lag = self.clock() - enqueued_at
+            self.max_lag = max(self.max_lag, self.last_lag)
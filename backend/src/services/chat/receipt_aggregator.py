@@ -0,0 +1,287 @@
+"""
+Write-Behind Chat Receipts
+
+Delivery and read receipts are recorded in memory on the send path and
+written in the background, so broadcasting a message or marking messages
+read never waits on the database. Pending receipts are flushed every
+``flush_interval`` seconds, or as soon as ``max_batch`` of them are
+waiting. Each flush is one multi-row ``INSERT ... ON CONFLICT`` per
+``max_batch`` rows.
+
+Receipts for the same (message, user) pair are merged before they are
+written, and a read receipt never clears an earlier ``read_at``. Rows
+whose message or user no longer exists (client-supplied ids, messages
+deleted in the meantime) are skipped by the upsert itself, and a row is
+retried at most ``max_attempts`` times, so one bad receipt cannot wedge
+the queue.
+Deliveries record the room rather than its members; the members of every
+room in a batch are fetched with one pipelined ``SMEMBERS`` round trip at
+flush time.
+
+Receipts still buffered when a worker dies are lost, and new receipts are
+shed once ``max_pending`` are waiting (while the database or Redis is
+unavailable). ``stop`` flushes whatever is pending.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, func, select, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ...models.base import AsyncSessionLocal
+from ...models.chat import ChatMessage, ChatMessageReceipt
+from ...models.user import User
+
+logger = logging.getLogger(__name__)
+
+ReceiptKey = Tuple[UUID, UUID]  # (message_id, user_id)
+
+
+class ReceiptAggregator:
+    """
+    Buffers chat receipts and upserts them in batches.
+
+    ``record_delivered`` and ``record_read`` only touch memory; the flusher
+    task started by ``start`` does the writing.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        session_factory: Optional[async_sessionmaker] = None,
+        flush_interval: float = 0.05,
+        max_batch: int = 1000,
+        max_pending: int = 100_000,
+        max_attempts: int = 3
+    ):
+        self.redis = redis
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+        # (message_id, room_id, delivered_at) awaiting member lookup
+        self._deliveries: List[Tuple[UUID, UUID, datetime]] = []
+        # (message_id, user_id) -> [received_at, read_at, failed writes]
+        self._receipts: Dict[ReceiptKey, List[Any]] = {}
+        self._wake = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "skipped": 0,
+            "flushes": 0,
+            "dropped": 0,
+            "errors": 0
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._deliveries) + len(self._receipts)
+
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None and not self._flusher.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._flusher = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still pending."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def record_delivered(
+        self,
+        message_id: UUID,
+        room_id: UUID,
+        delivered_at: Optional[datetime] = None
+    ) -> None:
+        """A message was delivered to everyone currently in ``room_id``."""
+        if self._full():
+            return
+        self._deliveries.append((message_id, room_id, delivered_at or datetime.utcnow()))
+        self._recorded(1)
+
+    def record_read(
+        self,
+        user_id: UUID,
+        message_ids: Iterable[UUID],
+        read_at: Optional[datetime] = None
+    ) -> None:
+        if self._full():
+            return
+        read_at = read_at or datetime.utcnow()
+        count = 0
+        for message_id in message_ids:
+            self._merge((message_id, user_id), read_at, read_at)
+            count += 1
+        self._recorded(count)
+
+    async def flush(self) -> int:
+        """
+        Write pending receipts now.
+
+        Returns:
+            Number of receipt rows written (rows for missing messages or
+            users are skipped)
+        """
+        async with self._flush_lock:
+            if self._deliveries:
+                await self._expand_deliveries()
+            if not self._receipts:
+                return 0
+
+            receipts, self._receipts = self._receipts, {}
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "message_id": message_id,
+                    "user_id": user_id,
+                    "received_at": received_at,
+                    "read_at": read_at
+                }
+                for (message_id, user_id), (received_at, read_at, _) in receipts.items()
+            ]
+
+            written = 0
+            try:
+                async with self.session_factory() as session:
+                    for start in range(0, len(rows), self.max_batch):
+                        result = await session.execute(upsert_receipts(rows[start:start + self.max_batch]))
+                        written += result.rowcount
+                    await session.commit()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Error writing {len(rows)} chat receipts: {e}")
+                self._requeue(receipts)
+                return 0
+
+            self.stats["written"] += written
+            self.stats["skipped"] += len(rows) - written
+            self.stats["flushes"] += 1
+            return written
+
+    def _full(self) -> bool:
+        # Shed new receipts rather than grow without bound while the
+        # database or Redis is unavailable
+        if self.pending < self.max_pending:
+            return False
+        self.stats["dropped"] += 1
+        return True
+
+    def _recorded(self, count: int) -> None:
+        self.stats["recorded"] += count
+        if self.pending >= self.max_batch:
+            self._wake.set()
+
+    def _merge(
+        self,
+        key: ReceiptKey,
+        received_at: Optional[datetime],
+        read_at: Optional[datetime]
+    ) -> None:
+        current = self._receipts.get(key)
+        if current is None:
+            self._receipts[key] = [received_at, read_at, 0]
+            return
+        if received_at is not None and (current[0] is None or received_at < current[0]):
+            current[0] = received_at
+        if read_at is not None and (current[1] is None or read_at < current[1]):
+            current[1] = read_at
+
+    async def _expand_deliveries(self) -> None:
+        """Turn room deliveries into per-member receipts."""
+        deliveries, self._deliveries = self._deliveries, []
+        rooms = list({room_id for _, room_id, _ in deliveries})
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for room_id in rooms:
+                pipe.smembers(f"chat:room:{room_id}:participants")
+            members = dict(zip(rooms, await pipe.execute()))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error loading room members for receipts: {e}")
+            self._deliveries = deliveries + self._deliveries
+            return
+
+        for message_id, room_id, delivered_at in deliveries:
+            for member in members[room_id]:
+                user_id = UUID(member.decode() if isinstance(member, bytes) else member)
+                self._merge((message_id, user_id), delivered_at, None)
+
+    def _requeue(self, receipts: Dict[ReceiptKey, List[Any]]) -> None:
+        """
+        Put back receipts from a failed write, dropping the excess and
+        rows that have failed ``max_attempts`` times.
+        """
+        for key, (received_at, read_at, attempts) in receipts.items():
+            if attempts + 1 >= self.max_attempts or len(self._receipts) >= self.max_pending:
+                self.stats["dropped"] += 1
+                continue
+            self._merge(key, received_at, read_at)
+            self._receipts[key][2] = max(self._receipts[key][2], attempts + 1)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.flush_interval):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Error flushing chat receipts: {e}")
+
+
+def upsert_receipts(rows: List[Dict[str, Any]]):
+    """
+    Multi-row receipt insert; on an existing (message, user) receipt only
+    a missing ``read_at`` is filled in.
+
+    Rows are selected from a VALUES list joined to ``chat_messages`` and
+    ``users``, so receipts for unknown or deleted messages and users are
+    skipped instead of failing the batch on a foreign key.
+    """
+    columns = ["id", "message_id", "user_id", "received_at", "read_at"]
+    incoming = values(
+        column("id", PGUUID),
+        column("message_id", PGUUID),
+        column("user_id", PGUUID),
+        column("received_at", DateTime),
+        column("read_at", DateTime),
+        name="incoming"
+    ).data([tuple(row[name] for name in columns) for row in rows])
+
+    existing = (
+        select(*(incoming.c[name] for name in columns))
+        .join(ChatMessage.__table__, ChatMessage.__table__.c.id == incoming.c.message_id)
+        .join(User.__table__, User.__table__.c.id == incoming.c.user_id)
+    )
+    stmt = insert(ChatMessageReceipt).from_select(columns, existing)
+    return stmt.on_conflict_do_update(
+        index_elements=["message_id", "user_id"],
+        set_={
+            "read_at": func.coalesce(ChatMessageReceipt.read_at, stmt.excluded.read_at)
+        }
+    )
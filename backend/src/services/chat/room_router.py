@@ -0,0 +1,162 @@
+"""
+Cross-Node Room Router
+
+Chat events are delivered to sockets on the node that produced them and
+published on ``chat:room:{room_id}`` for every other node. Each process
+holds a single pattern subscription over all room channels and hands an
+inbound event to its local sockets only when the room has members
+connected to this node; other rooms are skipped after reading the header.
+
+Published frames are the serialized event behind a one-line header,
+``"{node_id} {ephemeral}\\n{event json}"``. Receivers drop their own
+frames (already delivered locally) and forward the event text to sockets
+as-is, without decoding it.
+
+Pub/sub is at-most-once: events published while a node is resubscribing
+are lost for that node's sockets, like any message sent while a client is
+reconnecting.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+LocalDelivery = Callable[[UUID, str, bool], Any]
+
+
+class RoomRouter:
+    """
+    Publishes room events and fans other nodes' events out locally.
+
+    ``deliver(room_id, text, ephemeral)`` hands an event to local sockets;
+    ``is_hosted(room_id)`` says whether any member is connected here.
+    """
+
+    CHANNEL_PREFIX = "chat:room:"
+
+    def __init__(
+        self,
+        redis: Any,
+        deliver: LocalDelivery,
+        is_hosted: Callable[[UUID], bool],
+        node_id: Optional[str] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0
+    ):
+        self.redis = redis
+        self.deliver = deliver
+        self.is_hosted = is_hosted
+        self.node_id = node_id or uuid.uuid4().hex
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
+
+        self.stats: Dict[str, int] = {
+            "published": 0,
+            "received": 0,
+            "delivered": 0,
+            "own": 0,
+            "not_hosted": 0,
+            "subscriptions": 0,
+            "errors": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    def channel(self, room_id: UUID) -> str:
+        return f"{self.CHANNEL_PREFIX}{room_id}"
+
+    async def publish(self, room_id: UUID, text: str, ephemeral: bool = False) -> None:
+        """Send a serialized event to the other nodes hosting ``room_id``."""
+        frame = f"{self.node_id} {int(ephemeral)}\n{text}"
+        try:
+            await self.redis.publish(self.channel(room_id), frame)
+            self.stats["published"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Room event publish failed for {room_id}: {e}")
+
+    async def start(self, timeout: float = 5.0) -> None:
+        """Start listening and wait (up to ``timeout``) for the subscription."""
+        if self.running:
+            return
+        self._subscribed = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Chat room router not subscribed yet; retrying in background")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+                self.stats["subscriptions"] += 1
+                self._subscribed.set()
+                delay = self.reconnect_delay
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self._handle_frame(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                self._subscribed.clear()
+                logger.warning(f"Chat room router disconnected: {e}; retrying in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def _handle_frame(self, channel: Any, data: Any) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        if isinstance(data, bytes):
+            data = data.decode()
+
+        try:
+            header, text = data.split("\n", 1)
+            node_id, ephemeral = header.split(" ")
+            room_id = UUID(channel[len(self.CHANNEL_PREFIX):])
+        except (AttributeError, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Malformed room event on {channel}: {e}")
+            return
+
+        self.stats["received"] += 1
+        if node_id == self.node_id:
+            self.stats["own"] += 1
+            return
+        if not self.is_hosted(room_id):
+            self.stats["not_hosted"] += 1
+            return
+
+        try:
+            self.deliver(room_id, text, ephemeral == "1")
+            self.stats["delivered"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Local delivery failed for room {room_id}: {e}")
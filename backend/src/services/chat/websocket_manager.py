@@ -1,37 +1,107 @@
-from typing import Dict, Set
+from typing import Any, Dict, Optional, Set
 from uuid import UUID
 from fastapi import WebSocket
 from redis.asyncio import Redis
+import asyncio
 import json
 import logging
 from datetime import datetime
 
-from ...models.chat import ChatRoom, ChatMessage, ChatMessageReceipt
+from ...models.chat import ChatRoom, ChatMessage
 from ...database import AsyncSession
 from ...core.config import settings
+from .outbound_queue import EPHEMERAL_EVENTS, OutboundQueue
+from .receipt_aggregator import ReceiptAggregator
+from .room_router import RoomRouter
 
 logger = logging.getLogger(__name__)
 
 class WebSocketManager:
-    def __init__(self, redis: Redis):
+    def __init__(
+        self,
+        redis: Redis,
+        max_queue_depth: int = 512,
+        shed_queue_depth: int = 64,
+        send_timeout: float = 10.0,
+        node_id: Optional[str] = None,
+        receipts: Optional[ReceiptAggregator] = None
+    ):
         self.active_connections: Dict[UUID, Dict[str, WebSocket]] = {}
         self.room_participants: Dict[UUID, Set[UUID]] = {}
         self.redis = redis
-        self.pubsub = self.redis.pubsub()
+
+        # Events from other nodes reach local sockets through the router
+        self.router = RoomRouter(
+            redis,
+            deliver=self._deliver_local,
+            is_hosted=lambda room_id: room_id in self.room_participants,
+            node_id=node_id
+        )
+
+        # Receipts are written behind the send path in batches
+        self.receipts = receipts or ReceiptAggregator(redis)
+
+        # One outbound queue and writer task per connection
+        self.outbound: Dict[str, OutboundQueue] = {}
+        self.max_queue_depth = max_queue_depth
+        self.shed_queue_depth = shed_queue_depth
+        self.send_timeout = send_timeout
+        self.slow_consumer_disconnects = 0
+
+    async def start(self):
+        self.receipts.start()
+        await self.router.start()
+
+    async def shutdown(self):
+        await self.router.stop()
+        await self.receipts.stop()
+        for queue in list(self.outbound.values()):
+            await queue.close()
+        self.outbound.clear()
 
     async def connect(self, websocket: WebSocket, user_id: UUID, connection_id: str):
+        if not self.router.running:
+            await self.start()
         await websocket.accept()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = {}
         self.active_connections[user_id][connection_id] = websocket
 
+        queue = OutboundQueue(
+            websocket,
+            connection_id,
+            max_depth=self.max_queue_depth,
+            shed_depth=self.shed_queue_depth,
+            send_timeout=self.send_timeout,
+            on_close=lambda _: asyncio.ensure_future(
+                self._drop_slow_consumer(user_id, connection_id)
+            )
+        )
+        self.outbound[connection_id] = queue
+        queue.start()
+
     async def disconnect(self, user_id: UUID, connection_id: str):
+        queue = self.outbound.pop(connection_id, None)
+        if queue is not None:
+            await queue.close()
         if user_id in self.active_connections:
             self.active_connections[user_id].pop(connection_id, None)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
             await self._notify_user_offline(user_id)
 
+    def outbound_stats(self) -> Dict[str, Any]:
+        """Per-connection queue depth, lag and drop counts, with totals."""
+        connections = [queue.stats() for queue in self.outbound.values()]
+        return {
+            "connections": connections,
+            "queued": sum(stats["depth"] for stats in connections),
+            "dropped": sum(stats["dropped"] for stats in connections),
+            "lag": max((stats["lag"] for stats in connections), default=0.0),
+            "max_lag": max((stats["max_lag"] for stats in connections), default=0.0),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects
+        }
+
     async def join_room(self, room_id: UUID, user_id: UUID):
         if room_id not in self.room_participants:
             self.room_participants[room_id] = set()
@@ -57,7 +127,7 @@ class WebSocketManager:
             "timestamp": datetime.utcnow().isoformat()
         })
 
-    async def broadcast_message(self, room_id: UUID, message: ChatMessage, db: AsyncSession):
+    async def broadcast_message(self, room_id: UUID, message: ChatMessage, db: Optional[AsyncSession] = None):
         message_data = {
             "type": "new_message",
             "room_id": str(room_id),
@@ -73,7 +143,7 @@ class WebSocketManager:
         }
         
         await self._notify_room(room_id, message_data)
-        await self._store_message_receipts(message, room_id, db)
+        self.receipts.record_delivered(message.id, room_id)
 
     async def notify_typing(self, room_id: UUID, user_id: UUID, is_typing: bool):
         notification = {
@@ -91,16 +161,9 @@ class WebSocketManager:
                 "1"
             )
 
-    async def mark_messages_read(self, room_id: UUID, user_id: UUID, message_ids: list[UUID], db: AsyncSession):
+    async def mark_messages_read(self, room_id: UUID, user_id: UUID, message_ids: list[UUID], db: Optional[AsyncSession] = None):
         now = datetime.utcnow()
-        for message_id in message_ids:
-            receipt = ChatMessageReceipt(
-                message_id=message_id,
-                user_id=user_id,
-                read_at=now
-            )
-            db.add(receipt)
-        await db.commit()
+        self.receipts.record_read(user_id, message_ids, now)
 
         notification = {
             "type": "messages_read",
@@ -112,18 +175,28 @@ class WebSocketManager:
         await self._notify_room(room_id, notification)
 
     async def _notify_room(self, room_id: UUID, data: dict):
-        channel = f"chat:room:{room_id}"
-        await self.redis.publish(channel, json.dumps(data))
-        
-        if room_id in self.room_participants:
-            message = json.dumps(data)
-            for user_id in self.room_participants[room_id]:
-                if user_id in self.active_connections:
-                    for websocket in self.active_connections[user_id].values():
-                        try:
-                            await websocket.send_text(message)
-                        except Exception as e:
-                            logger.error(f"Failed to send message to user {user_id}: {e}")
+        message = json.dumps(data)
+        ephemeral = data.get("type") in EPHEMERAL_EVENTS
+        self._deliver_local(room_id, message, ephemeral)
+        await self.router.publish(room_id, message, ephemeral)
+
+    def _deliver_local(self, room_id: UUID, message: str, ephemeral: bool):
+        # Enqueue only; each connection's writer task does the sending
+        for user_id in self.room_participants.get(room_id, ()):
+            for connection_id in self.active_connections.get(user_id, ()):
+                queue = self.outbound.get(connection_id)
+                if queue is not None:
+                    queue.offer(message, ephemeral)
+
+    async def _drop_slow_consumer(self, user_id: UUID, connection_id: str):
+        websocket = self.active_connections.get(user_id, {}).get(connection_id)
+        self.slow_consumer_disconnects += 1
+        await self.disconnect(user_id, connection_id)
+        if websocket is not None:
+            try:
+                await websocket.close(code=1013, reason="Client too slow")
+            except Exception as e:
+                logger.error(f"Failed to close slow connection {connection_id}: {e}")
 
     async def _notify_user_offline(self, user_id: UUID):
         rooms = await self._get_user_rooms(user_id)
@@ -135,22 +208,6 @@ class WebSocketManager:
                 "timestamp": datetime.utcnow().isoformat()
             })
 
-    async def _store_message_receipts(self, message: ChatMessage, room_id: UUID, db: AsyncSession):
-        now = datetime.utcnow()
-        online_participants = await self.redis.smembers(f"chat:room:{room_id}:participants")
-        
-        receipts = []
-        for participant_id in online_participants:
-            receipt = ChatMessageReceipt(
-                message_id=message.id,
-                user_id=UUID(participant_id.decode()),
-                received_at=now
-            )
-            receipts.append(receipt)
-        
-        db.add_all(receipts)
-        await db.commit()
-
     async def _get_user_rooms(self, user_id: UUID) -> Set[UUID]:
         return {
             room_id 
@@ -13,7 +13,8 @@ from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy import select, update, and_, or_, func
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import IntegrityError
 import redis
 from pydantic import BaseModel, HttpUrl, Field, validator
@@ -24,6 +25,7 @@ from ..models.citation import (
     SourceType, VerificationStatus, ContentType,
     FeedbackType, MetricType
 )
+from ..models.base import execute_concurrently
 from ..core.exceptions import (
     NotFoundError, ValidationError, ConflictError,
     ServiceUnavailableError
@@ -104,13 +106,20 @@ class CitationService:
     
     def __init__(
         self,
-        db: Session,
+        db: AsyncSession,
         cache_manager: Optional[CacheManager] = None,
         postgres_mcp: Optional[PostgresMCP] = None,
-        puppeteer_mcp: Optional[PuppeteerMCP] = None
+        puppeteer_mcp: Optional[PuppeteerMCP] = None,
+        session_factory: Optional[async_sessionmaker] = None
     ):
-        """Initialize citation service with dependencies."""
+        """
+        Initialize citation service with dependencies.
+
+        ``session_factory`` lets independent read queries (search counts,
+        report aggregates) run concurrently on separate connections.
+        """
         self.db = db
+        self.session_factory = session_factory
         self.cache = cache_manager or CacheManager()
         self.postgres_mcp = postgres_mcp
         self.puppeteer_mcp = puppeteer_mcp
@@ -150,9 +159,11 @@ class CitationService:
         try:
             # Check for duplicate citations by URL
             if citation_data.url:
-                existing = self.db.query(Citation).filter(
-                    Citation.url == str(citation_data.url)
-                ).first()
+                existing = (await self.db.execute(
+                    select(Citation)
+                    .where(Citation.url == str(citation_data.url))
+                    .limit(1)
+                )).scalars().first()
                 if existing:
                     logger.info(f"Citation with URL {citation_data.url} already exists")
                     return existing
@@ -173,8 +184,8 @@ class CitationService:
             
             # Add to database
             self.db.add(citation)
-            self.db.commit()
-            self.db.refresh(citation)
+            await self.db.commit()
+            await self.db.refresh(citation)
             
             # Auto-verify if requested and URL is provided
             if auto_verify and citation.url:
@@ -192,11 +203,11 @@ class CitationService:
             return citation
             
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database integrity error creating citation: {e}")
             raise ConflictError("Citation creation failed due to data conflict")
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error creating citation: {e}")
             raise
     
@@ -226,7 +237,7 @@ class CitationService:
         
         # Query database
         query = select(Citation).where(Citation.id == citation_id)
-        citation = self.db.execute(query).scalar_one_or_none()
+        citation = (await self.db.execute(query)).scalar_one_or_none()
         
         if not citation:
             raise NotFoundError(f"Citation {citation_id} not found")
@@ -267,8 +278,8 @@ class CitationService:
         citation.updated_at = datetime.utcnow()
         
         try:
-            self.db.commit()
-            self.db.refresh(citation)
+            await self.db.commit()
+            await self.db.refresh(citation)
             
             # Invalidate cache
             cache_key = f"citation:{citation_id}"
@@ -278,7 +289,7 @@ class CitationService:
             return citation
             
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database integrity error updating citation: {e}")
             raise ValidationError("Citation update failed due to data conflict")
     
@@ -328,7 +339,7 @@ class CitationService:
             started_at=datetime.utcnow()
         )
         self.db.add(verification_log)
-        self.db.commit()
+        await self.db.commit()
         
         try:
             # Perform verification using Puppeteer MCP
@@ -372,7 +383,7 @@ class CitationService:
                 (verification_log.completed_at - verification_log.started_at).total_seconds() * 1000
             )
             
-            self.db.commit()
+            await self.db.commit()
             
             # Invalidate cache
             cache_key = f"citation:{citation_id}"
@@ -396,7 +407,7 @@ class CitationService:
             if citation.verification_attempts >= 3:
                 citation.requires_reverification = False  # Stop retrying after 3 attempts
             
-            self.db.commit()
+            await self.db.commit()
             
             logger.error(f"Failed to verify citation {citation_id}: {e}")
             raise ServiceUnavailableError(f"Verification failed: {e}")
@@ -442,14 +453,14 @@ class CitationService:
         
         try:
             self.db.add(usage)
-            self.db.commit()
-            self.db.refresh(usage)
+            await self.db.commit()
+            await self.db.refresh(usage)
             
             logger.info(f"Tracked usage of citation {citation_id} in content {content_id}")
             return usage
             
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error tracking citation usage: {e}")
             raise ConflictError("Citation usage already tracked for this position")
     
@@ -495,8 +506,8 @@ class CitationService:
         # Update citation scores based on feedback
         await self._update_citation_scores(citation_id)
         
-        self.db.commit()
-        self.db.refresh(tracking)
+        await self.db.commit()
+        await self.db.refresh(tracking)
         
         logger.info(f"Submitted accuracy feedback for citation {citation_id}")
         return tracking
@@ -509,7 +520,7 @@ class CitationService:
             citation_id: Citation ID
         """
         # Calculate average scores from feedback
-        result = self.db.execute(
+        result = (await self.db.execute(
             select(
                 func.avg(AccuracyTracking.score).filter(
                     AccuracyTracking.metric_type == MetricType.ACCURACY
@@ -521,10 +532,10 @@ class CitationService:
                     AccuracyTracking.metric_type == MetricType.AVAILABILITY
                 ).label('availability')
             ).where(AccuracyTracking.citation_id == citation_id)
-        ).first()
+        )).first()
         
         if result:
-            citation = self.db.get(Citation, citation_id)
+            citation = await self.db.get(Citation, citation_id)
             if result.accuracy is not None:
                 citation.accuracy_score = float(result.accuracy)
             if result.relevance is not None:
@@ -533,7 +544,7 @@ class CitationService:
                 citation.availability_score = float(result.availability)
             
             # Overall quality score is calculated by trigger in database
-            self.db.commit()
+            await self.db.commit()
     
     async def search_citations(
         self,
@@ -572,16 +583,20 @@ class CitationService:
             cutoff_date = datetime.utcnow() - timedelta(days=params.max_age_days)
             query = query.where(Citation.access_date >= cutoff_date)
         
-        # Get total count
+        # Total count and the requested page are independent reads
         count_query = select(func.count()).select_from(query.subquery())
-        total_count = self.db.execute(count_query).scalar()
-        
-        # Apply pagination and ordering
-        query = query.order_by(Citation.overall_quality_score.desc())
-        query = query.limit(params.limit).offset(params.offset)
+        page_query = (
+            query.order_by(Citation.overall_quality_score.desc())
+            .limit(params.limit)
+            .offset(params.offset)
+        )
         
-        # Execute query
-        results = self.db.execute(query).scalars().all()
+        total_count, results = await execute_concurrently(
+            self.db,
+            self.session_factory,
+            (count_query, Result.scalar),
+            (page_query, lambda result: result.scalars().all())
+        )
         
         return results, total_count
     
@@ -606,14 +621,14 @@ class CitationService:
         if not start_date:
             start_date = end_date - timedelta(days=30)
         
-        # Get overall system accuracy
-        overall_accuracy = self.db.execute(
+        # Overall system accuracy
+        overall_query = (
             select(func.avg(Citation.overall_quality_score))
             .where(Citation.is_active == True)
-        ).scalar() or 0.0
+        )
         
-        # Get accuracy by source type
-        accuracy_by_source = self.db.execute(
+        # Accuracy by source type
+        by_source_query = (
             select(
                 Citation.source_type,
                 func.avg(Citation.overall_quality_score).label('avg_score'),
@@ -621,20 +636,20 @@ class CitationService:
             )
             .where(Citation.is_active == True)
             .group_by(Citation.source_type)
-        ).all()
+        )
         
-        # Get verification statistics
-        verification_stats = self.db.execute(
+        # Verification statistics
+        verification_query = (
             select(
                 Citation.verification_status,
                 func.count(Citation.id).label('count')
             )
             .where(Citation.is_active == True)
             .group_by(Citation.verification_status)
-        ).all()
+        )
         
-        # Get citations needing attention (low accuracy)
-        low_accuracy_citations = self.db.execute(
+        # Citations needing attention (low accuracy)
+        low_accuracy_query = (
             select(Citation)
             .where(
                 and_(
@@ -644,10 +659,10 @@ class CitationService:
             )
             .order_by(Citation.overall_quality_score.asc())
             .limit(10)
-        ).scalars().all()
+        )
         
-        # Get feedback statistics
-        feedback_stats = self.db.execute(
+        # Feedback statistics
+        feedback_query = (
             select(
                 AccuracyTracking.feedback_type,
                 func.count(AccuracyTracking.id).label('count'),
@@ -660,7 +675,25 @@ class CitationService:
                 )
             )
             .group_by(AccuracyTracking.feedback_type)
-        ).all()
+        )
+        
+        # The five aggregates are independent, so run them concurrently
+        (
+            overall_accuracy,
+            accuracy_by_source,
+            verification_stats,
+            low_accuracy_citations,
+            feedback_stats
+        ) = await execute_concurrently(
+            self.db,
+            self.session_factory,
+            (overall_query, Result.scalar),
+            (by_source_query, Result.all),
+            (verification_query, Result.all),
+            (low_accuracy_query, lambda result: result.scalars().all()),
+            (feedback_query, Result.all)
+        )
+        overall_accuracy = overall_accuracy or 0.0
         
         report = {
             'period': {
@@ -765,5 +798,5 @@ class CitationService:
             )
         ).limit(limit)
         
-        results = self.db.execute(query).scalars().all()
+        results = (await self.db.execute(query)).scalars().all()
         return results
\ No newline at end of file
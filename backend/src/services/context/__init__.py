@@ -8,6 +8,7 @@ for handling Session, Journey, and Knowledge contexts with MCP integrations.
 from .context_manager import ContextManager
 from .layers import SessionContext, JourneyContext, KnowledgeContext
 from .token_manager import TokenBudgetManager
+from .registry import ContextManagerRegistry, context_registry
 
 __all__ = [
     "ContextManager",
@@ -15,4 +16,6 @@ __all__ = [
     "JourneyContext",
     "KnowledgeContext",
     "TokenBudgetManager",
+    "ContextManagerRegistry",
+    "context_registry",
 ]
\ No newline at end of file
@@ -12,6 +12,9 @@ import json
 import hashlib
 from enum import Enum
 
+from .vector_index import ContextVectorIndex
+from ...infrastructure.token_counter import get_token_counter
+
 
 class ContextLayerType(Enum):
     """Types of context layers in the system"""
@@ -63,6 +66,7 @@ class ContextLayerConfig:
     vector_enabled: bool = True
     cache_enabled: bool = True
     cache_ttl: int = 3600  # seconds
+    vector_index_enabled: bool = False  # In-process ANN index over entry vectors
 
 
 class BaseContextLayer(ABC):
@@ -87,6 +91,11 @@ class BaseContextLayer(ABC):
         self.current_tokens = 0
         self.last_optimization = datetime.utcnow()
         self.metadata: Dict[str, Any] = {}
+        self.vector_index: Optional[ContextVectorIndex] = (
+            ContextVectorIndex()
+            if config.vector_enabled and config.vector_index_enabled
+            else None
+        )
         
     @abstractmethod
     async def add_entry(
@@ -123,10 +132,10 @@ class BaseContextLayer(ABC):
     
     def calculate_tokens(self, text: str) -> int:
         """
-        Estimate token count for text.
-        Uses approximation: 1 token ≈ 4 characters
+        Token count for text.
+        Exact cl100k count, memoized by content hash in the shared counter
         """
-        return len(text) // 4
+        return get_token_counter().count(text)
     
     def get_total_tokens(self) -> int:
         """Get total token count across all entries"""
@@ -209,6 +218,80 @@ class BaseContextLayer(ABC):
         
         return "\n".join(formatted_parts)
     
+    def entries_by_vector_id(self) -> Dict[str, ContextEntry]:
+        """Map vector IDs to their entries for O(1) lookup of search results"""
+        return {
+            entry.vector_id: entry
+            for entry in self.entries
+            if entry.vector_id
+        }
+    
+    def index_vector(self, vector_id: Optional[str], embedding: List[float]) -> None:
+        """Add a stored entry vector to the in-process index, if enabled"""
+        if self.vector_index is not None and vector_id:
+            self.vector_index.add(vector_id, embedding)
+    
+    async def _store_vector(
+        self,
+        content: str,
+        metadata: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Store content in pgvector and the in-process vector index.
+        Used by layers that persist vectors through ``self.postgres_mcp``.
+        """
+        embedding = await self.postgres_mcp.embed_text(content)
+        vector_id = await self.postgres_mcp.store_vector(
+            content=content,
+            embedding=embedding,
+            metadata=metadata
+        )
+        self.index_vector(vector_id, embedding)
+        return vector_id
+    
+    def search_vector_index(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        threshold: float = 0.7
+    ) -> Optional[List[ContextEntry]]:
+        """
+        Answer a relevance query from the in-process vector index.
+        
+        Returns None when the index is disabled or cold, i.e. it does not
+        cover every entry with a stored vector, so callers fall back to
+        pgvector. Matched entries get their similarity as relevance score;
+        indexed vectors whose entries are gone are dropped from the index.
+        """
+        if self.vector_index is None:
+            return None
+        
+        entries = self.entries_by_vector_id()
+        if not entries or any(vector_id not in self.vector_index for vector_id in entries):
+            return None
+        
+        relevant_entries = []
+        for vector_id, score in self.vector_index.search(query_embedding, limit, threshold):
+            entry = entries.get(vector_id)
+            if entry is None:
+                self.vector_index.remove(vector_id)
+                continue
+            entry.relevance_score = score
+            relevant_entries.append(entry)
+        
+        return relevant_entries
+    
+    def _export_vector_index(self) -> Optional[Dict[str, Any]]:
+        """Snapshot of the vector index for persisting with the layer"""
+        if self.vector_index is None:
+            return None
+        return self.vector_index.to_dict()
+    
+    def _import_vector_index(self, data: Optional[Dict[str, Any]]) -> None:
+        """Restore a persisted vector index; without one the index stays cold"""
+        if self.vector_index is not None and data:
+            self.vector_index = ContextVectorIndex.from_dict(data)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get layer statistics"""
         return {
@@ -236,6 +319,8 @@ class BaseContextLayer(ABC):
         self.entries = []
         self.current_tokens = 0
         self.metadata = {}
+        if self.vector_index is not None:
+            self.vector_index = ContextVectorIndex()
     
     def export_entries(self) -> List[Dict[str, Any]]:
         """Export all entries as dictionaries"""
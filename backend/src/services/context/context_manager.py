@@ -430,7 +430,39 @@ class ContextManager:
         except Exception as e:
             logger.error(f"Error persisting context: {e}")
             return False
-    
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Snapshot of all three layers, for restoring without reloading them.
+
+        Returns:
+            JSON-serializable state dictionary
+        """
+        return {
+            "session": self.session_context.export_state(),
+            "journey": self.journey_context.export_state(),
+            "knowledge": self.knowledge_context.export_state(),
+            "metrics": self.metrics,
+            "last_update": self.last_update.isoformat()
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a snapshot produced by export_state in place of initialize().
+
+        Args:
+            state: State dictionary
+        """
+        self.session_context.import_state(state.get("session", {}))
+        self.journey_context.import_state(state.get("journey", {}))
+        self.knowledge_context.import_state(state.get("knowledge", {}))
+        self.metrics.update(state.get("metrics", {}))
+        if state.get("last_update"):
+            self.last_update = datetime.fromisoformat(state["last_update"])
+
+        self._update_token_allocations()
+        self.is_initialized = True
+
     async def clear_session(self) -> bool:
         """
         Clear session context while preserving journey and knowledge.
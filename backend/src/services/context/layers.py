@@ -170,20 +170,32 @@ class SessionContext(BaseContextLayer):
         except Exception as e:
             logger.error(f"Error optimizing session context: {e}")
     
+    def export_state(self) -> Dict[str, Any]:
+        """Serializable layer state, as persisted to Redis"""
+        return {
+            "entries": self.export_entries(),
+            "message_buffer": self.message_buffer,
+            "metadata": self.metadata,
+            "last_optimization": self.last_optimization.isoformat()
+        }
+    
+    def import_state(self, data: Dict[str, Any]) -> None:
+        """Restore layer state produced by export_state"""
+        self.import_entries(data.get("entries", []))
+        self.message_buffer = data.get("message_buffer", [])
+        self.metadata = data.get("metadata", {})
+        if data.get("last_optimization"):
+            self.last_optimization = datetime.fromisoformat(
+                data["last_optimization"]
+            )
+    
     async def persist(self) -> None:
         """Persist session context to Redis"""
         try:
             key = f"session_context:{self.user_id}:{self.session_id}"
-            data = {
-                "entries": self.export_entries(),
-                "message_buffer": self.message_buffer,
-                "metadata": self.metadata,
-                "last_optimization": self.last_optimization.isoformat()
-            }
-            
             await self.redis_mcp.set_cache(
                 key,
-                data,
+                self.export_state(),
                 expiry=int(self.config.retention_period.total_seconds())
             )
             
@@ -197,13 +209,7 @@ class SessionContext(BaseContextLayer):
             data = await self.redis_mcp.get_cache(key)
             
             if data:
-                self.import_entries(data.get("entries", []))
-                self.message_buffer = data.get("message_buffer", [])
-                self.metadata = data.get("metadata", {})
-                if data.get("last_optimization"):
-                    self.last_optimization = datetime.fromisoformat(
-                        data["last_optimization"]
-                    )
+                self.import_state(data)
                     
         except Exception as e:
             logger.error(f"Error loading session context: {e}")
@@ -228,7 +234,8 @@ class JourneyContext(BaseContextLayer):
             auto_summarize=True,
             vector_enabled=True,
             cache_enabled=True,
-            cache_ttl=1800  # 30 minutes
+            cache_ttl=1800,  # 30 minutes
+            vector_index_enabled=True
         )
         super().__init__(
             ContextLayerType.JOURNEY,
@@ -266,16 +273,15 @@ class JourneyContext(BaseContextLayer):
             
             # Generate vector if enabled
             if self.config.vector_enabled and metadata and metadata.get("important"):
-                vector_id = await self.postgres_mcp.store_vector(
-                    content=content,
-                    metadata={
+                entry.vector_id = await self._store_vector(
+                    content,
+                    {
                         "user_id": self.user_id,
                         "type": "journey",
                         "milestone": self.current_milestone,
                         **metadata
                     }
                 )
-                entry.vector_id = vector_id
             
             # Add to entries
             self.entries.append(entry)
@@ -394,6 +400,24 @@ class JourneyContext(BaseContextLayer):
         except Exception as e:
             logger.error(f"Error optimizing journey context: {e}")
     
+    def export_state(self) -> Dict[str, Any]:
+        """Serializable layer state, as persisted to the Memory Bank"""
+        return {
+            "entries": self.export_entries(),
+            "current_milestone": self.current_milestone,
+            "task_history": self.task_history,
+            "metadata": self.metadata,
+            "vector_index": self._export_vector_index()
+        }
+    
+    def import_state(self, data: Dict[str, Any]) -> None:
+        """Restore layer state produced by export_state"""
+        self.import_entries(data.get("entries", []))
+        self.current_milestone = data.get("current_milestone")
+        self.task_history = data.get("task_history", [])
+        self.metadata = data.get("metadata", {})
+        self._import_vector_index(data.get("vector_index"))
+    
     async def persist(self) -> None:
         """Persist journey context to Memory Bank and PostgreSQL"""
         try:
@@ -401,12 +425,7 @@ class JourneyContext(BaseContextLayer):
             key = f"journey_context:{self.user_id}"
             await self.memory_mcp.store_memory(
                 key=key,
-                content={
-                    "entries": self.export_entries(),
-                    "current_milestone": self.current_milestone,
-                    "task_history": self.task_history,
-                    "metadata": self.metadata
-                },
+                content=self.export_state(),
                 metadata={
                     "user_id": self.user_id,
                     "session_id": self.session_id,
@@ -417,15 +436,14 @@ class JourneyContext(BaseContextLayer):
             # Store important entries as vectors
             for entry in self.entries:
                 if entry.metadata.get("important") and not entry.vector_id:
-                    vector_id = await self.postgres_mcp.store_vector(
-                        content=entry.content,
-                        metadata={
+                    entry.vector_id = await self._store_vector(
+                        entry.content,
+                        {
                             "user_id": self.user_id,
                             "type": "journey",
                             **entry.metadata
                         }
                     )
-                    entry.vector_id = vector_id
                     
         except Exception as e:
             logger.error(f"Error persisting journey context: {e}")
@@ -439,10 +457,7 @@ class JourneyContext(BaseContextLayer):
             if data and isinstance(data, dict):
                 content = data.get("content", {})
                 if isinstance(content, dict):
-                    self.import_entries(content.get("entries", []))
-                    self.current_milestone = content.get("current_milestone")
-                    self.task_history = content.get("task_history", [])
-                    self.metadata = content.get("metadata", {})
+                    self.import_state(content)
                     
         except Exception as e:
             logger.error(f"Error loading journey context: {e}")
@@ -450,21 +465,29 @@ class JourneyContext(BaseContextLayer):
     async def _get_relevant_entries(self, query: str) -> List[ContextEntry]:
         """Get relevant entries using vector search"""
         try:
-            # Search vectors
+            query_embedding = await self.postgres_mcp.embed_text(query)
+            
+            # Answer from the in-process index when it is warm
+            relevant_entries = self.search_vector_index(query_embedding, limit=10)
+            if relevant_entries is not None:
+                return relevant_entries
+            
+            # Cold user: search vectors in pgvector
             results = await self.postgres_mcp.search_vectors(
                 query=query,
+                query_embedding=query_embedding,
                 filters={"user_id": self.user_id, "type": "journey"},
                 limit=10
             )
             
             # Map results to entries
+            entries = self.entries_by_vector_id()
             relevant_entries = []
             for result in results:
-                for entry in self.entries:
-                    if entry.vector_id == result.get("id"):
-                        entry.relevance_score = result.get("score", 0.5)
-                        relevant_entries.append(entry)
-                        break
+                entry = entries.get(result.get("id"))
+                if entry is not None:
+                    entry.relevance_score = result.get("score", 0.5)
+                    relevant_entries.append(entry)
             
             return relevant_entries
             
@@ -543,7 +566,8 @@ class KnowledgeContext(BaseContextLayer):
             auto_summarize=True,
             vector_enabled=True,
             cache_enabled=True,
-            cache_ttl=3600  # 1 hour
+            cache_ttl=3600,  # 1 hour
+            vector_index_enabled=True
         )
         super().__init__(
             ContextLayerType.KNOWLEDGE,
@@ -581,16 +605,15 @@ class KnowledgeContext(BaseContextLayer):
             
             # Always store knowledge as vectors
             if self.config.vector_enabled:
-                vector_id = await self.postgres_mcp.store_vector(
-                    content=content,
-                    metadata={
+                entry.vector_id = await self._store_vector(
+                    content,
+                    {
                         "user_id": self.user_id,
                         "type": "knowledge",
                         "category": metadata.get("category", "general"),
                         **metadata
                     }
                 )
-                entry.vector_id = vector_id
             
             # Add to entries
             self.entries.append(entry)
@@ -730,6 +753,24 @@ class KnowledgeContext(BaseContextLayer):
         except Exception as e:
             logger.error(f"Error optimizing knowledge context: {e}")
     
+    def export_state(self) -> Dict[str, Any]:
+        """Serializable layer state, as persisted to the Memory Bank"""
+        return {
+            "entries": self.export_entries(),
+            "knowledge_graph": self.knowledge_graph,
+            "user_profile": self.user_profile,
+            "metadata": self.metadata,
+            "vector_index": self._export_vector_index()
+        }
+    
+    def import_state(self, data: Dict[str, Any]) -> None:
+        """Restore layer state produced by export_state"""
+        self.import_entries(data.get("entries", []))
+        self.knowledge_graph = data.get("knowledge_graph", {})
+        self.user_profile = data.get("user_profile", {})
+        self.metadata = data.get("metadata", {})
+        self._import_vector_index(data.get("vector_index"))
+    
     async def persist(self) -> None:
         """Persist knowledge context to all storage layers"""
         try:
@@ -737,12 +778,7 @@ class KnowledgeContext(BaseContextLayer):
             key = f"knowledge_context:{self.user_id}"
             await self.memory_mcp.store_memory(
                 key=key,
-                content={
-                    "entries": self.export_entries(),
-                    "knowledge_graph": self.knowledge_graph,
-                    "user_profile": self.user_profile,
-                    "metadata": self.metadata
-                },
+                content=self.export_state(),
                 metadata={
                     "user_id": self.user_id,
                     "type": "knowledge_context",
@@ -753,15 +789,14 @@ class KnowledgeContext(BaseContextLayer):
             # Ensure all entries have vectors
             for entry in self.entries:
                 if not entry.vector_id:
-                    vector_id = await self.postgres_mcp.store_vector(
-                        content=entry.content,
-                        metadata={
+                    entry.vector_id = await self._store_vector(
+                        entry.content,
+                        {
                             "user_id": self.user_id,
                             "type": "knowledge",
                             **entry.metadata
                         }
                     )
-                    entry.vector_id = vector_id
                     
         except Exception as e:
             logger.error(f"Error persisting knowledge context: {e}")
@@ -775,10 +810,7 @@ class KnowledgeContext(BaseContextLayer):
             if data and isinstance(data, dict):
                 content = data.get("content", {})
                 if isinstance(content, dict):
-                    self.import_entries(content.get("entries", []))
-                    self.knowledge_graph = content.get("knowledge_graph", {})
-                    self.user_profile = content.get("user_profile", {})
-                    self.metadata = content.get("metadata", {})
+                    self.import_state(content)
                     
         except Exception as e:
             logger.error(f"Error loading knowledge context: {e}")
@@ -786,21 +818,27 @@ class KnowledgeContext(BaseContextLayer):
     async def _get_relevant_knowledge(self, query: str) -> List[ContextEntry]:
         """Get relevant knowledge using vector search"""
         try:
-            # Search vectors with knowledge filter
-            results = await self.postgres_mcp.search_vectors(
-                query=query,
-                filters={"user_id": self.user_id, "type": "knowledge"},
-                limit=15
-            )
-            
-            # Map results to entries
-            relevant_entries = []
-            for result in results:
-                for entry in self.entries:
-                    if entry.vector_id == result.get("id"):
+            query_embedding = await self.postgres_mcp.embed_text(query)
+            
+            # Answer from the in-process index when it is warm
+            relevant_entries = self.search_vector_index(query_embedding, limit=15)
+            if relevant_entries is None:
+                # Cold user: search vectors with knowledge filter in pgvector
+                results = await self.postgres_mcp.search_vectors(
+                    query=query,
+                    query_embedding=query_embedding,
+                    filters={"user_id": self.user_id, "type": "knowledge"},
+                    limit=15
+                )
+                
+                # Map results to entries
+                entries = self.entries_by_vector_id()
+                relevant_entries = []
+                for result in results:
+                    entry = entries.get(result.get("id"))
+                    if entry is not None:
                         entry.relevance_score = result.get("score", 0.5)
                         relevant_entries.append(entry)
-                        break
             
             # Also search Memory Bank for historical knowledge
             historical = await self.memory_mcp.search_memories(
@@ -0,0 +1,263 @@
+"""
+Context Manager Registry
+
+Bounded, per-worker registry of live ContextManager instances, one per user
+session. Managers are kept in least-recently-used order; the registry holds
+at most ``max_managers`` and drops managers untouched for ``idle_timeout``
+seconds, so memory stays flat however many sessions a worker has served.
+
+A dropped manager is retired in the background: its layers are persisted
+as usual and the whole manager is written to Redis as one compressed
+snapshot. The next request for that session restores the snapshot instead
+of running ``initialize()`` (three layer loads). Concurrent first touches of
+the same session share a single load.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+
+from .context_manager import ContextManager
+from ...infrastructure.redis.redis_mcp import RedisMCPClient, redis_mcp_client
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class _Slot:
+    manager: ContextManager
+    last_access: float
+
+
+class ContextManagerRegistry:
+    """
+    LRU + idle-timeout registry of context managers with Redis snapshots.
+
+    ``get`` returns the live manager for a session, reviving one that is
+    still being retired, joining a load already in flight, or loading it
+    from its snapshot (falling back to ``initialize()``). ``close`` retires
+    every live manager and should run on shutdown.
+    """
+
+    SNAPSHOT_PREFIX = "context_snapshot"
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisMCPClient] = None,
+        max_managers: int = 10_000,
+        idle_timeout: float = 1800.0,
+        snapshot_ttl: int = 7 * 24 * 3600,
+        sweep_interval: float = 60.0,
+        manager_factory: Callable[..., ContextManager] = ContextManager,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.redis = redis_client or redis_mcp_client
+        self.max_managers = max_managers
+        self.idle_timeout = idle_timeout
+        self.snapshot_ttl = snapshot_ttl
+        self.sweep_interval = sweep_interval
+        self.manager_factory = manager_factory
+        self.clock = clock
+
+        self._managers: "OrderedDict[str, _Slot]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._retiring: Dict[str, ContextManager] = {}
+        self._retire_tasks: Set[asyncio.Task] = set()
+        self._last_sweep = clock()
+
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "revived": 0,
+            "hydrated": 0,
+            "initialized": 0,
+            "evicted": 0,
+            "expired": 0,
+            "snapshot_errors": 0
+        }
+
+    @staticmethod
+    def session_key(user_id: str, session_id: str) -> str:
+        return f"{user_id}:{session_id}"
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._managers
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Registry size and counters, with the hit rate over all lookups."""
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            "size": len(self._managers),
+            "max_managers": self.max_managers,
+            "loading": len(self._loading),
+            "retiring": len(self._retiring),
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0.0,
+            **self.metrics
+        }
+
+    async def get(self, user_id: str, session_id: str) -> ContextManager:
+        """Return the live manager for a session, loading it at most once."""
+        now = self.clock()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        key = self.session_key(user_id, session_id)
+        slot = self._managers.get(key)
+        if slot is not None:
+            self._managers.move_to_end(key)
+            slot.last_access = now
+            self.metrics["hits"] += 1
+            return slot.manager
+
+        self.metrics["misses"] += 1
+
+        # Still being persisted after eviction: take it back as it is
+        manager = self._retiring.pop(key, None)
+        if manager is not None:
+            self.metrics["revived"] += 1
+            self._admit(key, manager)
+            return manager
+
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, user_id, session_id))
+            self._loading[key] = task
+        else:
+            self.metrics["coalesced"] += 1
+
+        # Shielded so a cancelled request doesn't abort the shared load
+        return await asyncio.shield(task)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Retire managers idle for longer than ``idle_timeout``.
+
+        Returns:
+            Number of managers retired
+        """
+        now = self.clock() if now is None else now
+        self._last_sweep = now
+
+        expired = 0
+        while self._managers:
+            key, slot = next(iter(self._managers.items()))
+            if now - slot.last_access < self.idle_timeout:
+                break
+            self._evict(key)
+            expired += 1
+
+        self.metrics["expired"] += expired
+        return expired
+
+    async def close(self) -> None:
+        """Retire every live manager and wait for all snapshots to be written."""
+        while self._managers:
+            self._evict(next(iter(self._managers)))
+        if self._retire_tasks:
+            await asyncio.gather(*self._retire_tasks, return_exceptions=True)
+
+    async def _load(self, key: str, user_id: str, session_id: str) -> ContextManager:
+        try:
+            manager = self.manager_factory(user_id=user_id, session_id=session_id)
+
+            state = await self._read_snapshot(key)
+            if state is not None:
+                manager.import_state(state)
+                self.metrics["hydrated"] += 1
+            else:
+                await manager.initialize()
+                self.metrics["initialized"] += 1
+
+            self._admit(key, manager)
+            return manager
+
+        finally:
+            self._loading.pop(key, None)
+
+    def _admit(self, key: str, manager: ContextManager) -> None:
+        self._managers[key] = _Slot(manager, self.clock())
+        while len(self._managers) > self.max_managers:
+            self._evict(next(iter(self._managers)))
+            self.metrics["evicted"] += 1
+
+    def _evict(self, key: str) -> None:
+        slot = self._managers.pop(key)
+        self._retiring[key] = slot.manager
+
+        task = asyncio.ensure_future(self._retire(key, slot.manager))
+        self._retire_tasks.add(task)
+        task.add_done_callback(self._retire_tasks.discard)
+
+    async def _retire(self, key: str, manager: ContextManager) -> None:
+        try:
+            await manager.persist_all()
+            await self._write_snapshot(key, manager)
+        except Exception as e:
+            self.metrics["snapshot_errors"] += 1
+            logger.error(f"Error retiring context manager {key}: {e}")
+        finally:
+            if self._retiring.get(key) is manager:
+                del self._retiring[key]
+
+    def _snapshot_key(self, key: str) -> str:
+        return f"{self.SNAPSHOT_PREFIX}:{key}"
+
+    async def _write_snapshot(self, key: str, manager: ContextManager) -> None:
+        await self.redis.set_bytes(
+            self._snapshot_key(key),
+            encode_snapshot(manager.export_state()),
+            expiry=self.snapshot_ttl
+        )
+
+    async def _read_snapshot(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and consume a session's snapshot.
+
+        The snapshot is deleted once read, since the manager restored from
+        it is live from then on and will write a fresh one when retired.
+        """
+        try:
+            data = await self.redis.get_bytes(self._snapshot_key(key))
+            if not data:
+                return None
+            state = decode_snapshot(data)
+            await self.redis.delete_cache(self._snapshot_key(key))
+            return state
+        except Exception as e:
+            self.metrics["snapshot_errors"] += 1
+            logger.error(f"Error reading context snapshot {key}: {e}")
+            return None
+
+
+def encode_snapshot(state: Dict[str, Any]) -> bytes:
+    """Compact JSON of a manager's state, zlib-compressed."""
+    payload = json.dumps(
+        {"version": _SNAPSHOT_VERSION, "state": state},
+        separators=(",", ":"),
+        default=str
+    )
+    return zlib.compress(payload.encode("utf-8"), 6)
+
+
+def decode_snapshot(data: bytes) -> Optional[Dict[str, Any]]:
+    """State from ``encode_snapshot``, or None for another snapshot version."""
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    if payload.get("version") != _SNAPSHOT_VERSION:
+        return None
+    return payload["state"]
+
+
+# Global registry instance
+context_registry = ContextManagerRegistry()
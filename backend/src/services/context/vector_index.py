@@ -0,0 +1,249 @@
+"""
+In-Memory Context Vector Index
+
+Per-user approximate-nearest-neighbour index over context entry embeddings,
+so relevance queries are answered in-process instead of by a pgvector round
+trip. Vectors are kept L2-normalized in one float32 matrix and scored with
+cosine similarity, matching pgvector's ``<=>`` ordering.
+
+Small indexes are searched exhaustively (exact, and faster than probing at
+that size). Once an index passes ``ivf_threshold`` live vectors it trains an
+IVF-flat partition: k-means centroids over the vectors, with each query
+scoring only the rows assigned to its ``nprobe`` nearest centroids. New
+vectors are assigned to their nearest centroid as they are added, and the
+centroids are retrained whenever the index has doubled since the last
+training.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ...infrastructure.vector_codec import as_float32, decode_vector, encode_vector
+from ...infrastructure.vector_storage import INITIAL_CAPACITY, grow_rows
+
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+class ContextVectorIndex:
+    """
+    Incremental cosine-similarity index keyed by vector ID.
+
+    Removal tombstones a row; tombstoned rows are compacted away once they
+    make up half of the matrix.
+    """
+
+    def __init__(
+        self,
+        dimensions: Optional[int] = None,
+        ivf_threshold: int = 4096,
+        nprobe: int = 8,
+        kmeans_iterations: int = 10,
+        seed: int = 0
+    ):
+        self.dimensions = dimensions
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+
+        self._ids: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.empty((0, dimensions or 0), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+
+        # IVF partition; None while the index is searched exhaustively
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._positions
+
+    @property
+    def is_partitioned(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, vector_id: str, embedding: VectorLike) -> None:
+        """Add or replace the vector for ``vector_id``"""
+        vector = self._normalize(self._check_dimensions(as_float32(embedding)))
+
+        position = self._positions.get(vector_id)
+        if position is None:
+            self._reserve(self._size + 1)
+            position = self._size
+            self._size += 1
+            self._ids.append(vector_id)
+            self._positions[vector_id] = position
+
+        self._vectors[position] = vector
+        self._alive[position] = True
+        if self._centroids is not None:
+            self._assignments[position] = int(np.argmax(self._centroids @ vector))
+
+        live = len(self._positions)
+        if live >= self.ivf_threshold and (
+            self._centroids is None or live >= 2 * self._trained_size
+        ):
+            self.train()
+
+    def remove(self, vector_id: str) -> bool:
+        """Drop ``vector_id``; returns whether it was indexed"""
+        position = self._positions.pop(vector_id, None)
+        if position is None:
+            return False
+
+        self._alive[position] = False
+        self._ids[position] = None
+        if self._size >= INITIAL_CAPACITY and len(self._positions) * 2 < self._size:
+            self._compact()
+        return True
+
+    def search(
+        self,
+        query_embedding: VectorLike,
+        limit: int = 10,
+        threshold: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """
+        Nearest vectors to the query by cosine similarity.
+
+        Returns:
+            Up to ``limit`` (vector_id, similarity) pairs at or above
+            ``threshold``, most similar first
+        """
+        if limit <= 0 or not self._positions:
+            return []
+
+        query = self._normalize(self._check_dimensions(as_float32(query_embedding)))
+        candidates = self._candidates(query)
+        if candidates.size == 0:
+            return []
+
+        scores = self._vectors[candidates] @ query
+        if limit < scores.size:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(scores.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for index in top.tolist():
+            score = float(scores[index])
+            if score < threshold:
+                break
+            results.append((self._ids[candidates[index]], score))
+        return results
+
+    def train(self) -> None:
+        """(Re)build the IVF partition over the live vectors with k-means"""
+        self._compact()
+        if self._size == 0:
+            return
+
+        vectors = self._vectors[:self._size]
+        nlist = max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(self._size, size=nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            counts = np.bincount(assignments, minlength=nlist)
+
+            # Empty lists keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = self._normalize_rows(sums[filled])
+
+        self._centroids = centroids
+        self._assignments[:self._size] = np.argmax(vectors @ centroids.T, axis=1)
+        self._trained_size = self._size
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe snapshot for persisting alongside the context layer"""
+        live = np.flatnonzero(self._alive[:self._size])
+        matrix = self._vectors[live]
+        return {
+            "dimensions": self.dimensions,
+            "ids": [self._ids[position] for position in live.tolist()],
+            "vectors": base64.b64encode(encode_vector(matrix.reshape(-1))).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **kwargs) -> "ContextVectorIndex":
+        """Restore a snapshot from ``to_dict``; the IVF partition is retrained"""
+        index = cls(dimensions=data.get("dimensions"), **kwargs)
+        ids = data.get("ids", [])
+        if not ids:
+            return index
+
+        vectors = decode_vector(base64.b64decode(data["vectors"])).reshape(len(ids), -1)
+        index._check_dimensions(vectors[0])
+        index._reserve(len(ids))
+        index._vectors[:len(ids)] = vectors
+        index._alive[:len(ids)] = True
+        index._ids = list(ids)
+        index._positions = {vector_id: position for position, vector_id in enumerate(ids)}
+        index._size = len(ids)
+
+        if index._size >= index.ivf_threshold:
+            index.train()
+        return index
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        """Row positions to score: every live row, or those in probed lists"""
+        alive = self._alive[:self._size]
+        if self._centroids is None:
+            return np.flatnonzero(alive)
+
+        nprobe = min(self.nprobe, self._centroids.shape[0])
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        return np.flatnonzero(alive & np.isin(self._assignments[:self._size], probes))
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows, keeping live rows in insertion order"""
+        live = np.flatnonzero(self._alive[:self._size])
+        if live.size == self._size:
+            return
+
+        count = live.size
+        self._vectors[:count] = self._vectors[live]
+        self._assignments[:count] = self._assignments[live]
+        self._alive[:count] = True
+        self._alive[count:] = False
+        self._ids = [self._ids[position] for position in live.tolist()]
+        self._positions = {vector_id: position for position, vector_id in enumerate(self._ids)}
+        self._size = count
+
+    def _check_dimensions(self, vector: np.ndarray) -> np.ndarray:
+        if self.dimensions is None:
+            self.dimensions = vector.size
+            self._vectors = np.empty((0, self.dimensions), dtype=np.float32)
+        elif vector.size != self.dimensions:
+            raise ValueError(
+                f"Expected a vector of {self.dimensions} dimensions, got {vector.size}"
+            )
+        return vector
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _reserve(self, size: int) -> None:
+        grown = grow_rows((self._vectors, self._alive, self._assignments), size, self._size)
+        if grown is not None:
+            self._vectors, self._alive, self._assignments = grown
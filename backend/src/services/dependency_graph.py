@@ -0,0 +1,314 @@
+"""
+Milestone Dependency Graph Index
+
+In-memory index over the milestone dependency graph holding the topological
+order, transitive prerequisite/dependent bitsets and the reverse adjacency.
+Cycle checks are a single bit test and dependency chains are walked in
+memory, so neither touches the database. The index carries a version stamp
+and serializes to a plain dict so workers can share it through Redis.
+"""
+
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass
+class DependencyEdge:
+    """A "milestone depends on dependency" edge."""
+    milestone_id: str
+    dependency_id: str
+    is_required: bool = True
+    minimum_completion: float = 100.0
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits in ``bits``."""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class DependencyGraphIndex:
+    """
+    Versioned transitive-closure index of the milestone dependency graph.
+
+    Every milestone gets a bit position. ``_prerequisites[i]`` has a bit set
+    for every milestone that milestone ``i`` transitively depends on, and
+    ``_dependents[i]`` for every milestone that transitively depends on it.
+    Adding an edge updates both closures incrementally; removing one
+    recomputes them, since a closure cannot be decremented cheaply.
+    """
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self.labels: Dict[str, Tuple[str, str]] = {}
+        self.dependencies: Dict[str, Dict[str, DependencyEdge]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self._nodes: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._prerequisites: List[int] = []
+        self._dependents: List[int] = []
+        self._order: Optional[List[str]] = None
+        self._cycles: Optional[List[List[str]]] = None
+
+    @classmethod
+    def build(
+        cls,
+        edges: Iterable[DependencyEdge],
+        labels: Optional[Dict[str, Tuple[str, str]]] = None,
+        version: int = 0
+    ) -> "DependencyGraphIndex":
+        """Build an index from the full edge list."""
+        index = cls(version)
+        index.labels.update(labels or {})
+        for edge in edges:
+            index._link(edge)
+        index._recompute_closure()
+        return index
+
+    # Queries
+
+    def would_create_cycle(self, milestone_id: str, dependency_id: str) -> bool:
+        """Whether making ``milestone_id`` depend on ``dependency_id`` closes a cycle."""
+        if milestone_id == dependency_id:
+            return True
+        if milestone_id not in self._positions or dependency_id not in self._positions:
+            return False
+        position = self._positions[milestone_id]
+        return bool(self._prerequisites[self._positions[dependency_id]] >> position & 1)
+
+    def prerequisites(self, milestone_id: str) -> Set[str]:
+        """All milestones ``milestone_id`` transitively depends on."""
+        if milestone_id not in self._positions:
+            return set()
+        bits = self._prerequisites[self._positions[milestone_id]]
+        return {self._nodes[i] for i in _iter_bits(bits)}
+
+    def dependents_of(self, milestone_id: str) -> Set[str]:
+        """All milestones that transitively depend on ``milestone_id``."""
+        if milestone_id not in self._positions:
+            return set()
+        bits = self._dependents[self._positions[milestone_id]]
+        return {self._nodes[i] for i in _iter_bits(bits)}
+
+    def topological_order(self) -> List[str]:
+        """Milestones ordered so that dependencies come first (cycles omitted)."""
+        if self._order is None:
+            self._order = self._kahn_order()
+        return list(self._order)
+
+    def find_cycles(self) -> List[List[str]]:
+        """Circular dependency chains, following dependency -> dependent edges."""
+        if self._cycles is None:
+            if len(self.topological_order()) == len(self._nodes):
+                self._cycles = []
+            else:
+                self._cycles = self._dfs_cycles()
+        return [list(cycle) for cycle in self._cycles]
+
+    def chain(
+        self,
+        milestone_id: str,
+        include_optional: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Milestones that must be completed before ``milestone_id``.
+
+        ``level`` is the distance from ``milestone_id`` (0 for direct
+        dependencies). Each milestone appears once, at its shortest distance.
+        """
+        chain = []
+        visited = {milestone_id}
+        queue = deque([(milestone_id, 0)])
+
+        while queue:
+            current, level = queue.popleft()
+            for dependency_id, edge in self.dependencies.get(current, {}).items():
+                if not include_optional and not edge.is_required:
+                    continue
+                if dependency_id in visited:
+                    continue
+                visited.add(dependency_id)
+
+                label = self.labels.get(dependency_id)
+                if label:
+                    code, name = label
+                    chain.append({
+                        "milestone_id": dependency_id,
+                        "milestone_code": code,
+                        "milestone_name": name,
+                        "level": level,
+                        "is_required": edge.is_required,
+                        "minimum_completion": edge.minimum_completion
+                    })
+                queue.append((dependency_id, level + 1))
+
+        chain.sort(key=lambda x: (x["level"], x["milestone_code"]))
+        return chain
+
+    # Mutations
+
+    def add_edge(
+        self,
+        edge: DependencyEdge,
+        label: Optional[Tuple[str, str]] = None
+    ) -> None:
+        """
+        Add an edge and extend both closures incrementally.
+
+        Callers must reject edges for which ``would_create_cycle`` is true.
+        """
+        if label:
+            self.labels[edge.dependency_id] = label
+        self._link(edge)
+
+        milestone = self._positions[edge.milestone_id]
+        dependency = self._positions[edge.dependency_id]
+        prerequisites = (1 << dependency) | self._prerequisites[dependency]
+        affected = (1 << milestone) | self._dependents[milestone]
+
+        for position in _iter_bits(affected):
+            self._prerequisites[position] |= prerequisites
+        for position in _iter_bits(prerequisites):
+            self._dependents[position] |= affected
+
+        self._order = None
+        self._cycles = None
+
+    def remove_edge(self, milestone_id: str, dependency_id: str) -> None:
+        """Remove an edge and recompute the closures."""
+        self.dependencies.get(milestone_id, {}).pop(dependency_id, None)
+        self.dependents.get(dependency_id, set()).discard(milestone_id)
+        self._recompute_closure()
+
+    # Serialization
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index, closures included, for sharing through Redis."""
+        return {
+            "version": self.version,
+            "nodes": self._nodes,
+            "labels": {mid: list(label) for mid, label in self.labels.items()},
+            "edges": [
+                asdict(edge)
+                for edges in self.dependencies.values()
+                for edge in edges.values()
+            ],
+            "prerequisites": [format(bits, "x") for bits in self._prerequisites],
+            "dependents": [format(bits, "x") for bits in self._dependents],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DependencyGraphIndex":
+        """Restore an index produced by ``to_dict`` without recomputing it."""
+        index = cls(data.get("version", 0))
+        index.labels = {mid: tuple(label) for mid, label in data.get("labels", {}).items()}
+        for node in data.get("nodes", []):
+            index._position(node)
+        for edge in data.get("edges", []):
+            index._link(DependencyEdge(**edge))
+        index._prerequisites = [int(bits, 16) for bits in data.get("prerequisites", [])]
+        index._dependents = [int(bits, 16) for bits in data.get("dependents", [])]
+        return index
+
+    # Internals
+
+    def _position(self, milestone_id: str) -> int:
+        position = self._positions.get(milestone_id)
+        if position is None:
+            position = len(self._nodes)
+            self._positions[milestone_id] = position
+            self._nodes.append(milestone_id)
+            self._prerequisites.append(0)
+            self._dependents.append(0)
+        return position
+
+    def _link(self, edge: DependencyEdge) -> None:
+        self._position(edge.milestone_id)
+        self._position(edge.dependency_id)
+        self.dependencies.setdefault(edge.milestone_id, {})[edge.dependency_id] = edge
+        self.dependents.setdefault(edge.dependency_id, set()).add(edge.milestone_id)
+
+    def _kahn_order(self) -> List[str]:
+        remaining = {
+            node: len(self.dependencies.get(node, {}))
+            for node in self._nodes
+        }
+        queue = deque(node for node, count in remaining.items() if count == 0)
+        order = []
+
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in self.dependents.get(node, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+
+        return order
+
+    def _recompute_closure(self) -> None:
+        order = self._kahn_order()
+        prerequisites = [0] * len(self._nodes)
+
+        def closure_of(node: str) -> int:
+            bits = 0
+            for dependency_id in self.dependencies.get(node, {}):
+                position = self._positions[dependency_id]
+                bits |= (1 << position) | prerequisites[position]
+            return bits
+
+        for node in order:
+            prerequisites[self._positions[node]] = closure_of(node)
+
+        # Nodes on or behind a cycle never leave Kahn's queue; iterate
+        # their closures to a fixed point instead.
+        ordered = set(order)
+        cyclic = [node for node in self._nodes if node not in ordered]
+        changed = bool(cyclic)
+        while changed:
+            changed = False
+            for node in cyclic:
+                position = self._positions[node]
+                bits = closure_of(node)
+                if bits != prerequisites[position]:
+                    prerequisites[position] = bits
+                    changed = True
+
+        dependents = [0] * len(self._nodes)
+        for position, bits in enumerate(prerequisites):
+            for prerequisite in _iter_bits(bits):
+                dependents[prerequisite] |= 1 << position
+
+        self._prerequisites = prerequisites
+        self._dependents = dependents
+        self._order = order
+        self._cycles = None
+
+    def _dfs_cycles(self) -> List[List[str]]:
+        visited = set()
+        rec_stack = set()
+        cycles = []
+
+        def dfs(node: str, path: List[str]) -> None:
+            visited.add(node)
+            rec_stack.add(node)
+            path.append(node)
+
+            for neighbor in self.dependents.get(node, ()):
+                if neighbor not in visited:
+                    dfs(neighbor, path.copy())
+                elif neighbor in rec_stack:
+                    cycle_start = path.index(neighbor)
+                    cycles.append(path[cycle_start:] + [neighbor])
+
+            path.pop()
+            rec_stack.remove(node)
+
+        for node in self._nodes:
+            if node not in visited:
+                dfs(node, [])
+
+        return cycles
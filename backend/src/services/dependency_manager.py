@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from uuid import UUID
 import asyncio
 from collections import deque, defaultdict
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 import logging
@@ -26,7 +27,9 @@ from ..models.milestone import (
 )
 from ..models.user import User, SubscriptionTier
 from .milestone_cache import MilestoneCacheService
+from .dependency_graph import DependencyEdge, DependencyGraphIndex
 from ..infrastructure.redis.redis_mcp import RedisMCPClient
+from ..infrastructure.cache.invalidation_bus import CacheInvalidation, CacheInvalidationBus
 from ..core.exceptions import (
     CircularDependencyError,
     DependencyValidationError,
@@ -35,6 +38,24 @@ from ..core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+GRAPH_INDEX_KEY = "dep_graph:index"
+GRAPH_VERSION_KEY = "dep_graph:version"
+GRAPH_INDEX_TTL = 86400
+
+# Store the graph snapshot only while the version stamp still equals the
+# version it was built from, so a slow rebuild cannot replace a newer one.
+#
+# KEYS = version stamp, snapshot
+# ARGV = version, snapshot JSON, TTL in seconds
+# Returns 1 if the snapshot was stored
+STORE_GRAPH_INDEX_SCRIPT = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
 
 class DependencyType(str, Enum):
     """Types of milestone dependencies"""
@@ -52,25 +73,46 @@ class DependencyCondition(str, Enum):
     FEATURE_FLAG = "feature_flag"  # Feature flag based
 
 
+@dataclass
+class _DependencySnapshot:
+    """
+    A user's dependency state loaded in a fixed number of queries so that
+    unlock status for many milestones can be evaluated in memory.
+    """
+    dependencies: Dict[str, List[MilestoneDependency]] = field(default_factory=dict)
+    progress: Dict[str, UserMilestone] = field(default_factory=dict)
+    metadata: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    user_tier: Optional[str] = None
+
+
 class DependencyManager:
     """
     Manages all milestone dependency operations including validation,
     resolution, and auto-unlocking with efficient caching strategies.
     """
     
+    # Invalidation bus namespace for validation results
+    INVALIDATION_NAMESPACE = "dep_validation"
+    
     def __init__(
         self,
         db_session: AsyncSession,
         cache_service: MilestoneCacheService,
-        redis_client: Optional[RedisMCPClient] = None
+        redis_client: Optional[RedisMCPClient] = None,
+        invalidation_bus: Optional[CacheInvalidationBus] = None
     ):
         """Initialize the dependency manager."""
         self.db = db_session
         self.cache_service = cache_service
-        self.redis = redis_client or RedisMCPClient()
-        self._dependency_graph_cache = {}
+        self.redis = redis_client or RedisMCPClient(async_mode=True)
+        self._graph_index: Optional[DependencyGraphIndex] = None
         self._validation_cache = {}
         
+        # Validation results invalidated in other processes are dropped here too
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.register(self.INVALIDATION_NAMESPACE, self._apply_invalidation)
+        
     # Core Dependency Operations
     
     async def add_dependency(
@@ -142,6 +184,18 @@ class DependencyManager:
             self.db.add(new_dependency)
             await self.db.commit()
             
+            await self._apply_graph_change(
+                lambda index: index.add_edge(
+                    DependencyEdge(
+                        milestone_id=milestone_id,
+                        dependency_id=dependency_id,
+                        is_required=is_required,
+                        minimum_completion=minimum_completion
+                    ),
+                    label=(dependency.code, dependency.name)
+                )
+            )
+            
             # Invalidate caches
             await self._invalidate_dependency_caches(milestone_id)
             
@@ -187,6 +241,10 @@ class DependencyManager:
             await self.db.delete(dependency)
             await self.db.commit()
             
+            await self._apply_graph_change(
+                lambda index: index.remove_edge(milestone_id, dependency_id)
+            )
+            
             # Clear dependency metadata
             await self._clear_dependency_metadata(milestone_id, dependency_id)
             
@@ -224,50 +282,50 @@ class DependencyManager:
             if cached["expires"] > datetime.utcnow():
                 return cached["result"]
         
-        # Get all dependencies for the milestone
-        dependencies = await self._get_milestone_dependencies(milestone_id)
-        
-        if not dependencies:
-            result = (True, [])
-            self._cache_validation_result(cache_key, result)
-            return result
+        validations = await self._validate_from_snapshot(
+            user_id,
+            [milestone_id],
+            check_conditions
+        )
+        return validations[milestone_id]
+    
+    async def bulk_validate_dependencies(
+        self,
+        user_id: str,
+        milestone_ids: Optional[List[str]] = None,
+        check_conditions: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate dependencies for many milestones at once.
         
-        unmet = []
+        The user's progress map, every relevant dependency row and their
+        metadata are loaded up front, so the number of queries does not
+        grow with the number of milestones or dependency edges.
         
-        for dep in dependencies:
-            # Get dependency metadata
-            metadata = await self._get_dependency_metadata(
-                milestone_id,
-                str(dep.dependency_id)
-            )
-            
-            # Check if dependency is met
-            is_met = await self._check_single_dependency(
-                user_id,
-                dep,
-                metadata,
-                check_conditions
-            )
+        Args:
+            user_id: User whose progress is checked
+            milestone_ids: Milestones to validate (defaults to all active ones)
+            check_conditions: Whether to evaluate conditional dependencies
             
-            if not is_met:
-                dep_milestone = await self._get_milestone(str(dep.dependency_id))
-                unmet.append({
-                    "milestone_id": str(dep.dependency_id),
-                    "milestone_code": dep_milestone.code if dep_milestone else "Unknown",
-                    "milestone_name": dep_milestone.name if dep_milestone else "Unknown",
-                    "is_required": dep.is_required,
-                    "minimum_completion": dep.minimum_completion_percentage,
-                    "type": metadata.get("type", DependencyType.REQUIRED) if metadata else DependencyType.REQUIRED
-                })
+        Returns:
+            Mapping of milestone ID to ``{"all_met", "unmet_dependencies"}``
+        """
+        if milestone_ids is None:
+            milestone_ids = await self._get_all_milestone_ids()
         
-        # Filter out optional dependencies if there are required ones unmet
-        required_unmet = [d for d in unmet if d["is_required"]]
-        if required_unmet:
-            unmet = required_unmet
+        validations = await self._validate_from_snapshot(
+            user_id,
+            milestone_ids,
+            check_conditions
+        )
         
-        result = (len(unmet) == 0, unmet)
-        self._cache_validation_result(cache_key, result)
-        return result
+        return {
+            milestone_id: {
+                "all_met": all_met,
+                "unmet_dependencies": unmet
+            }
+            for milestone_id, (all_met, unmet) in validations.items()
+        }
     
     async def check_circular_dependencies(self) -> List[List[str]]:
         """
@@ -276,37 +334,8 @@ class DependencyManager:
         Returns:
             List of circular dependency chains found
         """
-        # Build the full dependency graph
-        graph = await self._build_dependency_graph()
-        
-        # Use DFS to detect cycles
-        visited = set()
-        rec_stack = set()
-        cycles = []
-        
-        def dfs(node: str, path: List[str]) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor, path.copy())
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:] + [neighbor]
-                    cycles.append(cycle)
-            
-            path.pop()
-            rec_stack.remove(node)
-        
-        # Check from each unvisited node
-        for node in graph:
-            if node not in visited:
-                dfs(node, [])
-        
-        return cycles
+        index = await self._get_graph_index()
+        return index.find_cycles()
     
     async def get_dependency_chain(
         self,
@@ -319,43 +348,8 @@ class DependencyManager:
         Returns:
             Ordered list of milestones that must be completed
         """
-        chain = []
-        visited = set()
-        
-        async def build_chain(mid: str, level: int = 0):
-            if mid in visited:
-                return
-            visited.add(mid)
-            
-            dependencies = await self._get_milestone_dependencies(mid)
-            
-            for dep in dependencies:
-                if not include_optional and not dep.is_required:
-                    continue
-                
-                dep_milestone = await self._get_milestone(str(dep.dependency_id))
-                if dep_milestone:
-                    chain_entry = {
-                        "milestone_id": str(dep.dependency_id),
-                        "milestone_code": dep_milestone.code,
-                        "milestone_name": dep_milestone.name,
-                        "level": level,
-                        "is_required": dep.is_required,
-                        "minimum_completion": dep.minimum_completion_percentage
-                    }
-                    
-                    if chain_entry not in chain:
-                        chain.append(chain_entry)
-                    
-                    # Recursively get dependencies of dependencies
-                    await build_chain(str(dep.dependency_id), level + 1)
-        
-        await build_chain(milestone_id)
-        
-        # Sort by level (depth in dependency tree)
-        chain.sort(key=lambda x: (x["level"], x["milestone_code"]))
-        
-        return chain
+        index = await self._get_graph_index()
+        return index.chain(milestone_id, include_optional)
     
     # Auto-unlock Operations
     
@@ -380,27 +374,36 @@ class DependencyManager:
         )
         
         result = await self.db.execute(stmt)
-        dependent_dependencies = result.scalars().all()
         
-        for dep in dependent_dependencies:
-            milestone = dep.milestone
-            
-            # Skip if milestone is not configured for auto-unlock
-            if not milestone.auto_unlock:
-                continue
-            
+        # Skip milestones that are not configured for auto-unlock
+        dependents = {
+            str(dep.milestone_id): dep.milestone
+            for dep in result.scalars().all()
+            if dep.milestone.auto_unlock
+        }
+        
+        if not dependents:
+            return newly_unlocked
+        
+        # One snapshot of the user's progress covers every dependent milestone
+        snapshot = await self._load_dependency_snapshot(
+            user_id,
+            list(dependents),
+            check_conditions=True
+        )
+        
+        for milestone_id, milestone in dependents.items():
             # Check if all dependencies are now met
-            all_met, _ = await self.validate_dependencies(
+            all_met, _ = await self._evaluate_dependencies(
                 user_id,
-                str(milestone.id)
+                milestone_id,
+                snapshot,
+                check_conditions=True
             )
             
             if all_met:
                 # Check if user milestone exists
-                user_milestone = await self._get_user_milestone(
-                    user_id,
-                    str(milestone.id)
-                )
+                user_milestone = snapshot.progress.get(milestone_id)
                 
                 if user_milestone:
                     if user_milestone.status == MilestoneStatus.LOCKED:
@@ -447,6 +450,7 @@ class DependencyManager:
             
             # Invalidate user's cache
             await self.cache_service.invalidate_user_cache(user_id)
+            self._invalidate_validations(user_id=user_id)
             
             # Publish unlock events
             for unlocked in newly_unlocked:
@@ -534,17 +538,18 @@ class DependencyManager:
         
         # Find longest dependency chain
         all_milestones = await self._get_all_milestone_ids()
+        index = await self._get_graph_index()
         max_chain_length = 0
         
         for milestone_id in all_milestones:
-            chain = await self.get_dependency_chain(milestone_id, include_optional=False)
+            chain = index.chain(milestone_id, include_optional=False)
             chain_length = max([d["level"] for d in chain], default=0) + 1
             max_chain_length = max(max_chain_length, chain_length)
         
         stats["max_dependency_chain_length"] = max_chain_length
         
         # Check for circular dependencies
-        cycles = await self.check_circular_dependencies()
+        cycles = index.find_cycles()
         if cycles:
             stats["circular_dependencies_found"] = [
                 [await self._get_milestone_code(mid) for mid in cycle]
@@ -691,70 +696,243 @@ class DependencyManager:
         dependency_id: str
     ) -> bool:
         """Check if adding a dependency would create a cycle."""
-        # Build current graph
-        graph = await self._build_dependency_graph()
+        index = await self._get_graph_index()
+        return index.would_create_cycle(milestone_id, dependency_id)
+    
+    async def _get_graph_index(self) -> DependencyGraphIndex:
+        """
+        Get the dependency graph index, refreshing it if another worker changed it.
         
-        # Add the proposed edge
-        if milestone_id not in graph:
-            graph[milestone_id] = []
-        graph[milestone_id].append(dependency_id)
+        The version stamp in Redis is checked on every call; the shared
+        snapshot is only fetched (or rebuilt from the database) when the
+        local copy is behind. If the stamp cannot be read, neither copy can
+        be trusted, so the index is built from the database and not cached.
+        """
+        version = await self._get_graph_version()
+        if version is None:
+            self._graph_index = None
+            return await self._load_graph_index(0)
         
-        # Check for cycle using DFS
-        visited = set()
-        rec_stack = set()
+        if self._graph_index is not None and self._graph_index.version == version:
+            return self._graph_index
         
-        def has_cycle(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    if has_cycle(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            
-            rec_stack.remove(node)
-            return False
+        snapshot = await self.redis.get_cache(GRAPH_INDEX_KEY)
+        if snapshot and snapshot.get("version") == version:
+            self._graph_index = DependencyGraphIndex.from_dict(snapshot)
+            return self._graph_index
         
-        # Start from the dependency_id to see if we can reach milestone_id
-        return has_cycle(dependency_id) if dependency_id in graph else False
+        self._graph_index = await self._load_graph_index(version)
+        await self._store_graph_index(self._graph_index)
+        return self._graph_index
     
-    async def _build_dependency_graph(self) -> Dict[str, List[str]]:
-        """Build the complete dependency graph."""
-        if self._dependency_graph_cache:
-            cache_age = self._dependency_graph_cache.get("timestamp", datetime.min)
-            if datetime.utcnow() - cache_age < timedelta(minutes=5):
-                return self._dependency_graph_cache.get("graph", {})
-        
-        stmt = select(MilestoneDependency)
+    async def _get_graph_version(self) -> Optional[int]:
+        """Get the shared graph version stamp, or None if Redis failed."""
+        try:
+            return int(await self.redis.execute("get", GRAPH_VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Error reading dependency graph version: {e}")
+            return None
+    
+    async def _store_graph_index(self, index: DependencyGraphIndex) -> bool:
+        """Share ``index`` unless the graph changed since it was built."""
+        try:
+            return bool(await self.redis.execute(
+                "eval",
+                STORE_GRAPH_INDEX_SCRIPT,
+                2,
+                GRAPH_VERSION_KEY,
+                GRAPH_INDEX_KEY,
+                index.version,
+                json.dumps(index.to_dict()),
+                GRAPH_INDEX_TTL
+            ))
+        except Exception as e:
+            logger.warning(f"Error storing dependency graph index: {e}")
+            return False
+    
+    async def _load_graph_index(self, version: int) -> DependencyGraphIndex:
+        """Build the graph index from the database in a single query."""
+        stmt = (
+            select(MilestoneDependency)
+            .options(joinedload(MilestoneDependency.dependency))
+        )
         result = await self.db.execute(stmt)
         dependencies = result.scalars().all()
         
-        graph = defaultdict(list)
+        edges = []
+        labels = {}
         for dep in dependencies:
-            graph[str(dep.dependency_id)].append(str(dep.milestone_id))
+            edges.append(DependencyEdge(
+                milestone_id=str(dep.milestone_id),
+                dependency_id=str(dep.dependency_id),
+                is_required=dep.is_required,
+                minimum_completion=dep.minimum_completion_percentage
+            ))
+            if dep.dependency is not None:
+                labels[str(dep.dependency_id)] = (dep.dependency.code, dep.dependency.name)
         
-        self._dependency_graph_cache = {
-            "graph": dict(graph),
-            "timestamp": datetime.utcnow()
+        return DependencyGraphIndex.build(edges, labels, version)
+    
+    async def _apply_graph_change(self, change) -> None:
+        """
+        Apply a committed edge change to the local index and publish it.
+        
+        Bumps the shared version stamp. If the bump shows that another
+        worker changed the graph concurrently, the local index is dropped
+        and rebuilt on next use instead of being patched.
+        """
+        try:
+            version = int(await self.redis.execute("incr", GRAPH_VERSION_KEY))
+        except Exception as e:
+            logger.warning(f"Error bumping dependency graph version: {e}")
+            self._graph_index = None
+            return
+        
+        index = self._graph_index
+        if index is None or index.version != version - 1:
+            self._graph_index = None
+            return
+        
+        change(index)
+        index.version = version
+        await self._store_graph_index(index)
+    
+    async def _validate_from_snapshot(
+        self,
+        user_id: str,
+        milestone_ids: List[str],
+        check_conditions: bool
+    ) -> Dict[str, Tuple[bool, List[Dict[str, Any]]]]:
+        """Validate milestones against a single snapshot and cache the results."""
+        snapshot = await self._load_dependency_snapshot(
+            user_id,
+            milestone_ids,
+            check_conditions
+        )
+        
+        results = {}
+        for milestone_id in milestone_ids:
+            result = await self._evaluate_dependencies(
+                user_id,
+                milestone_id,
+                snapshot,
+                check_conditions
+            )
+            self._cache_validation_result(
+                f"dep_validation:{user_id}:{milestone_id}",
+                result
+            )
+            results[milestone_id] = result
+        
+        return results
+    
+    async def _load_dependency_snapshot(
+        self,
+        user_id: str,
+        milestone_ids: List[str],
+        check_conditions: bool
+    ) -> _DependencySnapshot:
+        """
+        Load dependency rows, user progress and metadata for many milestones.
+        
+        Uses one query for the dependency rows (with the dependency milestone
+        joined in), one for the user's progress and a single Redis MGET for
+        metadata; the user's tier is only fetched when a conditional
+        dependency asks for it.
+        """
+        snapshot = _DependencySnapshot()
+        if not milestone_ids:
+            return snapshot
+        
+        stmt = (
+            select(MilestoneDependency)
+            .options(joinedload(MilestoneDependency.dependency))
+            .where(MilestoneDependency.milestone_id.in_(
+                [UUID(milestone_id) for milestone_id in set(milestone_ids)]
+            ))
+        )
+        result = await self.db.execute(stmt)
+        for dep in result.scalars().all():
+            snapshot.dependencies.setdefault(str(dep.milestone_id), []).append(dep)
+        
+        # Milestones without dependencies need no progress lookups
+        if not snapshot.dependencies:
+            return snapshot
+        
+        stmt = select(UserMilestone).where(UserMilestone.user_id == UUID(user_id))
+        result = await self.db.execute(stmt)
+        snapshot.progress = {
+            str(user_milestone.milestone_id): user_milestone
+            for user_milestone in result.scalars().all()
         }
         
-        return dict(graph)
+        snapshot.metadata = await self._get_dependency_metadata_bulk([
+            (milestone_id, str(dep.dependency_id))
+            for milestone_id, deps in snapshot.dependencies.items()
+            for dep in deps
+        ])
+        
+        needs_tier = any(
+            DependencyCondition.USER_TIER in metadata.get("conditions", {})
+            for metadata in snapshot.metadata.values()
+            if metadata.get("type") == DependencyType.CONDITIONAL
+        )
+        if check_conditions and needs_tier:
+            snapshot.user_tier = await self._get_user_tier(user_id)
+        
+        return snapshot
+    
+    async def _evaluate_dependencies(
+        self,
+        user_id: str,
+        milestone_id: str,
+        snapshot: _DependencySnapshot,
+        check_conditions: bool
+    ) -> Tuple[bool, List[Dict[str, Any]]]:
+        """Evaluate a milestone's dependencies against a loaded snapshot."""
+        unmet = []
+        
+        for dep in snapshot.dependencies.get(milestone_id, []):
+            metadata = snapshot.metadata.get((milestone_id, str(dep.dependency_id)))
+            
+            # Check if dependency is met
+            is_met = await self._check_single_dependency(
+                user_id,
+                dep,
+                metadata,
+                check_conditions,
+                snapshot
+            )
+            
+            if not is_met:
+                dep_milestone = dep.dependency
+                unmet.append({
+                    "milestone_id": str(dep.dependency_id),
+                    "milestone_code": dep_milestone.code if dep_milestone else "Unknown",
+                    "milestone_name": dep_milestone.name if dep_milestone else "Unknown",
+                    "is_required": dep.is_required,
+                    "minimum_completion": dep.minimum_completion_percentage,
+                    "type": metadata.get("type", DependencyType.REQUIRED) if metadata else DependencyType.REQUIRED
+                })
+        
+        # Filter out optional dependencies if there are required ones unmet
+        required_unmet = [d for d in unmet if d["is_required"]]
+        if required_unmet:
+            unmet = required_unmet
+        
+        return len(unmet) == 0, unmet
     
     async def _check_single_dependency(
         self,
         user_id: str,
         dependency: MilestoneDependency,
         metadata: Optional[Dict[str, Any]],
-        check_conditions: bool
+        check_conditions: bool,
+        snapshot: _DependencySnapshot
     ) -> bool:
         """Check if a single dependency is met."""
         # Get user's progress on the dependency
-        user_milestone = await self._get_user_milestone(
-            user_id,
-            str(dependency.dependency_id)
-        )
+        user_milestone = snapshot.progress.get(str(dependency.dependency_id))
         
         if not user_milestone:
             return False
@@ -769,7 +947,11 @@ class DependencyManager:
             
             if dep_type == DependencyType.CONDITIONAL:
                 conditions = metadata.get("conditions", {})
-                evaluation = await self._evaluate_conditions(user_id, conditions)
+                evaluation = await self._evaluate_conditions(
+                    user_id,
+                    conditions,
+                    snapshot
+                )
                 if not evaluation.get("all_conditions_met", False):
                     return False
             elif dep_type == DependencyType.OPTIONAL:
@@ -781,17 +963,24 @@ class DependencyManager:
     async def _evaluate_conditions(
         self,
         user_id: str,
-        conditions: Dict[str, Any]
+        conditions: Dict[str, Any],
+        snapshot: Optional[_DependencySnapshot] = None
     ) -> Dict[str, Any]:
-        """Evaluate conditional dependency requirements."""
+        """
+        Evaluate conditional dependency requirements.
+        
+        When a snapshot is given, tier and progress are read from it instead
+        of being queried per condition.
+        """
         results = {}
         
         for condition_type, condition_value in conditions.items():
             if condition_type == DependencyCondition.USER_TIER:
                 # Check user's subscription tier
-                stmt = select(User.subscription_tier).where(User.id == UUID(user_id))
-                result = await self.db.execute(stmt)
-                user_tier = result.scalar_one_or_none()
+                if snapshot:
+                    user_tier = snapshot.user_tier
+                else:
+                    user_tier = await self._get_user_tier(user_id)
                 
                 results[condition_type] = {
                     "required": condition_value,
@@ -805,10 +994,13 @@ class DependencyManager:
                 milestone_id = condition_value.get("milestone_id")
                 
                 if milestone_id:
-                    user_milestone = await self._get_user_milestone(
-                        user_id,
-                        milestone_id
-                    )
+                    if snapshot:
+                        user_milestone = snapshot.progress.get(milestone_id)
+                    else:
+                        user_milestone = await self._get_user_milestone(
+                            user_id,
+                            milestone_id
+                        )
                     actual_score = user_milestone.quality_score if user_milestone else 0
                     results[condition_type] = {
                         "required": min_score,
@@ -843,6 +1035,12 @@ class DependencyManager:
             "all_conditions_met": all(r.get("met", False) for r in results.values())
         }
     
+    async def _get_user_tier(self, user_id: str) -> Optional[str]:
+        """Get a user's subscription tier."""
+        stmt = select(User.subscription_tier).where(User.id == UUID(user_id))
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     async def _store_dependency_metadata(
         self,
         milestone_id: str,
@@ -867,6 +1065,34 @@ class DependencyManager:
         cached = await self.redis.get_cache(cache_key)
         return json.loads(cached) if cached else None
     
+    async def _get_dependency_metadata_bulk(
+        self,
+        edges: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Retrieve metadata for many (milestone, dependency) edges in one MGET."""
+        if not edges:
+            return {}
+        
+        keys = [
+            f"dep_meta:{milestone_id}:{dependency_id}"
+            for milestone_id, dependency_id in edges
+        ]
+        try:
+            values = await self.redis.execute("mget", keys)
+        except Exception as e:
+            logger.warning(f"Error loading dependency metadata: {e}")
+            return {}
+        
+        metadata = {}
+        for edge, raw in zip(edges, values or []):
+            if not raw:
+                continue
+            # set_cache JSON-encodes the already serialized metadata
+            value = json.loads(raw)
+            metadata[edge] = json.loads(value) if isinstance(value, str) else value
+        
+        return metadata
+    
     async def _clear_dependency_metadata(
         self,
         milestone_id: str,
@@ -879,17 +1105,57 @@ class DependencyManager:
     async def _invalidate_dependency_caches(self, milestone_id: str) -> None:
         """Invalidate all caches related to a milestone's dependencies."""
         # Clear validation cache for all users
-        pattern = f"dep_validation:*:{milestone_id}"
+        self._invalidate_validations(milestone_id=milestone_id)
+        
+        # Clear milestone cache
+        await self.cache_service.invalidate_milestone_cache(milestone_id)
+    
+    def _invalidate_validations(
+        self,
+        user_id: Optional[str] = None,
+        milestone_id: Optional[str] = None
+    ) -> None:
+        """Drop cached validations for a user and/or milestone in every process."""
+        user_id = None if user_id is None else str(user_id)
+        milestone_id = None if milestone_id is None else str(milestone_id)
+        self._drop_validations(user_id, milestone_id)
+        
+        if self._invalidation_bus is not None:
+            tags = []
+            if user_id is not None:
+                tags.append(f"user:{user_id}")
+            if milestone_id is not None:
+                tags.append(f"milestone:{milestone_id}")
+            self._invalidation_bus.publish(self.INVALIDATION_NAMESPACE, tags=tags)
+    
+    def _drop_validations(
+        self,
+        user_id: Optional[str] = None,
+        milestone_id: Optional[str] = None
+    ) -> None:
+        """Drop local validations matching the user or the milestone."""
+        def matches(cache_key: str) -> bool:
+            # Keys are laid out as dep_validation:{user_id}:{milestone_id}
+            _, cached_user, cached_milestone = cache_key.split(":", 2)
+            return cached_user == user_id or cached_milestone == milestone_id
+        
         self._validation_cache = {
             k: v for k, v in self._validation_cache.items()
-            if not k.startswith(pattern.replace("*", ""))
+            if not matches(k)
         }
+    
+    def _apply_invalidation(self, invalidation: CacheInvalidation) -> None:
+        """Apply a validation invalidation published by another process."""
+        if invalidation.flush:
+            self._validation_cache.clear()
+            return
         
-        # Clear dependency graph cache
-        self._dependency_graph_cache = {}
-        
-        # Clear milestone cache
-        await self.cache_service.invalidate_milestone_cache(milestone_id)
+        for tag in invalidation.tags:
+            kind, _, value = tag.partition(":")
+            if kind == "user":
+                self._drop_validations(user_id=value)
+            elif kind == "milestone":
+                self._drop_validations(milestone_id=value)
     
     def _cache_validation_result(
         self,
@@ -8,11 +8,11 @@ similarity matching, and performance optimization.
 import asyncio
 import hashlib
 import json
+import time
+from dataclasses import asdict
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from uuid import UUID
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +24,7 @@ from ..models.m0_feasibility import (
 )
 from ..infrastructure.redis.redis_mcp import RedisMCPClient
 from .mcp_integrations.memory_bank import MemoryBankMCP
+from .m0_similarity_index import SnapshotEntry, SnapshotSimilarityIndex
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,18 @@ class M0CacheService:
     MAX_CACHE_SIZE = 1000  # Maximum cached snapshots
     PRELOAD_BATCH_SIZE = 10  # Batch size for predictive preloading
     
+    # Sorted set of hot cache keys scored by last access time
+    LRU_INDEX_KEY = "m0:cache:lru"
+    
+    # Invalidation tag carried by every M0 cache entry
+    TAG_ALL = "m0"
+    
+    # Shared similarity index: hash of snapshot_id -> entry JSON, and a
+    # version stamp bumped on every change so workers know to resync
+    SIMILARITY_ENTRIES_KEY = "m0:similarity:entries"
+    SIMILARITY_VERSION_KEY = "m0:similarity:version"
+    SIMILARITY_WINDOW_HOURS = 24  # Only recent snapshots are reused
+    
     def __init__(
         self,
         db_session: AsyncSession,
@@ -58,12 +71,11 @@ class M0CacheService:
         self.redis = redis_client
         self.memory_bank = memory_bank or MemoryBankMCP()
         
-        # Initialize TF-IDF vectorizer for similarity matching
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        # Local copy of the shared snapshot similarity index
+        self.similarity_index: Optional[SnapshotSimilarityIndex] = None
+        
+        # SSCAN cursor for pruning expired keys from the tag sets
+        self._tag_prune_cursor = 0
         
         # Cache statistics
         self.stats = {
@@ -163,7 +175,8 @@ class M0CacheService:
         idea_summary: str,
         user_profile: Dict[str, Any],
         snapshot_data: Dict[str, Any],
-        research_data: Optional[Dict[str, Any]] = None
+        research_data: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
     ) -> bool:
         """
         Store snapshot in multi-tier cache.
@@ -174,6 +187,7 @@ class M0CacheService:
             user_profile: User profile
             snapshot_data: Complete snapshot data
             research_data: Optional research data for separate caching
+            user_id: Owner, so the entry is dropped with the user's cache
             
         Returns:
             Success status
@@ -182,15 +196,21 @@ class M0CacheService:
             # Generate cache keys
             cache_key = self._generate_cache_key(idea_summary, user_profile)
             idea_hash = self._generate_idea_hash(idea_summary)
+            tags = self.cache_tags(
+                snapshot_id=snapshot_id,
+                idea_hash=idea_hash,
+                user_id=user_id
+            )
             
             # Store in hot cache (Redis)
-            await self._set_hot_cache(cache_key, snapshot_data)
+            await self._set_hot_cache(cache_key, snapshot_data, tags)
             
             # Store idea hash mapping
             await self.redis.set_cache(
                 f"m0:hash:{idea_hash}",
                 snapshot_id,
-                self.CACHE_TTL_SECONDS
+                self.CACHE_TTL_SECONDS,
+                tags=tags
             )
             
             # Store research data separately if provided
@@ -202,7 +222,7 @@ class M0CacheService:
                 )
             
             # Update similarity index
-            await self._update_similarity_index(idea_summary, snapshot_id)
+            await self._update_similarity_index(idea_summary, snapshot_id, user_profile)
             
             # Check cache size and evict if necessary
             await self._manage_cache_size()
@@ -218,60 +238,158 @@ class M0CacheService:
         idea_summary: str,
         user_profile: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
-        """Find similar cached snapshot using semantic similarity."""
+        """
+        Find the most similar compatible snapshot using the similarity index.
+        
+        Only snapshots whose profile bucket is compatible are scored; the
+        match is then loaded by primary key.
+        """
         try:
-            # Get recent snapshots for similarity comparison
+            index = await self._get_similarity_index()
+            window_start = datetime.utcnow() - timedelta(hours=self.SIMILARITY_WINDOW_HOURS)
+            
+            match = index.nearest(
+                idea_summary,
+                user_profile,
+                compatible=self._are_profiles_compatible,
+                threshold=self.SIMILARITY_THRESHOLD,
+                since=window_start.timestamp()
+            )
+            if not match:
+                return None
+            
+            snapshot_id, similarity = match
             stmt = select(M0FeasibilitySnapshot).where(
                 and_(
-                    M0FeasibilitySnapshot.status == M0Status.COMPLETED.value,
-                    M0FeasibilitySnapshot.created_at > datetime.utcnow() - timedelta(hours=24)
+                    M0FeasibilitySnapshot.id == UUID(snapshot_id),
+                    M0FeasibilitySnapshot.status == M0Status.COMPLETED.value
                 )
-            ).limit(100)
-            
+            )
             result = await self.db.execute(stmt)
-            snapshots = result.scalars().all()
+            snapshot = result.scalar_one_or_none()
             
-            if not snapshots:
+            if snapshot is None:
                 return None
             
-            # Extract idea summaries
-            summaries = [s.idea_summary for s in snapshots]
-            summaries.append(idea_summary)
-            
-            # Vectorize and compute similarities
-            try:
-                vectors = self.vectorizer.fit_transform(summaries)
-                query_vector = vectors[-1]
-                candidate_vectors = vectors[:-1]
-                
-                similarities = cosine_similarity(query_vector, candidate_vectors)[0]
-                
-                # Find best match above threshold
-                best_idx = np.argmax(similarities)
-                best_similarity = similarities[best_idx]
-                
-                if best_similarity >= self.SIMILARITY_THRESHOLD:
-                    # Check if user profiles are compatible
-                    best_snapshot = snapshots[best_idx]
-                    
-                    if self._are_profiles_compatible(
-                        user_profile,
-                        best_snapshot.user_profile
-                    ):
-                        logger.info(
-                            f"Found similar snapshot with {best_similarity:.2%} similarity"
-                        )
-                        return best_snapshot.to_dict()
-                
-            except Exception as e:
-                logger.error(f"Similarity matching failed: {e}")
-            
-            return None
+            logger.info(f"Found similar snapshot with {similarity:.2%} similarity")
+            return snapshot.to_dict()
             
         except Exception as e:
             logger.error(f"Similar snapshot lookup failed: {e}")
             return None
     
+    async def _get_similarity_index(self) -> SnapshotSimilarityIndex:
+        """
+        Get the similarity index, syncing it if another worker changed it.
+        
+        The version stamp in Redis is checked on every call; entries are only
+        fetched when the local copy is behind, and only unseen ones are
+        vectorized. Entries that fell out of the window are removed from the
+        shared hash instead of being indexed, which keeps the hash bounded by
+        the window. An empty shared index is seeded from the database.
+        """
+        version = int(await self.redis.get_cache(self.SIMILARITY_VERSION_KEY) or 0)
+        index = self.similarity_index
+        if index is not None and index.version == version:
+            return index
+        
+        window_start = (
+            datetime.utcnow() - timedelta(hours=self.SIMILARITY_WINDOW_HOURS)
+        ).timestamp()
+        stored = await self.redis.execute("hgetall", self.SIMILARITY_ENTRIES_KEY) or {}
+        if stored:
+            entries = [SnapshotEntry(**json.loads(value)) for value in stored.values()]
+            expired = [entry.snapshot_id for entry in entries if entry.created_at < window_start]
+            if expired:
+                await self.redis.execute("hdel", self.SIMILARITY_ENTRIES_KEY, *expired)
+                entries = [entry for entry in entries if entry.created_at >= window_start]
+        else:
+            entries = await self._load_similarity_entries()
+            if entries:
+                await self.redis.execute(
+                    "hset",
+                    self.SIMILARITY_ENTRIES_KEY,
+                    mapping={entry.snapshot_id: json.dumps(asdict(entry)) for entry in entries}
+                )
+                version = int(await self.redis.execute("incr", self.SIMILARITY_VERSION_KEY))
+        
+        if index is None:
+            index = SnapshotSimilarityIndex()
+        index.add(entries)
+        index.prune(window_start)
+        index.version = version
+        self.similarity_index = index
+        return index
+    
+    async def _load_similarity_entries(self) -> List[SnapshotEntry]:
+        """Load recent completed snapshots from the database."""
+        stmt = select(
+            M0FeasibilitySnapshot.id,
+            M0FeasibilitySnapshot.idea_summary,
+            M0FeasibilitySnapshot.user_profile,
+            M0FeasibilitySnapshot.created_at
+        ).where(
+            and_(
+                M0FeasibilitySnapshot.status == M0Status.COMPLETED.value,
+                M0FeasibilitySnapshot.created_at > (
+                    datetime.utcnow() - timedelta(hours=self.SIMILARITY_WINDOW_HOURS)
+                )
+            )
+        ).order_by(
+            M0FeasibilitySnapshot.created_at.desc()
+        ).limit(self.MAX_CACHE_SIZE)
+        
+        result = await self.db.execute(stmt)
+        return [
+            self.similarity_entry(
+                str(row.id),
+                row.idea_summary,
+                row.user_profile,
+                row.created_at
+            )
+            for row in result
+        ]
+    
+    @staticmethod
+    def similarity_entry(
+        snapshot_id: str,
+        idea_summary: str,
+        user_profile: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None
+    ) -> SnapshotEntry:
+        """Similarity index entry for a completed snapshot."""
+        user_profile = user_profile or {}
+        return SnapshotEntry(
+            snapshot_id=snapshot_id,
+            idea_summary=idea_summary,
+            budget_band=user_profile.get("budget_band"),
+            experience=user_profile.get("experience"),
+            created_at=(created_at or datetime.utcnow()).timestamp()
+        )
+    
+    @classmethod
+    async def publish_similarity_entry(
+        cls,
+        redis: RedisMCPClient,
+        entry: SnapshotEntry
+    ) -> int:
+        """
+        Add an entry to the shared similarity index.
+        
+        Used by the generator as well, so snapshots stored outside this
+        service still become similarity candidates.
+        
+        Returns:
+            The new index version
+        """
+        await redis.execute(
+            "hset",
+            cls.SIMILARITY_ENTRIES_KEY,
+            entry.snapshot_id,
+            json.dumps(asdict(entry))
+        )
+        return int(await redis.execute("incr", cls.SIMILARITY_VERSION_KEY))
+    
     async def _get_hot_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get from hot cache (Redis)."""
         try:
@@ -279,11 +397,7 @@ class M0CacheService:
             
             if cached:
                 # Update access time
-                await self.redis.set_cache(
-                    f"{cache_key}:accessed",
-                    datetime.utcnow().isoformat(),
-                    self.CACHE_TTL_SECONDS
-                )
+                await self.redis.execute("zadd", self.LRU_INDEX_KEY, {cache_key: time.time()})
                 
             return cached
             
@@ -294,14 +408,17 @@ class M0CacheService:
     async def _set_hot_cache(
         self,
         cache_key: str,
-        data: Dict[str, Any]
+        data: Dict[str, Any],
+        tags: Optional[List[str]] = None
     ) -> None:
         """Store in hot cache (Redis)."""
         try:
+            tags = tags or self.cache_tags()
             await self.redis.set_cache(
                 cache_key,
                 data,
-                self.CACHE_TTL_SECONDS
+                self.CACHE_TTL_SECONDS,
+                tags=tags
             )
             
             # Store metadata
@@ -312,9 +429,12 @@ class M0CacheService:
                     "size": len(json.dumps(data)),
                     "access_count": 1
                 },
-                self.CACHE_TTL_SECONDS
+                self.CACHE_TTL_SECONDS,
+                tags=tags
             )
             
+            await self.redis.execute("zadd", self.LRU_INDEX_KEY, {cache_key: time.time()})
+            
         except Exception as e:
             logger.error(f"Hot cache store failed: {e}")
     
@@ -453,8 +573,21 @@ class M0CacheService:
     async def _manage_cache_size(self) -> None:
         """Manage cache size with intelligent eviction."""
         try:
+            # Drop index entries whose keys have already expired
+            await self.redis.execute(
+                "zremrangebyscore",
+                self.LRU_INDEX_KEY,
+                "-inf",
+                time.time() - self.CACHE_TTL_SECONDS
+            )
+            
+            # Drop expired keys from the tag sets, one batch per call
+            self._tag_prune_cursor = await self.redis.prune_tag(
+                self.TAG_ALL, self._tag_prune_cursor
+            )
+            
             # Get cache size
-            cache_size = await self.redis.get_cache("m0:cache:size") or 0
+            cache_size = await self.redis.execute("zcard", self.LRU_INDEX_KEY)
             
             if cache_size > self.MAX_CACHE_SIZE:
                 # Implement LRU eviction
@@ -466,29 +599,20 @@ class M0CacheService:
     async def _evict_lru_entries(self, count: int) -> None:
         """Evict least recently used cache entries."""
         try:
-            # Get access times from Redis
-            pattern = "m0:snapshot:*:accessed"
-            keys = await self.redis.client.keys(pattern)
+            # Oldest entries first from the access-time index
+            cache_keys = await self.redis.execute("zrange", self.LRU_INDEX_KEY, 0, count - 1)
             
-            if not keys:
+            if not cache_keys:
                 return
             
-            # Sort by access time
-            access_times = []
-            for key in keys[:count]:
-                accessed = await self.redis.get_cache(key)
-                if accessed:
-                    cache_key = key.replace(":accessed", "")
-                    access_times.append((cache_key, accessed))
-            
-            # Sort and evict oldest
-            access_times.sort(key=lambda x: x[1])
-            
-            for cache_key, _ in access_times[:count]:
-                await self.redis.delete_cache(cache_key)
-                self.stats["evictions"] += 1
+            await self.redis.delete_tagged(
+                *cache_keys,
+                *(f"{cache_key}:metadata" for cache_key in cache_keys)
+            )
+            await self.redis.execute("zrem", self.LRU_INDEX_KEY, *cache_keys)
+            self.stats["evictions"] += len(cache_keys)
             
-            logger.info(f"Evicted {count} cache entries")
+            logger.info(f"Evicted {len(cache_keys)} cache entries")
             
         except Exception as e:
             logger.error(f"LRU eviction failed: {e}")
@@ -496,10 +620,31 @@ class M0CacheService:
     async def _update_similarity_index(
         self,
         idea_summary: str,
-        snapshot_id: str
+        snapshot_id: str,
+        user_profile: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Update similarity index for fast lookup."""
+        """
+        Update similarity index for fast lookup.
+        
+        Publishes the snapshot to the shared index and adds it to the local
+        copy, which stays current unless another worker changed the index
+        concurrently. Snapshots that fell out of the window are pruned.
+        """
         try:
+            entry = self.similarity_entry(snapshot_id, idea_summary, user_profile)
+            version = await self.publish_similarity_entry(self.redis, entry)
+            
+            index = self.similarity_index
+            if index is not None:
+                index.add([entry])
+                if index.version == version - 1:
+                    index.version = version
+                
+                window_start = datetime.utcnow() - timedelta(hours=self.SIMILARITY_WINDOW_HOURS)
+                expired = index.prune(window_start.timestamp())
+                if expired:
+                    await self.redis.execute("hdel", self.SIMILARITY_ENTRIES_KEY, *expired)
+            
             # Store in memory bank for vector similarity
             if self.memory_bank:
                 await self.memory_bank.store_memory(
@@ -533,6 +678,27 @@ class M0CacheService:
         except Exception as e:
             logger.error(f"Failed to record cache hit: {e}")
     
+    @classmethod
+    def cache_tags(
+        cls,
+        snapshot_id: Optional[str] = None,
+        idea_hash: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[str]:
+        """Invalidation tags for an M0 cache entry."""
+        tags = [cls.TAG_ALL]
+        if snapshot_id:
+            tags.append(cls._tag("snapshot", snapshot_id))
+        if idea_hash:
+            tags.append(cls._tag("idea", idea_hash))
+        if user_id:
+            tags.append(cls._tag("user", user_id))
+        return tags
+    
+    @classmethod
+    def _tag(cls, kind: str, value: str) -> str:
+        return f"{cls.TAG_ALL}:{kind}:{value}"
+    
     def _generate_cache_key(
         self,
         idea_summary: str,
@@ -603,9 +769,7 @@ class M0CacheService:
             hit_rate = self.stats["hits"] / total_requests if total_requests > 0 else 0
             
             # Get cache size
-            pattern = "m0:snapshot:*"
-            keys = await self.redis.client.keys(pattern)
-            cache_size = len(keys)
+            cache_size = await self.redis.execute("zcard", self.LRU_INDEX_KEY)
             
             # Get database cache stats
             stmt = select(func.count(M0ResearchCache.id)).where(
@@ -635,39 +799,39 @@ class M0CacheService:
     async def invalidate_cache(
         self,
         idea_summary: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        snapshot_id: Optional[str] = None
     ) -> int:
         """
-        Invalidate cache entries.
+        Invalidate cache entries by tag, without scanning the keyspace.
         
         Args:
             idea_summary: Specific idea to invalidate
             user_id: Invalidate all entries for user
+            snapshot_id: Invalidate entries for one snapshot
             
         Returns:
             Number of entries invalidated
         """
         try:
-            count = 0
-            
             if idea_summary:
                 # Invalidate specific idea
-                idea_hash = self._generate_idea_hash(idea_summary)
-                pattern = f"m0:*{idea_hash}*"
+                tag = self._tag("idea", self._generate_idea_hash(idea_summary))
                 
             elif user_id:
                 # Invalidate user's entries
-                pattern = f"m0:user:{user_id}:*"
+                tag = self._tag("user", user_id)
+                
+            elif snapshot_id:
+                tag = self._tag("snapshot", snapshot_id)
                 
             else:
                 # Invalidate all
-                pattern = "m0:*"
-            
-            keys = await self.redis.client.keys(pattern)
+                tag = self.TAG_ALL
             
-            for key in keys:
-                await self.redis.delete_cache(key)
-                count += 1
+            count = await self.redis.invalidate_tags(tag)
+            if tag == self.TAG_ALL:
+                await self.redis.delete_cache(self.LRU_INDEX_KEY)
             
             logger.info(f"Invalidated {count} cache entries")
             return count
@@ -684,7 +848,7 @@ class M0CacheService:
                 self.preload_task.cancel()
                 
             # Flush any pending operations
-            await self.redis.client.flushall()
+            await self.redis.execute("flushall")
             
             logger.info("M0 Cache Service shutdown complete")
             
@@ -28,6 +28,7 @@ from .mcp_integrations.memory_bank import MemoryBankMCP
 from .mcp_integrations.ref_optimization import RefMCP
 from .mcp_integrations.redis_integration import RedisMCPClient
 from .citation_service import CitationService
+from .m0_cache_service import M0CacheService
 from ..infrastructure.redis.redis_mcp import RedisMCPClient as RedisCache
 
 logger = logging.getLogger(__name__)
@@ -658,25 +659,46 @@ Provide a structured JSON response with all required fields.
             # Generate cache key
             cache_key = f"m0:snapshot:{snapshot.id}"
             
-            # Store in Redis with 1 hour TTL
-            await self.redis.set_cache(
-                cache_key,
-                snapshot.to_dict(),
-                ttl=3600
-            )
-            
             # Also cache by idea hash for deduplication
             idea_hash = self._generate_idea_hash(
                 snapshot.idea_summary,
                 snapshot.user_profile
             )
+            tags = M0CacheService.cache_tags(
+                snapshot_id=str(snapshot.id),
+                user_id=str(snapshot.user_id)
+            )
+            
+            # Store in Redis with 1 hour TTL
+            await self.redis.set_cache(
+                cache_key,
+                snapshot.to_dict(),
+                expiry=3600,
+                tags=tags
+            )
             
             await self.redis.set_cache(
                 f"m0:idea_hash:{idea_hash}",
                 str(snapshot.id),
-                ttl=3600
+                expiry=3600,
+                tags=tags
             )
             
+            # Make the snapshot a candidate for similarity cache hits; a
+            # failure here must not skip the research cache below
+            try:
+                await M0CacheService.publish_similarity_entry(
+                    self.redis,
+                    M0CacheService.similarity_entry(
+                        str(snapshot.id),
+                        snapshot.idea_summary,
+                        snapshot.user_profile,
+                        snapshot.created_at
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish similarity entry: {e}")
+            
             # Store research cache for reuse
             research_cache = M0ResearchCache(
                 snapshot_id=snapshot.id,
@@ -0,0 +1,210 @@
+"""
+M0 Snapshot Similarity Index
+
+Incremental TF-IDF index over completed M0 snapshot ideas, answering
+"nearest compatible snapshot" queries without refitting a vectorizer per
+lookup. Term counts come from a stateless hashing vectorizer, so adding a
+snapshot only appends a sparse row and bumps the document frequencies; IDF
+weights and row norms are recomputed lazily on the first query after a
+change.
+
+Snapshots are bucketed by (budget band, experience) so a query only scores
+the buckets its profile is compatible with. Entries serialize to plain dicts
+so workers can share the index through Redis.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+ProfileBucket = Tuple[Optional[str], Optional[str]]
+
+
+@dataclass
+class SnapshotEntry:
+    """An indexed snapshot: its idea, profile bucket and creation time."""
+    snapshot_id: str
+    idea_summary: str
+    budget_band: Optional[str] = None
+    experience: Optional[str] = None
+    created_at: float = 0.0  # epoch seconds
+
+    @property
+    def bucket(self) -> ProfileBucket:
+        return (self.budget_band, self.experience)
+
+
+class SnapshotSimilarityIndex:
+    """
+    Versioned TF-IDF index of snapshot ideas, bucketed by profile.
+
+    IDF uses the same smoothed formula as ``TfidfVectorizer`` over the
+    indexed snapshots, and rows are L2-normalized so scores are cosine
+    similarities.
+    """
+
+    def __init__(self, version: int = 0, n_features: int = 2 ** 18):
+        self.version = version
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words="english",
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None
+        )
+        self.entries: List[SnapshotEntry] = []
+        self._positions: Dict[str, int] = {}
+        self._buckets: Dict[ProfileBucket, List[int]] = {}
+        self._created_at = np.empty(0, dtype=np.float64)
+        self._counts = sp.csr_matrix((0, n_features), dtype=np.float64)
+        self._document_frequency = np.zeros(n_features, dtype=np.int64)
+
+        # Lazily rebuilt after every change
+        self._idf: Optional[np.ndarray] = None
+        self._weighted: Optional[sp.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, snapshot_id: str) -> bool:
+        return snapshot_id in self._positions
+
+    def add(self, entries: Iterable[SnapshotEntry]) -> int:
+        """Index snapshots not indexed yet; returns how many were added."""
+        new_entries = []
+        for entry in entries:
+            if entry.snapshot_id not in self._positions:
+                self._positions[entry.snapshot_id] = len(self.entries) + len(new_entries)
+                new_entries.append(entry)
+        if not new_entries:
+            return 0
+
+        counts = self.vectorizer.transform([entry.idea_summary for entry in new_entries])
+        counts.sum_duplicates()
+        self._document_frequency += np.bincount(
+            counts.indices, minlength=self._document_frequency.size
+        )
+        self._counts = sp.vstack([self._counts, counts], format="csr")
+        self._created_at = np.concatenate(
+            [self._created_at, [entry.created_at for entry in new_entries]]
+        )
+        for entry in new_entries:
+            self._buckets.setdefault(entry.bucket, []).append(self._positions[entry.snapshot_id])
+        self.entries.extend(new_entries)
+
+        self._invalidate()
+        return len(new_entries)
+
+    def remove(self, snapshot_ids: Iterable[str]) -> List[str]:
+        """Drop snapshots; returns the IDs that were indexed."""
+        drop = {
+            self._positions[snapshot_id]
+            for snapshot_id in snapshot_ids
+            if snapshot_id in self._positions
+        }
+        if not drop:
+            return []
+
+        removed = [self.entries[position].snapshot_id for position in sorted(drop)]
+        keep = np.array(
+            [position for position in range(len(self.entries)) if position not in drop],
+            dtype=np.int64
+        )
+        dropped = self._counts[sorted(drop)]
+        self._document_frequency -= np.bincount(
+            dropped.indices, minlength=self._document_frequency.size
+        )
+
+        self._counts = self._counts[keep]
+        self._created_at = self._created_at[keep]
+        self.entries = [self.entries[position] for position in keep.tolist()]
+        self._positions = {
+            entry.snapshot_id: position for position, entry in enumerate(self.entries)
+        }
+        self._buckets = {}
+        for position, entry in enumerate(self.entries):
+            self._buckets.setdefault(entry.bucket, []).append(position)
+
+        self._invalidate()
+        return removed
+
+    def prune(self, before: float) -> List[str]:
+        """Drop snapshots created before ``before`` (epoch seconds)."""
+        expired = np.flatnonzero(self._created_at < before)
+        return self.remove(self.entries[position].snapshot_id for position in expired.tolist())
+
+    def nearest(
+        self,
+        idea_summary: str,
+        user_profile: Dict[str, Any],
+        compatible: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+        threshold: float = 0.0,
+        since: Optional[float] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Most similar snapshot whose profile is compatible with ``user_profile``.
+
+        Args:
+            idea_summary: Idea to match
+            user_profile: Profile of the requesting user
+            compatible: Profile compatibility check, evaluated once per bucket
+            threshold: Minimum cosine similarity
+            since: Only consider snapshots created at or after this time
+
+        Returns:
+            Tuple of (snapshot_id, similarity) or None
+        """
+        positions = [
+            position
+            for (budget_band, experience), bucket in self._buckets.items()
+            if compatible(user_profile, {"budget_band": budget_band, "experience": experience})
+            for position in bucket
+        ]
+        if not positions:
+            return None
+
+        candidates = np.array(positions, dtype=np.int64)
+        if since is not None:
+            candidates = candidates[self._created_at[candidates] >= since]
+            if candidates.size == 0:
+                return None
+
+        weighted, idf = self._weights()
+        query = normalize(self.vectorizer.transform([idea_summary]).multiply(idf).tocsr())
+        scores = (weighted[candidates] @ query.T).toarray().ravel()
+
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        return self.entries[candidates[best]].snapshot_id, float(scores[best])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict snapshot of the index."""
+        return {
+            "version": self.version,
+            "entries": [asdict(entry) for entry in self.entries]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SnapshotSimilarityIndex":
+        """Rebuild an index from ``to_dict`` output."""
+        index = cls(version=data.get("version", 0))
+        index.add(SnapshotEntry(**entry) for entry in data.get("entries", []))
+        return index
+
+    def _weights(self) -> Tuple[sp.csr_matrix, np.ndarray]:
+        """Normalized TF-IDF rows and the IDF vector, rebuilt after changes."""
+        if self._weighted is None:
+            documents = len(self.entries)
+            self._idf = np.log((1 + documents) / (1 + self._document_frequency)) + 1
+            self._weighted = normalize(self._counts.multiply(self._idf).tocsr())
+        return self._weighted, self._idf
+
+    def _invalidate(self) -> None:
+        self._idf = None
+        self._weighted = None
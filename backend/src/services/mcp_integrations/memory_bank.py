@@ -6,10 +6,13 @@ Provides long-term memory persistence using the Memory Bank MCP server.
 
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from collections import OrderedDict
 import json
 import logging
 import hashlib
 
+from .memory_search import MemorySearchIndex, tokenize
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,15 +25,21 @@ class MemoryBankMCP:
     - Semantic memory search
     - Memory consolidation
     - Hierarchical memory organization
+    
+    The local index is an LRU of at most ``max_memories`` records (least
+    recently stored or retrieved out) with a BM25 inverted index and
+    metadata facets on top for ``search_memories``.
     """
     
-    def __init__(self):
+    def __init__(self, max_memories: int = 10_000):
         self.connection_params = {
             "host": "memory-bank-mcp",
             "port": 5000,
             "protocol": "stdio"
         }
-        self.memory_index: Dict[str, Dict[str, Any]] = {}
+        self.max_memories = max_memories
+        self.memory_index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.search_index = MemorySearchIndex()
         
     async def store_memory(
         self,
@@ -50,11 +59,7 @@ class MemoryBankMCP:
             Success status
         """
         try:
-            # Serialize content if needed
-            if isinstance(content, (dict, list)):
-                content_str = json.dumps(content)
-            else:
-                content_str = str(content)
+            content_str = self._content_text(content)
             
             # Generate hash for deduplication
             content_hash = hashlib.sha256(content_str.encode()).hexdigest()
@@ -70,7 +75,7 @@ class MemoryBankMCP:
             }
             
             # Store in local index
-            self.memory_index[key] = memory_record
+            self._index_record(memory_record, content_str)
             
             # TODO: Implement actual MCP protocol call
             # For now, simulating the storage
@@ -98,6 +103,7 @@ class MemoryBankMCP:
         try:
             # Check local index first
             if key in self.memory_index:
+                self.memory_index.move_to_end(key)
                 memory = self.memory_index[key]
                 memory["access_count"] += 1
                 memory["last_accessed"] = datetime.utcnow().isoformat()
@@ -119,43 +125,33 @@ class MemoryBankMCP:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        Search memories using semantic search.
+        Search memories ranked by BM25 relevance.
         
         Args:
-            query: Search query
-            filters: Metadata filters
+            query: Search query; without any word in it, the most recently
+                used memories matching ``filters`` are returned unscored
+            filters: Metadata values the memories must equal
             limit: Maximum results
             
         Returns:
-            List of matching memories
+            List of matching memories with a "score" in [0, 1]
         """
         try:
-            results = []
-            
-            # Simple filtering for now
-            for key, memory in self.memory_index.items():
-                # Apply filters
-                if filters:
-                    match = True
-                    for filter_key, filter_value in filters.items():
-                        if memory["metadata"].get(filter_key) != filter_value:
-                            match = False
-                            break
-                    if not match:
-                        continue
-                
-                # Simple text search (to be replaced with semantic search)
-                content_str = str(memory["content"]).lower()
-                if query.lower() in content_str:
-                    results.append({
-                        **memory,
-                        "score": 0.8  # Placeholder score
-                    })
+            if tokenize(query):
+                return [
+                    {**self.memory_index[key], "score": score}
+                    for key, score in self.search_index.search(query, filters, limit)
+                ]
             
-            # Sort by score and limit
-            results.sort(key=lambda x: x["score"], reverse=True)
+            allowed = self.search_index.filter(filters)
+            results = []
+            for key in reversed(self.memory_index):
+                if allowed is None or key in allowed:
+                    results.append({**self.memory_index[key], "score": 0.0})
+                    if len(results) >= limit:
+                        break
             
-            return results[:limit]
+            return results
             
         except Exception as e:
             logger.error(f"Error searching memories: {e}")
@@ -239,6 +235,7 @@ class MemoryBankMCP:
         try:
             if key in self.memory_index:
                 del self.memory_index[key]
+                self.search_index.remove(key)
                 logger.info(f"Deleted memory with key: {key}")
                 return True
             
@@ -313,6 +310,9 @@ class MemoryBankMCP:
         """
         Export memories, optionally filtered.
         
+        Records come least recently used first, so importing them restores
+        the LRU order as well.
+        
         Args:
             filter_func: Optional filter function
             
@@ -338,6 +338,10 @@ class MemoryBankMCP:
         """
         Import memories from external source.
         
+        Records from ``export_memories`` are restored as they were,
+        including timestamps and access counts; missing fields are filled
+        in as ``store_memory`` would.
+        
         Args:
             memories: List of memory records
             
@@ -349,17 +353,40 @@ class MemoryBankMCP:
             
             for memory in memories:
                 if "key" in memory and "content" in memory:
-                    success = await self.store_memory(
-                        key=memory["key"],
-                        content=memory["content"],
-                        metadata=memory.get("metadata", {})
-                    )
-                    if success:
-                        imported += 1
+                    content_str = self._content_text(memory["content"])
+                    record = {
+                        **memory,
+                        "content_hash": memory.get("content_hash")
+                        or hashlib.sha256(content_str.encode()).hexdigest(),
+                        "metadata": memory.get("metadata") or {},
+                        "timestamp": memory.get("timestamp") or datetime.utcnow().isoformat(),
+                        "access_count": memory.get("access_count", 0)
+                    }
+                    self._index_record(record, content_str)
+                    imported += 1
             
             logger.info(f"Imported {imported} memories")
             return imported
             
         except Exception as e:
             logger.error(f"Error importing memories: {e}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    @staticmethod
+    def _content_text(content: Any) -> str:
+        """Text form of memory content, as hashed and indexed."""
+        if isinstance(content, (dict, list)):
+            return json.dumps(content)
+        return str(content)
+    
+    def _index_record(self, record: Dict[str, Any], content_str: str) -> None:
+        """Store a record as most recently used and evict past capacity."""
+        key = record["key"]
+        self.memory_index[key] = record
+        self.memory_index.move_to_end(key)
+        self.search_index.add(key, content_str, record["metadata"])
+        
+        while len(self.memory_index) > self.max_memories:
+            evicted, _ = self.memory_index.popitem(last=False)
+            self.search_index.remove(evicted)
+            logger.debug(f"Evicted memory with key: {evicted}")
@@ -0,0 +1,205 @@
+"""
+Memory Bank Search Index
+
+Incremental inverted index over memory contents with BM25 ranking, plus
+facet indexes over metadata values for exact-match filters. Searching
+touches only the postings of the query terms (intersected with the facet
+sets of the filters), so its cost grows with the number of matching
+memories rather than with the size of the memory bank.
+"""
+
+import math
+import re
+from collections import Counter
+from heapq import nlargest
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+_TOKEN = re.compile(r"\w+")
+
+Facet = Tuple[str, Hashable]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of ``text``."""
+    return _TOKEN.findall(text.lower())
+
+
+def _facet(key: str, value: Any) -> Optional[Facet]:
+    """Facet for a metadata item, or None if its value can't be indexed."""
+    if value is None:
+        return None
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (key, value)
+
+
+class MemorySearchIndex:
+    """
+    BM25 inverted index with metadata facets, keyed by memory key.
+
+    Scores are normalized to [0, 1] by the query's upper bound (every term
+    at saturating frequency), so they are comparable across queries.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._facets: Dict[Facet, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._lengths
+
+    def add(self, key: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Index a memory, replacing any previous version under ``key``."""
+        if key in self._lengths:
+            self.remove(key)
+
+        terms = Counter(tokenize(text))
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[key] = frequency
+        length = sum(terms.values())
+        self._terms[key] = list(terms)
+        self._lengths[key] = length
+        self._total_length += length
+
+        # Copied so facets stay consistent if the caller mutates the dict
+        metadata = dict(metadata or {})
+        self._metadata[key] = metadata
+        for name, value in metadata.items():
+            facet = _facet(name, value)
+            if facet is not None:
+                self._facets.setdefault(facet, set()).add(key)
+
+    def remove(self, key: str) -> bool:
+        """Drop a memory from the index; returns whether it was indexed."""
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return False
+        self._total_length -= length
+
+        for term in self._terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+        for name, value in self._metadata.pop(key).items():
+            facet = _facet(name, value)
+            keys = self._facets.get(facet) if facet is not None else None
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._facets[facet]
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._lengths.clear()
+        self._terms.clear()
+        self._total_length = 0
+        self._metadata.clear()
+        self._facets.clear()
+
+    def filter(self, filters: Optional[Dict[str, Any]] = None) -> Optional[Set[str]]:
+        """
+        Keys matching every filter, or None when no filter narrows the set.
+
+        Hashable filter values are answered from the facet indexes; others
+        (and None, which also matches memories missing the field) are
+        checked against the stored metadata of the remaining keys.
+        """
+        if not filters:
+            return None
+
+        indexed: List[Set[str]] = []
+        residual: Dict[str, Any] = {}
+        for name, value in filters.items():
+            facet = _facet(name, value)
+            if facet is None:
+                residual[name] = value
+            else:
+                indexed.append(self._facets.get(facet, set()))
+
+        if indexed:
+            indexed.sort(key=len)
+            keys = set(indexed[0])
+            for other in indexed[1:]:
+                keys &= other
+        else:
+            keys = set(self._lengths)
+
+        if residual:
+            keys = {key for key in keys if self._matches(key, residual)}
+        return keys
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank memories containing any query term.
+
+        Args:
+            query: Free-text query
+            filters: Metadata values the memories must equal
+            limit: Maximum results
+
+        Returns:
+            (key, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        allowed = self.filter(filters)
+        if not terms or allowed is not None and not allowed:
+            return []
+
+        documents = len(self._lengths)
+        average_length = self._total_length / documents if documents else 0.0
+        scores: Dict[str, float] = {}
+        upper_bound = 0.0
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            upper_bound += idf * (self.k1 + 1)
+
+            if allowed is not None and len(allowed) < len(postings):
+                matches: Iterable[Tuple[str, int]] = (
+                    (key, postings[key]) for key in allowed if key in postings
+                )
+            else:
+                matches = postings.items()
+                if allowed is not None:
+                    matches = ((key, tf) for key, tf in matches if key in allowed)
+
+            for key, frequency in matches:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if not scores:
+            return []
+        best = nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(key, score / upper_bound) for key, score in best]
+
+    def _matches(self, key: str, filters: Dict[str, Any]) -> bool:
+        metadata = self._metadata.get(key, {})
+        return all(metadata.get(name) == value for name, value in filters.items())
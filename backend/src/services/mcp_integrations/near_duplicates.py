@@ -0,0 +1,160 @@
+"""
+MinHash / LSH Near-Duplicate Detection
+
+Pairwise word-set Jaccard makes deduplicating n snippets O(n^2) set
+comparisons. Here every snippet gets a MinHash signature (the minimum of
+``num_perm`` universal hashes over its word set), the signature is split
+into LSH bands, and only snippets sharing a band bucket are compared.
+Candidates are verified with exact Jaccard, so nothing below the threshold
+is ever dropped; the banding is tuned so pairs above it are very likely to
+collide.
+
+Word sets and signatures are cached by content hash, so repeated snippets
+(common across prompt chains and context merges) are tokenized once.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def word_set(content: str) -> FrozenSet[str]:
+    """Lower-cased whitespace-separated words of ``content``."""
+    return frozenset(_WHITESPACE.sub(" ", content.lower()).split())
+
+
+def jaccard(words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two word sets; 0.0 if either is empty."""
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
+
+
+def optimal_bands(threshold: float, num_perm: int, min_recall: float = 0.9) -> Tuple[int, int]:
+    """
+    LSH (bands, rows) for a Jaccard threshold.
+
+    Picks the fewest bands (longest rows, so fewest false candidates) for
+    which a pair right at the threshold still collides with probability
+    ``min_recall``; pairs above it collide even more often. Candidates are
+    verified exactly, so false positives only cost a comparison while
+    every miss is a duplicate that survives.
+    """
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if bands * rows != num_perm:
+            continue
+        if 1 - (1 - threshold ** rows) ** bands >= min_recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHashDeduplicator:
+    """Order-preserving near-duplicate filter over MinHash LSH buckets."""
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        seed: int = 1,
+        cache_size: int = 10_000
+    ):
+        """
+        Args:
+            num_perm: Signature length; more permutations, sharper banding
+            seed: Seed for the universal hash parameters
+            cache_size: Word sets and signatures kept, least recently used out
+        """
+        self.num_perm = num_perm
+        self.cache_size = cache_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._cache: "OrderedDict[str, Tuple[FrozenSet[str], np.ndarray]]" = OrderedDict()
+        self._bands: Dict[float, Tuple[int, int]] = {}
+
+    def signature(self, key: str, content: str) -> Tuple[FrozenSet[str], np.ndarray]:
+        """Word set and MinHash signature of ``content``, cached under ``key``."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        words = word_set(content)
+        if words:
+            # crc32 rather than the salted built-in hash, so signatures and
+            # the items kept are the same in every process
+            hashes = np.fromiter(
+                (zlib.crc32(word.encode()) for word in words),
+                dtype=np.uint64,
+                count=len(words)
+            )
+            # (a * x + b) mod p per permutation, truncated to 32 bits
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+            signature = permuted.min(axis=0)
+        else:
+            signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+        self._cache[key] = (words, signature)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return words, signature
+
+    def deduplicate(
+        self,
+        contents: Iterable[str],
+        keys: Iterable[str],
+        threshold: float = 0.8
+    ) -> List[str]:
+        """
+        Keep each item unless it is an exact or near duplicate of a kept one.
+
+        Args:
+            contents: Items in priority order
+            keys: Content hash per item, used for exact matches and caching
+            threshold: Jaccard similarity at which an item is a duplicate
+        """
+        bands, rows = self._band_config(threshold)
+        buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        kept: List[str] = []
+        kept_words: List[FrozenSet[str]] = []
+        seen_keys = set()
+
+        for content, key in zip(contents, keys):
+            if key in seen_keys:
+                continue
+
+            words, signature = self.signature(key, content)
+            band_keys = [
+                signature[band * rows:(band + 1) * rows].tobytes()
+                for band in range(bands)
+            ] if words else []
+
+            candidates = set()
+            for band, band_key in enumerate(band_keys):
+                candidates.update(buckets[band].get(band_key, ()))
+            if any(jaccard(words, kept_words[index]) >= threshold for index in candidates):
+                continue
+
+            index = len(kept)
+            kept.append(content)
+            kept_words.append(words)
+            seen_keys.add(key)
+            for band, band_key in enumerate(band_keys):
+                buckets[band].setdefault(band_key, []).append(index)
+
+        return kept
+
+    def _band_config(self, threshold: float) -> Tuple[int, int]:
+        config = self._bands.get(threshold)
+        if config is None:
+            config = self._bands[threshold] = optimal_bands(threshold, self.num_perm)
+        return config
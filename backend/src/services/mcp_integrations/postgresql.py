@@ -14,6 +14,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...models.base import get_db_context
+from ...infrastructure.vector_codec import as_float32
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +104,9 @@ class PostgreSQLMCP:
             if embedding is None:
                 embedding = await self._generate_embedding(content)
             
+            # Sent to pgvector in its binary float32 format
+            embedding = as_float32(embedding)
+            
             # Ensure embedding is correct dimension
             if len(embedding) != self.vector_dimension:
                 logger.error(f"Invalid embedding dimension: {len(embedding)}")
@@ -179,6 +183,7 @@ class PostgreSQLMCP:
             # Generate query embedding if not provided
             if query_embedding is None:
                 query_embedding = await self._generate_embedding(query)
+            query_embedding = as_float32(query_embedding)
             
             async with get_db_context() as db:
                 # Build query with filters
@@ -272,7 +277,10 @@ class PostgreSQLMCP:
                     return {
                         "id": row.vector_id,
                         "content": row.content,
-                        "embedding": list(row.embedding) if row.embedding else None,
+                        "embedding": (
+                            np.asarray(row.embedding, dtype=np.float32).tolist()
+                            if row.embedding is not None else None
+                        ),
                         "metadata": json.loads(row.metadata) if row.metadata else {},
                         "created_at": row.created_at.isoformat(),
                         "updated_at": row.updated_at.isoformat()
@@ -396,7 +404,7 @@ class PostgreSQLMCP:
                             "user_id": user_id,
                             "vector_id": vector_id,
                             "content": content,
-                            "embedding": embedding,
+                            "embedding": as_float32(embedding),
                             "metadata": json.dumps(metadata)
                         })
                         stored += 1
@@ -476,6 +484,15 @@ class PostgreSQLMCP:
         """Generate unique vector ID from content."""
         return hashlib.sha256(content.encode()).hexdigest()[:16]
     
+    async def embed_text(self, text: str) -> List[float]:
+        """
+        Embed text with the same model used for stored vectors.
+        
+        Lets callers keep the embedding they pass to ``store_vector`` or
+        ``search_vectors``, e.g. for an in-process index.
+        """
+        return await self._generate_embedding(text)
+    
     async def _generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for text.
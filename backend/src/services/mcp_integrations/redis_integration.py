@@ -10,6 +10,12 @@ import json
 import logging
 
 from ...infrastructure.redis.redis_mcp import RedisMCPClient
+from ...infrastructure.vector_codec import (
+    VectorDType,
+    decode_vector,
+    encode_vector,
+    is_encoded_vector
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +50,10 @@ class RedisMCP(RedisMCPClient):
         """
         Cache a context layer.
         
+        Layer content is stored as JSON. It carries entry vector IDs, not
+        embeddings; vectors are cached with ``cache_embedding`` and layer
+        vector index snapshots are already in the binary vector format.
+        
         Args:
             user_id: User identifier
             layer_type: Type of context layer
@@ -247,22 +257,24 @@ class RedisMCP(RedisMCPClient):
         self,
         text_hash: str,
         embedding: List[float],
-        ttl: int = 86400
+        ttl: int = 86400,
+        dtype: VectorDType = VectorDType.FLOAT32
     ) -> bool:
         """
-        Cache text embedding.
+        Cache text embedding in the compact binary vector format.
         
         Args:
             text_hash: Hash of the text
             embedding: Vector embedding
             ttl: Cache TTL in seconds
+            dtype: Storage precision (float16/int8 trade accuracy for size)
             
         Returns:
             Success status
         """
         try:
             key = f"embedding:{text_hash}"
-            return await self.set_cache(key, embedding, expiry=ttl)
+            return await self.set_bytes(key, encode_vector(embedding, dtype), expiry=ttl)
             
         except Exception as e:
             logger.error(f"Error caching embedding: {e}")
@@ -283,7 +295,13 @@ class RedisMCP(RedisMCPClient):
         """
         try:
             key = f"embedding:{text_hash}"
-            return await self.get_cache(key)
+            data = await self.get_bytes(key)
+            if not data:
+                return None
+            if is_encoded_vector(data):
+                return decode_vector(data).tolist()
+            # Entry written before the binary format
+            return json.loads(data)
             
         except Exception as e:
             logger.error(f"Error getting cached embedding: {e}")
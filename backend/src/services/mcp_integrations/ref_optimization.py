@@ -10,6 +10,9 @@ import logging
 import hashlib
 import re
 
+from ...infrastructure.token_counter import get_token_counter
+from .near_duplicates import MinHashDeduplicator, jaccard, word_set
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +34,7 @@ class RefMCP:
             "remove_redundancy": self._remove_redundancy,
             "compress_whitespace": self._compress_whitespace
         }
+        self.deduplicator = MinHashDeduplicator()
         
     async def optimize_content(
         self,
@@ -132,14 +136,21 @@ class RefMCP:
     async def deduplicate_content(
         self,
         contents: List[str],
-        similarity_threshold: float = 0.8
+        similarity_threshold: float = 0.8,
+        use_lsh: bool = True
     ) -> List[str]:
         """
         Deduplicate similar content.
         
+        Items are kept in order unless they are an exact duplicate or have a
+        word-set Jaccard similarity at or above the threshold with a kept
+        item. By default candidates come from MinHash LSH buckets instead of
+        comparing against every kept item.
+        
         Args:
             contents: List of content strings
             similarity_threshold: Similarity threshold for deduplication
+            use_lsh: Use MinHash LSH candidates; False compares all pairs
             
         Returns:
             Deduplicated content list
@@ -148,29 +159,19 @@ class RefMCP:
             if len(contents) <= 1:
                 return contents
             
-            # Calculate hashes and similarities
             hashes = [self._content_hash(c) for c in contents]
-            unique_contents = []
-            seen_hashes = set()
-            
-            for i, content in enumerate(contents):
-                content_hash = hashes[i]
-                
-                # Check for exact duplicates
-                if content_hash in seen_hashes:
-                    continue
-                
-                # Check for similar content
-                is_similar = False
-                for unique_content in unique_contents:
-                    similarity = self._calculate_similarity(content, unique_content)
-                    if similarity >= similarity_threshold:
-                        is_similar = True
-                        break
-                
-                if not is_similar:
-                    unique_contents.append(content)
-                    seen_hashes.add(content_hash)
+            if use_lsh:
+                unique_contents = self.deduplicator.deduplicate(
+                    contents,
+                    hashes,
+                    similarity_threshold
+                )
+            else:
+                unique_contents = self._deduplicate_pairwise(
+                    contents,
+                    hashes,
+                    similarity_threshold
+                )
             
             logger.info(f"Deduplicated {len(contents)} to {len(unique_contents)} items")
             return unique_contents
@@ -179,6 +180,36 @@ class RefMCP:
             logger.error(f"Error deduplicating content: {e}")
             return contents
     
+    def _deduplicate_pairwise(
+        self,
+        contents: List[str],
+        hashes: List[str],
+        similarity_threshold: float
+    ) -> List[str]:
+        """Exhaustive deduplication comparing each item with every kept item."""
+        unique_contents = []
+        unique_words = []
+        seen_hashes = set()
+        
+        for content, content_hash in zip(contents, hashes):
+            # Check for exact duplicates
+            if content_hash in seen_hashes:
+                continue
+            
+            # Check for similar content
+            words = word_set(content)
+            if any(
+                jaccard(words, unique) >= similarity_threshold
+                for unique in unique_words
+            ):
+                continue
+            
+            unique_contents.append(content)
+            unique_words.append(words)
+            seen_hashes.add(content_hash)
+        
+        return unique_contents
+    
     async def create_content_index(
         self,
         contents: List[Tuple[str, Dict[str, Any]]]
@@ -477,19 +508,18 @@ class RefMCP:
             return "compress_whitespace"
     
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count (1 token ≈ 4 characters)."""
-        return len(text) // 4
+        """Token count from the shared token counter."""
+        return get_token_counter().count(text)
     
     def _truncate_content(self, content: str, max_tokens: int) -> str:
         """Truncate content to fit token budget."""
-        max_chars = max_tokens * 4
-        if len(content) <= max_chars:
+        truncated = get_token_counter().truncate(content, max_tokens)
+        if truncated == content:
             return content
         
         # Try to truncate at sentence boundary
-        truncated = content[:max_chars]
         last_period = truncated.rfind('.')
-        if last_period > max_chars * 0.8:
+        if last_period > len(truncated) * 0.8:
             return truncated[:last_period + 1]
         
         return truncated + "..."
@@ -499,19 +529,8 @@ class RefMCP:
         return hashlib.sha256(content.encode()).hexdigest()[:16]
     
     def _calculate_similarity(self, content1: str, content2: str) -> float:
-        """Calculate similarity between two contents (simple approach)."""
-        # Normalize
-        norm1 = set(re.sub(r'\s+', ' ', content1.lower()).split())
-        norm2 = set(re.sub(r'\s+', ' ', content2.lower()).split())
-        
-        # Jaccard similarity
-        if not norm1 or not norm2:
-            return 0.0
-        
-        intersection = norm1.intersection(norm2)
-        union = norm1.union(norm2)
-        
-        return len(intersection) / len(union) if union else 0.0
+        """Calculate word-set Jaccard similarity between two contents."""
+        return jaccard(word_set(content1), word_set(content2))
     
     def _extract_keywords(self, content: str, max_keywords: int = 10) -> List[str]:
         """Extract keywords from content."""
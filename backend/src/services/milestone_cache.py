@@ -33,6 +33,10 @@ class MilestoneCacheService:
     KEY_PREFIX_SESSION = "milestone:session:"
     KEY_PREFIX_LOCK = "milestone:lock:"
     
+    # Invalidation tags (see RedisMCPClient.invalidate_tags)
+    TAG_PREFIX_USER = "milestone:user:"
+    TAG_PREFIX_MILESTONE = "milestone:id:"
+    
     # Cache TTL settings (in seconds)
     TTL_USER_PROGRESS = 3600  # 1 hour
     TTL_MILESTONE_TREE = 1800  # 30 minutes
@@ -94,7 +98,8 @@ class MilestoneCacheService:
         return await self.redis.set_cache(
             key,
             progress_data,
-            self.TTL_USER_PROGRESS
+            self.TTL_USER_PROGRESS,
+            tags=self._cache_tags(user_id, milestone_id)
         )
     
     async def update_milestone_progress(
@@ -113,7 +118,10 @@ class MilestoneCacheService:
         if existing:
             existing.update(updates)
             existing["updated_at"] = datetime.utcnow().isoformat()
-            return await self.redis.set_cache(key, existing, self.TTL_USER_PROGRESS)
+            return await self.redis.set_cache(
+                key, existing, self.TTL_USER_PROGRESS,
+                tags=self._cache_tags(user_id, milestone_id)
+            )
         
         return False
     
@@ -152,7 +160,8 @@ class MilestoneCacheService:
         return await self.redis.set_cache(
             key,
             tree_data,
-            self.TTL_MILESTONE_TREE
+            self.TTL_MILESTONE_TREE,
+            tags=self._cache_tags(user_id)
         )
     
     # Dependency Checking Cache
@@ -188,7 +197,8 @@ class MilestoneCacheService:
         return await self.redis.set_cache(
             key,
             data,
-            self.TTL_DEPENDENCY_CHECK
+            self.TTL_DEPENDENCY_CHECK,
+            tags=self._cache_tags(user_id, milestone_id)
         )
     
     # Real-time Progress Updates
@@ -231,7 +241,8 @@ class MilestoneCacheService:
         return await self.redis.set_cache(
             key,
             session_data,
-            self.TTL_SESSION
+            self.TTL_SESSION,
+            tags=self._cache_tags(user_id, milestone_id)
         )
     
     async def update_session_activity(
@@ -247,7 +258,10 @@ class MilestoneCacheService:
         
         if session:
             session["last_activity"] = datetime.utcnow().isoformat()
-            return await self.redis.set_cache(key, session, self.TTL_SESSION)
+            return await self.redis.set_cache(
+                key, session, self.TTL_SESSION,
+                tags=self._cache_tags(user_id, milestone_id)
+            )
         
         return False
     
@@ -345,13 +359,13 @@ class MilestoneCacheService:
         
         try:
             # Redis sorted set for leaderboard
-            await self.redis.client.zadd(key, {user_id: score})
+            await self.redis.execute("zadd", key, {user_id: score})
             
             # Set expiry for weekly/monthly leaderboards
             if leaderboard_type == "weekly":
-                await self.redis.client.expire(key, 604800)  # 7 days
+                await self.redis.execute("expire", key, 604800)  # 7 days
             elif leaderboard_type == "monthly":
-                await self.redis.client.expire(key, 2592000)  # 30 days
+                await self.redis.execute("expire", key, 2592000)  # 30 days
             
             return True
         except Exception as e:
@@ -370,8 +384,8 @@ class MilestoneCacheService:
         
         try:
             # Get top scores with users
-            results = await asyncio.to_thread(
-                self.redis.client.zrevrange,
+            results = await self.redis.execute(
+                "zrevrange",
                 key,
                 0,
                 limit - 1,
@@ -393,28 +407,22 @@ class MilestoneCacheService:
     
     # Cache Management
     
+    def _cache_tags(self, user_id: str, milestone_id: Optional[str] = None) -> List[str]:
+        """
+        Tags for a user-scoped entry, so invalidating a user or a milestone
+        only touches the keys written under it.
+        """
+        tags = [f"{self.TAG_PREFIX_USER}{user_id}"]
+        if milestone_id:
+            tags.append(f"{self.TAG_PREFIX_MILESTONE}{milestone_id}")
+        return tags
+    
     async def invalidate_user_cache(self, user_id: str) -> bool:
         """
         Invalidate all cached data for a specific user.
         """
-        patterns = [
-            f"{self.KEY_PREFIX_USER_PROGRESS}{user_id}:*",
-            f"{self.KEY_PREFIX_MILESTONE_TREE}{user_id}",
-            f"{self.KEY_PREFIX_DEPENDENCY_CHECK}{user_id}:*",
-            f"{self.KEY_PREFIX_SESSION}{user_id}:*"
-        ]
-        
         try:
-            for pattern in patterns:
-                keys = await asyncio.to_thread(
-                    self.redis.client.keys,
-                    pattern
-                )
-                if keys:
-                    await asyncio.to_thread(
-                        self.redis.client.delete,
-                        *keys
-                    )
+            await self.redis.invalidate_tags(f"{self.TAG_PREFIX_USER}{user_id}")
             return True
         except Exception as e:
             print(f"Error invalidating user cache: {e}")
@@ -424,23 +432,9 @@ class MilestoneCacheService:
         """
         Invalidate all cached data for a specific milestone.
         """
-        patterns = [
-            f"{self.KEY_PREFIX_MILESTONE_DATA}{milestone_id}",
-            f"{self.KEY_PREFIX_DEPENDENCY_CHECK}*:{milestone_id}",
-            f"{self.KEY_PREFIX_USER_PROGRESS}*:{milestone_id}"
-        ]
-        
         try:
-            for pattern in patterns:
-                keys = await asyncio.to_thread(
-                    self.redis.client.keys,
-                    pattern
-                )
-                if keys:
-                    await asyncio.to_thread(
-                        self.redis.client.delete,
-                        *keys
-                    )
+            await self.redis.invalidate_tags(f"{self.TAG_PREFIX_MILESTONE}{milestone_id}")
+            await self.redis.delete_cache(f"{self.KEY_PREFIX_MILESTONE_DATA}{milestone_id}")
             return True
         except Exception as e:
             print(f"Error invalidating milestone cache: {e}")
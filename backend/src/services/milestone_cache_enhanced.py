@@ -9,14 +9,20 @@ import json
 import asyncio
 import hashlib
 import pickle
-from typing import Optional, Dict, Any, List, Set, Union, Callable
+import sys
+import time
+from typing import Optional, Dict, Any, Iterable, List, Set, Union, Callable
 from datetime import datetime, timedelta
 from functools import wraps
 from enum import Enum
 import logging
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 
 from ..infrastructure.redis.redis_mcp import RedisMCPClient
+from ..infrastructure.cache.invalidation_bus import CacheInvalidation, CacheInvalidationBus
+from ..infrastructure.cache.stampede import SingleFlight, run_with_lease, xfetch_should_refresh
+from ..infrastructure.cache.tags import TagIndex
 from ..models.milestone import MilestoneStatus, MilestoneType
 from ..infrastructure.config.settings import settings
 
@@ -40,6 +46,168 @@ class CachePriority(Enum):
     LOW = 4  # First to evict under pressure
 
 
+class _L1Entry:
+    """A value held in the L1 cache with its bookkeeping"""
+    __slots__ = ("value", "expires_at", "size", "access_count")
+    
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.access_count = 0
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory size of a cached value without serializing it.
+    Containers count their own footprint plus their direct items.
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for item_key, item in value.items():
+            size += sys.getsizeof(item_key) + sys.getsizeof(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += sys.getsizeof(item)
+    return size
+
+
+class PriorityLRUCache:
+    """
+    Priority-segmented LRU cache with TTL expiry.
+    
+    Each CachePriority has its own insertion-ordered segment, so lookups,
+    inserts and evictions are O(1): eviction takes the least recently used
+    entry of the lowest-priority non-empty segment. The cache is bounded by
+    entry count, and additionally by total bytes when ``max_bytes`` is set.
+    Entries may carry tags so related keys can be dropped together.
+    """
+    
+    # Segments in eviction order, lowest priority first
+    EVICTION_ORDER = sorted(CachePriority, key=lambda p: p.value, reverse=True)
+    
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None):
+        self._segments: Dict[CachePriority, OrderedDict] = {
+            priority: OrderedDict() for priority in self.EVICTION_ORDER
+        }
+        self._priorities: Dict[str, CachePriority] = {}
+        self._tags = TagIndex()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+    
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+    
+    @max_entries.setter
+    def max_entries(self, value: int) -> None:
+        self._max_entries = value
+        self._evict_to_bounds()
+    
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self._max_bytes
+    
+    @max_bytes.setter
+    def max_bytes(self, value: Optional[int]) -> None:
+        self._max_bytes = value
+        self._evict_to_bounds()
+    
+    def __len__(self) -> int:
+        return len(self._priorities)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._priorities
+    
+    def keys(self) -> List[str]:
+        return list(self._priorities)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value and mark it most recently used"""
+        priority = self._priorities.get(key)
+        if priority is None:
+            return None
+        
+        segment = self._segments[priority]
+        entry = segment[key]
+        if time.monotonic() > entry.expires_at:
+            self.delete(key)
+            return None
+        
+        segment.move_to_end(key)
+        entry.access_count += 1
+        return entry.value
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        priority: CachePriority = CachePriority.MEDIUM,
+        size: Optional[int] = None,
+        tags: Optional[Set[str]] = None
+    ) -> int:
+        """Insert or replace a value; returns the number of entries evicted"""
+        self.delete(key)
+        if tags:
+            self._tags.add(key, tags)
+        
+        entry = _L1Entry(
+            value,
+            time.monotonic() + ttl,
+            size if size is not None else _estimate_size(value)
+        )
+        self._segments[priority][key] = entry
+        self._priorities[key] = priority
+        self.total_bytes += entry.size
+        
+        return self._evict_to_bounds()
+    
+    def delete(self, key: str) -> bool:
+        priority = self._priorities.pop(key, None)
+        if priority is None:
+            return False
+        entry = self._segments[priority].pop(key)
+        self._tags.discard(key)
+        self.total_bytes -= entry.size
+        return True
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry tagged with any of ``tags``"""
+        return sum(1 for key in self._tags.pop(*tags) if self.delete(key))
+    
+    def clear(self) -> None:
+        for segment in self._segments.values():
+            segment.clear()
+        self._priorities.clear()
+        self._tags.clear()
+        self.total_bytes = 0
+    
+    def _over_bounds(self) -> bool:
+        if len(self._priorities) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self.total_bytes > self._max_bytes
+    
+    def _evict_to_bounds(self) -> int:
+        evicted = 0
+        while self._priorities and self._over_bounds():
+            for priority in self.EVICTION_ORDER:
+                segment = self._segments[priority]
+                if segment:
+                    key, entry = segment.popitem(last=False)
+                    del self._priorities[key]
+                    self._tags.discard(key)
+                    self.total_bytes -= entry.size
+                    evicted += 1
+                    break
+        self.evictions += evicted
+        return evicted
+
+
 class EnhancedMilestoneCacheService:
     """
     Enhanced caching service with advanced features:
@@ -67,6 +235,19 @@ class EnhancedMilestoneCacheService:
     KEY_REAL_TIME_UPDATE = f"{KEY_PREFIX}rt:update:"
     KEY_BATCH_OPERATION = f"{KEY_PREFIX}batch:"
     
+    # Invalidation bus namespace shared by every process's L1 cache
+    INVALIDATION_NAMESPACE = "milestone_l1"
+    
+    # Keys laid out as "{prefix}{user_id}" or "{prefix}{user_id}:{milestone_id}",
+    # tagged with their user (and milestone) for invalidation
+    USER_SCOPED_PREFIXES = (
+        KEY_USER_PROGRESS,
+        KEY_MILESTONE_TREE,
+        KEY_DEPENDENCY_STATUS,
+        KEY_SESSION,
+        KEY_REAL_TIME_UPDATE,
+    )
+    
     # Enhanced TTL settings with dynamic adjustment
     BASE_TTL = {
         CachePriority.CRITICAL: 7200,  # 2 hours
@@ -94,18 +275,25 @@ class EnhancedMilestoneCacheService:
         redis_client: RedisMCPClient,
         enable_l1_cache: bool = True,
         enable_compression: bool = True,
-        enable_metrics: bool = True
+        enable_metrics: bool = True,
+        l1_max_bytes: Optional[int] = None,
+        invalidation_bus: Optional[CacheInvalidationBus] = None
     ):
-        """Initialize the enhanced cache service"""
+        """
+        Initialize the enhanced cache service.
+        
+        The L1 cache holds up to 1000 entries; passing ``l1_max_bytes``
+        additionally bounds it by estimated memory use. With an
+        ``invalidation_bus``, Redis writes and invalidations are broadcast so
+        other processes drop the matching L1 entries.
+        """
         self.redis = redis_client
         self.enable_l1_cache = enable_l1_cache
         self.enable_compression = enable_compression
         self.enable_metrics = enable_metrics
         
         # L1 Memory cache for ultra-fast access
-        self._l1_cache: Dict[str, Any] = {}
-        self._l1_cache_metadata: Dict[str, Dict] = {}
-        self._l1_max_size = 1000
+        self._l1_cache = PriorityLRUCache(max_entries=1000, max_bytes=l1_max_bytes)
         
         # Metrics tracking
         self._metrics = {
@@ -116,9 +304,18 @@ class EnhancedMilestoneCacheService:
             "writes": 0,
             "errors": 0,
             "evictions": 0,
+            "early_refreshes": 0,
             "compression_ratio": 0.0,
         }
         
+        # Concurrent misses for the same cached call share one computation
+        self._single_flight = SingleFlight()
+        
+        # Cross-process L1 coherence
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.register(self.INVALIDATION_NAMESPACE, self._apply_invalidation)
+        
         # Circuit breaker state
         self._circuit_breaker_failures = 0
         self._circuit_breaker_threshold = 5
@@ -130,26 +327,37 @@ class EnhancedMilestoneCacheService:
         
     # ==================== L1 Memory Cache Management ====================
     
+    @property
+    def _l1_max_size(self) -> int:
+        """Maximum number of L1 entries"""
+        return self._l1_cache.max_entries
+    
+    @_l1_max_size.setter
+    def _l1_max_size(self, value: int) -> None:
+        evictions = self._l1_cache.evictions
+        self._l1_cache.max_entries = value
+        self._metrics["evictions"] += self._l1_cache.evictions - evictions
+    
+    @property
+    def _l1_max_bytes(self) -> Optional[int]:
+        """Memory bound for the L1 cache, or None when bounded by entries only"""
+        return self._l1_cache.max_bytes
+    
+    @_l1_max_bytes.setter
+    def _l1_max_bytes(self, value: Optional[int]) -> None:
+        evictions = self._l1_cache.evictions
+        self._l1_cache.max_bytes = value
+        self._metrics["evictions"] += self._l1_cache.evictions - evictions
+    
     def _l1_get(self, key: str) -> Optional[Any]:
         """Get from L1 memory cache"""
         if not self.enable_l1_cache:
             return None
-            
-        if key in self._l1_cache:
-            metadata = self._l1_cache_metadata[key]
-            
-            # Check if expired
-            if datetime.utcnow() > metadata["expires_at"]:
-                del self._l1_cache[key]
-                del self._l1_cache_metadata[key]
-                return None
-            
-            # Update access count and time
-            metadata["access_count"] += 1
-            metadata["last_accessed"] = datetime.utcnow()
-            
+        
+        value = self._l1_cache.get(key)
+        if value is not None:
             self._metrics["l1_hits"] += 1
-            return self._l1_cache[key]
+            return value
         
         self._metrics["l1_misses"] += 1
         return None
@@ -161,51 +369,62 @@ class EnhancedMilestoneCacheService:
         ttl: int,
         priority: CachePriority = CachePriority.MEDIUM
     ) -> None:
-        """Set in L1 memory cache with eviction if needed"""
+        """Set in L1 memory cache, evicting the lowest-priority LRU entries if needed"""
         if not self.enable_l1_cache:
             return
         
-        # Evict if at capacity
-        if len(self._l1_cache) >= self._l1_max_size:
-            self._l1_evict()
-        
-        self._l1_cache[key] = value
-        self._l1_cache_metadata[key] = {
-            "expires_at": datetime.utcnow() + timedelta(seconds=ttl),
-            "priority": priority,
-            "access_count": 0,
-            "last_accessed": datetime.utcnow(),
-            "size": len(json.dumps(value) if isinstance(value, (dict, list)) else str(value))
-        }
-    
-    def _l1_evict(self) -> None:
-        """Evict least recently used items from L1 cache based on priority"""
-        if not self._l1_cache:
-            return
-        
-        # Sort by priority and last accessed time
-        items = sorted(
-            self._l1_cache_metadata.items(),
-            key=lambda x: (x[1]["priority"].value, x[1]["last_accessed"])
+        self._metrics["evictions"] += self._l1_cache.set(
+            key, value, ttl, priority, tags=self._tags_for_key(key)
         )
-        
-        # Evict bottom 10%
-        evict_count = max(1, len(items) // 10)
-        for key, _ in items[:evict_count]:
-            del self._l1_cache[key]
-            del self._l1_cache_metadata[key]
-            self._metrics["evictions"] += 1
     
-    def _l1_invalidate(self, pattern: str) -> None:
-        """Invalidate L1 cache entries matching pattern"""
-        keys_to_delete = [
-            key for key in self._l1_cache.keys()
-            if pattern in key or key.startswith(pattern)
-        ]
+    # ==================== Cache Tags ====================
+    
+    def _user_tag(self, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}user:{user_id}"
+    
+    def _user_milestone_tag(self, user_id: str, milestone_id: str) -> str:
+        return f"{self.KEY_PREFIX}user:{user_id}:milestone:{milestone_id}"
+    
+    def _tags_for_key(self, key: str) -> Set[str]:
+        """
+        Invalidation tags for a cache key, derived from the key layout so
+        every write path registers them in both tiers
+        """
+        for prefix in self.USER_SCOPED_PREFIXES:
+            if key.startswith(prefix):
+                user_id, _, milestone_id = key[len(prefix):].partition(":")
+                tags = {self._user_tag(user_id)}
+                if milestone_id:
+                    tags.add(self._user_milestone_tag(user_id, milestone_id))
+                return tags
+        
+        return set()
+    
+    async def _invalidate_tags(self, *tags: str) -> int:
+        """Drop every key registered under ``tags`` from L1 and Redis"""
+        count = self._l1_cache.invalidate_tags(*tags)
+        self._publish_invalidation(tags=tags)
+        if not self._is_circuit_open():
+            count = max(count, await self.redis.invalidate_tags(*tags))
+        return count
+    
+    # ==================== Cross-process Invalidation ====================
+    
+    def _publish_invalidation(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        """Tell other processes to drop these keys/tags from their L1"""
+        if self._invalidation_bus is not None and self.enable_l1_cache:
+            self._invalidation_bus.publish(self.INVALIDATION_NAMESPACE, keys=keys, tags=tags)
+    
+    def _apply_invalidation(self, invalidation: CacheInvalidation) -> None:
+        """Drop L1 entries written or invalidated by another process"""
+        if invalidation.flush:
+            self._l1_cache.clear()
+            return
         
-        for key in keys_to_delete:
-            del self._l1_cache[key]
-            del self._l1_cache_metadata[key]
+        for key in invalidation.keys:
+            self._l1_cache.delete(key)
+        if invalidation.tags:
+            self._l1_cache.invalidate_tags(*invalidation.tags)
     
     # ==================== User Progress Caching ====================
     
@@ -500,8 +719,10 @@ class EnhancedMilestoneCacheService:
             updates = await self._safe_redis_get(rt_key) or []
         else:
             # Get all milestone updates for user
-            pattern = f"{self.KEY_REAL_TIME_UPDATE}{user_id}:*"
-            keys = await self._safe_redis_keys(pattern)
+            keys = [
+                key for key in await self._safe_redis_tag_members(self._user_tag(user_id))
+                if key.startswith(f"{self.KEY_REAL_TIME_UPDATE}{user_id}:")
+            ]
             updates = []
             for key in keys:
                 milestone_updates = await self._safe_redis_get(key) or []
@@ -594,25 +815,12 @@ class EnhancedMilestoneCacheService:
         cascade: bool = True
     ) -> bool:
         """
-        Invalidate all cache entries for a user with cascade option
+        Invalidate all cache entries for a user with cascade option.
+        Progress, tree, dependency status, session and real-time keys are
+        all tagged with the user, so no keyspace scan is needed.
         """
-        patterns = [
-            f"{self.KEY_USER_PROGRESS}{user_id}:*",
-            f"{self.KEY_MILESTONE_TREE}{user_id}",
-            f"{self.KEY_DEPENDENCY_STATUS}{user_id}:*",
-            f"{self.KEY_SESSION}{user_id}:*",
-            f"{self.KEY_REAL_TIME_UPDATE}{user_id}:*",
-        ]
-        
         try:
-            for pattern in patterns:
-                # Invalidate L1 cache
-                self._l1_invalidate(pattern)
-                
-                # Invalidate Redis cache
-                keys = await self._safe_redis_keys(pattern)
-                if keys:
-                    await self._safe_redis_delete(*keys)
+            await self._invalidate_tags(self._user_tag(user_id))
             
             # Cascade to related caches if requested
             if cascade:
@@ -632,19 +840,11 @@ class EnhancedMilestoneCacheService:
         """
         Invalidate cache for a specific milestone
         """
-        keys = [
-            f"{self.KEY_USER_PROGRESS}{user_id}:{milestone_id}",
-            f"{self.KEY_DEPENDENCY_STATUS}{user_id}:{milestone_id}",
-            f"{self.KEY_REAL_TIME_UPDATE}{user_id}:{milestone_id}",
-        ]
-        
-        for key in keys:
-            self._l1_invalidate(key)
-            await self._safe_redis_delete(key)
+        await self._invalidate_tags(self._user_milestone_tag(user_id, milestone_id))
         
         # Also invalidate the full tree cache as it contains this milestone
         tree_key = f"{self.KEY_MILESTONE_TREE}{user_id}"
-        self._l1_invalidate(tree_key)
+        self._l1_cache.delete(tree_key)
         await self._safe_redis_delete(tree_key)
         
         return True
@@ -691,7 +891,13 @@ class EnhancedMilestoneCacheService:
         
         try:
             async with self.connection_pool() as redis:
-                return await redis.set_cache(key, value, ttl)
+                tags = self._tags_for_key(key)
+                if tags:
+                    result = await redis.set_cache(key, value, ttl, tags=tags)
+                else:
+                    result = await redis.set_cache(key, value, ttl)
+                self._publish_invalidation(keys=[key])
+                return result
         except Exception as e:
             self._handle_redis_error(e)
             return False
@@ -704,6 +910,7 @@ class EnhancedMilestoneCacheService:
             return False
         
         try:
+            self._publish_invalidation(keys=keys)
             async with self.connection_pool() as redis:
                 tasks = [redis.delete_cache(key) for key in keys]
                 results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -712,21 +919,18 @@ class EnhancedMilestoneCacheService:
             self._handle_redis_error(e)
             return False
     
-    async def _safe_redis_keys(self, pattern: str) -> List[str]:
+    async def _safe_redis_tag_members(self, tag: str) -> Set[str]:
         """
-        Safe Redis keys lookup with circuit breaker
+        Safe Redis tag lookup with circuit breaker
         """
         if self._is_circuit_open():
-            return []
+            return set()
         
         try:
-            return await asyncio.to_thread(
-                self.redis.client.keys,
-                pattern
-            )
+            return await self.redis.tag_members(tag)
         except Exception as e:
             self._handle_redis_error(e)
-            return []
+            return set()
     
     # ==================== Circuit Breaker ====================
     
@@ -798,8 +1002,8 @@ class EnhancedMilestoneCacheService:
         Increment and return access counter
         """
         try:
-            return await asyncio.to_thread(
-                self.redis.client.incr,
+            return await self.redis.execute(
+                "incr",
                 f"{key}:counter"
             )
         except:
@@ -861,8 +1065,8 @@ class EnhancedMilestoneCacheService:
         for lb_type in leaderboard_types:
             key = f"{self.KEY_LEADERBOARD}{lb_type}"
             try:
-                await asyncio.to_thread(
-                    self.redis.client.zrem,
+                await self.redis.execute(
+                    "zrem",
                     key,
                     user_id
                 )
@@ -905,16 +1109,17 @@ class EnhancedMilestoneCacheService:
             "l1_hit_rate": (self._metrics["l1_hits"] / total_l1 * 100) if total_l1 > 0 else 0,
             "l2_hit_rate": (self._metrics["l2_hits"] / total_l2 * 100) if total_l2 > 0 else 0,
             "l1_cache_size": len(self._l1_cache),
-            "l1_cache_memory": sum(
-                meta["size"] for meta in self._l1_cache_metadata.values()
-            ),
+            "l1_cache_memory": self._l1_cache.total_bytes,
+            "l1_cache_max_entries": self._l1_cache.max_entries,
+            "l1_cache_max_bytes": self._l1_cache.max_bytes,
+            "coalesced": self._single_flight.coalesced,
             "circuit_breaker_state": "open" if self._is_circuit_open() else "closed",
             "circuit_breaker_failures": self._circuit_breaker_failures,
         }
         
         # Get Redis info
         try:
-            redis_info = await asyncio.to_thread(self.redis.client.info, "memory")
+            redis_info = await self.redis.execute("info", "memory")
             metrics["redis_memory_used"] = redis_info.get("used_memory_human", "N/A")
             metrics["redis_memory_peak"] = redis_info.get("used_memory_peak_human", "N/A")
         except:
@@ -934,8 +1139,10 @@ class EnhancedMilestoneCacheService:
             "writes": 0,
             "errors": 0,
             "evictions": 0,
+            "early_refreshes": 0,
             "compression_ratio": 0.0,
         }
+        self._single_flight.coalesced = 0
 
 
 # ==================== Cache Decorators ====================
@@ -944,10 +1151,18 @@ def cached(
     ttl: int = 3600,
     key_prefix: str = "",
     priority: CachePriority = CachePriority.MEDIUM,
-    strategy: CacheStrategy = CacheStrategy.TIME_BASED
+    strategy: CacheStrategy = CacheStrategy.TIME_BASED,
+    beta: float = 1.0,
+    lease: bool = False
 ):
     """
-    Decorator for caching function results with configurable strategy
+    Decorator for caching function results with configurable strategy.
+    
+    Concurrent misses for the same key run the function once. With
+    REFRESH_AHEAD, entries are refreshed in the background using
+    probabilistic early expiration (XFetch) driven by how long the function
+    took to compute; ``beta`` above 1 refreshes earlier. ``lease`` guards
+    misses with a Redis lease so only one process recomputes a key.
     """
     def decorator(func: Callable):
         @wraps(func)
@@ -958,65 +1173,102 @@ def cached(
                 f"{str(args)}:{str(kwargs)}".encode()
             ).hexdigest()
             
-            # Try to get from cache
-            if hasattr(self, 'cache_service'):
-                cache_service = self.cache_service
+            if not hasattr(self, 'cache_service'):
+                return await func(self, *args, **kwargs)
+            
+            cache_service = self.cache_service
+            single_flight = cache_service._single_flight
+            
+            async def compute():
+                started = time.perf_counter()
+                result = await func(self, *args, **kwargs)
+                if result is not None:
+                    await _store_result(
+                        cache_service, cache_key, result, ttl, priority,
+                        time.perf_counter() - started
+                    )
+                return result
+            
+            # Check cache based on strategy
+            if strategy in [CacheStrategy.TIME_BASED, CacheStrategy.REFRESH_AHEAD]:
+                cached_result = cache_service._l1_get(cache_key)
+                if not cached_result:
+                    cached_result = await cache_service._safe_redis_get(cache_key)
                 
-                # Check cache based on strategy
-                if strategy in [CacheStrategy.TIME_BASED, CacheStrategy.REFRESH_AHEAD]:
-                    cached_result = cache_service._l1_get(cache_key)
-                    if not cached_result:
-                        cached_result = await cache_service._safe_redis_get(cache_key)
+                if cached_result:
+                    if not isinstance(cached_result, dict):
+                        return cached_result
+                    
+                    # Check if refresh-ahead is needed
+                    if (
+                        strategy == CacheStrategy.REFRESH_AHEAD
+                        and not single_flight.in_flight(cache_key)
+                        and _should_refresh_ahead(cached_result, ttl, beta)
+                    ):
+                        cache_service._metrics["early_refreshes"] += 1
+                        asyncio.create_task(
+                            _background_refresh(single_flight, cache_key, compute)
+                        )
                     
-                    if cached_result:
-                        # Check if refresh-ahead is needed
-                        if strategy == CacheStrategy.REFRESH_AHEAD:
-                            cached_time = datetime.fromisoformat(
-                                cached_result.get("cached_at", datetime.utcnow().isoformat())
-                            )
-                            if (datetime.utcnow() - cached_time).seconds > (ttl * 0.8):
-                                # Schedule background refresh
-                                asyncio.create_task(
-                                    _background_refresh(func, self, args, kwargs, cache_key, ttl, priority)
-                                )
-                        
-                        return cached_result.get("result") if isinstance(cached_result, dict) else cached_result
+                    return cached_result.get("result")
             
-            # Execute function
-            result = await func(self, *args, **kwargs)
+            if not lease:
+                return await single_flight.do(cache_key, compute)
             
-            # Cache result
-            if hasattr(self, 'cache_service') and result is not None:
-                cache_data = {
-                    "result": result,
-                    "cached_at": datetime.utcnow().isoformat()
-                }
-                
-                await cache_service._safe_redis_set(cache_key, cache_data, ttl)
-                cache_service._l1_set(cache_key, cache_data, ttl, priority)
+            async def read_fresh():
+                fresh = await cache_service._safe_redis_get(cache_key)
+                return fresh.get("result") if isinstance(fresh, dict) else fresh
             
-            return result
+            async def compute_under_lease():
+                # Same shape as ``compute``: refreshes share this flight key
+                result, _ = await run_with_lease(cache_service.redis, cache_key, compute, read_fresh)
+                return result
+            
+            return await single_flight.do(cache_key, compute_under_lease)
         
         return wrapper
     return decorator
 
 
-async def _background_refresh(func, self, args, kwargs, cache_key, ttl, priority):
+async def _store_result(cache_service, cache_key, result, ttl, priority, delta):
+    """
+    Cache a computed result with the metadata used for early refresh
+    """
+    cache_data = {
+        "result": result,
+        "cached_at": datetime.utcnow().isoformat(),
+        "delta": delta,
+        "expires_at": time.time() + ttl,
+    }
+    
+    await cache_service._safe_redis_set(cache_key, cache_data, ttl)
+    cache_service._l1_set(cache_key, cache_data, ttl, priority)
+
+
+def _should_refresh_ahead(cached_result: Dict[str, Any], ttl: int, beta: float) -> bool:
+    """
+    XFetch check for a cached envelope; entries written before the envelope
+    carried timing metadata fall back to refreshing after 80% of the TTL
+    """
+    if "expires_at" in cached_result:
+        return xfetch_should_refresh(
+            cached_result.get("delta", 0.0),
+            cached_result["expires_at"],
+            beta=beta
+        )
+    
+    cached_time = datetime.fromisoformat(
+        cached_result.get("cached_at", datetime.utcnow().isoformat())
+    )
+    return (datetime.utcnow() - cached_time).total_seconds() > (ttl * 0.8)
+
+
+async def _background_refresh(single_flight: SingleFlight, cache_key: str, compute: Callable):
     """
     Background refresh for refresh-ahead strategy
     """
     try:
-        result = await func(self, *args, **kwargs)
-        if result is not None:
-            cache_data = {
-                "result": result,
-                "cached_at": datetime.utcnow().isoformat()
-            }
-            
-            if hasattr(self, 'cache_service'):
-                cache_service = self.cache_service
-                await cache_service._safe_redis_set(cache_key, cache_data, ttl)
-                cache_service._l1_set(cache_key, cache_data, ttl, priority)
+        await single_flight.do(cache_key, compute)
     except Exception as e:
         logger.error(f"Background refresh failed: {e}")
 
@@ -13,8 +13,8 @@ from unittest.mock import AsyncMock, Mock, patch
 from typing import Dict, Any, List
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from src.models.citation import (
     Citation, CitationUsage, AccuracyTracking, VerificationLog,
@@ -25,17 +25,20 @@ from src.api.v1.citations import router
 from src.core.exceptions import ServiceUnavailableError
 
 
-@pytest.fixture(scope="session")
-def integration_db():
-    """Create in-memory database for integration tests."""
-    engine = create_engine("sqlite:///:memory:", echo=False)
+@pytest.fixture
+async def integration_db():
+    """Create in-memory async database for integration tests."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
     
     # Import and create all tables
     from src.models.base import Base
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    async with SessionLocal() as session:
+        yield session
+    await engine.dispose()
 
 
 @pytest.fixture
@@ -214,7 +217,7 @@ class TestCitationWorkflowIntegration:
         await service.submit_accuracy_feedback(citation.id, community_feedback, evaluators[3])
         
         # Step 4: Verify integrated state
-        db.refresh(citation)
+        await db.refresh(citation)
         
         # Check citation scores were updated
         assert citation.accuracy_score == 0.95
@@ -230,26 +233,26 @@ class TestCitationWorkflowIntegration:
         assert citation.last_used is not None
         
         # Step 5: Verify verification log was created
-        verification_logs = db.query(VerificationLog).filter(
+        verification_logs = (await db.execute(select(VerificationLog).where(
             VerificationLog.citation_id == citation.id
-        ).all()
+        ))).scalars().all()
         assert len(verification_logs) == 1
         assert verification_logs[0].status == "success"
         assert verification_logs[0].content_matched is True
         
         # Step 6: Verify all usage records
-        usage_records = db.query(CitationUsage).filter(
+        usage_records = (await db.execute(select(CitationUsage).where(
             CitationUsage.citation_id == citation.id
-        ).all()
+        ))).scalars().all()
         assert len(usage_records) == 3
         
         content_types = {usage.content_type for usage in usage_records}
         assert content_types == {ContentType.RESEARCH, ContentType.ANALYSIS, ContentType.SUMMARY}
         
         # Step 7: Verify accuracy tracking records
-        accuracy_records = db.query(AccuracyTracking).filter(
+        accuracy_records = (await db.execute(select(AccuracyTracking).where(
             AccuracyTracking.citation_id == citation.id
-        ).all()
+        ))).scalars().all()
         assert len(accuracy_records) == 4
         
         feedback_types = {record.feedback_type for record in accuracy_records}
@@ -326,7 +326,7 @@ class TestCitationSystemWithMCP:
             overall_quality_score=0.85
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Calculate metrics
         metrics = await accuracy_tracker.calculate_accuracy_metrics(citation.id)
@@ -358,7 +358,7 @@ class TestCitationSystemWithMCP:
         
         for citation in citations:
             test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Check system accuracy
         status = await accuracy_tracker.check_system_accuracy()
@@ -394,14 +394,14 @@ class TestCitationSystemWithMCP:
         
         test_db.add(stale_citation)
         test_db.add(fresh_citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Process stale verifications
         await accuracy_tracker.process_stale_verifications()
         
         # Check that stale citation is marked for reverification
-        test_db.refresh(stale_citation)
-        test_db.refresh(fresh_citation)
+        await test_db.refresh(stale_citation)
+        await test_db.refresh(fresh_citation)
         
         assert stale_citation.verification_status == VerificationStatus.STALE
         assert stale_citation.requires_reverification is True
@@ -426,13 +426,13 @@ class TestCitationSystemWithMCP:
         )
         
         test_db.add(low_accuracy_citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Check individual citations
         await accuracy_tracker.check_individual_citations()
         
         # Verify that citation is marked for reverification
-        test_db.refresh(low_accuracy_citation)
+        await test_db.refresh(low_accuracy_citation)
         assert low_accuracy_citation.requires_reverification is True
 
 
@@ -36,6 +36,11 @@ async def redis_client():
     client.client.zrevrange = Mock(return_value=[])
     client.client.incr = Mock(return_value=1)
     client.client.info = Mock(return_value={"used_memory_human": "100MB"})
+
+    # Generic command passthrough routes to the raw client mocks
+    client.execute = AsyncMock(
+        side_effect=lambda command, *args, **kwargs: getattr(client.client, command)(*args, **kwargs)
+    )
     return client
 
 
@@ -260,21 +265,15 @@ class TestEnhancedCacheService:
         """Test cascading cache invalidation"""
         user_id = "user123"
         
-        # Mock keys to invalidate
-        redis_client.client.keys.side_effect = [
-            [f"v2:milestone:progress:user:{user_id}:m1"],
-            [f"v2:milestone:tree:user:{user_id}"],
-            [f"v2:milestone:deps:status:{user_id}:m1"],
-            [],
-            []
-        ]
+        redis_client.invalidate_tags = AsyncMock(return_value=3)
         
         # Invalidate with cascade
         success = await cache_service.invalidate_user_cache(user_id, cascade=True)
         assert success
         
-        # Verify patterns were searched
-        assert redis_client.client.keys.call_count >= 4
+        # Verify a single tag invalidation replaced the pattern scans
+        redis_client.invalidate_tags.assert_called_once_with(f"v2:milestone:user:{user_id}")
+        redis_client.client.keys.assert_not_called()
     
     async def test_circuit_breaker(self, cache_service, redis_client):
         """Test circuit breaker pattern"""
@@ -0,0 +1,128 @@
+"""
+Performance Benchmark for Concurrent Citation Search
+
+Measures /citations/search throughput (``CitationService.search_citations``)
+under concurrent load, and per-request latency, for three session setups:
+
+- a blocking session, standing in for the previous synchronous driver that
+  held the event loop for every round trip;
+- a single ``AsyncSession`` per request (count and page run back to back);
+- an ``AsyncSession`` plus a session factory, so the count and page queries
+  of each request run concurrently on separate connections.
+
+Database round trips are simulated with a fixed latency so the comparison
+reflects how the service schedules its queries rather than local SQL speed.
+"""
+
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from src.services.citation_service import CitationService, CitationSearchParams
+
+
+DB_LATENCY = 0.005
+TOTAL_REQUESTS = 200
+CONCURRENCY = 50
+PAGE_SIZE = 20
+
+
+class _SimulatedSession:
+    """Session stub whose ``execute`` costs one database round trip."""
+
+    def __init__(self, blocking: bool = False):
+        self.blocking = blocking
+
+    async def execute(self, statement):
+        if self.blocking:
+            time.sleep(DB_LATENCY)
+        else:
+            await asyncio.sleep(DB_LATENCY)
+
+        if getattr(statement.selected_columns[0], "name", None) == "count":
+            rows = [(TOTAL_REQUESTS * PAGE_SIZE,)]
+        else:
+            rows = [(object(),) for _ in range(PAGE_SIZE)]
+        return IteratorResult(SimpleResultMetaData(["value"]), iter(rows))
+
+
+def _session_factory():
+    @asynccontextmanager
+    async def factory():
+        yield _SimulatedSession()
+    return factory
+
+
+async def _run_searches(service: CitationService, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def search(i: int) -> None:
+        async with slots:
+            start = time.perf_counter()
+            citations, total = await service.search_citations(
+                CitationSearchParams(query=f"market {i % 10}", limit=PAGE_SIZE)
+            )
+            latencies.append(time.perf_counter() - start)
+        assert len(citations) == PAGE_SIZE and total > 0
+
+    started = time.perf_counter()
+    await asyncio.gather(*(search(i) for i in range(TOTAL_REQUESTS)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests_per_sec": TOTAL_REQUESTS / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def _services() -> Dict[str, CitationService]:
+    return {
+        "blocking session": CitationService(
+            db=_SimulatedSession(blocking=True), cache_manager=MagicMock()
+        ),
+        "async session": CitationService(
+            db=_SimulatedSession(), cache_manager=MagicMock()
+        ),
+        "async + session factory": CitationService(
+            db=_SimulatedSession(),
+            cache_manager=MagicMock(),
+            session_factory=_session_factory()
+        ),
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_concurrent_search_throughput():
+    """Async sessions should multiply concurrent search throughput."""
+    results = {
+        name: await _run_searches(service, CONCURRENCY)
+        for name, service in _services().items()
+    }
+    # One request at a time isolates per-request latency, where running the
+    # count and page queries side by side saves a full round trip.
+    sequential = {
+        name: await _run_searches(service, 1)
+        for name, service in _services().items()
+    }
+
+    print("\n=== Citation search ===")
+    print(f"{TOTAL_REQUESTS} requests, {DB_LATENCY * 1000:.0f}ms per round trip")
+    for label, runs in ((f"concurrency {CONCURRENCY}", results), ("sequential", sequential)):
+        print(label)
+        for name, stats in runs.items():
+            print(f"{name:>26}: {stats['requests_per_sec']:8.0f} req/s  "
+                  f"mean {stats['mean_ms']:7.2f}ms  max {stats['max_ms']:7.2f}ms")
+
+    assert (results["async session"]["requests_per_sec"]
+            > results["blocking session"]["requests_per_sec"] * 5)
+    assert (sequential["async + session factory"]["mean_ms"]
+            < sequential["async session"]["mean_ms"] * 0.75)
@@ -0,0 +1,98 @@
+"""
+Performance Benchmark for the Context Manager Registry
+
+Touches 100k user sessions, each holding a few KB of context, through the
+previous unbounded module-level dict and through a registry capped at 2,000
+managers, comparing the memory each keeps alive and the lookup rate.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+
+from src.services.context.registry import ContextManagerRegistry
+
+
+SESSIONS = 100_000
+CAPACITY = 2_000
+
+
+class _NullStore:
+    async def get_bytes(self, key):
+        return None
+
+    async def set_bytes(self, key, value, expiry=None):
+        return True
+
+    async def delete_cache(self, key):
+        return False
+
+
+class _Manager:
+    def __init__(self, user_id, session_id):
+        self.user_id = user_id
+        self.session_id = session_id
+        self.messages = []
+
+    async def initialize(self):
+        self.messages = [f"message {i} from {self.user_id}" * 4 for i in range(20)]
+        return True
+
+    async def persist_all(self):
+        return True
+
+    def export_state(self):
+        return {}
+
+
+async def _previous_get(managers, user_id, session_id):
+    """The previous algorithm, kept here as the baseline."""
+    key = f"{user_id}:{session_id}"
+    if key not in managers:
+        manager = _Manager(user_id=user_id, session_id=session_id)
+        await manager.initialize()
+        managers[key] = manager
+    return managers[key]
+
+
+async def _touch_all(get):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for user in range(SESSIONS):
+        await get(f"user{user}", "default")
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, SESSIONS / elapsed
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_memory_stays_flat_with_100k_sessions():
+    """The registry should hold CAPACITY managers, not one per session."""
+    managers = {}
+    previous_bytes, previous_rate = await _touch_all(
+        lambda user_id, session_id: _previous_get(managers, user_id, session_id)
+    )
+
+    registry = ContextManagerRegistry(
+        redis_client=_NullStore(), max_managers=CAPACITY, manager_factory=_Manager
+    )
+
+    async def get(user_id, session_id):
+        manager = await registry.get(user_id, session_id)
+        await asyncio.sleep(0)  # let retirements run, as between requests
+        return manager
+
+    registry_bytes, registry_rate = await _touch_all(get)
+    await registry.close()
+
+    print(f"\n=== {SESSIONS} sessions ===")
+    print(f"{'dict':>10}: {previous_bytes / 2**20:8.1f} MB, {previous_rate:10.0f} lookups/s")
+    print(f"{'registry':>10}: {registry_bytes / 2**20:8.1f} MB, {registry_rate:10.0f} lookups/s")
+
+    assert len(managers) == SESSIONS
+    assert registry.metrics["evicted"] == SESSIONS - CAPACITY
+    assert registry_bytes * 10 < previous_bytes
@@ -0,0 +1,65 @@
+"""
+Performance Benchmark for the In-Memory Context Vector Index
+
+Measures relevance-query latency of ContextVectorIndex at per-user sizes
+(1536-dim embeddings), exhaustive below the IVF threshold and partitioned
+above it, and how often a query finds the entry it was derived from.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.services.context.vector_index import ContextVectorIndex
+
+
+DIMENSIONS = 1536
+QUERIES = 200
+LIMIT = 10
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("count", [500, 5_000, 20_000])
+def test_context_index_query_latency(count):
+    """Per-user relevance queries should answer well under a millisecond."""
+    rng = np.random.default_rng(count)
+    vectors = rng.standard_normal((count, DIMENSIONS)).astype(np.float32)
+    sources = rng.choice(count, QUERIES)
+    queries = vectors[sources] + 0.05 * rng.standard_normal(
+        (QUERIES, DIMENSIONS)
+    ).astype(np.float32)
+
+    index = ContextVectorIndex()
+    exact = ContextVectorIndex(ivf_threshold=count + 1)
+    started = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        index.add(f"v{i}", vector)
+    add_us = (time.perf_counter() - started) / count * 1e6
+    for i, vector in enumerate(vectors):
+        exact.add(f"v{i}", vector)
+
+    def time_queries(target):
+        started = time.perf_counter()
+        results = [target.search(query, LIMIT) for query in queries]
+        return results, (time.perf_counter() - started) / QUERIES * 1e3
+
+    results, query_ms = time_queries(index)
+    _, exact_ms = time_queries(exact)
+    hit_rate = np.mean([
+        bool(result) and result[0][0] == f"v{source}"
+        for result, source in zip(results, sources.tolist())
+    ])
+
+    print(f"\n=== Context vector index, {count} entries ({DIMENSIONS} dims) ===")
+    print(f"  partitioned: {index.is_partitioned}")
+    print(f"  add:         {add_us:8.1f} us/vector")
+    print(f"  query:       {query_ms:8.3f} ms")
+    print(f"  exact query: {exact_ms:8.3f} ms")
+    print(f"  top-1 hit rate: {hit_rate:.3f}")
+
+    assert hit_rate >= 0.95
+    if index.is_partitioned:
+        assert query_ms < exact_ms
+    else:
+        assert query_ms < 1.0
@@ -0,0 +1,94 @@
+"""
+Performance Benchmark for MinHash / LSH Deduplication
+
+Deduplicates 100, 1k and 10k snippets, a third of them light edits of
+earlier ones, with RefMCP.deduplicate_content and with the previous
+implementation (every item compared against every kept item, rebuilding
+both word sets with a regex per comparison). Recall is the share of the
+near duplicates removed by the previous implementation that LSH removes too.
+The previous implementation is skipped at 10k, where it takes minutes.
+"""
+
+import random
+import re
+import time
+from typing import List
+
+import pytest
+
+from src.services.mcp_integrations.ref_optimization import RefMCP
+
+
+THRESHOLD = 0.8
+VOCABULARY = [f"term{i}" for i in range(5000)]
+
+
+def _snippets(count: int) -> List[str]:
+    rng = random.Random(count)
+    snippets = []
+    for i in range(count):
+        if i % 3 == 2:
+            words = snippets[rng.randrange(len(snippets))].split()
+            for _ in range(rng.randint(1, 3)):
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            snippets.append(" ".join(words))
+        else:
+            snippets.append(" ".join(rng.sample(VOCABULARY, rng.randint(30, 80))))
+    return snippets
+
+
+def _previous_similarity(content1: str, content2: str) -> float:
+    norm1 = set(re.sub(r'\s+', ' ', content1.lower()).split())
+    norm2 = set(re.sub(r'\s+', ' ', content2.lower()).split())
+    if not norm1 or not norm2:
+        return 0.0
+    return len(norm1 & norm2) / len(norm1 | norm2)
+
+
+def _previous_deduplicate(ref_mcp: RefMCP, contents: List[str]) -> List[str]:
+    """The previous algorithm, kept here as the baseline."""
+    hashes = [ref_mcp._content_hash(c) for c in contents]
+    unique_contents, seen_hashes = [], set()
+    for content, content_hash in zip(contents, hashes):
+        if content_hash in seen_hashes:
+            continue
+        if any(_previous_similarity(content, u) >= THRESHOLD for u in unique_contents):
+            continue
+        unique_contents.append(content)
+        seen_hashes.add(content_hash)
+    return unique_contents
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [100, 1_000, 10_000])
+async def test_minhash_vs_pairwise_deduplication(count):
+    """LSH should be much faster at scale and drop (nearly) the same items."""
+    snippets = _snippets(count)
+
+    ref_mcp = RefMCP()
+    started = time.perf_counter()
+    lsh = await ref_mcp.deduplicate_content(snippets, THRESHOLD)
+    lsh_ms = (time.perf_counter() - started) * 1e3
+
+    started = time.perf_counter()
+    await ref_mcp.deduplicate_content(snippets, THRESHOLD)
+    cached_ms = (time.perf_counter() - started) * 1e3
+
+    print(f"\n=== Deduplicating {count} snippets (Jaccard >= {THRESHOLD}) ===")
+    print(f"{'minhash':>10}: {lsh_ms:10.1f} ms  kept {len(lsh)}")
+    print(f"{'cached':>10}: {cached_ms:10.1f} ms")
+
+    if count <= 1_000:
+        started = time.perf_counter()
+        previous = _previous_deduplicate(RefMCP(), snippets)
+        previous_ms = (time.perf_counter() - started) * 1e3
+
+        removed = set(snippets) - set(previous)
+        recall = len(removed - set(lsh)) / len(removed) if removed else 1.0
+        print(f"{'pairwise':>10}: {previous_ms:10.1f} ms  kept {len(previous)}")
+        print(f"{'recall':>10}: {recall:.3f}")
+
+        assert recall >= 0.95
+        if count >= 1_000:
+            assert lsh_ms * 5 < previous_ms
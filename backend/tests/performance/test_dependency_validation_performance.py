@@ -0,0 +1,131 @@
+"""
+Performance Benchmark for Bulk Dependency Validation
+
+Validates every milestone of a synthetic 500-milestone dependency graph for
+one user, comparing a per-milestone ``validate_dependencies`` loop (what the
+/dependencies/bulk-validate endpoint used to do) with the set-based
+``bulk_validate_dependencies``. Database and Redis round trips are simulated
+with a fixed latency so the comparison reflects query count rather than
+local SQL speed.
+"""
+
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from src.models.milestone import MilestoneDependency, UserMilestone
+from src.services.dependency_manager import DependencyManager
+
+
+MILESTONE_COUNT = 500
+MAX_DEPENDENCIES = 3
+COMPLETED_COUNT = 200
+ROUND_TRIP_LATENCY = 0.001
+
+
+def _build_graph(seed: int = 7):
+    """Layered DAG where each milestone depends on up to three earlier ones."""
+    rng = random.Random(seed)
+    milestones = [
+        SimpleNamespace(id=uuid4(), code=f"M{i}", name=f"Milestone {i}")
+        for i in range(MILESTONE_COUNT)
+    ]
+
+    dependencies: Dict[str, List[SimpleNamespace]] = {}
+    for index, milestone in enumerate(milestones[1:], start=1):
+        parents = rng.sample(milestones[:index], min(index, rng.randint(1, MAX_DEPENDENCIES)))
+        dependencies[str(milestone.id)] = [
+            SimpleNamespace(
+                milestone_id=milestone.id,
+                dependency_id=parent.id,
+                dependency=parent,
+                is_required=True,
+                minimum_completion_percentage=100.0
+            )
+            for parent in parents
+        ]
+
+    progress = [
+        SimpleNamespace(milestone_id=milestone.id, completion_percentage=100.0)
+        for milestone in milestones[:COMPLETED_COUNT]
+    ]
+    return milestones, dependencies, progress
+
+
+class _SimulatedSession:
+    """Answers the dependency manager's queries after one round trip each."""
+
+    def __init__(self, dependencies, progress):
+        self.dependencies = dependencies
+        self.progress = progress
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        await asyncio.sleep(ROUND_TRIP_LATENCY)
+
+        entity = statement.column_descriptions[0]["entity"]
+        if entity is MilestoneDependency:
+            requested = statement.whereclause.right.value
+            rows = [
+                dep
+                for milestone_id in requested
+                for dep in self.dependencies.get(str(milestone_id), [])
+            ]
+        elif entity is UserMilestone:
+            rows = self.progress
+        else:
+            rows = []
+        return IteratorResult(SimpleResultMetaData(["value"]), iter((row,) for row in rows))
+
+
+def _manager(milestones, dependencies, progress):
+    session = _SimulatedSession(dependencies, progress)
+
+    async def mget(command, keys):
+        await asyncio.sleep(ROUND_TRIP_LATENCY)
+        return [None] * len(keys)
+
+    redis = AsyncMock()
+    redis.execute = AsyncMock(side_effect=mget)
+    return DependencyManager(session, AsyncMock(), redis), session
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bulk_validation_on_500_milestone_graph():
+    """Set-based validation should need a constant number of round trips."""
+    milestones, dependencies, progress = _build_graph()
+    user_id = str(uuid4())
+    milestone_ids = [str(m.id) for m in milestones]
+
+    looped_manager, looped_session = _manager(milestones, dependencies, progress)
+    started = time.perf_counter()
+    looped = {}
+    for milestone_id in milestone_ids:
+        looped[milestone_id] = await looped_manager.validate_dependencies(user_id, milestone_id)
+    looped_elapsed = time.perf_counter() - started
+
+    bulk_manager, bulk_session = _manager(milestones, dependencies, progress)
+    started = time.perf_counter()
+    bulk = await bulk_manager.bulk_validate_dependencies(user_id, milestone_ids)
+    bulk_elapsed = time.perf_counter() - started
+
+    unlocked = sum(1 for result in bulk.values() if result["all_met"])
+    edges = sum(len(deps) for deps in dependencies.values())
+
+    print("\n=== Dependency validation on a 500-milestone graph ===")
+    print(f"{MILESTONE_COUNT} milestones, {edges} edges, {unlocked} can start")
+    print(f"per-milestone loop: {looped_elapsed * 1000:8.1f}ms  {looped_session.queries} queries")
+    print(f"bulk validation:    {bulk_elapsed * 1000:8.1f}ms  {bulk_session.queries} queries")
+
+    assert all(bulk[mid]["all_met"] == looped[mid][0] for mid in milestone_ids)
+    assert bulk_session.queries <= 2
+    assert bulk_elapsed * 10 < looped_elapsed
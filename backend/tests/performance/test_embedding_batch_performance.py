@@ -0,0 +1,188 @@
+"""
+Performance Benchmark for Batched Embedding Cache Lookups
+
+Embeds 10k texts (half of them already cached, with repeats) through
+``EmbeddingService.generate_embeddings_batch`` and compares it with the
+previous per-text GET/SETEX loop. fakeredis stands in for Redis with a fixed
+per-round-trip latency, and the OpenAI client is stubbed, so the comparison
+reflects cache round trips rather than network or model speed.
+"""
+
+import hashlib
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.ai import embedding_service as embedding_module
+from src.ai.embedding_service import EmbeddingService
+
+
+TEXT_COUNT = 10_000
+DISTINCT_TEXTS = 8_000
+BATCH_SIZE = 1000
+DIMENSIONS = 16
+ROUND_TRIP_LATENCY = 0.0002
+
+
+class LatencyRedis(fakeredis.FakeRedis):
+    """fakeredis with a fixed delay per round trip, counting commands."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+
+    def execute_command(self, *args, **options):
+        self.round_trips += 1
+        time.sleep(ROUND_TRIP_LATENCY)
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed_execute(*args, **kwargs):
+            self.round_trips += 1
+            time.sleep(ROUND_TRIP_LATENCY)
+            return execute(*args, **kwargs)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+class StubEmbeddings:
+    """Deterministic stand-in for ``AsyncOpenAI().embeddings``."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, model, input, dimensions):
+        self.calls += 1
+        inputs = [input] if isinstance(input, str) else input
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=_vector(text)) for text in inputs],
+            usage=SimpleNamespace(total_tokens=4 * len(inputs))
+        )
+
+
+def _vector(text: str) -> List[float]:
+    # float32-representable, like embeddings decoded from the cache
+    digest = hashlib.sha256(text.encode()).digest()
+    return (np.frombuffer(digest[:DIMENSIONS], dtype=np.uint8) / np.float32(255)).tolist()
+
+
+def _build_service(redis_client) -> EmbeddingService:
+    config = SimpleNamespace(enable_caching=True, max_workers=2, batch_size=BATCH_SIZE, cache_ttl=3600)
+    embedding_config = {"api_key": "test", "model_name": "text-embedding-3-small", "dimensions": DIMENSIONS}
+    token_counter = SimpleNamespace(truncate=lambda text, max_tokens: text)
+
+    with patch.object(embedding_module, "llama_config_manager") as config_manager, \
+         patch.object(embedding_module, "OpenAI"), \
+         patch.object(embedding_module, "AsyncOpenAI"), \
+         patch.object(embedding_module, "get_token_counter", return_value=token_counter):
+        config_manager.get_config.return_value = config
+        config_manager.get_embedding_config.return_value = embedding_config
+        service = EmbeddingService(redis_client=redis_client)
+
+    service.async_client = SimpleNamespace(embeddings=StubEmbeddings())
+    return service
+
+
+def _workload() -> List[str]:
+    """Distinct texts followed by repeats of the first ones."""
+    distinct = [f"document {i} about launch planning" for i in range(DISTINCT_TEXTS)]
+    return distinct + distinct[:TEXT_COUNT - DISTINCT_TEXTS]
+
+
+async def _warm(service: EmbeddingService, texts: List[str]) -> None:
+    """Cache every other distinct text so lookups are a hit/miss mix."""
+    await service._cache_embeddings([
+        (text, {"embedding": _vector(text), "text": text, "metadata": {}})
+        for text in texts[:DISTINCT_TEXTS:2]
+    ])
+
+
+async def _per_text_loop(service: EmbeddingService, texts: List[str]) -> List[Dict]:
+    """The previous algorithm: one GET per text and one SETEX per new embedding."""
+    results = []
+    for i in range(0, len(texts), BATCH_SIZE):
+        misses = []
+        for text in texts[i:i + BATCH_SIZE]:
+            cached = await service._get_cached_embedding(text)
+            if cached:
+                results.append(cached)
+            else:
+                misses.append(text)
+        if misses:
+            response = await service.async_client.embeddings.create(
+                model="text-embedding-3-small", input=misses, dimensions=DIMENSIONS
+            )
+            for text, data in zip(misses, response.data):
+                result = {"embedding": data.embedding, "text": text, "metadata": {}}
+                results.append(result)
+                await service._cache_embedding(text, result)
+    return results
+
+
+@pytest.mark.asyncio
+async def test_batch_results_follow_input_order():
+    service = _build_service(fakeredis.FakeRedis())
+    await service._cache_embeddings([("b", {"embedding": _vector("b"), "text": "b", "metadata": {}})])
+
+    results = await service.generate_embeddings_batch(
+        ["a", "b", "a", "c"], metadata=[{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}]
+    )
+
+    assert [result["embedding"] for result in results] == [_vector(t) for t in "abac"]
+    assert [result["metadata"] for result in results] == [{"n": 0}, {}, {"n": 2}, {"n": 3}]
+    assert service.async_client.embeddings.calls == 1
+    assert service.stats["total_embeddings_generated"] == 2
+    assert (service.stats["cache_hits"], service.stats["cache_misses"]) == (1, 2)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_pipelined_vs_per_text_lookups(monkeypatch):
+    """Pipelined lookups should need far fewer round trips and finish faster."""
+    async def no_sleep(_delay):
+        return None
+
+    # Rate-limit pauses between API calls are not what is being measured
+    monkeypatch.setattr(embedding_module.asyncio, "sleep", no_sleep)
+    texts = _workload()
+
+    loop_redis = LatencyRedis()
+    loop_service = _build_service(loop_redis)
+    await _warm(loop_service, texts)
+    loop_redis.round_trips = 0
+    started = time.perf_counter()
+    await _per_text_loop(loop_service, texts)
+    loop_elapsed = time.perf_counter() - started
+
+    batch_redis = LatencyRedis()
+    batch_service = _build_service(batch_redis)
+    await _warm(batch_service, texts)
+    batch_redis.round_trips = 0
+    started = time.perf_counter()
+    results = await batch_service.generate_embeddings_batch(texts)
+    batch_elapsed = time.perf_counter() - started
+
+    print("\n=== Embedding batch cache lookups (10k texts) ===")
+    for name, elapsed, redis_client in (
+        ("per-text", loop_elapsed, loop_redis),
+        ("pipelined", batch_elapsed, batch_redis),
+    ):
+        print(
+            f"{name:>10}: {TEXT_COUNT / elapsed:10.0f} texts/s  "
+            f"{redis_client.round_trips:6d} Redis round trips"
+        )
+
+    assert [result["text"] for result in results] == texts
+    # One MGET and at most one write pipeline per batch of distinct texts
+    assert batch_redis.round_trips <= 2 * (DISTINCT_TEXTS // BATCH_SIZE)
+    assert batch_elapsed < loop_elapsed
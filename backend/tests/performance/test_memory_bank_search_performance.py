@@ -0,0 +1,63 @@
+"""
+Performance Benchmark for Memory Bank Search
+
+Runs filtered keyword searches over 1k, 10k and 50k memories with the
+inverted index and with the previous implementation (a substring test on
+every memory's stringified content).
+"""
+
+import random
+import time
+
+import pytest
+
+from src.services.mcp_integrations.memory_bank import MemoryBankMCP
+
+
+VOCABULARY = [f"term{i}" for i in range(20_000)]
+QUERIES = 200
+
+
+def _previous_search(memory_index, query, filters, limit=10):
+    """The previous algorithm, kept here as the baseline."""
+    results = []
+    for memory in memory_index.values():
+        if any(memory["metadata"].get(k) != v for k, v in filters.items()):
+            continue
+        if query.lower() in str(memory["content"]).lower():
+            results.append({**memory, "score": 0.8})
+    return results[:limit]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [1_000, 10_000, 50_000])
+async def test_indexed_vs_scanning_search(count):
+    """Indexed search should scale with matches, not with memory count."""
+    rng = random.Random(count)
+    memory_bank = MemoryBankMCP(max_memories=count)
+    for i in range(count):
+        await memory_bank.store_memory(
+            f"memory-{i}",
+            " ".join(rng.sample(VOCABULARY, 40)),
+            {"type": rng.choice(["knowledge", "journey", "prompt_context"]), "user_id": f"u{i % 50}"}
+        )
+    queries = [(rng.choice(VOCABULARY), {"type": "knowledge", "user_id": f"u{rng.randrange(50)}"})
+               for _ in range(QUERIES)]
+
+    started = time.perf_counter()
+    for query, filters in queries:
+        await memory_bank.search_memories(query, filters)
+    indexed_ms = (time.perf_counter() - started) * 1e3 / QUERIES
+
+    started = time.perf_counter()
+    for query, filters in queries:
+        _previous_search(memory_bank.memory_index, query, filters)
+    scan_ms = (time.perf_counter() - started) * 1e3 / QUERIES
+
+    print(f"\n=== Memory search over {count} memories (per query) ===")
+    print(f"{'indexed':>10}: {indexed_ms:8.3f} ms")
+    print(f"{'scan':>10}: {scan_ms:8.3f} ms")
+
+    if count >= 10_000:
+        assert indexed_ms * 10 < scan_ms
@@ -0,0 +1,93 @@
+"""
+Performance Benchmark for Chat Message History
+
+200 opens of a 200-member room against a simulated database where every
+query costs 1 ms plus 1 µs per row returned. Compares the previous
+history fetch (messages + selectin loads of authors, reactions and every
+receipt row) with the lean keyset page served through the recent-message
+cache.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.services.chat.chat_service import ChatService
+
+
+OPENS = 200
+MEMBERS = 200
+PAGE = 50
+QUERY_LATENCY = 0.001
+ROW_LATENCY = 0.000001
+
+
+class _Database:
+    def __init__(self, messages):
+        self.messages = messages
+        self.queries = 0
+        self.rows = 0
+
+    async def fetch(self, rows):
+        self.queries += 1
+        self.rows += rows
+        await asyncio.sleep(QUERY_LATENCY + rows * ROW_LATENCY)
+
+    async def execute(self, stmt):
+        limit = stmt.compile().params["param_1"]
+        page = self.messages[:limit]
+        await self.fetch(len(page))
+        return SimpleNamespace(all=lambda: page)
+
+
+async def _previous_get_messages(db, limit):
+    """The previous algorithm's round trips, kept here as the baseline."""
+    await db.fetch(limit)            # messages
+    await db.fetch(limit)            # selectinload(user)
+    await db.fetch(limit * 2)        # selectinload(reactions)
+    await db.fetch(limit * MEMBERS)  # selectinload(receipts)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_opening_a_room_skips_the_database():
+    """Repeat opens should be served from Redis with no queries at all."""
+    now = datetime.utcnow()
+    messages = [
+        SimpleNamespace(
+            id=uuid4(), user_id=uuid4(), content="message " * 10, content_type="text",
+            message_metadata={}, parent_id=None, created_at=now - timedelta(seconds=i),
+            deleted_at=None, delivered=MEMBERS, read=MEMBERS // 2
+        )
+        for i in range(500)
+    ]
+
+    previous_db = _Database(messages)
+    started = time.perf_counter()
+    for _ in range(OPENS):
+        await _previous_get_messages(previous_db, PAGE)
+    previous = time.perf_counter() - started
+
+    db = _Database(messages)
+    service = ChatService(db, fakeredis.aioredis.FakeRedis())
+    room_id = uuid4()
+    started = time.perf_counter()
+    for _ in range(OPENS):
+        page = await service.get_messages(room_id, limit=PAGE)
+    cached = time.perf_counter() - started
+
+    print(f"\n=== {OPENS} opens of a {MEMBERS}-member room ===")
+    print(f"{'previous':>10}: {previous * 1e3:8.1f} ms, {previous_db.queries} queries, {previous_db.rows} rows")
+    print(f"{'cached':>10}: {cached * 1e3:8.1f} ms, {db.queries} queries, {db.rows} rows")
+
+    assert len(page["messages"]) == PAGE
+    assert page["messages"][0]["receipts"] == {"delivered": MEMBERS, "read": MEMBERS // 2}
+    assert db.queries == 1
+    assert cached * 5 < previous
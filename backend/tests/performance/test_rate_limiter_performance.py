@@ -0,0 +1,156 @@
+"""
+Load Test for the HTTP Rate Limiter Middleware
+
+Drives RateLimitMiddleware at a few thousand requests per second against a
+fakeredis TCP server running in a separate process (standing in for a real
+Redis) while sampling event-loop lag, to verify the limiter no longer blocks
+the loop and lag stays flat as load continues.
+"""
+
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import time
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+from redis.asyncio import Redis
+
+from src.core.rate_limiter import RateLimitMiddleware
+
+
+TARGET_RPS = 2000
+DURATION_SECONDS = 2.0
+LAG_SAMPLE_INTERVAL = 0.005
+
+
+async def _sample_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes us compared to the requested sleep."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(time.perf_counter() - start - LAG_SAMPLE_INTERVAL)
+
+
+def _serve_fake_redis(port: int) -> None:
+    server = fakeredis.TcpFakeServer(("127.0.0.1", port))
+    server.serve_forever()
+
+
+@pytest.fixture
+def redis_server_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = multiprocessing.Process(target=_serve_fake_redis, args=(port,), daemon=True)
+    process.start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield port
+    process.terminate()
+    process.join()
+
+
+def _p99(data: List[float]) -> float:
+    ordered = sorted(data)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_event_loop_lag_stays_flat_under_load(redis_server_port):
+    redis = Redis(host="127.0.0.1", port=redis_server_port, max_connections=64)
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        redis=redis,
+        auth_limits={"default": (1_000_000, 60)}
+    )
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_sample_loop_lag(lag_samples, stop))
+
+    sent = 0
+    statuses: List[int] = []
+
+    async def fire(i: int) -> None:
+        # Call the ASGI app directly so the measurement reflects the server
+        # side (middleware + limiter) rather than an HTTP client.
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/ping",
+            "raw_path": b"/ping",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"x-forwarded-for", f"10.0.{i % 250}.{i % 200}".encode())],
+            "client": ("127.0.0.1", 1234),
+            "server": ("test", 80),
+        }
+
+        body_sent = False
+        finished = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                finished.set()
+
+        await app(scope, receive, send)
+
+    started = time.perf_counter()
+    tasks = []
+    while time.perf_counter() - started < DURATION_SECONDS:
+        tick = time.perf_counter()
+        batch = int(TARGET_RPS * 0.01)
+        tasks.extend(asyncio.create_task(fire(sent + j)) for j in range(batch))
+        sent += batch
+        await asyncio.sleep(max(0.0, 0.01 - (time.perf_counter() - tick)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    await redis.aclose()
+
+    half = len(lag_samples) // 2
+    first_half, second_half = lag_samples[:half], lag_samples[half:]
+
+    print("\n=== Rate limiter load test ===")
+    print(f"offered {TARGET_RPS} req/s; completed {sent} requests in {elapsed:.2f}s "
+          f"({sent / elapsed:.0f} req/s)")
+    print(f"loop lag mean {statistics.mean(lag_samples) * 1000:.2f}ms "
+          f"p99 first half {_p99(first_half) * 1000:.2f}ms "
+          f"p99 second half {_p99(second_half) * 1000:.2f}ms")
+
+    assert all(status == 200 for status in statuses)
+    # Lag must not grow as the run continues (no accumulating backlog)
+    assert _p99(second_half) <= max(_p99(first_half) * 3, 0.05)
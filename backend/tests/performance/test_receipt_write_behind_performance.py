@@ -0,0 +1,99 @@
+"""
+Performance Benchmark for Write-Behind Chat Receipts
+
+500 messages sent to a 50-member room against a simulated database where
+every commit costs 1 ms. Compares the send path's time, and the number of
+commits, for the previous per-message SMEMBERS + add_all + commit and for the
+receipt aggregator's batched upserts.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.services.chat.receipt_aggregator import ReceiptAggregator
+
+
+MESSAGES = 500
+MEMBERS = 50
+COMMIT_LATENCY = 0.001
+
+
+class _Database:
+    def __init__(self):
+        self.commits = 0
+        self.rows = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add_all(self, objects):
+        self.rows += len(objects)
+
+    async def execute(self, stmt):
+        rows = sum(isinstance(value, UUID) for value in stmt.compile().params.values()) // 3
+        self.rows += rows
+        return SimpleNamespace(rowcount=rows)
+
+    async def commit(self):
+        await asyncio.sleep(COMMIT_LATENCY)
+        self.commits += 1
+
+
+async def _previous_store_receipts(redis, db, message_id, room_id):
+    """The previous algorithm, kept here as the baseline (rows as dicts)."""
+    now = datetime.utcnow()
+    online_participants = await redis.smembers(f"chat:room:{room_id}:participants")
+    receipts = [
+        {"message_id": message_id, "user_id": UUID(participant.decode()), "received_at": now}
+        for participant in online_participants
+    ]
+    db.add_all(receipts)
+    await db.commit()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_send_path_does_not_wait_for_receipts():
+    """Sending should cost microseconds per message and commits should batch."""
+    redis = fakeredis.aioredis.FakeRedis()
+    room_id = uuid4()
+    await redis.sadd(f"chat:room:{room_id}:participants", *(str(uuid4()) for _ in range(MEMBERS)))
+    message_ids = [uuid4() for _ in range(MESSAGES)]
+
+    previous_db = _Database()
+    started = time.perf_counter()
+    for message_id in message_ids:
+        await _previous_store_receipts(redis, previous_db, message_id, room_id)
+    previous = time.perf_counter() - started
+
+    db = _Database()
+    receipts = ReceiptAggregator(redis, session_factory=db, max_batch=1000)
+    receipts.start()
+    started = time.perf_counter()
+    for message_id in message_ids:
+        receipts.record_delivered(message_id, room_id)
+        await asyncio.sleep(0)  # other requests run between sends
+    send_path = time.perf_counter() - started
+    await receipts.stop()
+
+    print(f"\n=== {MESSAGES} messages to a {MEMBERS}-member room ===")
+    print(f"{'previous':>10}: {previous * 1e3:8.1f} ms on the send path, {previous_db.commits} commits")
+    print(f"{'batched':>10}: {send_path * 1e3:8.1f} ms on the send path, {db.commits} commits")
+
+    assert previous_db.rows == db.rows == MESSAGES * MEMBERS
+    assert db.commits * 10 < previous_db.commits
+    assert send_path * 10 < previous
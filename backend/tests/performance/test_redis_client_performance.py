@@ -0,0 +1,81 @@
+"""
+Performance Benchmark for RedisMCPClient Execution Modes
+
+Compares ops/sec and p99 latency of the thread-offloaded client against the
+native ``redis.asyncio`` client under concurrent cache traffic, using
+fakeredis as a local Redis stand-in.
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+
+
+CONCURRENCY = 64
+OPS_PER_WORKER = 100
+
+
+def _percentile(data: List[float], percentile: float) -> float:
+    ordered = sorted(data)
+    index = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100)))
+    return ordered[index]
+
+
+async def _run_workload(client: RedisMCPClient) -> Dict[str, float]:
+    latencies: List[float] = []
+    payload = {"milestone_id": "M1", "status": "in_progress", "progress": 42.5}
+
+    async def worker(worker_id: int) -> None:
+        for i in range(OPS_PER_WORKER):
+            key = f"bench:{worker_id}:{i % 10}"
+            start = time.perf_counter()
+            if i % 4 == 0:
+                await client.set_cache(key, payload, expiry=60)
+            else:
+                await client.get_cache(key)
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "ops_per_sec": len(latencies) / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_native_vs_threaded_throughput():
+    """Native asyncio mode should not be slower than thread offloading."""
+    threaded = RedisMCPClient(
+        async_mode=False,
+        client=fakeredis.FakeRedis(decode_responses=True)
+    )
+    native = RedisMCPClient(
+        async_mode=True,
+        client=fakeredis.aioredis.FakeRedis(decode_responses=True)
+    )
+
+    threaded_stats = await _run_workload(threaded)
+    native_stats = await _run_workload(native)
+
+    print("\n=== RedisMCPClient mode comparison ===")
+    for name, stats in (("threaded", threaded_stats), ("native", native_stats)):
+        print(
+            f"{name:>9}: {stats['ops_per_sec']:10.0f} ops/s  "
+            f"mean {stats['mean_ms']:.3f}ms  p99 {stats['p99_ms']:.3f}ms"
+        )
+
+    assert native_stats["ops_per_sec"] > 0
+    assert native_stats["p99_ms"] <= threaded_stats["p99_ms"] * 1.5
@@ -0,0 +1,76 @@
+"""
+Performance Benchmark for the Shared Token Counter
+
+Counts a context-layer workload (a few hundred distinct entries, each
+recounted as layers are rebuilt and budgets rebalanced) with the shared
+counter and with a fresh tiktoken encode per call, and truncates long
+documents with the prefix window against a full encode.
+"""
+
+import random
+import time
+
+import pytest
+import tiktoken
+
+from src.infrastructure.token_counter import TokenCounter
+
+
+ROUNDS = 20
+
+
+def _entries(count: int):
+    rng = random.Random(count)
+    words = [f"word{i}" for i in range(3000)]
+    return [" ".join(rng.choices(words, k=rng.randint(50, 400))) for _ in range(count)]
+
+
+@pytest.mark.slow
+def test_memoized_counts_vs_repeated_encodes():
+    """Recounting hot entries should cost a hash, not an encode."""
+    entries = _entries(500)
+    encoding = tiktoken.get_encoding("cl100k_base")
+    counter = TokenCounter()
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        memoized = counter.count_batch(entries)
+    memoized_ms = (time.perf_counter() - started) * 1e3
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        encoded = [len(encoding.encode(entry)) for entry in entries]
+    encoded_ms = (time.perf_counter() - started) * 1e3
+
+    print(f"\n=== Counting {len(entries)} entries x {ROUNDS} rounds ===")
+    print(f"{'memoized':>10}: {memoized_ms:8.1f} ms")
+    print(f"{'encode':>10}: {encoded_ms:8.1f} ms")
+
+    assert memoized == encoded
+    assert memoized_ms * 3 < encoded_ms
+
+
+@pytest.mark.slow
+def test_prefix_truncation_vs_full_encode():
+    """Cutting a long document to a small budget should only encode a prefix."""
+    document = " ".join(_entries(200))
+    encoding = tiktoken.get_encoding("cl100k_base")
+    counter = TokenCounter()
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        counter.clear()
+        truncated = counter.truncate(document, 1000)
+    prefix_ms = (time.perf_counter() - started) * 1e3
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        expected = encoding.decode(encoding.encode(document)[:1000])
+    full_ms = (time.perf_counter() - started) * 1e3
+
+    print(f"\n=== Truncating {len(document)} chars to 1000 tokens x {ROUNDS} ===")
+    print(f"{'prefix':>10}: {prefix_ms:8.1f} ms")
+    print(f"{'full':>10}: {full_ms:8.1f} ms")
+
+    assert truncated == expected
+    assert prefix_ms * 3 < full_ms
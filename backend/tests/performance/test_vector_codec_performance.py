@@ -0,0 +1,63 @@
+"""
+Performance Benchmark for the Binary Vector Codec
+
+Compares payload size and encode/decode latency of 1536-dim embeddings
+stored as JSON float lists (the previous cache format) with the binary
+codec at float32, float16 and int8 precision.
+"""
+
+import json
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import pytest
+
+from src.infrastructure.vector_codec import VectorDType, decode_vector, encode_vector
+
+
+DIMENSIONS = 1536
+ITERATIONS = 2000
+
+
+def _time_per_op(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - started) / ITERATIONS * 1e6
+
+
+def _measure(encode: Callable, decode: Callable, vector) -> Dict[str, float]:
+    payload = encode(vector)
+    return {
+        "bytes": len(payload),
+        "encode_us": _time_per_op(lambda: encode(vector)),
+        "decode_us": _time_per_op(lambda: decode(payload)),
+    }
+
+
+@pytest.mark.slow
+def test_binary_vs_json_embedding_encoding():
+    """Binary float32 should be several times smaller and faster to decode."""
+    vector = np.random.default_rng(11).standard_normal(DIMENSIONS).astype(np.float32)
+    as_list = vector.tolist()
+
+    results = {
+        "json": _measure(lambda v: json.dumps(v).encode(), json.loads, as_list),
+    }
+    for dtype in VectorDType:
+        results[dtype.value] = _measure(
+            lambda v, dtype=dtype: encode_vector(v, dtype), decode_vector, vector
+        )
+
+    print(f"\n=== Embedding encoding ({DIMENSIONS} dims) ===")
+    for name, stats in results.items():
+        print(
+            f"{name:>8}: {stats['bytes']:7d} bytes  "
+            f"encode {stats['encode_us']:8.1f}us  decode {stats['decode_us']:8.1f}us"
+        )
+
+    assert results["float32"]["bytes"] * 4 < results["json"]["bytes"]
+    assert results["float16"]["bytes"] < results["float32"]["bytes"] / 1.9
+    assert results["int8"]["bytes"] < results["float32"]["bytes"] / 3.9
+    assert results["float32"]["decode_us"] * 10 < results["json"]["decode_us"]
@@ -0,0 +1,138 @@
+"""
+Performance Benchmark for WebSocket Room Fan-Out
+
+A 1,000-member room where 1% of the members are slow consumers (5 ms per
+frame) receives 20 chat messages interleaved with typing indicators. The
+benchmark measures how long the fast members wait for all messages, first
+with the previous serial send loop and then with per-connection outbound
+queues. With the queues, a stalled member is also in the room and must be
+disconnected without holding anyone else up.
+"""
+
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.services.chat.websocket_manager import WebSocketManager
+
+
+MEMBERS = 1_000
+SLOW_MEMBERS = 10
+MESSAGES = 20
+
+
+class _PubSub:
+    async def psubscribe(self, pattern):
+        pass
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield
+
+    async def aclose(self):
+        pass
+
+
+class _Redis:
+    def pubsub(self):
+        return _PubSub()
+
+    async def publish(self, channel, message):
+        return 0
+
+    async def setex(self, key, ttl, value):
+        return True
+
+
+class _Socket:
+    def __init__(self, delay=0.0, stalled=False):
+        self.delay = delay
+        self.stalled = stalled
+        self.messages = 0
+        self.done = asyncio.Event()
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if json.loads(text)["type"] == "new_message":
+            self.messages += 1
+            if self.messages == MESSAGES:
+                self.done.set()
+
+
+def _members():
+    members = {uuid4(): _Socket() for _ in range(MEMBERS - SLOW_MEMBERS)}
+    slow = {uuid4(): _Socket(delay=0.005) for _ in range(SLOW_MEMBERS)}
+    return members, slow
+
+
+async def _previous_notify_room(participants, connections, data):
+    """The previous algorithm, kept here as the baseline."""
+    message = json.dumps(data)
+    for user_id in participants:
+        for websocket in connections[user_id].values():
+            await websocket.send_text(message)
+
+
+async def _send_all(notify, room_id):
+    for i in range(MESSAGES):
+        await notify({"type": "typing_indicator", "room_id": str(room_id), "is_typing": True})
+        await notify({"type": "new_message", "room_id": str(room_id), "message": {"content": f"m{i}"}})
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_room_fanout_with_slow_consumers():
+    """Fast members shouldn't wait on slow ones; a stalled one gets dropped."""
+    room_id = uuid4()
+
+    fast, slow = _members()
+    participants = {**fast, **slow}
+    connections = {user_id: {"c": socket} for user_id, socket in participants.items()}
+    started = time.perf_counter()
+    await _send_all(lambda data: _previous_notify_room(participants, connections, data), room_id)
+    serial = time.perf_counter() - started
+
+    fast, slow = _members()
+    stalled_id, stalled = uuid4(), _Socket(stalled=True)
+    manager = WebSocketManager(_Redis(), max_queue_depth=64, shed_queue_depth=8, send_timeout=0.2)
+    for user_id, socket in {**fast, **slow, stalled_id: stalled}.items():
+        await manager.connect(socket, user_id, f"conn-{user_id}")
+    manager.room_participants[room_id] = {*fast, *slow, stalled_id}
+
+    started = time.perf_counter()
+    await _send_all(lambda data: manager._notify_room(room_id, data), room_id)
+    enqueue = time.perf_counter() - started
+    await asyncio.gather(*(socket.done.wait() for socket in fast.values()))
+    queued = time.perf_counter() - started
+    slow_pending = sum(not socket.done.is_set() for socket in slow.values())
+
+    await asyncio.gather(*(socket.done.wait() for socket in slow.values()))
+    await asyncio.sleep(0.3)
+    stats = manager.outbound_stats()
+
+    print(f"\n=== {MEMBERS}-member room, {SLOW_MEMBERS} slow, {MESSAGES} messages ===")
+    print(f"{'serial':>10}: {serial * 1e3:8.1f} ms until every member is served")
+    print(f"{'queued':>10}: {queued * 1e3:8.1f} ms for fast members ({enqueue * 1e3:.1f} ms enqueueing)")
+    print(f"{'':>10}  max lag {stats['max_lag'] * 1e3:.1f} ms, {stats['dropped']} typing frames shed")
+
+    assert slow_pending == SLOW_MEMBERS  # fast members finished first
+    assert queued * 2 < serial
+    assert all(socket.messages == MESSAGES for socket in slow.values())
+    assert stalled.closed_with == 1013
+    assert stats["slow_consumer_disconnects"] == 1
+    assert f"conn-{stalled_id}" not in manager.outbound
+
+    await manager.shutdown()
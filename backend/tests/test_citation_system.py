@@ -11,8 +11,7 @@ from datetime import datetime, timedelta
 from uuid import uuid4
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from fastapi.testclient import TestClient
 import redis
 
@@ -36,18 +35,19 @@ from src.main import app
 
 # Test fixtures
 @pytest.fixture
-def test_db():
-    """Create test database session."""
-    engine = create_engine("sqlite:///:memory:")
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def test_db():
+    """Create async test database session."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
     
     # Create tables
     from src.models.base import Base
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     
-    db = SessionLocal()
-    yield db
-    db.close()
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    async with SessionLocal() as db:
+        yield db
+    await engine.dispose()
 
 
 @pytest.fixture
@@ -143,7 +143,7 @@ def sample_citation_data():
 
 
 @pytest.fixture
-def sample_citation(test_db):
+async def sample_citation(test_db):
     """Create sample citation in database."""
     citation = Citation(
         reference_id="ref_20250101_0001",
@@ -162,7 +162,7 @@ def sample_citation(test_db):
         overall_quality_score=0.93
     )
     test_db.add(citation)
-    test_db.commit()
+    await test_db.commit()
     return citation
 
 
@@ -260,7 +260,7 @@ class TestCitationService:
             source_type=SourceType.BOOK
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         with pytest.raises(Exception) as exc_info:
             await citation_service.verify_citation(
@@ -357,7 +357,7 @@ class TestCitationService:
             last_verified=datetime.utcnow() - timedelta(days=45)
         )
         test_db.add(old_citation)
-        test_db.commit()
+        await test_db.commit()
         
         stale = await citation_service.get_stale_citations(
             days_threshold=30,
@@ -401,12 +401,12 @@ class TestAccuracyTracker:
             overall_quality_score=0.70
         )
         test_db.add(low_accuracy)
-        test_db.commit()
+        await test_db.commit()
         
         await accuracy_tracker.check_individual_citations(limit=10)
         
         # Check that citation was marked for reverification
-        test_db.refresh(low_accuracy)
+        await test_db.refresh(low_accuracy)
         assert low_accuracy.requires_reverification == True
     
     @pytest.mark.asyncio
@@ -421,7 +421,7 @@ class TestAccuracyTracker:
             evaluator_id=uuid4()
         )
         test_db.add(feedback)
-        test_db.commit()
+        await test_db.commit()
         
         metrics = await accuracy_tracker.calculate_accuracy_metrics(sample_citation.id)
         
@@ -635,7 +635,7 @@ class TestCitationIntegration:
             test_db.add(citation)
             citations.append(citation)
         
-        test_db.commit()
+        await test_db.commit()
         
         # Check system accuracy
         status = await accuracy_tracker.check_system_accuracy()
@@ -702,7 +702,7 @@ class TestCitationPerformance:
             )
             test_db.add(citation)
         
-        test_db.commit()
+        await test_db.commit()
         
         # Test search performance
         params = CitationSearchParams(
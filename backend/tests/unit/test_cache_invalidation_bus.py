@@ -0,0 +1,256 @@
+"""
+Unit Tests for the Cache Invalidation Bus
+
+A write in a worker subprocess must evict the matching L1 entry in this
+process, over a fake Redis TCP server. The remaining cases use two buses on
+one in-memory fake server: tag invalidations must reach other services, and
+lost messages or reconnects must flush rather than leave stale entries.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import redis.asyncio as aioredis
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.infrastructure.cache.cache_manager import CacheManager
+from src.infrastructure.cache.invalidation_bus import CacheInvalidation, CacheInvalidationBus
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+from src.services.milestone_cache_enhanced import EnhancedMilestoneCacheService
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Second worker process: writes a new value through its own CacheManager
+WRITER_PROCESS = """
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import redis.asyncio as aioredis
+
+from src.infrastructure.cache.cache_manager import CacheManager
+from src.infrastructure.cache.invalidation_bus import CacheInvalidationBus
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+
+
+async def main(port):
+    def redis_client():
+        return RedisMCPClient(
+            async_mode=True,
+            client=aioredis.Redis(port=port, decode_responses=True)
+        )
+
+    settings = SimpleNamespace(
+        memory_cache_max_size=100,
+        enable_memory_cache=True,
+        enable_redis_cache=True,
+        enable_distributed_cache=False,
+        cache_policies={"default": {"ttl": 3600, "layer": "both", "compress": False}},
+    )
+    bus = CacheInvalidationBus(redis_client())
+    await bus.start()
+    manager = CacheManager(settings, redis_client(), invalidation_bus=bus)
+    await manager.set("profile:1", "alice v2")
+    await bus.stop()
+
+
+asyncio.run(main(int(sys.argv[1])))
+"""
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def tcp_server_port():
+    """A fake Redis server other processes can connect to."""
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def _run_process(script, *args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", script, *map(str, args),
+        cwd=BACKEND_DIR, env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await asyncio.wait_for(process.communicate(), 60)
+    assert process.returncode == 0, stderr.decode()
+
+
+def _redis(server):
+    return RedisMCPClient(
+        async_mode=True,
+        client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+
+
+def _cache_settings():
+    return SimpleNamespace(
+        memory_cache_max_size=100,
+        enable_memory_cache=True,
+        enable_redis_cache=True,
+        enable_distributed_cache=False,
+        cache_policies={"default": {"ttl": 3600, "layer": "both", "compress": False}},
+    )
+
+
+async def _wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "invalidation did not arrive"
+        await asyncio.sleep(0.001)
+
+
+@asynccontextmanager
+async def two_processes(server):
+    """One started bus per simulated worker process."""
+    buses = [CacheInvalidationBus(_redis(server)), CacheInvalidationBus(_redis(server))]
+    for bus in buses:
+        await bus.start()
+    try:
+        yield buses
+    finally:
+        for bus in buses:
+            await bus.stop()
+
+
+class TestCacheInvalidationBus:
+
+    @pytest.mark.asyncio
+    async def test_write_in_another_process_invalidates_this_one(self, tcp_server_port):
+        def redis_client():
+            return RedisMCPClient(
+                async_mode=True,
+                client=aioredis.Redis(port=tcp_server_port, decode_responses=True)
+            )
+
+        bus = CacheInvalidationBus(redis_client())
+        await bus.start()
+        try:
+            worker = CacheManager(_cache_settings(), redis_client(), invalidation_bus=bus)
+            await worker.set("profile:1", "alice")
+            assert "profile:1" in worker.memory_cache.cache
+
+            await _run_process(WRITER_PROCESS, tcp_server_port)
+
+            await _wait_for(lambda: "profile:1" not in worker.memory_cache.cache, timeout=5.0)
+            assert await worker.get("profile:1") == "alice v2"
+            assert bus.stats["received"] == 1
+        finally:
+            await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation_reaches_enhanced_service(self, server):
+        async with two_processes(server) as (bus_a, bus_b):
+            service_a = EnhancedMilestoneCacheService(_redis(server), invalidation_bus=bus_a)
+            service_b = EnhancedMilestoneCacheService(_redis(server), invalidation_bus=bus_b)
+            key = f"{service_b.KEY_USER_PROGRESS}u1:m1"
+            service_b._l1_set(key, {"status": "in_progress"}, 3600)
+
+            await service_a.invalidate_user_cache("u1", cascade=False)
+
+            await _wait_for(lambda: key not in service_b._l1_cache)
+
+    @pytest.mark.asyncio
+    async def test_own_messages_are_ignored(self, server):
+        async with two_processes(server) as (bus_a, _):
+            received = []
+            bus_a.register("ns", received.append)
+
+            bus_a.publish("ns", keys=["k"])
+            await bus_a.flush()
+            await asyncio.sleep(0.01)
+
+            assert received == []
+            assert bus_a.stats["published"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sequence_gap_flushes_everything(self, server):
+        async with two_processes(server) as (bus_a, bus_b):
+            received = []
+            bus_b.register("ns", received.append)
+
+            bus_a.publish("ns", keys=["k1"])
+            await bus_a.flush()
+            await _wait_for(lambda: received)
+            assert received == [CacheInvalidation("ns", keys=("k1",))]
+
+            # A message from bus_a was lost on the way
+            bus_a._seq += 1
+            bus_a.publish("other", keys=["k2"])
+            await bus_a.flush()
+            await _wait_for(lambda: bus_b.stats["gaps"] == 1)
+
+            assert received[-1] == CacheInvalidation("ns", flush=True)
+
+    @pytest.mark.asyncio
+    async def test_resubscribe_bumps_epoch_and_flushes(self, server):
+        redis = _redis(server)
+        bus = CacheInvalidationBus(redis, reconnect_delay=0.01)
+        received = []
+        bus.register("ns", received.append)
+
+        class DroppedConnection:
+            """First subscription breaks as soon as it starts listening."""
+
+            def __init__(self, pubsub):
+                self.pubsub = pubsub
+
+            async def subscribe(self, channel):
+                await self.pubsub.subscribe(channel)
+
+            async def listen(self):
+                raise ConnectionError("connection lost")
+                yield
+
+            async def aclose(self):
+                await self.pubsub.aclose()
+
+        pubsubs = iter([DroppedConnection(redis.pubsub())])
+        redis.pubsub = lambda: next(pubsubs, None) or RedisMCPClient.pubsub(redis)
+
+        await bus.start()
+        await _wait_for(lambda: bus.epoch == 2)
+
+        assert bus.stats["errors"] == 1
+        assert received == [CacheInvalidation("ns", flush=True)] * 2
+        await bus.stop()
+
+    def test_bound_handlers_are_held_weakly(self):
+        bus = CacheInvalidationBus(redis_client=object())
+        service = EnhancedMilestoneCacheService(object(), invalidation_bus=bus)
+        assert len(bus._handlers[service.INVALIDATION_NAMESPACE]) == 1
+
+        del service
+        assert bus._handlers[EnhancedMilestoneCacheService.INVALIDATION_NAMESPACE][0]() is None
+
+    def test_dead_handlers_are_pruned_on_register(self):
+        bus = CacheInvalidationBus(redis_client=object())
+        for _ in range(100):
+            # One short-lived service per request
+            EnhancedMilestoneCacheService(object(), invalidation_bus=bus)
+        service = EnhancedMilestoneCacheService(object(), invalidation_bus=bus)
+
+        handlers = bus._handlers[service.INVALIDATION_NAMESPACE]
+        assert len(handlers) == 1 and handlers[0]() == service._apply_invalidation
@@ -0,0 +1,288 @@
+"""
+Unit Tests for Cache Stampede Protection
+
+Covers request coalescing, probabilistic early expiration and the Redis
+lease, both directly and through CacheManager.get_or_set and the
+milestone cache's ``cached`` decorator.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.cache.cache_manager import CacheManager
+from src.infrastructure.cache.stampede import (
+    SingleFlight,
+    run_with_lease,
+    xfetch_should_refresh,
+)
+from src.services.milestone_cache_enhanced import CacheStrategy, cached
+
+
+class FakeRedisClient:
+    """Dict-backed stand-in for RedisMCPClient's string and lock commands."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def try_lock(self, lock_name, expiry=10):
+        name = f"lock:{lock_name}"
+        if name in self.data:
+            return None
+        self.data[name] = str(time.time())
+        return self.data[name]
+
+    async def unlock(self, lock_name, lock_value):
+        name = f"lock:{lock_name}"
+        if self.data.get(name) == lock_value:
+            del self.data[name]
+            return True
+        return False
+
+
+def _cache_settings():
+    return SimpleNamespace(
+        memory_cache_max_size=100,
+        enable_memory_cache=False,
+        enable_redis_cache=True,
+        enable_distributed_cache=False,
+        cache_policies={"default": {"ttl": 60, "layer": "redis", "compress": False}},
+        cache_warmup=False,
+        enable_metrics=False,
+    )
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(20)))
+
+        assert results == ["value"] * 20
+        assert calls == 1
+        assert flight.coalesced == 19
+        assert not flight.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not flight.in_flight("key")
+
+
+class TestXFetch:
+
+    def test_refreshes_once_expired(self):
+        assert xfetch_should_refresh(0.5, expires_at=100.0, now=100.0)
+        assert not xfetch_should_refresh(0.0, expires_at=100.0, now=99.0)
+
+    def test_slow_recomputes_refresh_earlier(self):
+        now, expires_at = 1000.0, 1010.0
+        fast = sum(xfetch_should_refresh(0.01, expires_at, now=now) for _ in range(1000))
+        slow = sum(xfetch_should_refresh(5.0, expires_at, now=now) for _ in range(1000))
+
+        assert fast == 0
+        assert slow > 0
+
+
+class TestRedisLease:
+
+    @pytest.mark.asyncio
+    async def test_lease_holder_elsewhere_serves_stale(self):
+        redis = FakeRedisClient()
+        await redis.try_lock("cache_lease:key")
+
+        async def compute():
+            raise AssertionError("should not recompute")
+
+        value, source = await run_with_lease(
+            redis, "key", compute, lambda: redis.get("key"), stale="old"
+        )
+
+        assert (value, source) == ("old", "stale")
+
+    @pytest.mark.asyncio
+    async def test_waits_for_fresh_value_without_stale(self):
+        redis = FakeRedisClient()
+        await redis.try_lock("cache_lease:key")
+
+        async def publish():
+            await asyncio.sleep(0.02)
+            redis.data["key"] = "fresh"
+
+        async def compute():
+            raise AssertionError("should not recompute")
+
+        asyncio.create_task(publish())
+        value, source = await run_with_lease(redis, "key", compute, lambda: redis.get("key"))
+
+        assert (value, source) == ("fresh", "waited")
+
+    @pytest.mark.asyncio
+    async def test_lease_released_after_compute(self):
+        redis = FakeRedisClient()
+
+        async def compute():
+            return "new"
+
+        value, source = await run_with_lease(redis, "key", compute, lambda: redis.get("key"))
+
+        assert (value, source) == ("new", "computed")
+        assert "lock:cache_lease:key" not in redis.data
+
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_computes_without_waiting(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        import fakeredis.aioredis
+        from src.infrastructure.redis.redis_mcp import RedisMCPClient
+
+        server = fakeredis.FakeServer()
+        server.connected = False
+        redis = RedisMCPClient(async_mode=True, client=fakeredis.aioredis.FakeRedis(server=server))
+
+        async def compute():
+            return "new"
+
+        started = time.monotonic()
+        value, source = await run_with_lease(
+            redis, "key", compute, lambda: redis.get("key"), wait_timeout=5.0
+        )
+
+        assert (value, source) == ("new", "computed")
+        assert time.monotonic() - started < 1.0
+
+
+class TestCacheManagerGetOrSet:
+
+    @pytest.fixture
+    def manager(self):
+        return CacheManager(cache_settings=_cache_settings(), redis_client=FakeRedisClient())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_call_factory_once(self, manager):
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "report"
+
+        results = await asyncio.gather(
+            *(manager.get_or_set("report:1", factory) for _ in range(50))
+        )
+
+        assert results == ["report"] * 50
+        assert calls == 1
+        stats = await manager.get_stats()
+        assert stats["coalesced"] == 49
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_near_expiry(self, manager):
+        await manager.get_or_set("key", lambda: "v1")
+        # Pretend the value took long to compute and is about to expire
+        manager._refresh_meta["key"] = (60.0, time.time() + 0.001)
+
+        value = await manager.get_or_set("key", lambda: "v2")
+
+        assert value == "v2"
+        assert manager.stats["early_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_decorator_coalesces_calls(self, manager):
+        calls = 0
+
+        @manager.cache_decorator(key_prefix="report")
+        async def build_report(report_id):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"report-{report_id}"
+
+        results = await asyncio.gather(*(build_report(7) for _ in range(10)))
+
+        assert results == ["report-7"] * 10
+        assert calls == 1
+
+
+class _MilestoneCacheService:
+    """The parts of EnhancedMilestoneCacheService the decorator uses."""
+
+    def __init__(self):
+        self.redis = FakeRedisClient()
+        self.store = {}
+        self._single_flight = SingleFlight()
+        self._metrics = {"early_refreshes": 0}
+
+    def _l1_get(self, key):
+        return None
+
+    def _l1_set(self, key, value, ttl, priority):
+        pass
+
+    async def _safe_redis_get(self, key):
+        return self.store.get(key)
+
+    async def _safe_redis_set(self, key, value, ttl):
+        self.store[key] = value
+
+
+class TestCachedDecorator:
+
+    @pytest.mark.asyncio
+    async def test_lease_miss_joins_a_running_refresh(self):
+        class Reports:
+            cache_service = _MilestoneCacheService()
+            calls = 0
+
+            @cached(key_prefix="report", strategy=CacheStrategy.REFRESH_AHEAD, lease=True)
+            async def build(self, report_id):
+                Reports.calls += 1
+                await asyncio.sleep(0.02)
+                return f"report-{report_id}-{Reports.calls}"
+
+        reports = Reports()
+        assert await reports.build(7) == "report-7-1"
+
+        # Expired entry: the next hit starts a background refresh
+        for entry in reports.cache_service.store.values():
+            entry["expires_at"] = time.time()
+        assert await reports.build(7) == "report-7-1"
+        await asyncio.sleep(0)
+
+        # A miss while that refresh runs joins it under the same flight key
+        reports.cache_service.store.clear()
+        assert await reports.build(7) == "report-7-2"
+        assert Reports.calls == 2
+        assert reports.cache_service._metrics["early_refreshes"] == 1
@@ -0,0 +1,191 @@
+"""
+Unit Tests for Tag-based Cache Invalidation
+
+Writes register keys under user/milestone/snapshot tags in both the
+in-memory tier and Redis; invalidating a tag must remove exactly those keys
+without scanning the keyspace.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.infrastructure.cache.cache_manager import CacheManager
+from src.infrastructure.cache.tags import TagIndex
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+from src.services.m0_cache_service import M0CacheService
+from src.services.milestone_cache import MilestoneCacheService
+from src.services.milestone_cache_enhanced import EnhancedMilestoneCacheService
+
+
+class KeysForbiddenRedis(fakeredis.aioredis.FakeRedis):
+    """Fails the test if anything falls back to a KEYS scan."""
+
+    async def keys(self, *args, **kwargs):
+        raise AssertionError("KEYS must not be used for invalidation")
+
+
+@pytest.fixture
+def redis_client():
+    return RedisMCPClient(
+        async_mode=True,
+        client=KeysForbiddenRedis(decode_responses=True)
+    )
+
+
+class TestTagIndex:
+
+    def test_pop_returns_keys_and_forgets_them(self):
+        index = TagIndex()
+        index.add("a", ["user:1", "milestone:1"])
+        index.add("b", ["user:1"])
+        index.add("c", ["user:2"])
+
+        assert index.pop("user:1") == {"a", "b"}
+        assert index.keys_for("milestone:1") == set()
+        assert len(index) == 1
+
+    def test_re_adding_replaces_tags(self):
+        index = TagIndex()
+        index.add("a", ["user:1"])
+        index.add("a", ["user:2"])
+
+        assert index.keys_for("user:1") == set()
+        assert index.keys_for("user:2") == {"a"}
+
+
+def _both_layers_settings():
+    return SimpleNamespace(
+        memory_cache_max_size=100,
+        enable_memory_cache=True,
+        enable_redis_cache=True,
+        enable_distributed_cache=False,
+        cache_policies={"default": {"ttl": 60, "layer": "both", "compress": False}},
+    )
+
+
+class TestCacheManagerTags:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_clears_both_layers(self, redis_client):
+        manager = CacheManager(cache_settings=_both_layers_settings(), redis_client=redis_client)
+
+        await manager.set("profile:1", "alice", tags=["user:1"])
+        await manager.set("profile:2", "bob", tags=["user:2"])
+
+        assert await manager.invalidate_tags("user:1") == 1
+        assert await manager.memory_cache.get("profile:1") is None
+        assert await redis_client.get("profile:1") is None
+        assert await manager.get("profile:2") == "bob"
+
+    @pytest.mark.asyncio
+    async def test_promoted_entries_keep_their_tags(self, redis_client):
+        writer = CacheManager(cache_settings=_both_layers_settings(), redis_client=redis_client)
+        reader = CacheManager(cache_settings=_both_layers_settings(), redis_client=redis_client)
+        await writer.set("profile:1", "alice", tags=["user:1"])
+
+        # Served from Redis and promoted into the reader's memory tier
+        assert await reader.get("profile:1") == "alice"
+        assert await reader.memory_cache.get("profile:1") == "alice"
+
+        await reader.invalidate_tags("user:1")
+
+        assert await reader.get("profile:1") is None
+        assert not await redis_client.exists("cache:keytags:profile:1")
+
+
+class TestEnhancedServiceTags:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_cache(self, redis_client):
+        service = EnhancedMilestoneCacheService(redis_client)
+        await service.set_user_progress("u1", {"status": "in_progress"}, "m1")
+        await service.set_user_progress("u1", {"status": "done"})
+        await service.set_user_progress("u2", {"status": "done"}, "m1")
+
+        assert await service.invalidate_user_cache("u1", cascade=False)
+
+        assert service._l1_get(f"{service.KEY_USER_PROGRESS}u1:m1") is None
+        assert await redis_client.get_cache(f"{service.KEY_USER_PROGRESS}u1:m1") is None
+        assert await redis_client.get_cache(f"{service.KEY_USER_PROGRESS}u1") is None
+        assert await service.get_user_progress("u2", "m1") is not None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_milestone_cache(self, redis_client):
+        service = EnhancedMilestoneCacheService(redis_client)
+        await service.set_user_progress("u1", {"status": "in_progress"}, "m1")
+        await service.set_user_progress("u1", {"status": "in_progress"}, "m2")
+
+        await service.invalidate_milestone_cache("u1", "m1")
+
+        assert await service.get_user_progress("u1", "m1") is None
+        assert await service.get_user_progress("u1", "m2") is not None
+
+
+class TestMilestoneCacheServiceTags:
+
+    @pytest.mark.asyncio
+    async def test_user_and_milestone_invalidation(self, redis_client):
+        service = MilestoneCacheService(redis_client)
+        await service.set_user_progress("u1", {"p": 1}, "m1")
+        await service.set_dependency_check("u2", "m1", True, [])
+        await service.set_milestone_tree("u1", {"nodes": []})
+
+        assert await service.invalidate_milestone_cache("m1")
+        assert await service.get_user_progress("u1", "m1") is None
+        assert await service.get_dependency_check("u2", "m1") is None
+        assert await service.get_milestone_tree("u1") is not None
+
+        assert await service.invalidate_user_cache("u1")
+        assert await service.get_milestone_tree("u1") is None
+
+
+class TestM0CacheTags:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_user_and_lru_eviction(self, redis_client):
+        service = M0CacheService(AsyncMock(), redis_client, memory_bank=AsyncMock())
+        service.MAX_CACHE_SIZE = 2
+
+        for i in range(3):
+            await service.store_snapshot(
+                f"s{i}", f"idea number {i}", {"budget": "low"}, {"score": i},
+                user_id="u1" if i < 2 else "u2"
+            )
+
+        # The least recently used snapshot was evicted
+        assert await redis_client.execute("zcard", service.LRU_INDEX_KEY) == 2
+        assert await service._get_hot_cache(
+            service._generate_cache_key("idea number 0", {"budget": "low"})
+        ) is None
+
+        assert await service.invalidate_cache(user_id="u1") > 0
+        assert await service._get_hot_cache(
+            service._generate_cache_key("idea number 1", {"budget": "low"})
+        ) is None
+        assert await service._get_hot_cache(
+            service._generate_cache_key("idea number 2", {"budget": "low"})
+        ) == {"score": 2}
+
+    @pytest.mark.asyncio
+    async def test_tag_sets_only_hold_live_keys(self, redis_client):
+        service = M0CacheService(AsyncMock(), redis_client, memory_bank=AsyncMock())
+        service.MAX_CACHE_SIZE = 1
+
+        for i in range(3):
+            await service.store_snapshot(
+                f"s{i}", f"idea number {i}", {"budget": "low"}, {"score": i}, user_id="u1"
+            )
+
+        # Evicted hot-cache entries left every tag set they were in
+        live_hot_key = service._generate_cache_key("idea number 2", {"budget": "low"})
+        for tag in (service.TAG_ALL, service._tag("user", "u1")):
+            hot_keys = {
+                key for key in await redis_client.tag_members(tag)
+                if key.startswith("m0:snapshot:") and not key.endswith(":metadata")
+            }
+            assert hot_keys == {live_hot_key}
@@ -0,0 +1,245 @@
+"""
+Unit Tests for Cross-Node Chat Delivery
+
+Events must cross a real process boundary: a second node runs in a
+subprocess against a fake Redis TCP server, and each node's event must
+reach the member connected to the other. The remaining cases use two
+WebSocketManagers on one in-memory fake server: events must arrive exactly
+once, nodes without members in the room must skip them, and a dropped
+subscription must be re-established.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as aioredis
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Second node: one member in the room, who answers the first typing
+# indicator from another user with one of their own
+REMOTE_NODE = """
+import asyncio
+import json
+import sys
+from uuid import UUID, uuid4
+
+import redis.asyncio as aioredis
+
+from src.services.chat.websocket_manager import WebSocketManager
+
+
+class Socket:
+    def __init__(self):
+        self.events = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+    async def send_text(self, text):
+        self.events.append(json.loads(text))
+
+
+async def main(port, room_id):
+    node = WebSocketManager(aioredis.Redis(port=port))
+    user_id, socket = uuid4(), Socket()
+    await node.connect(socket, user_id, f"conn-{user_id}")
+    await node.join_room(room_id, user_id)
+    print(user_id, flush=True)
+
+    def typing_from_others():
+        return [
+            event for event in socket.events
+            if event["type"] == "typing_indicator" and event["user_id"] != str(user_id)
+        ]
+
+    try:
+        while not typing_from_others():
+            await asyncio.sleep(0.001)
+        await node.notify_typing(room_id, user_id, True)
+    finally:
+        await node.shutdown()
+
+
+asyncio.run(asyncio.wait_for(main(int(sys.argv[1]), UUID(sys.argv[2])), 30))
+"""
+
+from src.services.chat.websocket_manager import WebSocketManager
+
+
+class _Socket:
+    def __init__(self):
+        self.events = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+    async def send_text(self, text):
+        self.events.append(json.loads(text))
+
+    def of_type(self, event_type):
+        return [event for event in self.events if event["type"] == event_type]
+
+
+class _FlakyRedis:
+    """Delegates to ``redis`` but breaks the first pub/sub connection."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.broken = False
+
+    def __getattr__(self, name):
+        return getattr(self.redis, name)
+
+    def pubsub(self):
+        pubsub = self.redis.pubsub()
+        if not self.broken:
+            self.broken = True
+
+            async def listen():
+                raise ConnectionError("connection reset")
+                yield
+
+            pubsub.listen = listen
+        return pubsub
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def tcp_server_port():
+    """A fake Redis server other processes can connect to."""
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _node(redis):
+    return WebSocketManager(redis)
+
+
+async def _wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "event did not arrive"
+        await asyncio.sleep(0.001)
+
+
+async def _member(node, room_id):
+    user_id, socket = uuid4(), _Socket()
+    await node.connect(socket, user_id, f"conn-{user_id}")
+    await node.join_room(room_id, user_id)
+    return user_id, socket
+
+
+class TestRoomRouter:
+
+    @pytest.mark.asyncio
+    async def test_events_cross_process_boundaries(self, tcp_server_port):
+        node = _node(aioredis.Redis(port=tcp_server_port))
+        room_id = uuid4()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+        remote = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", REMOTE_NODE, str(tcp_server_port), str(room_id),
+            cwd=BACKEND_DIR, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            user_id, local = await _member(node, room_id)
+            remote_user = (await asyncio.wait_for(remote.stdout.readline(), 30)).decode().strip()
+            assert remote_user, (await remote.stderr.read()).decode()
+
+            await node.notify_typing(room_id, user_id, True)
+
+            await _wait_for(
+                lambda: any(event["user_id"] == remote_user for event in local.of_type("typing_indicator")),
+                timeout=10.0
+            )
+            _, stderr = await asyncio.wait_for(remote.communicate(), 30)
+            assert remote.returncode == 0, stderr.decode()
+            assert node.router.stats["delivered"] >= 1
+        finally:
+            if remote.returncode is None:
+                remote.kill()
+                await remote.wait()
+            await node.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_events_reach_other_nodes_once(self, server):
+        nodes = [_node(fakeredis.aioredis.FakeRedis(server=server)) for _ in range(2)]
+        room_id = uuid4()
+        try:
+            sender_id, local = await _member(nodes[0], room_id)
+            _, remote = await _member(nodes[1], room_id)
+
+            await nodes[0].notify_typing(room_id, sender_id, True)
+            await _wait_for(lambda: remote.of_type("typing_indicator"))
+            await asyncio.sleep(0.05)
+
+            assert len(local.of_type("typing_indicator")) == 1
+            assert len(remote.of_type("typing_indicator")) == 1
+            assert nodes[0].router.stats["own"] >= 1
+        finally:
+            for node in nodes:
+                await node.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rooms_without_local_members_are_skipped(self, server):
+        nodes = [_node(fakeredis.aioredis.FakeRedis(server=server)) for _ in range(2)]
+        try:
+            sender_id, _ = await _member(nodes[0], uuid4())
+            _, bystander = await _member(nodes[1], uuid4())
+            skipped = nodes[1].router.stats["not_hosted"]
+
+            busy_room = next(iter(nodes[0].room_participants))
+            await nodes[0].notify_typing(busy_room, sender_id, True)
+            await _wait_for(lambda: nodes[1].router.stats["not_hosted"] > skipped)
+
+            assert bystander.of_type("typing_indicator") == []
+        finally:
+            for node in nodes:
+                await node.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_router_resubscribes_after_disconnect(self, server):
+        receiver = _node(_FlakyRedis(fakeredis.aioredis.FakeRedis(server=server)))
+        receiver.router.reconnect_delay = 0.01
+        sender = _node(fakeredis.aioredis.FakeRedis(server=server))
+        room_id = uuid4()
+        try:
+            _, remote = await _member(receiver, room_id)
+            await _wait_for(lambda: receiver.router.stats["subscriptions"] == 2)
+            sender_id, _ = await _member(sender, room_id)
+
+            await sender.notify_typing(room_id, sender_id, True)
+            await _wait_for(lambda: remote.of_type("typing_indicator"))
+
+            assert receiver.router.stats["errors"] == 1
+        finally:
+            await receiver.shutdown()
+            await sender.shutdown()
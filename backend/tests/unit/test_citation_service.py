@@ -129,7 +129,7 @@ class TestCitationService:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Retrieve citation
         retrieved = await service.get_citation(citation.id)
@@ -162,7 +162,7 @@ class TestCitationService:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Update citation
         update_data = CitationUpdate(
@@ -192,7 +192,7 @@ class TestCitationService:
             source_type=SourceType.DOCUMENT
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         with pytest.raises(ValidationError) as exc_info:
             await service.verify_citation(
@@ -216,7 +216,7 @@ class TestCitationService:
             url="https://example.com"
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         with pytest.raises(ServiceUnavailableError) as exc_info:
             await service.verify_citation(
@@ -239,7 +239,7 @@ class TestCitationService:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Track usage
         usage = await service.track_usage(
@@ -257,7 +257,7 @@ class TestCitationService:
         assert usage.context == "Test context"
         
         # Check that usage count is incremented
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         assert citation.usage_count == 1
     
     @pytest.mark.asyncio
@@ -273,7 +273,7 @@ class TestCitationService:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Submit feedback
         feedback = AccuracyFeedback(
@@ -313,7 +313,7 @@ class TestCitationService:
         
         for citation in citations:
             test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Search for "Machine Learning"
         search_params = CitationSearchParams(
@@ -345,7 +345,7 @@ class TestCitationService:
         
         for citation in citations:
             test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Search for academic sources
         search_params = CitationSearchParams(
@@ -381,7 +381,7 @@ class TestCitationService:
         
         for citation in citations:
             test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         citation_ids = [c.id for c in citations]
         
@@ -415,7 +415,7 @@ class TestCitationService:
         
         for citation in citations:
             test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Generate report
         report = await service.get_accuracy_report(
@@ -566,7 +566,7 @@ class TestCitationCaching:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Update citation
         update_data = CitationUpdate(title="Updated Title")
@@ -582,19 +582,19 @@ class TestCitationCaching:
 
 # Test fixtures for this module
 @pytest.fixture
-def test_db():
-    """Create in-memory test database."""
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
+async def test_db():
+    """Create in-memory async test database."""
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
     from src.models.base import Base
     
-    engine = create_engine("sqlite:///:memory:")
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
     
-    db = SessionLocal()
-    yield db
-    db.close()
+    async with SessionLocal() as db:
+        yield db
+    await engine.dispose()
 
 
 @pytest.fixture
@@ -11,6 +11,8 @@ from uuid import uuid4
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from typing import List, Dict, Any
 
+from sqlalchemy import select
+
 from src.services.citation_service import (
     CitationService, CitationCreate, CitationUpdate,
     CitationVerifyRequest, AccuracyFeedback, CitationSearchParams
@@ -50,7 +52,7 @@ class TestAdvancedCitationOperations:
             )
             test_db.add(citation)
             citations.append(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Mock successful verification for all citations
         mock_puppeteer_mcp.verify_url.return_value = {
@@ -77,7 +79,7 @@ class TestAdvancedCitationOperations:
         
         # Verify all citations are now verified
         for citation in citations:
-            test_db.refresh(citation)
+            await test_db.refresh(citation)
             assert citation.verification_status == VerificationStatus.VERIFIED
             assert citation.verification_attempts == 1
             assert citation.availability_score == 1.0
@@ -103,7 +105,7 @@ class TestAdvancedCitationOperations:
             content_hash=original_hash
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Mock verification with changed content
         new_content = "Updated content that has been modified"
@@ -125,7 +127,7 @@ class TestAdvancedCitationOperations:
         assert result.changes_detected['new_hash'] != original_hash
         
         # Verify citation was updated
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         new_hash = service.calculate_content_hash(new_content)
         assert citation.content_hash == new_hash
         assert citation.title == "Updated Title"
@@ -143,7 +145,7 @@ class TestAdvancedCitationOperations:
             source_type=SourceType.ACADEMIC
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Submit multiple accuracy feedback entries
         evaluators = [uuid4() for _ in range(3)]
@@ -176,7 +178,7 @@ class TestAdvancedCitationOperations:
         await service.submit_accuracy_feedback(citation.id, feedback3, evaluators[2])
         
         # Verify citation scores were updated
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         assert citation.accuracy_score == 0.95
         assert citation.relevance_score == 0.80
         assert citation.availability_score == 0.98
@@ -198,7 +200,7 @@ class TestAdvancedCitationOperations:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Track multiple usages across different content types
         users = [uuid4() for _ in range(3)]
@@ -224,14 +226,14 @@ class TestAdvancedCitationOperations:
             )
         
         # Verify usage count updated
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         assert citation.usage_count == 5
         assert citation.last_used is not None
         
         # Verify all usage records were created
-        usages = test_db.query(CitationUsage).filter(
+        usages = (await test_db.execute(select(CitationUsage).where(
             CitationUsage.citation_id == citation.id
-        ).all()
+        ))).scalars().all()
         assert len(usages) == 5
         
         # Verify usage across different content types
@@ -273,7 +275,7 @@ class TestAdvancedCitationOperations:
             test_db.add(citation)
             citations.append(citation)
         
-        test_db.commit()
+        await test_db.commit()
         
         # Test search by source type
         academic_params = CitationSearchParams(
@@ -339,7 +341,7 @@ class TestAdvancedCitationOperations:
             )
             test_db.add(citation)
             citations.append(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Create collection
         owner_id = uuid4()
@@ -354,7 +356,7 @@ class TestAdvancedCitationOperations:
             is_public=True
         )
         test_db.add(collection)
-        test_db.commit()
+        await test_db.commit()
         
         # Test collection properties
         assert collection.citation_count == 3
@@ -365,7 +367,7 @@ class TestAdvancedCitationOperations:
         included_citations = citations[:3]
         expected_avg_quality = sum(c.overall_quality_score for c in included_citations) / 3
         collection.average_quality_score = expected_avg_quality
-        test_db.commit()
+        await test_db.commit()
         
         assert abs(collection.average_quality_score - expected_avg_quality) < 0.01
     
@@ -400,7 +402,7 @@ class TestAdvancedCitationOperations:
             test_db.add(citation)
             citations.append(citation)
         
-        test_db.commit()
+        await test_db.commit()
         
         # Test stale citation identification
         stale_citations = await service.get_stale_citations(
@@ -441,7 +443,7 @@ class TestCitationServiceErrorScenarios:
             url="https://example.com/timeout-test"
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Mock timeout exception
         mock_puppeteer_mcp.verify_url.side_effect = asyncio.TimeoutError("Verification timeout")
@@ -453,9 +455,9 @@ class TestCitationServiceErrorScenarios:
             await service.verify_citation(citation.id, user_id)
         
         # Verify error was logged
-        verification_logs = test_db.query(VerificationLog).filter(
+        verification_logs = (await test_db.execute(select(VerificationLog).where(
             VerificationLog.citation_id == citation.id
-        ).all()
+        ))).scalars().all()
         
         assert len(verification_logs) == 1
         log = verification_logs[0]
@@ -464,7 +466,7 @@ class TestCitationServiceErrorScenarios:
         assert "timeout" in log.error_message.lower()
         
         # Citation should be marked as failed
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         assert citation.verification_status == VerificationStatus.FAILED
         assert citation.verification_attempts == 1
         assert citation.availability_score == 0.0
@@ -482,7 +484,7 @@ class TestCitationServiceErrorScenarios:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Attempt to track same usage multiple times concurrently
         content_id = uuid4()
@@ -510,11 +512,11 @@ class TestCitationServiceErrorScenarios:
         assert len(conflicts) == 2
         
         # Verify only one usage record was created
-        usages = test_db.query(CitationUsage).filter(
+        usages = (await test_db.execute(select(CitationUsage).where(
             CitationUsage.citation_id == citation.id,
             CitationUsage.content_id == content_id,
             CitationUsage.position == 1
-        ).all()
+        ))).scalars().all()
         assert len(usages) == 1
     
     @pytest.mark.asyncio
@@ -551,7 +553,7 @@ class TestCitationServiceErrorScenarios:
         # This should raise validation error when saved
         test_db.add(invalid_citation)
         with pytest.raises(Exception):  # Database constraint violation
-            test_db.commit()
+            await test_db.commit()
     
     @pytest.mark.asyncio
     async def test_citation_accuracy_score_edge_cases(self, test_db):
@@ -566,7 +568,7 @@ class TestCitationServiceErrorScenarios:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Test extreme scores
         evaluators = [uuid4() for _ in range(3)]
@@ -588,7 +590,7 @@ class TestCitationServiceErrorScenarios:
             await service.submit_accuracy_feedback(citation.id, feedback, evaluators[i])
         
         # Verify scores are properly calculated
-        test_db.refresh(citation)
+        await test_db.refresh(citation)
         
         # Accuracy should be average of 0.0 and 1.0 = 0.5
         assert abs(citation.accuracy_score - 0.5) < 0.01
@@ -610,7 +612,7 @@ class TestCitationServiceErrorScenarios:
             source_type=SourceType.WEB
         )
         test_db.add(citation1)
-        test_db.commit()
+        await test_db.commit()
         
         # Attempt to create another citation with same reference_id
         citation2 = Citation(
@@ -623,7 +625,7 @@ class TestCitationServiceErrorScenarios:
         
         # Should raise integrity constraint violation
         with pytest.raises(Exception):  # IntegrityError
-            test_db.commit()
+            await test_db.commit()
     
     @pytest.mark.asyncio
     async def test_citation_search_performance(self, test_db):
@@ -649,7 +651,7 @@ class TestCitationServiceErrorScenarios:
             test_db.add(citation)
             citations.append(citation)
         
-        test_db.commit()
+        await test_db.commit()
         
         # Test search performance
         import time
@@ -699,7 +701,7 @@ class TestCitationServiceCaching:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Mock cache hit
         cached_data = {
@@ -746,7 +748,7 @@ class TestCitationServiceCaching:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Update citation
         update_data = CitationUpdate(title="Updated Title")
@@ -770,7 +772,7 @@ class TestCitationServiceCaching:
             source_type=SourceType.WEB
         )
         test_db.add(citation)
-        test_db.commit()
+        await test_db.commit()
         
         # Mock expired cache entry (returns None)
         mock_cache.get.return_value = None
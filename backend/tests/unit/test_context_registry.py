@@ -0,0 +1,187 @@
+"""
+Unit Tests for the Context Manager Registry
+
+Covers single-flight first touches, LRU and idle-timeout eviction through
+persist + snapshot, lazy rehydration from the snapshot, and the
+ContextManager state round trip the snapshots rely on.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.services.context.registry import (
+    ContextManagerRegistry,
+    decode_snapshot,
+    encode_snapshot
+)
+
+
+class _SnapshotStore:
+    """The slice of RedisMCPClient the registry uses, held in a dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get_bytes(self, key):
+        return self.values.get(key)
+
+    async def set_bytes(self, key, value, expiry=None):
+        self.values[key] = value
+        return True
+
+    async def delete_cache(self, key):
+        return self.values.pop(key, None) is not None
+
+
+class _FakeManager:
+    initializations = 0
+
+    def __init__(self, user_id, session_id):
+        self.user_id = user_id
+        self.session_id = session_id
+        self.notes = []
+        self.persisted = 0
+        self.persist_gate = None
+
+    async def initialize(self):
+        _FakeManager.initializations += 1
+        await asyncio.sleep(0.01)
+        return True
+
+    async def persist_all(self):
+        if self.persist_gate is not None:
+            await self.persist_gate.wait()
+        self.persisted += 1
+        return True
+
+    def export_state(self):
+        return {"notes": self.notes}
+
+    def import_state(self, state):
+        self.notes = state["notes"]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store():
+    return _SnapshotStore()
+
+
+@pytest.fixture
+def registry(store):
+    _FakeManager.initializations = 0
+    return ContextManagerRegistry(
+        redis_client=store,
+        max_managers=2,
+        idle_timeout=60,
+        manager_factory=_FakeManager,
+        clock=_Clock()
+    )
+
+
+class TestContextManagerRegistry:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_touches_initialize_once(self, registry):
+        managers = await asyncio.gather(*(registry.get("u1", "s1") for _ in range(10)))
+
+        assert all(manager is managers[0] for manager in managers)
+        assert _FakeManager.initializations == 1
+        assert registry.metrics["coalesced"] == 9
+        assert await registry.get("u1", "s1") is managers[0]
+        assert registry.metrics["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_persists_and_rehydrates(self, registry, store):
+        first = await registry.get("u1", "s1")
+        first.notes.append("pricing call booked")
+        await registry.get("u2", "s1")
+        await registry.get("u1", "s1")
+        await registry.get("u3", "s1")  # evicts u2, the least recently used
+        await registry.close()
+
+        assert registry.metrics["evicted"] == 1
+        assert first.persisted == 1
+        assert set(store.values) == {
+            "context_snapshot:u1:s1", "context_snapshot:u2:s1", "context_snapshot:u3:s1"
+        }
+
+        restored = await registry.get("u1", "s1")
+
+        assert restored is not first
+        assert restored.notes == ["pricing call booked"]
+        assert registry.metrics["hydrated"] == 1
+        assert _FakeManager.initializations == 3
+        assert "context_snapshot:u1:s1" not in store.values
+
+    @pytest.mark.asyncio
+    async def test_idle_managers_expire(self, registry):
+        await registry.get("u1", "s1")
+        registry.clock.now = 30
+        await registry.get("u2", "s1")
+        registry.clock.now = 70
+
+        assert registry.sweep() == 1
+        assert "u1:s1" not in registry and "u2:s1" in registry
+        assert registry.stats["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_manager_being_retired_is_revived(self, registry):
+        manager = await registry.get("u1", "s1")
+        manager.persist_gate = asyncio.Event()
+        registry.clock.now = 120
+        registry.sweep()
+        await asyncio.sleep(0)
+
+        assert await registry.get("u1", "s1") is manager
+        assert registry.metrics["revived"] == 1
+
+        manager.persist_gate.set()
+        await asyncio.sleep(0.01)
+        assert registry._retiring == {}
+        assert "u1:s1" in registry
+
+    def test_snapshot_codec_round_trip(self):
+        state = {"session": {"entries": [{"content": "hi " * 200}]}}
+
+        data = encode_snapshot(state)
+
+        assert decode_snapshot(data) == state
+        assert len(data) < len(str(state))
+
+
+class TestContextManagerState:
+
+    @pytest.fixture
+    def context_manager_cls(self):
+        with patch("src.services.context.layers.RedisMCP"), \
+             patch("src.services.context.layers.MemoryBankMCP"), \
+             patch("src.services.context.layers.PostgreSQLMCP"), \
+             patch("src.services.context.layers.RefMCP"), \
+             patch("src.services.context.context_manager.RefMCP"):
+            from src.services.context.context_manager import ContextManager
+            yield ContextManager
+
+    def test_export_import_round_trip(self, context_manager_cls):
+        source = context_manager_cls(user_id="u1", session_id="s1")
+        source.session_context.message_buffer.append({"role": "user", "content": "hello"})
+        source.journey_context.current_milestone = "M1"
+        source.knowledge_context.user_profile = {"industry": "retail"}
+
+        state = decode_snapshot(encode_snapshot(source.export_state()))
+        restored = context_manager_cls(user_id="u1", session_id="s1")
+        restored.import_state(state)
+
+        assert restored.is_initialized
+        assert restored.session_context.message_buffer == [{"role": "user", "content": "hello"}]
+        assert restored.journey_context.current_milestone == "M1"
+        assert restored.knowledge_context.user_profile == {"industry": "retail"}
@@ -0,0 +1,170 @@
+"""
+Unit Tests for the In-Memory Context Vector Index
+
+Covers exact and IVF search, removal and persistence of ContextVectorIndex,
+and the knowledge layer answering relevance queries from the index with a
+pgvector fallback for cold users.
+"""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from src.services.context.layers import KnowledgeContext
+from src.services.context.vector_index import ContextVectorIndex
+
+
+DIMENSIONS = 32
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(9).standard_normal((500, DIMENSIONS)).astype(np.float32)
+
+
+def _exact_top(vectors, query, limit):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return np.argsort(-scores)[:limit].tolist()
+
+
+class TestContextVectorIndex:
+
+    def test_exhaustive_search_is_exact(self, vectors):
+        index = ContextVectorIndex()
+        for i, vector in enumerate(vectors):
+            index.add(f"v{i}", vector)
+
+        results = index.search(vectors[3], limit=5, threshold=-1.0)
+
+        assert not index.is_partitioned
+        assert [vector_id for vector_id, _ in results] == [f"v{i}" for i in _exact_top(vectors, vectors[3], 5)]
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_ivf_partition_finds_near_duplicates(self, vectors):
+        index = ContextVectorIndex(ivf_threshold=200, nprobe=4)
+        for i, vector in enumerate(vectors):
+            index.add(f"v{i}", vector)
+
+        assert index.is_partitioned
+        for i in range(0, 500, 50):
+            results = index.search(vectors[i] + 0.01, limit=1)
+            assert results[0][0] == f"v{i}"
+
+    def test_threshold_filters_results(self, vectors):
+        index = ContextVectorIndex()
+        index.add("same", vectors[0])
+        index.add("opposite", -vectors[0])
+
+        assert [vector_id for vector_id, _ in index.search(vectors[0], threshold=0.7)] == ["same"]
+
+    def test_add_replaces_and_remove_drops(self, vectors):
+        index = ContextVectorIndex()
+        index.add("a", vectors[0])
+        index.add("a", vectors[1])
+        index.add("b", vectors[2])
+
+        assert len(index) == 2
+        assert index.search(vectors[1], limit=1)[0][0] == "a"
+        assert index.remove("a")
+        assert not index.remove("a")
+        assert "a" not in index
+        assert [vector_id for vector_id, _ in index.search(vectors[1], threshold=-1.0)] == ["b"]
+
+    def test_compaction_keeps_ids_aligned(self, vectors):
+        index = ContextVectorIndex()
+        for i, vector in enumerate(vectors[:200]):
+            index.add(f"v{i}", vector)
+        for i in range(0, 200, 3):
+            index.remove(f"v{i}")
+        for i in range(0, 200, 3):
+            if i + 1 < 200:
+                index.remove(f"v{i + 1}")
+
+        for i in range(2, 200, 3):
+            assert index.search(vectors[i], limit=1)[0][0] == f"v{i}"
+
+    def test_round_trip_through_dict(self, vectors):
+        index = ContextVectorIndex()
+        for i, vector in enumerate(vectors[:50]):
+            index.add(f"v{i}", vector)
+        index.remove("v7")
+
+        restored = ContextVectorIndex.from_dict(index.to_dict())
+
+        assert len(restored) == 49
+        assert "v7" not in restored
+        assert restored.search(vectors[8], limit=3) == index.search(vectors[8], limit=3)
+
+    def test_rejects_wrong_dimensions(self, vectors):
+        index = ContextVectorIndex()
+        index.add("a", vectors[0])
+
+        with pytest.raises(ValueError):
+            index.add("b", vectors[1][:10])
+
+
+class TestKnowledgeContextIndex:
+
+    @pytest.fixture
+    def layer(self):
+        layer = KnowledgeContext(user_id="user-1", session_id="session-1")
+        embeddings = {}
+
+        async def embed_text(text):
+            seed = sum(text.encode()) + len(text)
+            return embeddings.setdefault(
+                text, np.random.default_rng(seed).standard_normal(DIMENSIONS).tolist()
+            )
+
+        async def store_vector(content, embedding=None, metadata=None):
+            return f"vec-{content}"
+
+        layer.postgres_mcp = AsyncMock()
+        layer.postgres_mcp.embed_text.side_effect = embed_text
+        layer.postgres_mcp.store_vector.side_effect = store_vector
+        layer.postgres_mcp.search_vectors.return_value = []
+        layer.memory_mcp = AsyncMock()
+        layer.memory_mcp.search_memories.return_value = []
+        layer.redis_mcp = AsyncMock()
+        return layer
+
+    @pytest.mark.asyncio
+    async def test_relevance_query_uses_index_without_db(self, layer):
+        for text in ("pricing strategy", "hiring plan", "market research"):
+            assert await layer.add_entry(text, {"category": "notes"})
+
+        relevant = await layer._get_relevant_knowledge("hiring plan")
+
+        assert relevant[0].content == "hiring plan"
+        assert relevant[0].relevance_score == pytest.approx(1.0, abs=1e-5)
+        layer.postgres_mcp.search_vectors.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cold_index_falls_back_to_pgvector(self, layer):
+        await layer.add_entry("pricing strategy", {"category": "notes"})
+        layer.vector_index = ContextVectorIndex()
+        layer.postgres_mcp.search_vectors.return_value = [
+            {"id": "vec-pricing strategy", "score": 0.9}
+        ]
+
+        relevant = await layer._get_relevant_knowledge("pricing")
+
+        assert [entry.content for entry in relevant] == ["pricing strategy"]
+        assert relevant[0].relevance_score == 0.9
+        layer.postgres_mcp.search_vectors.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_index_is_persisted_with_the_layer(self, layer):
+        await layer.add_entry("pricing strategy", {"category": "notes"})
+
+        await layer.persist()
+        stored = layer.memory_mcp.store_memory.await_args_list[-1].kwargs["content"]
+
+        restored = KnowledgeContext(user_id="user-1", session_id="session-1")
+        restored.memory_mcp = AsyncMock()
+        restored.memory_mcp.retrieve_memory.return_value = {"content": stored}
+        await restored.load()
+
+        assert "vec-pricing strategy" in restored.vector_index
@@ -0,0 +1,93 @@
+"""
+Unit Tests for the Milestone Dependency Graph Index
+
+Covers transitive closure maintenance, cycle checks, chains and
+serialization of DependencyGraphIndex.
+"""
+
+import pytest
+
+from src.services.dependency_graph import DependencyEdge, DependencyGraphIndex
+
+
+def _edge(milestone_id, dependency_id, is_required=True):
+    return DependencyEdge(milestone_id, dependency_id, is_required=is_required)
+
+
+@pytest.fixture
+def diamond():
+    """M3 depends on M1 and M2, which both depend on M0."""
+    edges = [_edge("M1", "M0"), _edge("M2", "M0"), _edge("M3", "M1"), _edge("M3", "M2")]
+    labels = {mid: (mid, f"Milestone {mid}") for mid in ("M0", "M1", "M2", "M3")}
+    return DependencyGraphIndex.build(edges, labels, version=3)
+
+
+class TestDependencyGraphIndex:
+    """Test closure queries and incremental updates."""
+    
+    def test_closure_and_order(self, diamond):
+        """Test prerequisite/dependent sets and topological order."""
+        assert diamond.prerequisites("M3") == {"M0", "M1", "M2"}
+        assert diamond.dependents_of("M0") == {"M1", "M2", "M3"}
+        
+        order = diamond.topological_order()
+        assert order.index("M0") < order.index("M1") < order.index("M3")
+        assert diamond.find_cycles() == []
+    
+    def test_would_create_cycle(self, diamond):
+        """Test that cycle checks use the closure."""
+        assert diamond.would_create_cycle("M0", "M3") is True
+        assert diamond.would_create_cycle("M1", "M1") is True
+        assert diamond.would_create_cycle("M3", "M0") is False
+        assert diamond.would_create_cycle("M4", "M3") is False
+    
+    def test_incremental_add_matches_rebuild(self, diamond):
+        """Test that add_edge keeps the closure equal to a full rebuild."""
+        diamond.add_edge(_edge("M4", "M3"), label=("M3", "Milestone M3"))
+        diamond.add_edge(_edge("M0", "M5"), label=("M5", "Milestone M5"))
+        
+        rebuilt = DependencyGraphIndex.build(
+            [edge for edges in diamond.dependencies.values() for edge in edges.values()]
+        )
+        for node in ("M0", "M1", "M2", "M3", "M4", "M5"):
+            assert diamond.prerequisites(node) == rebuilt.prerequisites(node)
+            assert diamond.dependents_of(node) == rebuilt.dependents_of(node)
+        assert diamond.would_create_cycle("M5", "M4") is True
+    
+    def test_remove_edge(self, diamond):
+        """Test that removing an edge shrinks the closure."""
+        diamond.remove_edge("M3", "M1")
+        diamond.remove_edge("M3", "M2")
+        
+        assert diamond.prerequisites("M3") == set()
+        assert diamond.would_create_cycle("M0", "M3") is False
+    
+    def test_chain_levels_and_optional(self):
+        """Test chain levels and optional filtering."""
+        index = DependencyGraphIndex.build(
+            [_edge("C", "B"), _edge("B", "A"), _edge("C", "X", is_required=False)],
+            {mid: (mid, mid) for mid in ("A", "B", "X")}
+        )
+        
+        chain = index.chain("C")
+        assert [(e["milestone_code"], e["level"]) for e in chain] == [("B", 0), ("A", 1)]
+        
+        chain = index.chain("C", include_optional=True)
+        assert [e["milestone_code"] for e in chain] == ["B", "X", "A"]
+    
+    def test_cycles_detected_on_build(self):
+        """Test that cycles already present in the data are reported."""
+        index = DependencyGraphIndex.build([_edge("B", "A"), _edge("C", "B"), _edge("A", "C")])
+        
+        cycles = index.find_cycles()
+        assert len(cycles) == 1
+        assert set(cycles[0]) == {"A", "B", "C"}
+        assert index.prerequisites("A") == {"A", "B", "C"}
+    
+    def test_round_trip(self, diamond):
+        """Test that to_dict/from_dict preserve the index."""
+        restored = DependencyGraphIndex.from_dict(diamond.to_dict())
+        
+        assert restored.version == 3
+        assert restored.prerequisites("M3") == {"M0", "M1", "M2"}
+        assert restored.chain("M3") == diamond.chain("M3")
@@ -12,6 +12,8 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import json
 
 from src.services.dependency_manager import (
+    GRAPH_INDEX_KEY,
+    GRAPH_VERSION_KEY,
     DependencyManager,
     DependencyType,
     DependencyCondition
@@ -187,8 +189,10 @@ class TestDependencyCreation:
         
         # Create existing dependencies: M2 -> M3 -> M1
         existing_deps = [
-            Mock(milestone_id=m3.id, dependency_id=m2.id),
-            Mock(milestone_id=m1.id, dependency_id=m3.id)
+            Mock(milestone_id=m3.id, dependency_id=m2.id, is_required=True,
+                 minimum_completion_percentage=100.0, dependency=m2),
+            Mock(milestone_id=m1.id, dependency_id=m3.id, is_required=True,
+                 minimum_completion_percentage=100.0, dependency=m3)
         ]
         
         mock_db_session.execute.side_effect = [
@@ -234,8 +238,8 @@ class TestDependencyValidation:
         mock_db_session.execute.side_effect = [
             # Get dependencies for M2
             Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[dep])))),
-            # Get user progress for M1
-            Mock(scalar_one_or_none=Mock(return_value=user_milestone))
+            # Get user progress map
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[user_milestone]))))
         ]
         
         all_met, unmet = await dependency_manager.validate_dependencies(
@@ -261,15 +265,13 @@ class TestDependencyValidation:
         
         # No user milestone for M1 (not started)
         mock_db_session.execute.side_effect = [
-            # Get dependencies for M2
+            # Get dependencies for M2 (M1 joined in for details)
             Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[dep])))),
-            # Get user progress for M1 - none found
-            Mock(scalar_one_or_none=Mock(return_value=None)),
-            # Get milestone M1 for details
-            Mock(scalar_one_or_none=Mock(return_value=m1))
+            # Get user progress map - M1 not started
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
         ]
         
-        mock_redis_client.get_cache.return_value = None
+        mock_redis_client.execute = AsyncMock(return_value=[None])
         
         all_met, unmet = await dependency_manager.validate_dependencies(
             str(sample_user.id),
@@ -302,15 +304,14 @@ class TestDependencyValidation:
         
         # M1 is completed, M2 is not
         m1_progress = Mock(spec=UserMilestone)
+        m1_progress.milestone_id = m1.id
         m1_progress.completion_percentage = 100.0
         
         mock_db_session.execute.side_effect = [
             # Get dependencies for M3
             Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[required_dep, optional_dep])))),
-            # Get user progress for M1
-            Mock(scalar_one_or_none=Mock(return_value=m1_progress)),
-            # Get user progress for M2 - not started
-            Mock(scalar_one_or_none=Mock(return_value=None))
+            # Get user progress map - M2 not started
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[m1_progress]))))
         ]
         
         all_met, unmet = await dependency_manager.validate_dependencies(
@@ -322,6 +323,86 @@ class TestDependencyValidation:
         assert len(unmet) == 0
 
 
+class TestBulkValidation:
+    """Test set-based validation across many milestones."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_validate_uses_fixed_number_of_queries(self, dependency_manager, sample_milestones, sample_user, mock_db_session, mock_redis_client):
+        """Test that a chain of milestones is validated with two queries."""
+        deps = []
+        for prev, milestone in zip(sample_milestones, sample_milestones[1:]):
+            dep = Mock(spec=MilestoneDependency)
+            dep.milestone_id = milestone.id
+            dep.dependency_id = prev.id
+            dep.is_required = True
+            dep.minimum_completion_percentage = 100.0
+            dep.dependency = prev
+            deps.append(dep)
+        
+        # User has completed M0 and M1 only
+        progress = []
+        for milestone in sample_milestones[:2]:
+            user_milestone = Mock(spec=UserMilestone)
+            user_milestone.milestone_id = milestone.id
+            user_milestone.completion_percentage = 100.0
+            progress.append(user_milestone)
+        
+        mock_db_session.execute.side_effect = [
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps)))),
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=progress))))
+        ]
+        mock_redis_client.execute = AsyncMock(return_value=[None] * len(deps))
+        
+        milestone_ids = [str(m.id) for m in sample_milestones]
+        results = await dependency_manager.bulk_validate_dependencies(
+            str(sample_user.id),
+            milestone_ids
+        )
+        
+        assert mock_db_session.execute.call_count == 2
+        mock_redis_client.execute.assert_called_once()
+        assert [results[mid]["all_met"] for mid in milestone_ids] == [True, True, True, False, False]
+        assert results[milestone_ids[3]]["unmet_dependencies"][0]["milestone_code"] == "M2"
+    
+    @pytest.mark.asyncio
+    async def test_bulk_validate_conditional_metadata(self, dependency_manager, sample_milestones, sample_user, mock_db_session, mock_redis_client):
+        """Test that conditional metadata from MGET is evaluated in memory."""
+        m1, m2 = sample_milestones[1], sample_milestones[2]
+        
+        dep = Mock(spec=MilestoneDependency)
+        dep.milestone_id = m2.id
+        dep.dependency_id = m1.id
+        dep.is_required = True
+        dep.minimum_completion_percentage = 50.0
+        dep.dependency = m1
+        
+        m1_progress = Mock(spec=UserMilestone)
+        m1_progress.milestone_id = m1.id
+        m1_progress.completion_percentage = 100.0
+        
+        metadata = json.dumps({
+            "type": DependencyType.CONDITIONAL,
+            "conditions": {DependencyCondition.USER_TIER: SubscriptionTier.GROWTH.value}
+        })
+        mock_redis_client.execute = AsyncMock(return_value=[json.dumps(metadata)])
+        
+        mock_db_session.execute.side_effect = [
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[dep])))),
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[m1_progress])))),
+            # Tier is loaded once for all conditional dependencies
+            Mock(scalar_one_or_none=Mock(return_value=SubscriptionTier.FREE.value))
+        ]
+        
+        results = await dependency_manager.bulk_validate_dependencies(
+            str(sample_user.id),
+            [str(m2.id)]
+        )
+        
+        result = results[str(m2.id)]
+        assert result["all_met"] is False
+        assert result["unmet_dependencies"][0]["type"] == DependencyType.CONDITIONAL
+
+
 class TestCircularDependencyDetection:
     """Test circular dependency detection."""
     
@@ -330,8 +411,10 @@ class TestCircularDependencyDetection:
         """Test when no circular dependencies exist."""
         # Create linear dependencies: M1 -> M2 -> M3
         deps = [
-            Mock(milestone_id=uuid4(), dependency_id=uuid4()),
-            Mock(milestone_id=uuid4(), dependency_id=uuid4())
+            Mock(milestone_id=uuid4(), dependency_id=uuid4(), is_required=True,
+                 minimum_completion_percentage=100.0, dependency=None),
+            Mock(milestone_id=uuid4(), dependency_id=uuid4(), is_required=True,
+                 minimum_completion_percentage=100.0, dependency=None)
         ]
         
         mock_db_session.execute.return_value = Mock(
@@ -357,6 +440,9 @@ class TestCircularDependencyDetection:
         for dep in deps:
             dep.milestone_id = UUID(dep.milestone_id)
             dep.dependency_id = UUID(dep.dependency_id)
+            dep.is_required = True
+            dep.minimum_completion_percentage = 100.0
+            dep.dependency = None
         
         mock_db_session.execute.return_value = Mock(
             scalars=Mock(return_value=Mock(all=Mock(return_value=deps)))
@@ -370,6 +456,125 @@ class TestCircularDependencyDetection:
         assert m1_id in cycle or str(deps[0].dependency_id) in cycle
 
 
+class TestGraphIndexSharing:
+    """Test that the graph index is shared between workers through Redis."""
+    
+    @pytest.fixture
+    def shared_redis(self):
+        """Dict-backed Redis client shared by several managers."""
+        store = {}
+        redis = AsyncMock()
+        
+        async def set_cache(key, value, expiry=None, **kwargs):
+            store[key] = value
+            return True
+        
+        async def execute(command, *args):
+            if command == "get":
+                return store.get(args[0])
+            if command == "eval":
+                # STORE_GRAPH_INDEX_SCRIPT: version key, index key, version, index, ttl
+                _, _, version_key, index_key, version, index, _ = args
+                if str(store.get(version_key, 0)) != str(version):
+                    return 0
+                store[index_key] = json.loads(index)
+                return 1
+            assert command == "incr"
+            store[args[0]] = store.get(args[0], 0) + 1
+            return store[args[0]]
+        
+        redis.get_cache = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.set_cache = AsyncMock(side_effect=set_cache)
+        redis.execute = AsyncMock(side_effect=execute)
+        return redis
+    
+    @pytest.fixture
+    def fake_redis(self):
+        """Redis client over an in-process fake server."""
+        fakeredis = pytest.importorskip("fakeredis")
+        import fakeredis.aioredis
+        from src.infrastructure.redis.redis_mcp import RedisMCPClient
+        
+        return RedisMCPClient(
+            async_mode=True,
+            client=fakeredis.aioredis.FakeRedis(decode_responses=True)
+        )
+    
+    @staticmethod
+    def _no_dependencies():
+        return Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
+    
+    @pytest.mark.asyncio
+    async def test_added_dependency_visible_to_other_worker(self, shared_redis, mock_cache_service, sample_milestones):
+        """Test that a second worker picks up an added edge without the database."""
+        m1, m2 = sample_milestones[1], sample_milestones[2]
+        
+        db_a = AsyncMock()
+        db_a.add = MagicMock()
+        db_a.execute.side_effect = [
+            # Build the index (no dependencies yet)
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[])))),
+            Mock(scalar_one_or_none=Mock(return_value=m2)),
+            Mock(scalar_one_or_none=Mock(return_value=m1)),
+            Mock(scalar_one_or_none=Mock(return_value=None))
+        ]
+        db_b = AsyncMock()
+        
+        worker_a = DependencyManager(db_a, mock_cache_service, shared_redis)
+        worker_b = DependencyManager(db_b, mock_cache_service, shared_redis)
+        
+        assert await worker_a.get_dependency_chain(str(m2.id)) == []
+        assert await worker_b.get_dependency_chain(str(m2.id)) == []
+        
+        success, _ = await worker_a.add_dependency(str(m2.id), str(m1.id))
+        assert success is True
+        
+        chain = await worker_b.get_dependency_chain(str(m2.id))
+        assert [entry["milestone_code"] for entry in chain] == ["M1"]
+        assert await worker_b._would_create_cycle(str(m1.id), str(m2.id)) is True
+        db_b.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_slow_rebuild_does_not_replace_newer_snapshot(self, fake_redis, mock_cache_service):
+        """Test that a rebuild overtaken by a graph change is not shared."""
+        pytest.importorskip("lupa")
+        db = AsyncMock()
+        
+        async def rebuild_while_graph_changes(stmt):
+            await fake_redis.execute("incr", GRAPH_VERSION_KEY)
+            return self._no_dependencies()
+        
+        db.execute.side_effect = rebuild_while_graph_changes
+        worker = DependencyManager(db, mock_cache_service, fake_redis)
+        
+        assert (await worker._get_graph_index()).version == 0
+        assert await fake_redis.get_cache(GRAPH_INDEX_KEY) is None
+        
+        db.execute.side_effect = lambda stmt: self._no_dependencies()
+        assert (await worker._get_graph_index()).version == 1
+        assert (await fake_redis.get_cache(GRAPH_INDEX_KEY))["version"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_skips_the_cache(self, mock_cache_service):
+        """Test that an unreadable version stamp never serves a cached graph."""
+        fakeredis = pytest.importorskip("fakeredis")
+        import fakeredis.aioredis
+        from src.infrastructure.redis.redis_mcp import RedisMCPClient
+        
+        server = fakeredis.FakeServer()
+        server.connected = False
+        redis = RedisMCPClient(async_mode=True, client=fakeredis.aioredis.FakeRedis(server=server))
+        db = AsyncMock()
+        db.execute.side_effect = lambda stmt: self._no_dependencies()
+        worker = DependencyManager(db, mock_cache_service, redis)
+        
+        await worker._get_graph_index()
+        await worker._get_graph_index()
+        
+        assert db.execute.await_count == 2
+        assert worker._graph_index is None
+
+
 class TestAutoUnlock:
     """Test auto-unlock functionality."""
     
@@ -382,9 +587,16 @@ class TestAutoUnlock:
         dep = Mock(spec=MilestoneDependency)
         dep.milestone_id = m2.id
         dep.dependency_id = m1.id
+        dep.is_required = True
+        dep.minimum_completion_percentage = 100.0
         dep.milestone = m2
+        dep.dependency = m1
+        
+        # User has completed M1 and has M2 in locked state
+        m1_progress = Mock(spec=UserMilestone)
+        m1_progress.milestone_id = m1.id
+        m1_progress.completion_percentage = 100.0
         
-        # User has M2 in locked state
         user_milestone = Mock(spec=UserMilestone)
         user_milestone.id = uuid4()
         user_milestone.milestone_id = m2.id
@@ -395,9 +607,9 @@ class TestAutoUnlock:
             # Get milestones that depend on M1
             Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[dep])))),
             # Get dependencies for M2 (to validate)
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[])))),
-            # Get user milestone for M2
-            Mock(scalar_one_or_none=Mock(return_value=user_milestone))
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[dep])))),
+            # Get user progress map
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[m1_progress, user_milestone]))))
         ]
         
         newly_unlocked = await dependency_manager.process_milestone_completion(
@@ -533,31 +745,26 @@ class TestDependencyChain:
         m1, m2, m3 = sample_milestones[1], sample_milestones[2], sample_milestones[3]
         
         # M3 -> M2 -> M1
-        deps_m3 = [Mock(
-            dependency_id=m2.id,
-            is_required=True,
-            minimum_completion_percentage=100.0,
-            dependency=m2
-        )]
-        
-        deps_m2 = [Mock(
-            dependency_id=m1.id,
-            is_required=True,
-            minimum_completion_percentage=100.0,
-            dependency=m1
-        )]
+        deps = [
+            Mock(
+                milestone_id=m3.id,
+                dependency_id=m2.id,
+                is_required=True,
+                minimum_completion_percentage=100.0,
+                dependency=m2
+            ),
+            Mock(
+                milestone_id=m2.id,
+                dependency_id=m1.id,
+                is_required=True,
+                minimum_completion_percentage=100.0,
+                dependency=m1
+            )
+        ]
         
+        # The whole graph index is loaded with a single query
         mock_db_session.execute.side_effect = [
-            # Get dependencies for M3
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps_m3)))),
-            # Get M2 details
-            Mock(scalar_one_or_none=Mock(return_value=m2)),
-            # Get dependencies for M2
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps_m2)))),
-            # Get M1 details
-            Mock(scalar_one_or_none=Mock(return_value=m1)),
-            # Get dependencies for M1 (none)
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps))))
         ]
         
         chain = await dependency_manager.get_dependency_chain(str(m3.id))
@@ -574,12 +781,14 @@ class TestDependencyChain:
         # M3 requires M1, optionally depends on M2
         deps = [
             Mock(
+                milestone_id=m3.id,
                 dependency_id=m1.id,
                 is_required=True,
                 minimum_completion_percentage=100.0,
                 dependency=m1
             ),
             Mock(
+                milestone_id=m3.id,
                 dependency_id=m2.id,
                 is_required=False,
                 minimum_completion_percentage=100.0,
@@ -588,16 +797,7 @@ class TestDependencyChain:
         ]
         
         mock_db_session.execute.side_effect = [
-            # Get dependencies for M3
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps)))),
-            # Get M1 details
-            Mock(scalar_one_or_none=Mock(return_value=m1)),
-            # Get dependencies for M1
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[])))),
-            # Get M2 details (for optional)
-            Mock(scalar_one_or_none=Mock(return_value=m2)),
-            # Get dependencies for M2
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps))))
         ]
         
         # Without optional
@@ -605,15 +805,6 @@ class TestDependencyChain:
         assert len(chain) == 1
         assert chain[0]["milestone_code"] == "M1"
         
-        # Reset mock for second call
-        mock_db_session.execute.side_effect = [
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=deps)))),
-            Mock(scalar_one_or_none=Mock(return_value=m1)),
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[])))),
-            Mock(scalar_one_or_none=Mock(return_value=m2)),
-            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
-        ]
-        
-        # With optional
+        # With optional (served from the same index, no further queries)
         chain = await dependency_manager.get_dependency_chain(str(m3.id), include_optional=True)
         assert len(chain) == 2
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Unit Tests for the HTTP Rate Limiter Middleware
+
+Covers the GCRA script semantics and the headers returned by
+RateLimitMiddleware, using fakeredis (with Lua support) as Redis.
+"""
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+import fakeredis.aioredis
+
+from src.core.rate_limiter import RateLimiter, RateLimitMiddleware
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.aioredis.FakeRedis()
+
+
+@pytest.fixture
+def app(fake_redis):
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        redis=fake_redis,
+        auth_limits={"default": (3, 60)}
+    )
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+class TestRateLimiter:
+    """GCRA limiter semantics"""
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_up_to_limit(self, fake_redis):
+        limiter = RateLimiter(redis=fake_redis)
+
+        results = [await limiter.check_rate_limit("k", 5, 60) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[-1].retry_after > 0
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, fake_redis):
+        limiter = RateLimiter(redis=fake_redis)
+
+        for _ in range(2):
+            await limiter.check_rate_limit("a", 2, 60)
+
+        assert not (await limiter.check_rate_limit("a", 2, 60)).allowed
+        assert (await limiter.check_rate_limit("b", 2, 60)).allowed
+
+    @pytest.mark.asyncio
+    async def test_reset_reflects_consumed_quota(self, fake_redis):
+        limiter = RateLimiter(redis=fake_redis)
+
+        first = await limiter.check_rate_limit("r", 10, 60)
+        assert first.reset_after == 6  # one emission interval
+
+        for _ in range(9):
+            last = await limiter.check_rate_limit("r", 10, 60)
+        assert last.reset_after == 60
+
+
+class TestRateLimitMiddleware:
+    """Middleware headers and 429 handling"""
+
+    @pytest.mark.asyncio
+    async def test_headers_track_remaining(self, app):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            responses = [await client.get("/ping") for _ in range(4)]
+
+        assert [r.status_code for r in responses] == [200, 200, 200, 429]
+        assert [r.headers["X-RateLimit-Remaining"] for r in responses] == ["2", "1", "0", "0"]
+        assert responses[0].headers["X-RateLimit-Limit"] == "3"
+        assert int(responses[-1].headers["Retry-After"]) > 0
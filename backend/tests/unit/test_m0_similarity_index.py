@@ -0,0 +1,160 @@
+"""
+Unit Tests for the M0 Snapshot Similarity Index
+
+Covers incremental TF-IDF matching with profile-bucket pre-filtering and
+pruning, and M0CacheService sharing the index between workers through
+Redis without refitting per lookup.
+"""
+
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.services.m0_cache_service import M0CacheService
+from src.services.m0_similarity_index import SnapshotEntry, SnapshotSimilarityIndex
+
+
+CLEANING = "Mobile app for booking home cleaning services with vetted cleaners"
+CLEANING_SIMILAR = "Mobile app for booking home cleaning services with vetted cleaners nearby"
+BAKERY = "Subscription box for artisan sourdough bread delivered weekly"
+
+
+def _compatible(profile1, profile2):
+    service = M0CacheService(AsyncMock(), AsyncMock(), memory_bank=AsyncMock())
+    return service._are_profiles_compatible(profile1, profile2)
+
+
+def _entry(snapshot_id, idea, budget="<5k", experience="none", created_at=None):
+    return SnapshotEntry(snapshot_id, idea, budget, experience, created_at or time.time())
+
+
+class TestSnapshotSimilarityIndex:
+
+    def test_nearest_matches_similar_idea(self):
+        index = SnapshotSimilarityIndex()
+        index.add([_entry("clean", CLEANING), _entry("bread", BAKERY)])
+
+        match = index.nearest(
+            CLEANING_SIMILAR, {"budget_band": "<5k", "experience": "none"}, _compatible, threshold=0.8
+        )
+
+        assert match is not None
+        assert match[0] == "clean"
+        assert match[1] >= 0.8
+
+    def test_incompatible_buckets_are_not_scored(self):
+        index = SnapshotSimilarityIndex()
+        index.add([
+            _entry("far", CLEANING, budget="100k+", experience="experienced"),
+            _entry("near", CLEANING_SIMILAR, budget="5k-25k", experience="some"),
+        ])
+
+        match = index.nearest(CLEANING, {"budget_band": "<5k", "experience": "none"}, _compatible)
+
+        assert match[0] == "near"
+
+    def test_since_and_prune_drop_old_snapshots(self):
+        now = time.time()
+        index = SnapshotSimilarityIndex()
+        index.add([_entry("old", CLEANING, created_at=now - 7200), _entry("bread", BAKERY)])
+        profile = {"budget_band": "<5k", "experience": "none"}
+
+        assert index.nearest(CLEANING, profile, _compatible, 0.8, since=now - 3600) is None
+        assert index.prune(now - 3600) == ["old"]
+        assert "old" not in index
+        assert len(index) == 1
+        assert index.nearest(CLEANING, profile, _compatible, 0.8) is None
+
+    def test_adding_is_idempotent_and_updates_document_frequencies(self):
+        index = SnapshotSimilarityIndex()
+        assert index.add([_entry("clean", CLEANING)]) == 1
+        assert index.add([_entry("clean", CLEANING), _entry("bread", BAKERY)]) == 1
+
+        index.remove(["bread"])
+        rebuilt = SnapshotSimilarityIndex()
+        rebuilt.add([_entry("clean", CLEANING)])
+
+        assert (index._document_frequency == rebuilt._document_frequency).all()
+
+    def test_round_trip_through_dict(self):
+        index = SnapshotSimilarityIndex(version=3)
+        index.add([_entry("clean", CLEANING), _entry("bread", BAKERY)])
+
+        restored = SnapshotSimilarityIndex.from_dict(index.to_dict())
+
+        profile = {"budget_band": "<5k", "experience": "none"}
+        assert restored.version == 3
+        assert restored.nearest(BAKERY, profile, _compatible) == index.nearest(BAKERY, profile, _compatible)
+
+
+class TestM0CacheServiceSimilarity:
+
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        import fakeredis.aioredis
+        from src.infrastructure.redis.redis_mcp import RedisMCPClient
+
+        return RedisMCPClient(async_mode=True, client=fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+    def _service(self, redis_client, snapshots):
+        db = AsyncMock()
+        seed_rows = [
+            SimpleNamespace(
+                id=snapshot_id,
+                idea_summary=idea,
+                user_profile={"budget_band": "<5k", "experience": "none"},
+                created_at=datetime.utcnow()
+            )
+            for snapshot_id, idea in snapshots
+        ]
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = SimpleNamespace(
+            to_dict=lambda: {"idea_name": "CleanBook"}
+        )
+        db.execute.side_effect = lambda stmt: seed_rows if "created_at >" in str(stmt) else found
+        return M0CacheService(db, redis_client, memory_bank=AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_cold_index_is_seeded_from_database_once(self, redis_client):
+        snapshot_id = str(uuid4())
+        service = self._service(redis_client, [(snapshot_id, CLEANING)])
+        profile = {"budget_band": "<5k", "experience": "none"}
+
+        first = await service._find_similar_snapshot(CLEANING_SIMILAR, profile)
+        second = await service._find_similar_snapshot(CLEANING_SIMILAR, profile)
+
+        assert first == second == {"idea_name": "CleanBook"}
+        # Seed query plus one primary-key lookup per hit
+        assert service.db.execute.await_count == 3
+        assert await redis_client.execute("hexists", M0CacheService.SIMILARITY_ENTRIES_KEY, snapshot_id)
+
+    @pytest.mark.asyncio
+    async def test_stored_snapshots_reach_other_workers(self, redis_client):
+        writer = self._service(redis_client, [(str(uuid4()), BAKERY)])
+        reader = self._service(redis_client, [])
+        profile = {"budget_band": "<5k", "experience": "none"}
+        await reader._get_similarity_index()
+
+        snapshot_id = str(uuid4())
+        await writer._update_similarity_index(CLEANING, snapshot_id, profile)
+        index = await reader._get_similarity_index()
+
+        assert snapshot_id in index
+        assert index.nearest(CLEANING_SIMILAR, profile, reader._are_profiles_compatible)[0] == snapshot_id
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_leave_the_shared_hash(self, redis_client):
+        reader = self._service(redis_client, [])
+        fresh, stale = _entry("fresh", CLEANING), _entry("stale", BAKERY, created_at=time.time() - 2 * 86400)
+        for entry in (fresh, stale):
+            await M0CacheService.publish_similarity_entry(redis_client, entry)
+
+        index = await reader._get_similarity_index()
+
+        assert "fresh" in index and "stale" not in index
+        assert await redis_client.execute("hkeys", M0CacheService.SIMILARITY_ENTRIES_KEY) == ["fresh"]
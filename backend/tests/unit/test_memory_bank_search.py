@@ -0,0 +1,103 @@
+"""
+Unit Tests for Memory Bank Search
+
+Covers BM25 ranking over the inverted index, facet filtering, LRU eviction
+and export/import round trips of MemoryBankMCP.
+"""
+
+import pytest
+
+from src.services.mcp_integrations.memory_bank import MemoryBankMCP
+from src.services.mcp_integrations.memory_search import MemorySearchIndex, tokenize
+
+
+class TestMemorySearchIndex:
+
+    def test_tokenize(self):
+        assert tokenize("Prompt_Context: M0 ideas, (v2)") == ["prompt_context", "m0", "ideas", "v2"]
+
+    def test_ranks_by_term_frequency_and_rarity(self):
+        index = MemorySearchIndex()
+        index.add("once", "redis cache for sessions")
+        index.add("twice", "redis cache cache for sessions")
+        index.add("other", "postgres for sessions")
+
+        ranked = index.search("cache sessions")
+
+        assert [key for key, _ in ranked] == ["twice", "once", "other"]
+        assert all(0.0 < score <= 1.0 for _, score in ranked)
+
+    def test_filters_use_facets_and_fall_back_for_unhashable_values(self):
+        index = MemorySearchIndex()
+        index.add("a", "cache", {"type": "knowledge", "user_id": "u1", "tags": ["x"]})
+        index.add("b", "cache", {"type": "knowledge", "user_id": "u2"})
+        index.add("c", "cache", {"type": "note"})
+
+        assert index.filter({"type": "knowledge"}) == {"a", "b"}
+        assert index.filter({"type": "knowledge", "user_id": "u2"}) == {"b"}
+        assert index.filter({"tags": ["x"]}) == {"a"}
+        assert index.filter({"user_id": None}) == {"c"}
+        assert index.search("cache", {"type": "missing"}) == []
+
+    def test_replacing_and_removing_keep_postings_consistent(self):
+        index = MemorySearchIndex()
+        index.add("a", "alpha beta", {"type": "old"})
+        index.add("a", "gamma", {"type": "new"})
+
+        assert index.search("alpha") == []
+        assert index.filter({"type": "old"}) == set()
+        assert index.remove("a")
+        assert not index.remove("a")
+        assert index._postings == {} and index._facets == {} and index._total_length == 0
+
+
+class TestMemoryBankMCPSearch:
+
+    @pytest.mark.asyncio
+    async def test_search_returns_records_with_scores(self):
+        memory_bank = MemoryBankMCP()
+        await memory_bank.store_memory("k1", {"topic": "caching strategies"}, {"type": "knowledge"})
+        await memory_bank.store_memory("k2", "deployment notes", {"type": "knowledge"})
+
+        results = await memory_bank.search_memories("caching", filters={"type": "knowledge"})
+
+        assert [r["key"] for r in results] == ["k1"]
+        assert results[0]["content"] == {"topic": "caching strategies"}
+        assert 0.0 < results[0]["score"] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_query_without_words_lists_recent_matches(self):
+        memory_bank = MemoryBankMCP()
+        for key in ("k1", "k2", "k3"):
+            await memory_bank.store_memory(key, key, {"type": "prompt_context"})
+
+        results = await memory_bank.search_memories("", filters={"type": "prompt_context"}, limit=2)
+
+        assert [r["key"] for r in results] == ["k3", "k2"]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_memories_are_evicted(self):
+        memory_bank = MemoryBankMCP(max_memories=2)
+        await memory_bank.store_memory("k1", "first")
+        await memory_bank.store_memory("k2", "second")
+        await memory_bank.retrieve_memory("k1")
+        await memory_bank.store_memory("k3", "third")
+
+        assert list(memory_bank.memory_index) == ["k1", "k3"]
+        assert await memory_bank.search_memories("second") == []
+
+    @pytest.mark.asyncio
+    async def test_export_import_restores_records_and_order(self):
+        source = MemoryBankMCP()
+        await source.store_memory("k1", "first memory", {"type": "note"})
+        await source.store_memory("k2", "second memory", {"type": "note"})
+        await source.retrieve_memory("k1")
+
+        restored = MemoryBankMCP()
+        assert await restored.import_memories(await source.export_memories()) == 2
+
+        assert list(restored.memory_index) == ["k2", "k1"]
+        assert restored.memory_index["k1"]["access_count"] == 1
+        assert restored.memory_index["k1"]["timestamp"] == source.memory_index["k1"]["timestamp"]
+        results = await restored.search_memories("memory", filters={"type": "note"})
+        assert {r["key"] for r in results} == {"k1", "k2"}
@@ -0,0 +1,198 @@
+"""
+Unit Tests for Chat Message History
+
+Covers the keyset history query, cursors, serving the latest page from
+the cached recent messages without touching the database, rebuilding the
+cache on a miss, and discarding a rebuild that raced with a new message.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.services.chat.chat_service import ChatService
+from src.services.chat.message_history import (
+    RecentMessages,
+    decode_cursor,
+    encode_cursor,
+    history_query,
+    serialize_message
+)
+
+
+def _message(created_at, **fields):
+    return SimpleNamespace(
+        id=uuid4(), user_id=uuid4(), content="hello", content_type="text",
+        message_metadata={}, parent_id=None, created_at=created_at, deleted_at=None,
+        delivered=fields.pop("delivered", 0), read=fields.pop("read", 0), **fields
+    )
+
+
+class _Database:
+    """Answers history queries from a list of messages, newest first."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.queries = []
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        limit = stmt.compile().params["param_1"]
+        return SimpleNamespace(all=lambda: self.messages[:limit])
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis()
+
+
+def _history(count):
+    now = datetime.utcnow()
+    return [_message(now - timedelta(seconds=i), delivered=3, read=1) for i in range(count)]
+
+
+class TestHistoryQuery:
+
+    def test_keyset_page_with_receipt_counts(self):
+        cursor = (datetime.utcnow(), uuid4())
+
+        sql = str(history_query(uuid4(), 51, cursor).compile(dialect=postgresql.dialect()))
+
+        assert "ORDER BY chat_messages.created_at DESC, chat_messages.id DESC" in sql
+        assert "chat_messages.created_at <= " in sql
+        assert "chat_messages.id < " in sql
+        assert sql.count("count(*)") == 2
+        assert "OFFSET" not in sql
+
+    def test_before_id_is_resolved_in_the_same_query(self):
+        sql = str(history_query(uuid4(), 51, before_id=uuid4()).compile(dialect=postgresql.dialect()))
+
+        assert "chat_messages.created_at <= (SELECT chat_messages.created_at" in sql
+
+    def test_cursor_round_trip(self):
+        item = serialize_message(_message(datetime(2024, 5, 1, 12, 0, 0, 123456)))
+
+        created_at, message_id = decode_cursor(encode_cursor(item))
+
+        assert created_at == datetime(2024, 5, 1, 12, 0, 0, 123456)
+        assert str(message_id) == item["id"]
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestGetMessages:
+
+    @pytest.mark.asyncio
+    async def test_opening_a_room_twice_queries_once(self, redis):
+        db = _Database(_history(150))
+        service = ChatService(db, redis)
+        room_id = uuid4()
+
+        first = await service.get_messages(room_id, limit=50)
+        second = await service.get_messages(room_id, limit=50)
+
+        assert len(db.queries) == 1
+        assert first == second
+        assert first["messages"][0]["receipts"] == {"delivered": 3, "read": 1}
+        assert first["next_cursor"] == encode_cursor(first["messages"][-1])
+
+    @pytest.mark.asyncio
+    async def test_sent_messages_join_the_cached_page(self, redis):
+        db = _Database(_history(10))
+        service = ChatService(db, redis)
+        room_id = uuid4()
+        await service.get_messages(room_id)
+
+        sent = serialize_message(_message(datetime.utcnow() + timedelta(seconds=1)))
+        await service.recent.push(room_id, sent)
+        page = await service.get_messages(room_id, limit=5)
+
+        assert len(db.queries) == 1
+        assert page["messages"][0] == sent
+        assert page["next_cursor"] is not None
+
+    @pytest.mark.asyncio
+    async def test_whole_history_in_cache_has_no_next_page(self, redis):
+        db = _Database([])
+        service = ChatService(db, redis)
+        room_id = uuid4()
+
+        assert await service.get_messages(room_id) == {"messages": [], "next_cursor": None}
+        assert await service.get_messages(room_id) == {"messages": [], "next_cursor": None}
+        assert len(db.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_older_pages_come_from_the_database(self, redis):
+        db = _Database(_history(3))
+        service = ChatService(db, redis)
+        room_id = uuid4()
+        page = await service.get_messages(room_id, limit=2)
+
+        db.messages = db.messages[2:]
+        older = await service.get_messages(room_id, limit=2, before=page["next_cursor"])
+
+        assert len(db.queries) == 2
+        assert decode_cursor(page["next_cursor"])[1] in db.queries[1].compile().params.values()
+        assert older == {"messages": [serialize_message(db.messages[0], 3, 1)], "next_cursor": None}
+
+
+class TestRecentMessages:
+
+    @pytest.mark.asyncio
+    async def test_push_does_not_create_a_partial_list(self, redis):
+        recent = RecentMessages(redis)
+        room_id = uuid4()
+
+        await recent.push(room_id, serialize_message(_message(datetime.utcnow())))
+
+        assert await recent.read(room_id, 50) is None
+
+    @pytest.mark.asyncio
+    async def test_fill_loses_to_a_concurrent_send(self, redis):
+        recent = RecentMessages(redis)
+        room_id = uuid4()
+        version = await recent.version(room_id)
+
+        await recent.push(room_id, serialize_message(_message(datetime.utcnow())))
+        items = [serialize_message(message) for message in _history(5)]
+
+        assert await recent.fill(room_id, items, True, version) is False
+        assert await recent.read(room_id, 5) is None
+
+    @pytest.mark.asyncio
+    async def test_list_is_capped(self, redis):
+        recent = RecentMessages(redis, size=3)
+        room_id = uuid4()
+        await recent.fill(room_id, [serialize_message(m) for m in _history(3)], False, None)
+
+        for message in _history(2):
+            await recent.push(room_id, serialize_message(message))
+
+        assert await redis.llen(recent.key(room_id)) == 3
+
+    @pytest.mark.asyncio
+    async def test_end_of_history_with_decoded_responses(self):
+        recent = RecentMessages(fakeredis.aioredis.FakeRedis(decode_responses=True))
+        room_id = uuid4()
+        items = [serialize_message(message) for message in _history(2)]
+        await recent.fill(room_id, items, True, None)
+
+        assert await recent.read(room_id, 50) == (items, False)
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_falls_back_to_the_database(self, redis):
+        db = _Database(_history(3))
+        service = ChatService(db, redis)
+        room_id = uuid4()
+        await redis.rpush(service.recent.key(room_id), "{not json", b"")
+
+        page = await service.get_messages(room_id)
+
+        assert len(db.queries) == 1
+        assert len(page["messages"]) == 3
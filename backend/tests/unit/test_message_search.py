@@ -0,0 +1,155 @@
+"""
+Unit Tests for Chat Message Search
+
+Covers the full-text search query (GIN-indexable match, ts_rank order,
+keyset cursor instead of OFFSET), search cursors, paging through
+ChatService.search_messages, and the precompiled query sanitizer.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_mock_engine
+from sqlalchemy.dialects import postgresql
+
+from src.models.base import Base
+from src.models.chat import ChatMessage
+from src.services.chat.chat_service import ChatService
+from src.services.chat.message_search import (
+    decode_search_cursor,
+    encode_search_cursor,
+    search_query
+)
+
+
+def _row(rank):
+    return SimpleNamespace(
+        id=uuid4(), user_id=uuid4(), content="quarterly invoice", content_type="text",
+        message_metadata={}, parent_id=None, created_at=datetime.utcnow(), deleted_at=None,
+        delivered=2, read=1, rank=rank
+    )
+
+
+class _Database:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        limit = stmt.compile().params["param_1"]
+        return SimpleNamespace(all=lambda: self.rows[:limit])
+
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestSearchQuery:
+
+    def test_matches_the_indexed_vector_and_ranks(self):
+        sql = _sql(search_query(uuid4(), "invoice", 51))
+
+        assert "chat_messages.search_vector @@ plainto_tsquery(" in sql
+        assert "ORDER BY ts_rank(chat_messages.search_vector, plainto_tsquery(" in sql
+        assert "DESC, chat_messages.created_at DESC, chat_messages.id DESC" in sql
+        assert "chat_messages.deleted_at IS NULL" in sql
+        assert "ILIKE" not in sql and "OFFSET" not in sql
+
+    def test_cursor_is_a_row_comparison(self):
+        cursor = (0.0607927, datetime.utcnow(), uuid4())
+
+        sql = _sql(search_query(uuid4(), "invoice", 51, cursor))
+
+        assert "(ts_rank(chat_messages.search_vector, plainto_tsquery(" in sql
+        assert "chat_messages.created_at, chat_messages.id) < (" in sql
+
+    def test_cursor_round_trip(self):
+        row = _row(0.0607927)
+        item = {"created_at": row.created_at.isoformat(), "id": str(row.id)}
+
+        assert decode_search_cursor(encode_search_cursor(row.rank, item)) == (row.rank, row.created_at, row.id)
+        with pytest.raises(ValueError):
+            decode_search_cursor("0.5_not-a-date_x")
+
+
+class TestSearchSchema:
+
+    def test_create_all_adds_trigger_and_index_after_btree_gin(self):
+        statements = []
+        engine = create_mock_engine(
+            "postgresql://",
+            lambda ddl, *args, **kwargs: statements.append(str(ddl.compile(dialect=engine.dialect)))
+        )
+
+        Base.metadata.create_all(engine, tables=[ChatMessage.__table__], checkfirst=False)
+
+        created = [statement.split("(")[0].strip() for statement in statements]
+        extension = created.index("CREATE EXTENSION IF NOT EXISTS btree_gin")
+        assert created.index("CREATE TABLE chat_messages") < extension
+        assert any(statement.startswith("CREATE TRIGGER chat_messages_search_vector") for statement in created)
+        assert created.index(
+            "CREATE INDEX ix_chat_messages_room_search ON chat_messages USING gin"
+        ) > extension
+
+
+class TestSearchMessages:
+
+    @pytest.mark.asyncio
+    async def test_pages_with_a_cursor(self):
+        db = _Database([_row(0.9), _row(0.5), _row(0.1)])
+        service = ChatService(db, redis=None)
+
+        page = await service.search_messages(uuid4(), "invoice", limit=2)
+
+        assert [item["content"] for item in page["messages"]] == ["quarterly invoice"] * 2
+        assert page["messages"][0]["receipts"] == {"delivered": 2, "read": 1}
+        assert decode_search_cursor(page["next_cursor"])[0] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        service = ChatService(_Database([_row(0.9)]), redis=None)
+
+        page = await service.search_messages(uuid4(), "invoice", limit=2)
+
+        assert len(page["messages"]) == 1 and page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_rejected_query_does_not_search(self):
+        db = _Database([_row(0.9)])
+        service = ChatService(db, redis=None)
+
+        page = await service.search_messages(uuid4(), "x' UNION SELECT password FROM users --")
+
+        assert page == {"messages": [], "next_cursor": None}
+        assert db.queries == []
+
+
+class TestSanitizer:
+
+    @pytest.mark.parametrize("query,expected", [
+        ("quarterly invoice", "quarterly invoice"),
+        ("  launch <b>plan</b>!  ", "launch bplanb!"),
+        ("#roadmap @alice", "#roadmap @alice"),
+        ("drop table users", ""),
+        ("Selected items", "Selected items"),
+        ("a -- b", ""),
+        ("", ""),
+    ])
+    def test_sanitize(self, query, expected):
+        service = ChatService(_Database([]), redis=None)
+
+        assert service._sanitize_search_query(query) == expected
+
+    def test_injection_attempt_is_reported(self):
+        service = ChatService(_Database([]), redis=None)
+        service.security_monitor = SimpleNamespace(events=[])
+        service.security_monitor.track_security_event = (
+            lambda event, user_id, details: service.security_monitor.events.append(details)
+        )
+
+        service._sanitize_search_query("1 UNION select 2", uuid4())
+
+        assert service.security_monitor.events[0]["pattern_matched"] == "union"
@@ -47,6 +47,11 @@ def mock_redis_client():
     client.client.pipeline = Mock()
     client.client.info = Mock(return_value={"used_memory_human": "100MB"})
     client.client.ping = Mock(return_value=True)
+
+    # Generic command passthrough routes to the raw client mocks
+    client.execute = AsyncMock(
+        side_effect=lambda command, *args, **kwargs: getattr(client.client, command)(*args, **kwargs)
+    )
     
     return client
 
@@ -759,56 +764,44 @@ class TestCacheManagement:
     """Test cache management and invalidation."""
     
     @pytest.mark.asyncio
-    async def test_invalidate_user_cache(self, cache_service):
+    async def test_invalidate_user_cache(self, cache_service, mock_redis_client):
         """Test invalidating all cached data for a user."""
         user_id = "user123"
+        mock_redis_client.invalidate_tags = AsyncMock(return_value=5)
         
-        # Mock Redis keys matching patterns
-        def mock_keys(pattern):
-            if "user_progress" in pattern:
-                return [f"milestone:progress:user:{user_id}:m1", f"milestone:progress:user:{user_id}:m2"]
-            elif "milestone_tree" in pattern:
-                return [f"milestone:tree:user:{user_id}"]
-            elif "dependency_check" in pattern:
-                return [f"milestone:deps:check:{user_id}:m1"]
-            elif "session" in pattern:
-                return [f"milestone:session:{user_id}:m1"]
-            return []
-        
-        with patch('asyncio.to_thread', side_effect=mock_keys):
-            # Execute
-            success = await cache_service.invalidate_user_cache(user_id)
+        # Execute
+        success = await cache_service.invalidate_user_cache(user_id)
         
-        # Assert
+        # Assert: one tag invalidation, no keyspace scan
         assert success is True
+        mock_redis_client.invalidate_tags.assert_called_once_with(f"milestone:user:{user_id}")
+        mock_redis_client.client.keys.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_invalidate_milestone_cache(self, cache_service):
+    async def test_invalidate_milestone_cache(self, cache_service, mock_redis_client):
         """Test invalidating cached data for a specific milestone."""
         milestone_id = "milestone456"
+        mock_redis_client.invalidate_tags = AsyncMock(return_value=2)
         
-        # Mock Redis keys for milestone
-        def mock_keys(pattern):
-            if milestone_id in pattern:
-                return [f"milestone:data:{milestone_id}", f"milestone:progress:user1:{milestone_id}"]
-            return []
-        
-        with patch('asyncio.to_thread', side_effect=mock_keys):
-            # Execute
-            success = await cache_service.invalidate_milestone_cache(milestone_id)
+        # Execute
+        success = await cache_service.invalidate_milestone_cache(milestone_id)
         
         # Assert
         assert success is True
+        mock_redis_client.invalidate_tags.assert_called_once_with(f"milestone:id:{milestone_id}")
+        mock_redis_client.delete_cache.assert_called_once_with(f"milestone:data:{milestone_id}")
+        mock_redis_client.client.keys.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_invalidate_cache_error_handling(self, cache_service):
+    async def test_invalidate_cache_error_handling(self, cache_service, mock_redis_client):
         """Test cache invalidation error handling."""
         user_id = "user123"
         
         # Mock Redis error
-        with patch('asyncio.to_thread', side_effect=Exception("Redis connection failed")):
-            # Execute
-            success = await cache_service.invalidate_user_cache(user_id)
+        mock_redis_client.invalidate_tags = AsyncMock(side_effect=Exception("Redis connection failed"))
+        
+        # Execute
+        success = await cache_service.invalidate_user_cache(user_id)
         
         # Assert
         assert success is False
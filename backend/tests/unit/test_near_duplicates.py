@@ -0,0 +1,106 @@
+"""
+Unit Tests for MinHash / LSH Near-Duplicate Detection
+
+Checks band selection, signature caching and that RefMCP.deduplicate_content
+keeps the same items with LSH candidates as with exhaustive comparison.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.services.mcp_integrations.near_duplicates import (
+    MinHashDeduplicator,
+    jaccard,
+    optimal_bands,
+    word_set,
+)
+from src.services.mcp_integrations.ref_optimization import RefMCP
+
+
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def _snippets(count, seed=0):
+    """Random snippets, every third one a light edit of an earlier one."""
+    rng = random.Random(seed)
+    snippets = []
+    for i in range(count):
+        if i % 3 == 2:
+            words = snippets[rng.randrange(len(snippets))].split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            snippets.append(" ".join(words))
+        else:
+            snippets.append(" ".join(rng.sample(VOCABULARY, 40)))
+    return snippets
+
+
+class TestMinHash:
+
+    def test_word_set_and_jaccard(self):
+        assert word_set("The  quick\nthe FOX") == {"the", "quick", "fox"}
+        assert jaccard(word_set("a b c"), word_set("a b d")) == pytest.approx(0.5)
+        assert jaccard(frozenset(), word_set("a")) == 0.0
+
+    @pytest.mark.parametrize("threshold", [0.5, 0.7, 0.8, 0.9])
+    def test_banding_favours_recall_at_the_threshold(self, threshold):
+        bands, rows = optimal_bands(threshold, 128)
+
+        def collide(similarity, b, r):
+            return 1 - (1 - similarity ** r) ** b
+
+        assert bands * rows == 128
+        assert collide(threshold, bands, rows) >= 0.9
+        # Halving the bands would miss pairs at the threshold
+        assert bands == 1 or collide(threshold, bands // 2, rows * 2) < 0.9
+
+    def test_signature_estimates_jaccard_and_is_cached(self):
+        deduplicator = MinHashDeduplicator(num_perm=256)
+        first = " ".join(VOCABULARY[:100])
+        second = " ".join(VOCABULARY[20:120])
+
+        words1, signature1 = deduplicator.signature("first", first)
+        _, signature2 = deduplicator.signature("second", second)
+
+        estimate = float(np.mean(signature1 == signature2))
+        assert estimate == pytest.approx(jaccard(words1, word_set(second)), abs=0.1)
+        assert deduplicator.signature("first", "ignored")[1] is signature1
+
+    def test_cache_is_bounded(self):
+        deduplicator = MinHashDeduplicator(cache_size=2)
+        for key in "abc":
+            deduplicator.signature(key, f"text {key}")
+
+        assert list(deduplicator._cache) == ["b", "c"]
+
+
+class TestRefMCPDeduplication:
+
+    @pytest.mark.asyncio
+    async def test_keeps_order_and_drops_near_duplicates(self):
+        ref_mcp = RefMCP()
+        base = " ".join(VOCABULARY[:30])
+        near = " ".join(VOCABULARY[:29] + ["different"])
+        other = " ".join(VOCABULARY[100:130])
+
+        result = await ref_mcp.deduplicate_content([base, other, near, base], similarity_threshold=0.8)
+
+        assert result == [base, other]
+
+    @pytest.mark.asyncio
+    async def test_lsh_matches_exhaustive_comparison(self):
+        ref_mcp = RefMCP()
+        snippets = _snippets(600)
+
+        lsh = await ref_mcp.deduplicate_content(snippets, similarity_threshold=0.8)
+        exhaustive = await ref_mcp.deduplicate_content(snippets, similarity_threshold=0.8, use_lsh=False)
+
+        assert lsh == exhaustive
+        assert len(lsh) < len(snippets)
+
+    @pytest.mark.asyncio
+    async def test_empty_snippets_are_kept_once(self):
+        result = await RefMCP().deduplicate_content(["", "  ", "", "text"])
+
+        assert result == ["", "  ", "text"]
@@ -0,0 +1,126 @@
+"""
+Unit Tests for Per-Connection Outbound Queues
+
+Covers in-order delivery by the writer task, shedding ephemeral events
+before essential ones, disconnecting past the high-water mark or on a
+stalled send, and the lag metrics.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.chat.outbound_queue import OutboundQueue
+
+
+class _Socket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.gate = None
+
+    async def send_text(self, text):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(text)
+
+
+async def _settle():
+    await asyncio.sleep(0.01)
+
+
+class TestOutboundQueue:
+
+    @pytest.mark.asyncio
+    async def test_writer_delivers_in_order(self):
+        socket = _Socket()
+        queue = OutboundQueue(socket, "c1")
+        queue.start()
+
+        for i in range(5):
+            assert queue.offer(f"m{i}")
+        await _settle()
+
+        assert socket.frames == [f"m{i}" for i in range(5)]
+        assert queue.stats()["sent"] == 5 and queue.depth == 0
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_ephemeral_events_are_shed_first(self):
+        socket = _Socket()
+        socket.gate = asyncio.Event()
+        closed = []
+        queue = OutboundQueue(socket, "c1", max_depth=6, shed_depth=3, on_close=closed.append)
+        queue.start()
+
+        queue.offer("typing-1", ephemeral=True)
+        queue.offer("message-1")
+        queue.offer("typing-2", ephemeral=True)
+        await _settle()  # writer holds typing-1 at the gate
+        queue.offer("message-2")
+        queue.offer("message-3")
+        assert not queue.offer("typing-3", ephemeral=True)  # past shed_depth
+
+        queue.offer("message-4")
+        queue.offer("message-5")
+        queue.offer("message-6")  # full: typing-2 is purged to make room
+
+        assert closed == []
+        socket.gate.set()
+        await _settle()
+
+        assert socket.frames == ["typing-1"] + [f"message-{i}" for i in range(1, 7)]
+        assert queue.dropped == 2
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_high_water_mark_disconnects(self):
+        socket = _Socket()
+        socket.gate = asyncio.Event()
+        closed = []
+        queue = OutboundQueue(socket, "c1", max_depth=3, on_close=closed.append)
+        queue.start()
+
+        results = [queue.offer(f"m{i}") for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert closed == [queue] and queue.closed and queue.depth == 0
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_stalled_send_disconnects(self):
+        socket = _Socket()
+        socket.gate = asyncio.Event()  # never set
+        closed = []
+        queue = OutboundQueue(socket, "c1", send_timeout=0.01, on_close=closed.append)
+        queue.start()
+
+        queue.offer("m0")
+        await asyncio.sleep(0.05)
+
+        assert closed == [queue]
+        assert not queue.offer("m1")
+
+    @pytest.mark.asyncio
+    async def test_lag_metrics(self):
+        now = [0.0]
+        socket = _Socket()
+        socket.gate = asyncio.Event()
+        queue = OutboundQueue(socket, "c1", clock=lambda: now[0])
+        queue.start()
+
+        queue.offer("m0")
+        queue.offer("m1")
+        await _settle()
+        now[0] = 2.5
+
+        assert queue.lag == 2.5  # m1 is still queued
+        socket.gate.set()
+        await _settle()
+
+        stats = queue.stats()
+        assert stats["max_lag"] == 2.5 and stats["lag"] == 0.0
+        assert stats["peak_depth"] == 2
+        await queue.close()
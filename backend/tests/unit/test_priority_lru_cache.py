@@ -0,0 +1,115 @@
+"""
+Unit Tests for the priority-segmented L1 cache
+
+Covers LRU ordering within a priority, lowest-priority-first eviction, TTL
+expiry, the memory-bounded mode and how EnhancedMilestoneCacheService and
+CachePerformanceMonitor drive it.
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.services.milestone_cache_enhanced import (
+    CachePriority,
+    EnhancedMilestoneCacheService,
+    PriorityLRUCache,
+)
+from src.infrastructure.redis.cache_monitor import CachePerformanceMonitor, MetricType
+
+
+class TestPriorityLRUCache:
+
+    def test_evicts_least_recently_used_within_priority(self):
+        cache = PriorityLRUCache(max_entries=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key, ttl=60)
+
+        cache.get("a")
+        evicted = cache.set("d", "d", ttl=60)
+
+        assert evicted == 1
+        assert "b" not in cache
+        assert all(key in cache for key in ("a", "c", "d"))
+
+    def test_evicts_lowest_priority_first(self):
+        cache = PriorityLRUCache(max_entries=3)
+        cache.set("critical", 1, ttl=60, priority=CachePriority.CRITICAL)
+        cache.set("low", 2, ttl=60, priority=CachePriority.LOW)
+        cache.set("high", 3, ttl=60, priority=CachePriority.HIGH)
+
+        cache.set("medium", 4, ttl=60, priority=CachePriority.MEDIUM)
+        cache.set("another", 5, ttl=60, priority=CachePriority.MEDIUM)
+
+        assert "low" not in cache
+        assert "medium" not in cache
+        assert "critical" in cache and "high" in cache
+
+    def test_expired_entries_are_dropped_on_read(self):
+        cache = PriorityLRUCache()
+        cache.set("key", "value", ttl=60)
+
+        with patch("src.services.milestone_cache_enhanced.time.monotonic",
+                   return_value=time.monotonic() + 61):
+            assert cache.get("key") is None
+
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
+
+    def test_memory_bounded_mode(self):
+        cache = PriorityLRUCache(max_entries=1000, max_bytes=100)
+        for i in range(5):
+            cache.set(f"key_{i}", "x" * 30, ttl=60)
+
+        assert cache.total_bytes <= 100
+        assert len(cache) == 3
+        assert "key_4" in cache
+
+        cache.max_bytes = 60
+        assert len(cache) == 2
+        assert cache.evictions == 3
+
+    def test_replacing_a_key_updates_size(self):
+        cache = PriorityLRUCache()
+        cache.set("key", "x" * 10, ttl=60)
+        cache.set("key", "x" * 25, ttl=60, priority=CachePriority.HIGH)
+
+        assert len(cache) == 1
+        assert cache.total_bytes == 25
+
+
+class TestServiceL1Cache:
+
+    @pytest.fixture
+    def cache_service(self):
+        return EnhancedMilestoneCacheService(AsyncMock(), l1_max_bytes=10_000)
+
+    def test_l1_set_records_evictions(self, cache_service):
+        cache_service._l1_max_size = 2
+        for i in range(4):
+            cache_service._l1_set(f"key_{i}", {"i": i}, 60)
+
+        assert len(cache_service._l1_cache) == 2
+        assert cache_service._metrics["evictions"] == 2
+
+    def test_invalidate_by_tag(self, cache_service):
+        progress = cache_service.KEY_USER_PROGRESS
+        cache_service._l1_set(f"{progress}1:m1", 1, 60)
+        cache_service._l1_set(f"{progress}2:m1", 2, 60)
+
+        cache_service._l1_cache.invalidate_tags(cache_service._user_tag("1"))
+
+        assert cache_service._l1_get(f"{progress}1:m1") is None
+        assert cache_service._l1_get(f"{progress}2:m1") == 2
+
+    @pytest.mark.asyncio
+    async def test_auto_tune_adjusts_memory_budget(self, cache_service):
+        monitor = CachePerformanceMonitor(cache_service, AsyncMock())
+        cache_service._l1_max_bytes = 10 * 1024 * 1024
+
+        monitor._baselines = {MetricType.MEMORY_USAGE: 0.9}
+        await monitor._auto_tune_cache()
+
+        assert cache_service._l1_max_bytes == 8 * 1024 * 1024
+        assert cache_service._l1_max_size == 1000
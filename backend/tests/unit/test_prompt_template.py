@@ -0,0 +1,94 @@
+"""
+Unit Tests for Compiled Prompt Templates
+
+Covers single-pass rendering of the three placeholder styles, and
+PromptLoader's render cache keyed by template version and variables with
+mtime-based recompilation.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.ai.prompt_loader import PromptLoader, PromptType
+from src.ai.prompt_template import PromptTemplate
+
+
+class TestPromptTemplate:
+
+    def test_renders_all_placeholder_styles(self):
+        template = PromptTemplate.compile("Hi {name}, ${name} and $name; {missing} $names.")
+
+        assert template.names == ("missing", "name", "names")
+        assert template.render({"name": "Ada"}) == "Hi Ada, Ada and Ada; {missing} $names."
+
+    def test_values_are_not_substituted_again(self):
+        template = PromptTemplate.compile("{first} {second}")
+
+        assert template.render({"first": "{second}", "second": "2"}) == "{second} 2"
+
+    def test_literal_only_templates_render_their_source(self):
+        template = PromptTemplate.compile("No placeholders here.")
+
+        assert template.slots == ()
+        assert template.render({"unused": 1}) is template.source
+
+    def test_variables_key_ignores_unreferenced_values(self):
+        template = PromptTemplate.compile("Build {product} for {market}")
+
+        key = template.variables_key({"product": "app", "market": "SMB", "extra": object()})
+
+        assert key == (("market", "SMB"), ("product", "app"))
+        assert template.variables_key({"market": "SMB", "product": "app"}) == key
+
+
+class TestPromptLoaderRenderCache:
+
+    @pytest.fixture
+    def loader(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "system").mkdir()
+            (Path(temp_dir) / "system" / "greeting.md").write_text("Hello {company_name}")
+
+            with patch("src.ai.prompt_loader.RefMCP"), \
+                 patch("src.ai.prompt_loader.MemoryBankMCP"), \
+                 patch("src.ai.prompt_loader.TokenOptimizer"):
+                yield PromptLoader(prompts_dir=temp_dir)
+
+    async def _load(self, loader, **variables):
+        result = await loader.load_prompt(
+            "greeting", PromptType.SYSTEM, variables=variables, inject_context=False, optimize=False
+        )
+        return result["prompt"]
+
+    def test_templates_are_compiled_at_registry_load(self, loader):
+        assert loader._templates["system/greeting"].names == ("company_name",)
+
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_variables(self, loader):
+        assert await self._load(loader, company_name="Acme") == "Hello Acme"
+        assert await self._load(loader, company_name="Globex") == "Hello Globex"
+        assert await self._load(loader, company_name="Acme", unrelated="x") == "Hello Acme"
+
+        assert len(loader._cache["system/greeting"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_edited_file_is_recompiled(self, loader):
+        assert await self._load(loader, company_name="Acme") == "Hello Acme"
+
+        path = loader.prompts_dir / "system" / "greeting.md"
+        path.write_text("Welcome to {company_name}!")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert await self._load(loader, company_name="Acme") == "Welcome to Acme!"
+        assert len(loader._cache["system/greeting"]) == 1
+
+    def test_invalidation_drops_compiled_templates(self, loader):
+        loader.invalidate_cache("system/greeting")
+
+        assert "system/greeting" not in loader._templates
+        assert loader._get_template("system/greeting").source == "Hello {company_name}"
@@ -0,0 +1,179 @@
+"""
+Unit Tests for Write-Behind Chat Receipts
+
+Covers merging delivery and read receipts per (message, user), batched
+upserts that skip missing messages and users, flushing on the batch size,
+requeueing after a failed write (a bounded number of times), and that
+broadcasting no longer touches the request's database session.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.services.chat.receipt_aggregator import ReceiptAggregator, upsert_receipts
+from src.services.chat.websocket_manager import WebSocketManager
+
+
+class _Sessions:
+    """Session factory recording the bound values of every upsert."""
+
+    def __init__(self, fail: int = 0):
+        self.batches = []
+        self.rows = []
+        self.commits = 0
+        self.fail = fail
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        values = list(stmt.compile(dialect=postgresql.dialect()).params.values())
+        rows = sum(isinstance(value, UUID) for value in values) // 3  # id, message_id, user_id
+        self.batches.append(rows)
+        self.rows.append(values)
+        return SimpleNamespace(rowcount=rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis()
+
+
+async def _room(redis, members):
+    room_id = uuid4()
+    await redis.sadd(f"chat:room:{room_id}:participants", *(str(member) for member in members))
+    return room_id
+
+
+class TestReceiptAggregator:
+
+    def test_upsert_keeps_existing_read_at(self):
+        rows = [{"id": uuid4(), "message_id": uuid4(), "user_id": uuid4(),
+                 "received_at": datetime.utcnow(), "read_at": None}]
+
+        sql = str(upsert_receipts(rows).compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (message_id, user_id) DO UPDATE" in sql
+        assert "coalesce(chat_message_receipts.read_at, excluded.read_at)" in sql
+        assert "JOIN chat_messages ON chat_messages.id = incoming.message_id" in sql
+        assert "JOIN users ON users.id = incoming.user_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_deliveries_and_reads_merge_into_one_row(self, redis):
+        reader, other = uuid4(), uuid4()
+        room_id = await _room(redis, [reader, other])
+        sessions = _Sessions()
+        receipts = ReceiptAggregator(redis, session_factory=sessions)
+        message_id = uuid4()
+        delivered = datetime.utcnow()
+
+        receipts.record_delivered(message_id, room_id, delivered)
+        receipts.record_read(reader, [message_id], delivered + timedelta(seconds=3))
+
+        assert await receipts.flush() == 2
+        assert sessions.batches == [2] and sessions.commits == 1
+        # received_at for both members, read_at for the reader only
+        timestamps = sorted(value for value in sessions.rows[0] if isinstance(value, datetime))
+        assert timestamps == [delivered, delivered, delivered + timedelta(seconds=3)]
+
+    @pytest.mark.asyncio
+    async def test_writes_are_batched(self, redis):
+        sessions = _Sessions()
+        receipts = ReceiptAggregator(redis, session_factory=sessions, max_batch=100)
+
+        receipts.record_read(uuid4(), [uuid4() for _ in range(250)])
+        await receipts.flush()
+
+        assert sessions.batches == [100, 100, 50]
+        assert sessions.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_before_the_interval(self, redis):
+        sessions = _Sessions()
+        receipts = ReceiptAggregator(redis, session_factory=sessions, flush_interval=60, max_batch=10)
+        receipts.start()
+        try:
+            await asyncio.sleep(0)
+            receipts.record_read(uuid4(), [uuid4() for _ in range(10)])
+            await asyncio.sleep(0.01)
+
+            assert sessions.batches == [10]
+        finally:
+            await receipts.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried(self, redis):
+        sessions = _Sessions(fail=1)
+        receipts = ReceiptAggregator(redis, session_factory=sessions)
+
+        receipts.record_read(uuid4(), [uuid4(), uuid4()])
+        assert await receipts.flush() == 0
+        assert receipts.pending == 2
+
+        assert await receipts.flush() == 2
+        assert receipts.stats["errors"] == 1 and receipts.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_rows_are_dropped_after_max_attempts(self, redis):
+        sessions = _Sessions(fail=3)
+        receipts = ReceiptAggregator(redis, session_factory=sessions, max_attempts=3)
+
+        receipts.record_read(uuid4(), [uuid4()])
+        for _ in range(3):
+            assert await receipts.flush() == 0
+        assert receipts.pending == 0 and receipts.stats["dropped"] == 1
+
+        receipts.record_read(uuid4(), [uuid4()])
+        assert await receipts.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_receipts_are_bounded(self, redis):
+        receipts = ReceiptAggregator(redis, session_factory=_Sessions(), max_pending=3)
+
+        for _ in range(5):
+            receipts.record_read(uuid4(), [uuid4()])
+
+        assert receipts.pending == 3
+        assert receipts.stats["dropped"] == 2
+
+
+class TestSendPath:
+
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_touch_the_database(self, redis):
+        sessions = _Sessions()
+        manager = WebSocketManager(redis, receipts=ReceiptAggregator(redis, session_factory=sessions))
+        member = uuid4()
+        room_id = await _room(redis, [member])
+        message = SimpleNamespace(
+            id=uuid4(), content="hi", content_type="text", user_id=member,
+            created_at=datetime.utcnow(), metadata={}, parent_id=None
+        )
+        db = MagicMock()
+
+        await manager.broadcast_message(room_id, message, db)
+        await manager.mark_messages_read(room_id, member, [message.id], db)
+
+        assert db.method_calls == []
+        assert await manager.receipts.flush() == 1
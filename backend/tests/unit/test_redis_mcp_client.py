@@ -0,0 +1,115 @@
+"""
+Unit Tests for RedisMCPClient
+
+Verifies that the thread-offloaded (sync) and native asyncio modes expose
+identical JSON cache, locking, pub/sub and rate limiting semantics.
+"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import fakeredis.aioredis
+
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+
+
+def _make_client(async_mode: bool) -> RedisMCPClient:
+    server = fakeredis.FakeServer()
+    if async_mode:
+        raw = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    else:
+        raw = fakeredis.FakeRedis(server=server, decode_responses=True)
+    return RedisMCPClient(async_mode=async_mode, client=raw)
+
+
+@pytest.fixture(params=[False, True], ids=["threaded", "native"])
+def redis_client(request):
+    return _make_client(request.param)
+
+
+class TestRedisMCPClientModes:
+    """Both execution modes must behave identically."""
+
+    @pytest.mark.asyncio
+    async def test_json_roundtrip(self, redis_client):
+        payload = {"milestone": "M1", "progress": [1, 2, 3], "done": False}
+
+        assert await redis_client.set_cache("k", payload, expiry=60)
+        assert await redis_client.get_cache("k") == payload
+        assert await redis_client.get_cache("missing") is None
+
+        assert await redis_client.delete_cache("k")
+        assert await redis_client.get_cache("k") is None
+
+    @pytest.mark.asyncio
+    async def test_string_helpers(self, redis_client):
+        assert await redis_client.set("s", "value", ttl=30)
+        assert await redis_client.get("s") == "value"
+        assert await redis_client.exists("s")
+        assert await redis_client.increment("counter") == 1
+        assert await redis_client.increment("counter", 4) == 5
+        assert await redis_client.delete("s")
+        assert not await redis_client.exists("s")
+
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive(self, redis_client):
+        token = await redis_client.lock("resource", expiry=5)
+        assert token is not None
+        assert await redis_client.lock("resource", expiry=5) is None
+
+        assert not await redis_client.unlock("resource", "wrong-token")
+        assert await redis_client.unlock("resource", token)
+        assert await redis_client.lock("resource", expiry=5) is not None
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pipeline(self, redis_client):
+        assert await redis_client.rate_limit("rl", limit=5, window=60)
+
+    @pytest.mark.asyncio
+    async def test_execute_passthrough(self, redis_client):
+        await redis_client.execute("zadd", "board", {"alice": 3, "bob": 7})
+        top = await redis_client.execute("zrevrange", "board", 0, 0, withscores=True)
+        assert top[0][0] == "bob"
+
+    @pytest.mark.asyncio
+    async def test_publish_returns_receiver_count(self, redis_client):
+        assert await redis_client.publish("channel", {"event": "x"}) == 0
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation(self, redis_client):
+        await redis_client.set_cache("p:1", {"v": 1}, expiry=60, tags=["user:1"])
+        await redis_client.set_cache("p:2", {"v": 2}, expiry=60, tags=["user:1", "m:2"])
+        await redis_client.set("s:1", "raw", ttl=60, tags=["user:2"])
+
+        assert await redis_client.tag_members("user:1") == {"p:1", "p:2"}
+        assert await redis_client.invalidate_tags("user:1") == 2
+
+        assert await redis_client.get_cache("p:1") is None
+        assert await redis_client.get_cache("p:2") is None
+        assert await redis_client.get("s:1") == "raw"
+        assert await redis_client.tag_members("user:1") == set()
+        # Deleted keys also leave the other tags they were written under
+        assert await redis_client.tag_members("m:2") == set()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_large_tag_in_batches(self, redis_client, monkeypatch):
+        monkeypatch.setattr("src.infrastructure.redis.redis_mcp.TAG_BATCH_SIZE", 7)
+        for i in range(50):
+            await redis_client.set(f"k:{i}", "v", ttl=60, tags=["all"])
+
+        assert await redis_client.invalidate_tags("all") == 50
+        assert await redis_client.tag_members("all") == set()
+        assert await redis_client.execute("dbsize") == 0
+
+    @pytest.mark.asyncio
+    async def test_prune_tag_drops_expired_keys(self, redis_client):
+        await redis_client.set("live", "v", ttl=60, tags=["all", "user:1"])
+        await redis_client.set("gone", "v", ttl=60, tags=["all", "user:1"])
+        await redis_client.execute("delete", "gone")  # as if it expired
+
+        cursor = await redis_client.prune_tag("all")
+
+        assert cursor == 0
+        assert await redis_client.tag_members("all") == {"live"}
+        assert await redis_client.tag_members("user:1") == {"live"}
+        assert not await redis_client.exists("cache:keytags:gone")
@@ -0,0 +1,147 @@
+"""
+Unit Tests for the Matrix-Based Similarity Engine
+
+Checks SimilarityMatrix scores against the pairwise
+EmbeddingService.calculate_similarity formulas, top-k selection, batch
+queries, thread-pool mode and awaiting the pool from a coroutine.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.ai.similarity import SimilarityMatrix, SimilarityMetric
+
+
+def _pairwise(query, vector, metric):
+    query, vector = np.asarray(query, dtype=np.float64), np.asarray(vector, dtype=np.float64)
+    if metric == "cosine":
+        return query @ vector / (np.linalg.norm(query) * np.linalg.norm(vector))
+    if metric == "euclidean":
+        return 1 / (1 + np.linalg.norm(query - vector))
+    return query @ vector
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(5).standard_normal((200, 32)).astype(np.float32)
+
+
+class TestSimilarityMatrix:
+
+    @pytest.mark.parametrize("metric", list(SimilarityMetric))
+    def test_scores_match_pairwise_formulas(self, vectors, metric):
+        matrix = SimilarityMatrix.from_pairs(enumerate(vectors), metric=metric)
+        query = vectors[0] + 0.1
+
+        scores = matrix.score(query)
+
+        expected = [_pairwise(query, vector, metric.value) for vector in vectors]
+        assert scores.shape == (len(vectors),)
+        np.testing.assert_allclose(scores, expected, rtol=1e-4, atol=1e-4)
+
+    @pytest.mark.parametrize("metric", list(SimilarityMetric))
+    def test_top_k_matches_full_sort(self, vectors, metric):
+        matrix = SimilarityMatrix.from_pairs(enumerate(vectors), metric=metric)
+        query = vectors[7]
+
+        result = matrix.top_k(query, k=10)
+
+        expected = np.argsort(-matrix.score(query), kind="stable")[:10]
+        assert [key for key, _ in result] == expected.tolist()
+        assert result[0][0] == 7 or metric is SimilarityMetric.DOT
+        assert [score for _, score in result] == sorted((s for _, s in result), reverse=True)
+
+    def test_threshold_and_k_larger_than_matrix(self):
+        matrix = SimilarityMatrix.from_pairs(
+            [("x", [1.0, 0.0]), ("diag", [1.0, 1.0]), ("y", [0.0, 1.0])]
+        )
+
+        result = matrix.top_k([1.0, 0.0], k=10, threshold=0.5)
+
+        assert [key for key, _ in result] == ["x", "diag"]
+        assert result[0][1] == pytest.approx(1.0)
+        assert result[1][1] == pytest.approx(2 ** -0.5, rel=1e-6)
+
+    def test_batch_queries_match_single_queries(self, vectors):
+        matrix = SimilarityMatrix.from_pairs(enumerate(vectors))
+        queries = vectors[:4]
+
+        batch = matrix.top_k_batch(queries, k=3)
+
+        assert matrix.score(queries).shape == (4, len(vectors))
+        singles = [matrix.top_k(query, k=3) for query in queries]
+        assert [[key for key, _ in row] for row in batch] == [[key for key, _ in row] for row in singles]
+        for row, single in zip(batch, singles):
+            assert [score for _, score in row] == pytest.approx([score for _, score in single])
+
+    def test_thread_pool_mode_matches_single_threaded(self, vectors):
+        serial = SimilarityMatrix.from_pairs(enumerate(vectors))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = SimilarityMatrix.from_pairs(
+                enumerate(vectors), executor=executor, parallel_threshold=1, chunk_rows=16
+            )
+
+            result = parallel.top_k_batch(vectors[:3], k=12)
+
+        expected = serial.top_k_batch(vectors[:3], k=12)
+        assert [[key for key, _ in row] for row in result] == [[key for key, _ in row] for row in expected]
+
+    @pytest.mark.asyncio
+    async def test_async_top_k_awaits_executor_chunks(self, vectors):
+        serial = SimilarityMatrix.from_pairs(enumerate(vectors))
+        ticks = 0
+
+        def slow_chunk(*args):
+            time.sleep(0.02)
+            return SimilarityMatrix._chunk_top_k(parallel, *args)
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            parallel = SimilarityMatrix.from_pairs(
+                enumerate(vectors), executor=executor, parallel_threshold=1, chunk_rows=16
+            )
+            parallel._chunk_top_k = slow_chunk
+            ticker = asyncio.create_task(tick())
+            result = await parallel.top_k_async(vectors[3], k=12)
+            ticker.cancel()
+
+        assert [key for key, _ in result] == [key for key, _ in serial.top_k(vectors[3], k=12)]
+        # 13 chunks of 20 ms on 2 threads; a blocked loop would not tick at all
+        assert ticks >= 5
+
+    def test_incremental_adds_grow_storage(self, vectors):
+        matrix = SimilarityMatrix(metric="dot")
+        for start in range(0, len(vectors), 30):
+            matrix.add(list(range(start, min(start + 30, len(vectors)))), vectors[start:start + 30])
+
+        assert len(matrix) == len(vectors)
+        assert matrix.keys == list(range(len(vectors)))
+        np.testing.assert_array_equal(matrix.vectors, vectors)
+        assert matrix.vectors.flags.c_contiguous
+
+    def test_zero_vector_scores_zero_under_cosine(self):
+        matrix = SimilarityMatrix.from_pairs([("zero", [0.0, 0.0]), ("x", [1.0, 0.0])])
+
+        np.testing.assert_array_equal(matrix.score([1.0, 0.0]), [0.0, 1.0])
+
+    def test_rejects_mismatched_input(self):
+        matrix = SimilarityMatrix(dimensions=3)
+
+        with pytest.raises(ValueError):
+            matrix.add(["a"], [[1.0, 2.0]])
+        with pytest.raises(ValueError):
+            matrix.add(["a", "b"], [[1.0, 2.0, 3.0]])
+
+    def test_empty_matrix_returns_no_results(self):
+        matrix = SimilarityMatrix.from_pairs([])
+
+        assert matrix.top_k([1.0, 0.0]) == []
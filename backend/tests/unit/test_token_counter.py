@@ -0,0 +1,96 @@
+"""
+Unit Tests for the Shared Token Counter
+
+Checks memoized and batched counts against plain tiktoken encodes, the
+estimate mode and the fallback to it when no encoding loads, and that
+prefix-window truncation matches truncating the full encoding.
+"""
+
+import asyncio
+import random
+
+import pytest
+import tiktoken
+
+from src.infrastructure.token_counter import TokenCounter, TokenCountMode
+
+
+WORDS = ["launch", "plan", "user's", "pricing", "42", "1999", "(beta)", "—", "ünïcode", "🚀", "...", "\n", "\n\n", "\t"]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return "".join(rng.choice(WORDS) + rng.choice([" ", "  ", "", "\n"]) for _ in range(words))
+
+
+@pytest.fixture(scope="module")
+def encoding():
+    return tiktoken.get_encoding("cl100k_base")
+
+
+class TestTokenCounter:
+
+    def test_counts_match_tiktoken_and_are_memoized(self, encoding):
+        counter = TokenCounter()
+        text = "Validate the pricing hypothesis with ten customer interviews."
+
+        assert counter.count(text) == len(encoding.encode(text))
+        assert counter.count(text) == len(encoding.encode(text))
+        assert counter.stats == {"hits": 1, "misses": 1}
+        assert counter.count("") == 0
+
+    def test_batch_matches_single_counts_and_encodes_duplicates_once(self):
+        counter = TokenCounter()
+        texts = ["first text", "second, longer text", "", "first text"]
+
+        counts = counter.count_batch(texts)
+
+        assert counts == [TokenCounter().count(text) for text in texts]
+        assert len(counter._counts) == 2
+        assert asyncio.run(counter.count_batch_async(texts)) == counts
+
+    def test_estimate_mode_skips_encoding(self):
+        counter = TokenCounter(mode=TokenCountMode.ESTIMATE)
+
+        assert counter.count("x" * 40) == 10
+        assert counter.count("x" * 40, mode=TokenCountMode.EXACT) == TokenCounter().count("x" * 40)
+        assert counter.count_batch(["abcd" * 3]) == [3]
+
+    def test_falls_back_to_estimates_without_an_encoding(self, monkeypatch):
+        def unavailable(name):
+            raise OSError("BPE file not reachable")
+
+        monkeypatch.setattr(tiktoken, "get_encoding", unavailable)
+        counter = TokenCounter()
+
+        assert counter.mode == TokenCountMode.ESTIMATE
+        assert counter.count("x" * 40, mode=TokenCountMode.EXACT) == 10
+        assert counter.count_batch(["abcd" * 3, ""]) == [3, 0]
+        assert counter.truncate("abcd" * 10, 2) == "abcd" * 2
+
+    def test_cache_is_bounded(self):
+        counter = TokenCounter(cache_size=2)
+        for text in ("a", "b", "c"):
+            counter.count(text)
+
+        assert len(counter._counts) == 2
+        assert counter._key("a") not in counter._counts
+
+    def test_prefix_truncation_matches_full_encoding(self, encoding):
+        counter = TokenCounter()
+        rng = random.Random(7)
+
+        for _ in range(300):
+            text = _text(rng, rng.randint(1, 400))
+            limit = rng.randint(1, 300)
+            tokens = encoding.encode(text)
+            expected = text if len(tokens) <= limit else encoding.decode(tokens[:limit])
+
+            assert counter.truncate(text, limit) == expected
+
+    def test_truncate_returns_fitting_text_unchanged(self):
+        counter = TokenCounter()
+        text = "short enough " * 20
+        counter.count(text)
+
+        assert counter.truncate(text, 500) is text
+        assert counter.truncate(text, 0) == ""
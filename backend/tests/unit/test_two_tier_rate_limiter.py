@@ -0,0 +1,78 @@
+"""
+Unit Tests for TwoTierRateLimiter
+
+Verifies that the local token bucket answers most requests without Redis,
+that leases are drawn from a shared budget across limiter instances, and
+that IP block lookups are cached locally.
+"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+import fakeredis.aioredis
+
+from src.core.security.rate_limiter import TwoTierRateLimiter
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.aioredis.FakeRedis()
+
+
+class TestTwoTierRateLimiter:
+
+    @pytest.mark.asyncio
+    async def test_under_limit_traffic_served_locally(self, fake_redis):
+        limiter = TwoTierRateLimiter(fake_redis, lease_fraction=0.1)
+
+        results = [
+            await limiter.check_rate_limit("http", "1.2.3.4", "get", 1000, 60)
+            for _ in range(250)
+        ]
+
+        assert all(allowed for allowed, _ in results)
+        # 100-request leases: 3 round trips for 250 requests
+        assert limiter.stats["leases"] == 3
+        assert limiter.stats["local_hits"] == 247
+
+    @pytest.mark.asyncio
+    async def test_limit_enforced_across_nodes(self, fake_redis):
+        node_a = TwoTierRateLimiter(fake_redis, lease_fraction=0.2)
+        node_b = TwoTierRateLimiter(fake_redis, lease_fraction=0.2)
+
+        allowed = 0
+        for i in range(30):
+            node = node_a if i % 2 == 0 else node_b
+            ok, _ = await node.check_rate_limit("http", "ip", "post", 10, 60)
+            allowed += ok
+
+        assert allowed == 10
+
+    @pytest.mark.asyncio
+    async def test_denials_cached_until_window_end(self, fake_redis):
+        limiter = TwoTierRateLimiter(fake_redis, lease_fraction=0)
+
+        for _ in range(3):
+            await limiter.check_rate_limit("ws", "user", "message", 3, 60)
+        leases_before = limiter.stats["leases"]
+
+        allowed, retry_after = await limiter.check_rate_limit("ws", "user", "message", 3, 60)
+        assert not allowed and retry_after > 0
+
+        allowed, _ = await limiter.check_rate_limit("ws", "user", "message", 3, 60)
+        assert not allowed
+        assert limiter.stats["leases"] == leases_before + 1
+        assert limiter.stats["local_denials"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ip_block_cache(self, fake_redis):
+        limiter = TwoTierRateLimiter(fake_redis, block_cache_ttl=60)
+
+        assert not await limiter.ip_is_blocked("9.9.9.9")
+        await fake_redis.setex("blocked_ip:9.9.9.9", 60, "{}")
+        # Cached negative answer until the TTL expires
+        assert not await limiter.ip_is_blocked("9.9.9.9")
+
+        await limiter.block_ip("8.8.8.8", "test")
+        assert await limiter.ip_is_blocked("8.8.8.8")
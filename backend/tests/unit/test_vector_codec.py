@@ -0,0 +1,97 @@
+"""
+Unit Tests for the Binary Vector Codec
+
+Covers the header, float32/float16/int8 round trips, zero-copy decoding and
+storing encoded vectors through a decode_responses Redis client.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.infrastructure.redis.redis_mcp import RedisMCPClient
+from src.infrastructure.vector_codec import (
+    VectorCodecError,
+    VectorDType,
+    decode_vector,
+    decode_vector_prefix,
+    encode_vector,
+    is_encoded_vector,
+)
+
+
+@pytest.fixture
+def vector():
+    return np.random.default_rng(3).standard_normal(1536).astype(np.float32)
+
+
+class TestVectorCodec:
+
+    def test_float32_round_trip_is_exact_and_zero_copy(self, vector):
+        data = encode_vector(vector)
+
+        decoded = decode_vector(data)
+
+        assert len(data) == 8 + 1536 * 4
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, vector)
+        # A read-only view into the payload, not a copy
+        assert not decoded.flags.writeable
+        assert decoded.base is not None
+
+    @pytest.mark.parametrize("dtype, itemsize, tolerance", [
+        (VectorDType.FLOAT16, 2, 2e-3),
+        (VectorDType.INT8, 1, 2e-2),
+    ])
+    def test_quantized_round_trip(self, vector, dtype, itemsize, tolerance):
+        data = encode_vector(vector, dtype)
+
+        decoded = decode_vector(data)
+
+        assert len(data) <= 12 + 1536 * itemsize
+        assert decoded.dtype == np.float32
+        np.testing.assert_allclose(decoded, vector, atol=tolerance * np.abs(vector).max())
+
+    def test_raw_quantized_values_without_dequantizing(self, vector):
+        raw = decode_vector(encode_vector(vector, VectorDType.INT8), dequantize=False)
+
+        assert raw.dtype == np.int8
+        assert np.abs(raw).max() == 127
+
+    def test_trailing_data_after_vector(self):
+        data = encode_vector([1.0, 2.0]) + b'{"text": "hi"}'
+
+        decoded, end = decode_vector_prefix(data)
+
+        assert decoded.tolist() == [1.0, 2.0]
+        assert json.loads(data[end:]) == {"text": "hi"}
+
+    def test_rejects_legacy_and_corrupt_data(self):
+        legacy = json.dumps([0.1, 0.2]).encode()
+        assert not is_encoded_vector(legacy)
+
+        with pytest.raises(VectorCodecError):
+            decode_vector(legacy)
+        with pytest.raises(VectorCodecError):
+            decode_vector(encode_vector([1.0, 2.0])[:-1])
+        with pytest.raises(VectorCodecError):
+            decode_vector(b"VC\x09\x00" + bytes(4))
+
+
+class TestBinaryRedisValues:
+
+    @pytest.mark.asyncio
+    async def test_bytes_survive_a_decoding_client(self, vector):
+        fakeredis = pytest.importorskip("fakeredis")
+        import fakeredis.aioredis
+
+        client = RedisMCPClient(
+            async_mode=True,
+            client=fakeredis.aioredis.FakeRedis(decode_responses=True)
+        )
+        data = encode_vector(vector)
+
+        assert await client.set_bytes("embedding:1", data, expiry=60)
+        assert await client.mget_bytes(["embedding:1", "missing"]) == [data, None]
+        np.testing.assert_array_equal(decode_vector(await client.get_bytes("embedding:1")), vector)
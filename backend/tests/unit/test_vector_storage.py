@@ -0,0 +1,34 @@
+"""
+Unit Tests for Growable Vector Storage
+
+Covers growing row arrays together, keeping the used rows and their dtypes,
+and leaving arrays alone while they still fit.
+"""
+
+import numpy as np
+
+from src.infrastructure.vector_storage import INITIAL_CAPACITY, grow_rows
+
+
+class TestGrowRows:
+
+    def test_grows_all_arrays_and_keeps_used_rows(self):
+        rows = np.arange(12, dtype=np.float32).reshape(4, 3)
+        alive = np.array([True, False, True, True])
+
+        grown_rows, grown_alive = grow_rows((rows, alive), 5, 3)
+
+        assert grown_rows.shape == (INITIAL_CAPACITY, 3) and grown_rows.dtype == np.float32
+        assert grown_alive.shape == (INITIAL_CAPACITY,) and grown_alive.dtype == bool
+        np.testing.assert_array_equal(grown_rows[:3], rows[:3])
+        np.testing.assert_array_equal(grown_alive[:3], alive[:3])
+        assert not grown_alive[3:].any()
+
+    def test_capacity_doubles(self):
+        rows = np.zeros((100, 2), dtype=np.float32)
+
+        assert grow_rows((rows,), 101, 100)[0].shape[0] == 200
+        assert grow_rows((rows,), 500, 100)[0].shape[0] == 500
+
+    def test_no_copy_while_it_fits(self):
+        assert grow_rows((np.zeros((8, 2)),), 8, 8) is None